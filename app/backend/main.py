@@ -52,6 +52,10 @@ else:
 db_path_str = os.getenv("DB_PATH", "haiku_rag.lancedb")
 db_path = Path(db_path_str)
 
+# Load search indexes at startup; /health answers 503 until they are loaded.
+warm_indexes = os.getenv("WARM_INDEXES", "").lower() in ("1", "true", "yes")
+_ready = asyncio.Event()
+
 logger.info(f"Database path: {db_path}")
 logger.info(f"QA Provider: {config.qa.model.provider}, Model: {config.qa.model.name}")
 
@@ -132,15 +136,17 @@ async def stream_chat(request: Request) -> Response:
 
 
 async def health_check(_: Request) -> JSONResponse:
-    """Health check endpoint."""
+    """Health check endpoint. Reports 503 while startup warm-up is running."""
+    ready = _ready.is_set()
     return JSONResponse(
         {
-            "status": "healthy",
+            "status": "healthy" if ready else "warming",
             "qa_provider": config.qa.model.provider,
             "qa_model": config.qa.model.name,
             "db_path": str(db_path),
             "db_exists": db_path.exists(),
-        }
+        },
+        status_code=200 if ready else 503,
     )
 
 
@@ -247,15 +253,35 @@ async def visualize_chunk(request: Request) -> JSONResponse:
     )
 
 
+async def _warm() -> None:
+    """Load the search indexes, then report ready even if that failed."""
+    try:
+        client = await get_client()
+        await client.store.warm()
+    except Exception as e:
+        logger.warning(f"Index warm-up failed: {e}")
+    finally:
+        _ready.set()
+
+
 @asynccontextmanager
 async def lifespan(_app: Starlette):
     """Shut down the cached HaikuRAG client cleanly on app exit.
 
     Awaits any in-flight background vacuum tasks and closes the LanceDB
     connection. Without this, vacuum tasks are cancelled abruptly and the
-    connection is never closed on process shutdown.
+    connection is never closed on process shutdown. With WARM_INDEXES set, the
+    search indexes load in the background first.
     """
+    warm_task: asyncio.Task | None = None
+    if warm_indexes:
+        warm_task = asyncio.create_task(_warm())
+    else:
+        _ready.set()
     yield
+    if warm_task is not None:
+        warm_task.cancel()
+        await asyncio.gather(warm_task, return_exceptions=True)
     global _client
     if _client is not None:
         await _client.__aexit__(None, None, None)
@@ -101,7 +101,14 @@ class HaikuRAGApp:
 
         # Per-table row counts and sizes. Missing required tables are
         # reported as "absent" rather than raising.
-        for name in ("documents", "document_meta", "chunks", "document_items"):
+        for name in (
+            "documents",
+            "document_meta",
+            "chunks",
+            "document_items",
+            "document_pages",
+            "picture_blobs",
+        ):
             entry = tables[name]
             if entry.exists:
                 self.console.print(
@@ -160,6 +167,70 @@ class HaikuRAGApp:
                 f"{tables['chunks'].num_versions}"
             )
 
+        self.console.rule()
+        self.console.print("[bold]Compaction[/bold]")
+        for name in (
+            "documents",
+            "document_meta",
+            "chunks",
+            "document_items",
+            "document_pages",
+            "picture_blobs",
+        ):
+            entry = tables[name]
+            if not entry.exists:
+                continue
+            layout = entry.layout
+            due = (
+                f"[yellow]due: {', '.join(entry.compaction_due)}[/yellow]"
+                if entry.compaction_due
+                else "ok"
+            )
+            self.console.print(
+                f"  [repr.attrib_name]{name}[/repr.attrib_name]: "
+                f"{layout.num_fragments} fragments "
+                f"({layout.num_small_fragments} small), "
+                f"{layout.deleted_row_ratio:.0%} deleted, "
+                f"{layout.stale_versions} stale versions — {due}"
+            )
+        last = info.last_compaction
+        if last is None:
+            self.console.print("  [repr.attrib_name]last run[/repr.attrib_name]: never")
+        else:
+            self.console.print(
+                f"  [repr.attrib_name]last run[/repr.attrib_name]: "
+                f"{last.started_at:%Y-%m-%d %H:%M:%S} ({last.duration_s:.1f}s)"
+            )
+            for table in last.tables:
+                if table.compacted:
+                    self.console.print(
+                        f"    {table.name}: compacted in {table.duration_s:.1f}s "
+                        f"({', '.join(table.reasons)})"
+                    )
+                else:
+                    self.console.print(f"    {table.name}: skipped")
+
+        for title, cache in (
+            ("Disk cache", info.disk_cache),
+            ("Conversion cache", info.conversion_cache),
+        ):
+            if cache is None:
+                continue
+            ratio = f"{cache.hit_ratio:.1%}" if cache.hit_ratio is not None else "n/a"
+            self.console.rule()
+            self.console.print(f"[bold]{title}[/bold]")
+            self.console.print(
+                f"  [repr.attrib_name]path[/repr.attrib_name]: {cache.path}"
+            )
+            self.console.print(
+                f"  [repr.attrib_name]size[/repr.attrib_name]: "
+                f"{format_bytes(cache.size_bytes)} of {format_bytes(cache.max_size_bytes)}"
+            )
+            self.console.print(
+                f"  [repr.attrib_name]hit ratio[/repr.attrib_name]: {ratio} "
+                f"({cache.hits} hits, {cache.misses} misses)"
+            )
+
         self.console.rule()
         if info.pending_migrations:
             self.console.print(
@@ -287,6 +358,8 @@ class HaikuRAGApp:
                 "document_meta",
                 "chunks",
                 "document_items",
+                "document_pages",
+                "picture_blobs",
                 "settings",
             ]
             if table:
@@ -505,6 +578,48 @@ class HaikuRAGApp:
                     f"[yellow]Document with id {doc_id} not found.[/yellow]"
                 )
 
+    async def delete_documents(
+        self, doc_ids: list[str] | None = None, filter: str | None = None
+    ):
+        async with HaikuRAG(
+            db_path=self.db_path,
+            config=self.config,
+            read_only=self.read_only,
+            skip_validation=True,
+        ) as self.client:
+            deleted = await self.client.delete_documents(
+                document_ids=doc_ids, filter=filter
+            )
+            if deleted:
+                self.console.print(
+                    f"[bold green]Deleted {deleted} documents.[/bold green]"
+                )
+            else:
+                self.console.print("[yellow]No matching documents found.[/yellow]")
+
+    async def update_documents_metadata(
+        self,
+        metadata: dict,
+        doc_ids: list[str] | None = None,
+        filter: str | None = None,
+        replace: bool = False,
+    ):
+        async with HaikuRAG(
+            db_path=self.db_path,
+            config=self.config,
+            read_only=self.read_only,
+            skip_validation=True,
+        ) as self.client:
+            updated = await self.client.update_documents_metadata(
+                metadata, document_ids=doc_ids, filter=filter, replace=replace
+            )
+            if updated:
+                self.console.print(
+                    f"[bold green]Updated metadata of {updated} documents.[/bold green]"
+                )
+            else:
+                self.console.print("[yellow]No matching documents found.[/yellow]")
+
     async def search(
         self,
         query: str | None = None,
@@ -512,6 +627,7 @@ class HaikuRAGApp:
         filter: str | None = None,
         search_type: SearchType | None = None,
         image: Path | None = None,
+        at_tag: str | None = None,
     ):
         if query is None and image is None:
             self.console.print(
@@ -538,12 +654,21 @@ class HaikuRAGApp:
             config=self.config,
             read_only=True,
         ) as self.client:
-            results = await self.client.search(
-                search_input,
-                limit=limit,
-                filter=filter,
-                search_type=search_type,
-            )
+            if at_tag is None:
+                results = await self.client.search(
+                    search_input,
+                    limit=limit,
+                    filter=filter,
+                    search_type=search_type,
+                )
+            else:
+                async with self.client.snapshot(tag=at_tag) as snapshot:
+                    results = await snapshot.search(
+                        search_input,
+                        limit=limit,
+                        filter=filter,
+                        search_type=search_type,
+                    )
             if not results:
                 self.console.print("[yellow]No results found.[/yellow]")
                 return
@@ -711,8 +836,118 @@ class HaikuRAGApp:
             await client.vacuum()
         self.console.print("[bold green]Vacuum completed successfully.[/bold green]")
 
-    async def migrate(self) -> list[str]:
-        """Run pending database migrations.
+    async def train_dictionary(self, samples: int, size: int):
+        """Train a zstd dictionary for docling structure and report its effect."""
+        from haiku.rag.store.dictionary import train_docling_dictionary
+        from haiku.rag.store.engine import Store
+
+        async with Store(
+            self.db_path,
+            config=self.config,
+            skip_validation=True,
+            read_only=self.read_only,
+        ) as store:
+            report = await train_docling_dictionary(
+                store, sample_size=samples, dict_size=size
+            )
+
+        self.console.print(
+            f"[bold green]Trained dictionary {report.dictionary_id} "
+            f"({report.dictionary_bytes:,} bytes) on {report.samples} "
+            "documents.[/bold green]"
+        )
+        self.console.print(
+            f"  [repr.attrib_name]raw[/repr.attrib_name]: {report.raw_bytes:,} bytes"
+        )
+        self.console.print(
+            f"  [repr.attrib_name]without dictionary[/repr.attrib_name]: "
+            f"{report.plain_bytes:,} bytes, decompressed in "
+            f"{report.plain_decompress_s * 1000:.1f} ms"
+        )
+        self.console.print(
+            f"  [repr.attrib_name]with dictionary[/repr.attrib_name]: "
+            f"{report.dictionary_compressed_bytes:,} bytes "
+            f"({report.size_change:+.1%}), decompressed in "
+            f"{report.dictionary_decompress_s * 1000:.1f} ms"
+        )
+        self.console.print(
+            "New writes use the dictionary. Reopen other processes using this "
+            "database before they read new documents."
+        )
+
+    async def export_database(
+        self,
+        destination: Path,
+        format: str = "parquet",
+        include_vectors: bool = True,
+        include_pages: bool = True,
+        concurrency: int = 4,
+    ):
+        """Export every table to a directory of Parquet or Arrow IPC files."""
+        from haiku.rag.store.engine import Store
+        from haiku.rag.store.transfer import ExportFormat, export_database
+
+        async with Store(
+            self.db_path, config=self.config, skip_validation=True, read_only=True
+        ) as store:
+            with Progress() as progress:
+                manifest = await export_database(
+                    store,
+                    destination,
+                    format=ExportFormat(format),
+                    include_vectors=include_vectors,
+                    include_pages=include_pages,
+                    concurrency=concurrency,
+                    on_progress=self._transfer_progress(progress),
+                )
+
+        rows = sum(table.rows for table in manifest.tables)
+        self.console.print(
+            f"[bold green]Exported {rows:,} rows from {len(manifest.tables)} "
+            f"tables to {destination}.[/bold green]"
+        )
+
+    async def import_database(self, source: Path, concurrency: int = 4):
+        """Load an export into an empty database and build its indexes."""
+        from haiku.rag.store.exceptions import ReadOnlyError
+        from haiku.rag.store.transfer import import_database
+
+        if self.read_only:
+            raise ReadOnlyError("Cannot import into a database in read-only mode.")
+
+        with Progress() as progress:
+            manifest = await import_database(
+                self.config,
+                self.db_path,
+                source,
+                concurrency=concurrency,
+                on_progress=self._transfer_progress(progress),
+            )
+
+        rows = sum(table.rows for table in manifest.tables)
+        self.console.print(
+            f"[bold green]Imported {rows:,} rows into {self.db_path}.[/bold green]"
+        )
+        if not manifest.include_vectors:
+            self.console.print(
+                "[yellow]The export has no vectors; run 'haiku-rag rebuild "
+                "--embed-only' before searching.[/yellow]"
+            )
+
+    @staticmethod
+    def _transfer_progress(progress: Progress):
+        """A progress callback drawing one bar per table or migration step."""
+        tasks: dict[str, TaskID] = {}
+
+        def on_progress(table: str, done: int, total: int) -> None:
+            if table not in tasks:
+                tasks[table] = progress.add_task(table, total=total)
+            progress.update(tasks[table], completed=done)
+
+        return on_progress
+
+    async def migrate(self, concurrency: int = 4) -> list[str]:
+        """Run pending database migrations, drawing a progress bar per step.
 
         Returns:
             List of descriptions of applied migrations.
@@ -726,7 +961,11 @@ class HaikuRAGApp:
             skip_migration_check=True,
             read_only=self.read_only,
         ) as store:
-            return await store.migrate()
+            with Progress(transient=True) as progress:
+                return await store.migrate(
+                    concurrency=concurrency,
+                    on_progress=self._transfer_progress(progress),
+                )
 
     async def create_index(self):
         """Create vector index on the chunks table."""
@@ -885,6 +1124,8 @@ class HaikuRAGApp:
         transport: str | None = None,
         host: str = "127.0.0.1",
         port: int = 8001,
+        warm: bool = False,
+        warm_blocking: bool = False,
     ):
         """Run the MCP server until interrupted."""
         async with HaikuRAG(
@@ -893,7 +1134,11 @@ class HaikuRAGApp:
             read_only=self.read_only,
         ):
             server = create_mcp_server(
-                self.db_path, config=self.config, read_only=self.read_only
+                self.db_path,
+                config=self.config,
+                read_only=self.read_only,
+                warm=warm,
+                warm_blocking=warm_blocking,
             )
             try:
                 if transport == "stdio":
@@ -6,6 +6,7 @@ from importlib.metadata import version
 from pathlib import Path
 from typing import TYPE_CHECKING, Any
 
+import click
 import typer
 from dotenv import find_dotenv, load_dotenv
 
@@ -251,10 +252,18 @@ def get_document(
     asyncio.run(app.get_document(doc_id=doc_id))
 
 
-@_cli.command("delete", help="Delete a document by its ID")
+@_cli.command("delete", help="Delete documents by ID or by filter")
 def delete_document(
-    doc_id: str = typer.Argument(
-        help="The ID of the document to delete",
+    doc_ids: list[str] | None = typer.Argument(
+        None,
+        help="The IDs of the documents to delete",
+        show_default=False,
+    ),
+    filter: str | None = typer.Option(
+        None,
+        "--filter",
+        "-f",
+        help="SQL WHERE clause selecting the documents to delete instead of IDs",
     ),
     db: Path | None = typer.Option(
         None,
@@ -262,8 +271,13 @@ def delete_document(
         help="Path to the LanceDB database file",
     ),
 ):
+    if bool(doc_ids) == (filter is not None):
+        raise typer.BadParameter("Pass document IDs or --filter, not both")
     app = create_app(db)
-    asyncio.run(app.delete_document(doc_id=doc_id))
+    if doc_ids is not None and len(doc_ids) == 1:
+        asyncio.run(app.delete_document(doc_id=doc_ids[0]))
+    else:
+        asyncio.run(app.delete_documents(doc_ids=doc_ids or None, filter=filter))
 
 
 # Add alias `rm` for delete
@@ -272,6 +286,47 @@ _cli.command("rm", help="Alias for delete: remove a document by its ID")(
 )
 
 
+@_cli.command("update-metadata", help="Set metadata on documents by ID or filter")
+def update_metadata(
+    doc_ids: list[str] | None = typer.Argument(
+        None,
+        help="The IDs of the documents to update",
+        show_default=False,
+    ),
+    meta: list[str] = typer.Option(
+        ...,
+        "--meta",
+        help="Metadata entries as KEY=VALUE (repeatable)",
+        metavar="KEY=VALUE",
+    ),
+    filter: str | None = typer.Option(
+        None,
+        "--filter",
+        "-f",
+        help="SQL WHERE clause selecting the documents to update instead of IDs",
+    ),
+    replace: bool = typer.Option(
+        False,
+        "--replace",
+        help="Replace each document's metadata instead of merging into it",
+    ),
+    db: Path | None = typer.Option(
+        None,
+        "--db",
+        help="Path to the LanceDB database file",
+    ),
+):
+    if bool(doc_ids) == (filter is not None):
+        raise typer.BadParameter("Pass document IDs or --filter, not both")
+    metadata = _parse_meta_options(meta)
+    app = create_app(db)
+    asyncio.run(
+        app.update_documents_metadata(
+            metadata=metadata, doc_ids=doc_ids or None, filter=filter, replace=replace
+        )
+    )
+
+
 @_cli.command("search", help="Search for documents by a query")
 def search(
     query: str | None = typer.Argument(
@@ -301,6 +356,11 @@ def search(
         "--image",
         help="Path to an image file to use as the query (requires a multimodal embedder)",
     ),
+    at_tag: str | None = typer.Option(
+        None,
+        "--at-tag",
+        help="Search the database as it was when this tag was created",
+    ),
     db: Path | None = typer.Option(
         None,
         "--db",
@@ -308,15 +368,20 @@ def search(
     ),
 ):
     app = create_app(db)
-    asyncio.run(
-        app.search(
-            query=query,
-            limit=limit,
-            filter=filter,
-            search_type=search_type,
-            image=image,
+    try:
+        asyncio.run(
+            app.search(
+                query=query,
+                limit=limit,
+                filter=filter,
+                search_type=search_type,
+                image=image,
+                at_tag=at_tag,
+            )
         )
-    )
+    except ValueError as e:
+        typer.echo(f"Error: {e}", err=True)
+        raise typer.Exit(1)
 
 
 @_cli.command("visualize", help="Show visual grounding for a chunk")
@@ -527,8 +592,117 @@ def vacuum(
     asyncio.run(app.vacuum())
 
 
+@_cli.command(
+    "train-dictionary",
+    help="Train a zstd dictionary for docling structure from a sample of documents",
+)
+def train_dictionary(
+    samples: int = typer.Option(
+        1000,
+        "--samples",
+        min=1,
+        help="Number of documents to sample",
+    ),
+    size: int = typer.Option(
+        112 * 1024,
+        "--size",
+        min=256,
+        help="Maximum dictionary size in bytes",
+    ),
+    db: Path | None = typer.Option(
+        None,
+        "--db",
+        help="Path to the LanceDB database file",
+    ),
+):
+    app = create_app(db)
+    try:
+        asyncio.run(app.train_dictionary(samples=samples, size=size))
+    except ValueError as e:
+        typer.echo(f"Error: {e}", err=True)
+        raise typer.Exit(1)
+
+
+@_cli.command(
+    "export", help="Export every table to Parquet or Arrow IPC files in a directory"
+)
+def export_db(
+    destination: Path = typer.Argument(help="Directory to write, new or empty"),
+    format: str = typer.Option(
+        "parquet",
+        "--format",
+        click_type=click.Choice(["parquet", "arrow"]),
+        help="File format of the exported tables",
+    ),
+    no_vectors: bool = typer.Option(
+        False,
+        "--no-vectors",
+        help="Leave out embeddings; the import needs rebuild --embed-only",
+    ),
+    no_pages: bool = typer.Option(
+        False,
+        "--no-pages",
+        help="Leave out page images",
+    ),
+    parallel: int = typer.Option(
+        4,
+        "--parallel",
+        min=1,
+        help="Number of tables exported at once",
+    ),
+    db: Path | None = typer.Option(
+        None,
+        "--db",
+        help="Path to the LanceDB database file",
+    ),
+):
+    app = create_app(db)
+    try:
+        asyncio.run(
+            app.export_database(
+                destination=destination,
+                format=format,
+                include_vectors=not no_vectors,
+                include_pages=not no_pages,
+                concurrency=parallel,
+            )
+        )
+    except ValueError as e:
+        typer.echo(f"Error: {e}", err=True)
+        raise typer.Exit(1)
+
+
+@_cli.command("import", help="Load an export into a new database")
+def import_db(
+    source: Path = typer.Argument(help="Directory written by haiku-rag export"),
+    parallel: int = typer.Option(
+        4,
+        "--parallel",
+        min=1,
+        help="Number of tables loaded at once",
+    ),
+    db: Path | None = typer.Option(
+        None,
+        "--db",
+        help="Path to the LanceDB database file",
+    ),
+):
+    app = create_app(db)
+    try:
+        asyncio.run(app.import_database(source=source, concurrency=parallel))
+    except ValueError as e:
+        typer.echo(f"Error: {e}", err=True)
+        raise typer.Exit(1)
+
+
 @_cli.command("migrate", help="Run pending database migrations")
 def migrate(
+    parallel: int = typer.Option(
+        4,
+        "--parallel",
+        min=1,
+        help="Migration steps writing different tables to run at once",
+    ),
     db: Path | None = typer.Option(
         None,
         "--db",
@@ -537,7 +711,7 @@ def migrate(
 ):
     app = create_app(db)
     try:
-        applied = asyncio.run(app.migrate())
+        applied = asyncio.run(app.migrate(concurrency=parallel))
         if applied:
             typer.echo(f"Applied {len(applied)} migration(s):")
             for desc in applied:
@@ -617,7 +791,7 @@ def history(
         None,
         "--table",
         "-t",
-        help="Specific table to show history for (documents, document_meta, chunks, document_items, settings)",
+        help="Specific table to show history for (documents, document_meta, chunks, document_items, document_pages, picture_blobs, settings)",
     ),
     limit: int | None = typer.Option(
         None,
@@ -815,13 +989,31 @@ def mcp(
         "--port",
         help="Port to bind MCP server to (ignored with --stdio)",
     ),
+    warm: bool = typer.Option(
+        False,
+        "--warm",
+        help="Load search indexes in the background at startup; /health reports 503 until done",
+    ),
+    warm_blocking: bool = typer.Option(
+        False,
+        "--warm-blocking",
+        help="Load search indexes before accepting connections",
+    ),
 ) -> None:
     """Run the MCP server."""
     app = create_app(db)
 
     transport = "stdio" if stdio else None
 
-    asyncio.run(app.run_mcp(transport=transport, host=host, port=port))
+    asyncio.run(
+        app.run_mcp(
+            transport=transport,
+            host=host,
+            port=port,
+            warm=warm,
+            warm_blocking=warm_blocking,
+        )
+    )
 
 
 if __name__ == "__main__":
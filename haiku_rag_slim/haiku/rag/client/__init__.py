@@ -1,10 +1,12 @@
 import asyncio
+import copy
 import hashlib
 import json
 import logging
 import mimetypes
 import tempfile
-from collections.abc import AsyncGenerator, Sequence
+from collections.abc import AsyncGenerator, AsyncIterator, Sequence
+from contextlib import asynccontextmanager
 from enum import Enum
 from functools import cached_property
 from pathlib import Path
@@ -15,9 +17,15 @@ from urllib.parse import urlparse
 import httpx
 
 from haiku.rag.client.documents import DocumentImport
+from haiku.rag.client.titles import TitleBackfiller
 from haiku.rag.config import AppConfig, get_config
 from haiku.rag.converters import get_converter
+from haiku.rag.converters.worker_pool import (
+    acquire_worker_pools,
+    release_worker_pools,
+)
 from haiku.rag.reranking import get_reranker
+from haiku.rag.store.commit import GroupCommitter, GroupDeleter
 from haiku.rag.store.engine import Store
 from haiku.rag.store.models.chunk import Chunk, SearchResult, SearchType
 from haiku.rag.store.models.document import Document
@@ -25,6 +33,8 @@ from haiku.rag.store.models.document_item import extract_items
 from haiku.rag.store.repositories.chunk import ChunkRepository
 from haiku.rag.store.repositories.document import DocumentRepository
 from haiku.rag.store.repositories.document_item import DocumentItemRepository
+from haiku.rag.store.repositories.document_page import DocumentPageRepository
+from haiku.rag.store.repositories.picture_blob import PictureBlobRepository
 from haiku.rag.store.repositories.settings import SettingsRepository
 from haiku.rag.utils import escape_sql_string
 
@@ -37,14 +47,14 @@ if TYPE_CHECKING:
     from haiku.rag.reranking.base import RerankerBase
     from haiku.rag.sandbox import AnalysisResult
     from haiku.rag.sources.base import Source
+    from haiku.rag.store.docling_serialization import DoclingSerialization
     from haiku.rag.store.models.citation import Citation
 
 logger = logging.getLogger(__name__)
 
-# Throttle for the background auto-vacuum: under sustained ingestion, scheduling
-# a compaction on every write degenerates into back-to-back optimize() passes
-# that churn the blob-bearing documents table. Fire at most one per interval; a
-# final vacuum on close collapses anything throttled here.
+# Throttle for the background compaction pass: under sustained ingestion,
+# reading every table's layout after each write is wasted work. Fire at most one
+# per interval; a final pass on close covers anything throttled here.
 _VACUUM_MIN_INTERVAL_S = 300.0
 
 
@@ -93,6 +103,9 @@ class HaikuRAG:
         self._vacuum_tasks: set[asyncio.Task] = set()
         self._last_vacuum_at: float | None = None
         self._vacuum_dirty = False
+        self.group_committer: GroupCommitter | None = None
+        self.group_deleter: GroupDeleter | None = None
+        self.title_backfiller: TitleBackfiller | None = None
 
     @property
     def is_read_only(self) -> bool:
@@ -130,13 +143,85 @@ class HaikuRAG:
         except BaseException:
             self.store.close()
             raise
-        self.document_repository = DocumentRepository(self.store)
-        self.chunk_repository = ChunkRepository(self.store)
-        self.document_item_repository = DocumentItemRepository(self.store)
+        self._bind_store(self.store)
+        group_commit = self._config.storage.group_commit
+        if group_commit.enabled and not self.store.is_read_only:
+            self.group_committer = GroupCommitter(
+                self.store,
+                max_batch_size=group_commit.max_batch_size,
+                max_delay_s=group_commit.max_delay_s,
+            )
+            self.group_deleter = GroupDeleter(
+                self.store,
+                self._delete_subtrees_of,
+                max_batch_size=group_commit.max_batch_size,
+                max_delay_s=group_commit.max_delay_s,
+            )
+        processing = self._config.processing
+        if (
+            processing.auto_title
+            and processing.title_backfill.enabled
+            and not self.store.is_read_only
+        ):
+            self.title_backfiller = TitleBackfiller(
+                self.store,
+                self._config,
+                max_batch_size=processing.title_backfill.max_batch_size,
+                max_delay_s=processing.title_backfill.max_delay_s,
+                max_concurrency=processing.title_backfill.max_concurrency,
+            )
+        acquire_worker_pools()
         return self
 
+    def _bind_store(self, store: Store) -> None:
+        """Point the client and its repositories at a store."""
+        self.store = store
+        self.document_repository = DocumentRepository(store)
+        self.chunk_repository = ChunkRepository(store)
+        self.document_item_repository = DocumentItemRepository(store)
+        self.document_page_repository = DocumentPageRepository(store)
+        self.picture_blob_repository = PictureBlobRepository(store)
+
+    @asynccontextmanager
+    async def snapshot(self, tag: str | None = None) -> AsyncIterator["HaikuRAG"]:
+        """A read-only client that sees one consistent version of the database.
+
+        Every table is pinned at the same set of versions for the duration of
+        the block, so an agent run or a request reads chunks, items and
+        documents that belong together even while an ingester commits, and no
+        query pays a read-consistency check. See Store.pin_versions.
+
+        Args:
+            tag: Read the versions of this tag instead of the latest ones.
+
+        Raises:
+            ValueError: If the tag does not exist or is partial.
+        """
+        async with self.store.pin_versions(tag=tag) as store:
+            client = copy.copy(self)
+            client._read_only = True
+            client.group_committer = None
+            client.group_deleter = None
+            client.title_backfiller = None
+            client._vacuum_tasks = set()
+            client._vacuum_dirty = False
+            client._bind_store(store)
+            # Parsed documents are cached per documents-table version, so the
+            # live client's entries stay valid for the pinned one.
+            client.document_repository._docling_cache = (
+                self.document_repository._docling_cache
+            )
+            yield client
+
     async def __aexit__(self, exc_type, exc_val, exc_tb):  # noqa: ARG002
         """Async context manager exit."""
+        if self.group_committer is not None:
+            await self.group_committer.aclose()
+        if self.group_deleter is not None:
+            await self.group_deleter.aclose()
+        # Titles are written after the documents they belong to are committed.
+        if self.title_backfiller is not None:
+            await self.title_backfiller.aclose()
         await self._await_vacuum_tasks()
         # Best-effort: __aexit__ may run during exception unwinding, and a
         # raising close must not mask the original exception. The reranker is
@@ -149,36 +234,40 @@ class HaikuRAG:
         except Exception:
             logger.debug("Closing embedder/reranker failed on teardown", exc_info=True)
         self.close()
+        # Conversion workers stop with the last open client instead of
+        # outliving it; they start again on the next conversion.
+        await asyncio.to_thread(release_worker_pools)
         return False
 
     async def _await_vacuum_tasks(self) -> None:
-        """Drain background vacuum work and run a final collapse before teardown.
-
-        Writes schedule a throttled background vacuum; many are debounced or skip
-        because another vacuum holds the lock. The final pass collapses the
-        versions those left behind. It runs whenever writes happened
-        (``_vacuum_dirty``) — not gated on in-flight tasks remaining, since a
-        debounced run may have scheduled none — but never when nothing was
-        written (so opening + closing a store still never writes).
+        """Drain background compaction and run a final pass before teardown.
+
+        Writes schedule a throttled background compaction; many are debounced
+        or skip because another pass holds the lock. The final pass compacts
+        what those left behind, if any table crossed a threshold. It runs
+        whenever writes happened (``_vacuum_dirty``) — not gated on in-flight
+        tasks remaining, since a debounced run may have scheduled none — but
+        never when nothing was written (so opening + closing a store still
+        never writes).
         """
         if self._vacuum_tasks:
             await asyncio.gather(*self._vacuum_tasks, return_exceptions=True)
         if not self._vacuum_dirty:
             return
         self._vacuum_dirty = False
-        # __aexit__ runs during exception unwinding; a raising vacuum here would
+        # __aexit__ runs during exception unwinding; a raising pass here would
         # mask the original exception, so the drain stays best-effort.
         try:
-            await self.store.vacuum()
+            await self.store.compact()
         except Exception:
-            logger.debug("Final vacuum on close failed", exc_info=True)
+            logger.debug("Final compaction on close failed", exc_info=True)
 
     def _schedule_vacuum(self) -> None:
-        """Schedule a background vacuum, throttled to at most one per
-        ``_VACUUM_MIN_INTERVAL_S``. Sustained writes would otherwise trigger
-        back-to-back compaction of the blob-bearing documents table. The throttle
-        only skips the background task — ``_vacuum_dirty`` still marks that a
-        final vacuum on close is owed."""
+        """Schedule a background compaction pass, throttled to at most one per
+        ``_VACUUM_MIN_INTERVAL_S``. The pass itself compacts only the tables
+        over a ``storage.compaction`` threshold. The throttle only skips the
+        background task — ``_vacuum_dirty`` still marks that a final pass on
+        close is owed."""
         self._vacuum_dirty = True
         now = monotonic()
         if (
@@ -187,7 +276,7 @@ class HaikuRAG:
         ):
             return
         self._last_vacuum_at = now
-        task = asyncio.create_task(self.store.vacuum())
+        task = asyncio.create_task(self.store.compact())
         self._vacuum_tasks.add(task)
         task.add_done_callback(self._vacuum_tasks.discard)
 
@@ -222,6 +311,7 @@ class HaikuRAG:
         *,
         existing_picture_data: dict[str, bytes] | None = None,
         document_id: str | None = None,
+        serialization: "DoclingSerialization | None" = None,
     ) -> list[Chunk]:
         from haiku.rag.client.processing import chunk
 
@@ -231,6 +321,7 @@ class HaikuRAG:
             embedder=self.embedder,
             existing_picture_data=existing_picture_data,
             document_id=document_id,
+            serialization=serialization,
         )
 
     # =========================================================================
@@ -388,39 +479,110 @@ class HaikuRAG:
         The whole subtree (root + transitive children) is deleted under a single
         write lock and a single version snapshot, so the cascade is atomic: any
         failure restores every table to the pre-delete state, and no other write
-        can interleave between deleting a child and its parent.
+        can interleave between deleting a child and its parent. With
+        ``storage.group_commit`` enabled, concurrent calls are coalesced into
+        one bulk delete.
         """
-        from haiku.rag.client.documents import parent_uri_filter
+        if self.group_deleter is not None:
+            deleted = await self.group_deleter.submit(document_id)
+        else:
+            deleted = document_id in await self._delete_subtrees_of([document_id])
 
+        if deleted and self._config.storage.auto_vacuum:
+            self._schedule_vacuum()
+        return deleted
+
+    async def delete_documents(
+        self,
+        document_ids: Sequence[str] | None = None,
+        filter: str | None = None,
+    ) -> int:
+        """Delete many documents at once, with their children linked via
+        ``metadata.parent_uri``.
+
+        Like ``delete_document``, but every table is written once per batch of
+        documents rather than once per document, and the whole set is deleted
+        under a single write transaction.
+
+        Args:
+            document_ids: IDs of the documents to delete. Unknown IDs are
+                skipped.
+            filter: SQL WHERE clause over document_meta columns selecting the
+                documents to delete instead.
+
+        Returns:
+            Number of documents deleted, children included.
+
+        Raises:
+            ValueError: If not exactly one of `document_ids` and `filter` is
+                given.
+        """
+        if (document_ids is None) == (filter is None):
+            raise ValueError("Pass exactly one of document_ids or filter")
+        deleted = await self._delete_subtrees(document_ids, filter)
+        if deleted and self._config.storage.auto_vacuum:
+            self._schedule_vacuum()
+        return len(deleted)
+
+    async def _delete_subtrees_of(self, document_ids: list[str]) -> set[str]:
+        return set(await self._delete_subtrees(document_ids, None))
+
+    async def _delete_subtrees(
+        self, document_ids: Sequence[str] | None, filter: str | None
+    ) -> list[str]:
+        from haiku.rag.client.documents import collect_subtrees
+
+        async with self.store.write_transaction():
+            # Collect the subtrees under the lock so two concurrent deletes of
+            # the same id can't both proceed, and children can't appear or move
+            # between collection and deletion.
+            ids = await collect_subtrees(self, document_ids, filter)
+            return await self.document_repository.delete_many(ids)
+
+    async def update_documents_metadata(
+        self,
+        metadata: dict,
+        document_ids: Sequence[str] | None = None,
+        filter: str | None = None,
+        replace: bool = False,
+    ) -> int:
+        """Set metadata on many documents at once.
+
+        Only the small ``document_meta`` rows are rewritten, with one merge per
+        batch of documents, under a single write transaction. Promoted metadata
+        columns are kept in step.
+
+        Args:
+            metadata: Keys to set; merged into each document's metadata.
+            document_ids: IDs of the documents to update. Unknown IDs are
+                skipped.
+            filter: SQL WHERE clause over document_meta columns selecting the
+                documents to update instead.
+            replace: Replace each document's metadata with `metadata` instead
+                of merging.
+
+        Returns:
+            Number of documents updated.
+
+        Raises:
+            ValueError: If not exactly one of `document_ids` and `filter` is
+                given.
+        """
+        if (document_ids is None) == (filter is None):
+            raise ValueError("Pass exactly one of document_ids or filter")
         async with self.store.write_transaction():
-            # Resolve existence and collect the subtree under the lock so two
-            # concurrent deletes of the same id can't both proceed, and children
-            # can't appear or move between collection and deletion. parent_uri
-            # links a child to its parent's uri; walk transitively, guarding
-            # against cycles.
-            ids_to_delete: list[str] = []
-            seen: set[str] = set()
-            queue = [await self.get_document_by_id(document_id)]
-            while queue:
-                doc = queue.pop()
-                if doc is None or doc.id is None or doc.id in seen:
-                    continue
-                seen.add(doc.id)
-                ids_to_delete.append(doc.id)
-                if doc.uri:
-                    queue.extend(
-                        await self.list_documents(filter=parent_uri_filter(doc.uri))
-                    )
-
-            if not ids_to_delete:
-                return False
-
-            for doc_id in ids_to_delete:
-                await self.document_repository.delete(doc_id)
-
-        if self._config.storage.auto_vacuum:
+            if filter is not None:
+                document_ids = [
+                    doc.id
+                    for doc in await self.list_documents(filter=filter)
+                    if doc.id is not None
+                ]
+            updated = await self.document_repository.update_metadata(
+                document_ids or [], metadata, replace=replace
+            )
+        if updated and self._config.storage.auto_vacuum:
             self._schedule_vacuum()
-        return True
+        return updated
 
     async def list_documents(
         self,
@@ -463,10 +625,13 @@ class HaikuRAG:
         search_type: SearchType | None = None,
         filter: str | None = None,
         include_images: bool = True,
+        chunk_filter: str | None = None,
     ) -> list[SearchResult]:
         from haiku.rag.client.search import search
 
-        return await search(self, query, limit, search_type, filter, include_images)
+        return await search(
+            self, query, limit, search_type, filter, include_images, chunk_filter
+        )
 
     async def expand_context(
         self,
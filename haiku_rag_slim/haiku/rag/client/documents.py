@@ -3,6 +3,7 @@ import hashlib
 import json
 import logging
 import mimetypes
+from collections.abc import Sequence
 from dataclasses import dataclass, field
 from pathlib import Path
 from typing import TYPE_CHECKING
@@ -14,18 +15,24 @@ from haiku.rag.client.processing import (
     ensure_chunks_embedded,
     get_extension_from_content_type_or_url,
 )
-from haiku.rag.client.titles import resolve_title
+from haiku.rag.client.titles import extract_structural_title, resolve_title
 from haiku.rag.converters import get_converter
-from haiku.rag.store.models.chunk import Chunk
+from haiku.rag.store.commit import CommitBundle
+from haiku.rag.store.compression import CompressionParams
+from haiku.rag.store.docling_serialization import serialize_docling
+from haiku.rag.store.models.chunk import Chunk, picture_vectors
 from haiku.rag.store.models.document import Document
 from haiku.rag.store.models.document_item import DocumentItem, extract_items
+from haiku.rag.store.schema import metadata_column_name
 from haiku.rag.telemetry import logfire
 from haiku.rag.uri import is_local_uri, uri_to_path
+from haiku.rag.utils import escape_sql_string
 
 if TYPE_CHECKING:
     from docling_core.types.doc.document import DoclingDocument
 
     from haiku.rag.client import HaikuRAG
+    from haiku.rag.config.models import MetadataColumnConfig
     from haiku.rag.ingester.metadata import MetadataProvider
     from haiku.rag.sources.base import FetchResult, Source
 
@@ -62,53 +69,146 @@ _RESERVED_METADATA_KEYS = frozenset({"content_type", "md5", "source_revision"})
 
 
 def _prepare_document_from_docling_sync(
-    document: Document, docling_document: "DoclingDocument"
+    document: Document,
+    docling_document: "DoclingDocument",
+    params: CompressionParams | None = None,
 ) -> str:
     """Populate content/docling blobs from a DoclingDocument.
 
-    This performs size-proportional serialization, JSON splitting, and
-    compression via ``Document.set_docling``. Async ingestion paths should call
-    it through ``_prepare_document_from_docling`` so large image-bearing
-    documents do not block the event loop.
+    This performs size-proportional serialization and compression via
+    ``serialize_docling``, which also extracts the item rows that chunking and
+    storing the document reuse (see ``Document.docling_serialization``). Async
+    ingestion paths should call it through ``_prepare_document_from_docling``
+    so large image-bearing documents do not block the event loop.
     """
-    content = docling_document.export_to_markdown()
-    document.content = content
-    document.set_docling(docling_document)
-    return content
+    serialization = serialize_docling(docling_document, params)
+    document.set_serialized_docling(docling_document, serialization)
+    return serialization.markdown
 
 
 async def _prepare_document_from_docling(
-    document: Document, docling_document: "DoclingDocument"
+    document: Document,
+    docling_document: "DoclingDocument",
+    params: CompressionParams | None = None,
 ) -> str:
     return await asyncio.to_thread(
-        _prepare_document_from_docling_sync, document, docling_document
+        _prepare_document_from_docling_sync, document, docling_document, params
     )
 
 
 async def _prepare_and_title(
     client: "HaikuRAG", document: Document, docling_document: "DoclingDocument"
-) -> None:
+) -> bool:
     """Fill the document from its converted form and title it if it has none.
 
     A caller-supplied title always wins: set it on the document before calling.
     Update paths that must keep an existing empty title call
     ``_prepare_document_from_docling`` directly instead.
+
+    With a title backfiller running, a document without a structural title is
+    left untitled rather than waiting on the title model. Returns True in that
+    case; the caller passes the stored document to ``_backfill_title``.
     """
-    stored_content = await _prepare_document_from_docling(document, docling_document)
-    if document.title is None:
-        document.title = await resolve_title(
-            client._config, docling_document, stored_content
-        )
+    stored_content = await _prepare_document_from_docling(
+        document, docling_document, client.store.compression_params
+    )
+    if document.title is not None:
+        return False
+    if client.title_backfiller is not None:
+        document.title = extract_structural_title(docling_document)
+        return document.title is None
+    document.title = await resolve_title(
+        client._config, docling_document, stored_content
+    )
+    return False
 
 
-def parent_uri_filter(parent_uri: str) -> str:
+def _backfill_title(client: "HaikuRAG", document: Document) -> None:
+    """Queue a stored, untitled document for an LLM title."""
+    assert client.title_backfiller is not None and document.id is not None
+    client.title_backfiller.submit(document.id, document.content)
+
+
+def parent_uri_filter(
+    parent_uri: str, metadata_columns: "Sequence[MetadataColumnConfig]" = ()
+) -> str:
     """SQL `WHERE` clause matching documents whose ``metadata.parent_uri``
-    equals ``parent_uri``. ``metadata`` is stored as a JSON string produced by
-    the standard library's ``json.dumps`` (which inserts ``": "`` between key
-    and value), so the match is a substring search over that serialized form —
+    equals ``parent_uri``.
+
+    When ``metadata_columns`` (a store's materialized columns) promotes
+    ``parent_uri`` to a string column, this is an indexed equality on it.
+    Otherwise ``metadata`` is matched as the JSON string produced by the
+    standard library's ``json.dumps`` (which inserts ``": "`` between key and
+    value), so the match is a substring search over that serialized form —
     escape JSON-meaningful chars in the URI, then SQL-escape single quotes."""
-    json_fragment = json.dumps(parent_uri)[1:-1].replace("'", "''")
-    return f'metadata LIKE \'%"parent_uri": "{json_fragment}"%\''
+    return parent_uris_filter([parent_uri], metadata_columns)
+
+
+def parent_uris_filter(
+    parent_uris: Sequence[str],
+    metadata_columns: "Sequence[MetadataColumnConfig]" = (),
+) -> str:
+    """SQL `WHERE` clause matching documents whose ``metadata.parent_uri`` is
+    any of ``parent_uris``: an ``IN`` over the promoted column, or one
+    ``LIKE`` per uri otherwise. See ``parent_uri_filter``."""
+    if any(c.key == "parent_uri" and c.type == "string" for c in metadata_columns):
+        column = metadata_column_name("parent_uri")
+        if len(parent_uris) == 1:
+            return f"{column} = '{escape_sql_string(parent_uris[0])}'"
+        quoted = ", ".join(f"'{escape_sql_string(uri)}'" for uri in parent_uris)
+        return f"{column} IN ({quoted})"
+    clauses = []
+    for uri in parent_uris:
+        json_fragment = json.dumps(uri)[1:-1].replace("'", "''")
+        clauses.append(f'metadata LIKE \'%"parent_uri": "{json_fragment}"%\'')
+    if len(clauses) == 1:
+        return clauses[0]
+    return f"({' OR '.join(clauses)})"
+
+
+# Documents per `IN (...)` lookup while resolving a bulk delete's subtrees.
+_SUBTREE_BATCH = 256
+
+
+async def collect_subtrees(
+    client: "HaikuRAG",
+    document_ids: Sequence[str] | None = None,
+    filter: str | None = None,
+) -> list[str]:
+    """Ids of the documents selected by ``document_ids`` or ``filter`` and of
+    their transitive children (linked via ``metadata.parent_uri``), roots
+    first. Unknown ids are skipped. The walk goes one level at a time with one
+    lookup per batch of parent uris, and guards against cycles."""
+    if filter is not None:
+        level = await client.list_documents(filter=filter)
+    else:
+        level = []
+        unique = list(dict.fromkeys(document_ids or ()))
+        for start in range(0, len(unique), _SUBTREE_BATCH):
+            quoted = ", ".join(
+                f"'{escape_sql_string(i)}'"
+                for i in unique[start : start + _SUBTREE_BATCH]
+            )
+            level.extend(await client.list_documents(filter=f"id IN ({quoted})"))
+
+    ids: list[str] = []
+    seen: set[str] = set()
+    while level:
+        uris: list[str] = []
+        for doc in level:
+            if doc.id is None or doc.id in seen:
+                continue
+            seen.add(doc.id)
+            ids.append(doc.id)
+            if doc.uri:
+                uris.append(doc.uri)
+        level = []
+        for start in range(0, len(uris), _SUBTREE_BATCH):
+            children = parent_uris_filter(
+                uris[start : start + _SUBTREE_BATCH], client.store.metadata_columns
+            )
+            level.extend(await client.list_documents(filter=children))
+    return ids
 
 
 async def _store_document_with_chunks(
@@ -121,8 +221,25 @@ async def _store_document_with_chunks(
 
     Handles versioning/rollback on failure.
     """
-    chunks = await ensure_chunks_embedded(client._config, chunks, client.embedder)
-    items = await asyncio.to_thread(extract_items, "", docling_document)
+    chunks = await ensure_chunks_embedded(
+        client._config,
+        chunks,
+        client.embedder,
+        await client.picture_blob_repository.get_vectors_for(chunks),
+    )
+    serialization = document.docling_serialization(docling_document, release=True)
+    if serialization is not None:
+        items = serialization.items
+    else:
+        items = await asyncio.to_thread(extract_items, "", docling_document)
+
+    if client.group_committer is not None:
+        stored_doc = await client.group_committer.submit(
+            CommitBundle(document, chunks, items)
+        )
+        if client._config.storage.auto_vacuum:
+            client._schedule_vacuum()
+        return stored_doc
 
     async with client.store.write_transaction():
         # A concurrent ingestion of the same URI may have created the document
@@ -152,11 +269,13 @@ async def _store_document_with_chunks(
         if existing is not None:
             await client.chunk_repository.replace_for_document(stored_doc.id, chunks)
             await client.document_item_repository.replace_for_document(
-                stored_doc.id, items
+                stored_doc.id, items, picture_vectors(chunks)
             )
         else:
             await client.chunk_repository.create(chunks)
-            await client.document_item_repository.create_items(stored_doc.id, items)
+            await client.document_item_repository.create_items(
+                stored_doc.id, items, picture_vectors(chunks)
+            )
 
     if client._config.storage.auto_vacuum:
         client._schedule_vacuum()
@@ -186,13 +305,37 @@ async def _update_document_with_chunks(
             await client.document_item_repository.get_all_picture_data(document.id)
         )
 
-    chunks = await ensure_chunks_embedded(client._config, chunks, client.embedder)
+    # Chunks whose text is unchanged keep their stored id and vector, so an
+    # edit embeds only the chunks it touched.
+    await client.chunk_repository.reuse_embeddings(document.id, chunks)
+    chunks = await ensure_chunks_embedded(
+        client._config,
+        chunks,
+        client.embedder,
+        await client.picture_blob_repository.get_vectors_for(chunks),
+    )
 
     items: list[DocumentItem] | None = None
     if docling_document is not None:
-        items = await asyncio.to_thread(
-            extract_items, document.id, docling_document, existing_picture_data
+        serialization = document.docling_serialization(docling_document, release=True)
+        if serialization is not None:
+            items = serialization.items
+            for item in items:
+                item.document_id = document.id
+                if item.picture_data is None and existing_picture_data:
+                    item.picture_data = existing_picture_data.get(item.self_ref)
+        else:
+            items = await asyncio.to_thread(
+                extract_items, document.id, docling_document, existing_picture_data
+            )
+
+    if client.group_committer is not None:
+        updated_doc = await client.group_committer.submit(
+            CommitBundle(document, chunks, items)
         )
+        if client._config.storage.auto_vacuum:
+            client._schedule_vacuum()
+        return updated_doc
 
     async with client.store.write_transaction():
         updated_doc = await client.document_repository.update(document)
@@ -206,7 +349,7 @@ async def _update_document_with_chunks(
 
         if items is not None:
             await client.document_item_repository.replace_for_document(
-                updated_doc.id, items
+                updated_doc.id, items, picture_vectors(chunks)
             )
 
     if client._config.storage.auto_vacuum:
@@ -229,7 +372,6 @@ async def create_document(
     """
     converter = get_converter(client._config)
     docling_document = await converter.convert_text(content, format=format)
-    chunks = await client.chunk(docling_document)
 
     document = Document(
         content="",
@@ -237,9 +379,18 @@ async def create_document(
         title=title,
         metadata=metadata or {},
     )
-    await _prepare_and_title(client, document, docling_document)
+    deferred = await _prepare_and_title(client, document, docling_document)
+    chunks = await client.chunk(
+        docling_document,
+        serialization=document.docling_serialization(docling_document),
+    )
 
-    return await _store_document_with_chunks(client, document, chunks, docling_document)
+    stored = await _store_document_with_chunks(
+        client, document, chunks, docling_document
+    )
+    if deferred:
+        _backfill_title(client, stored)
+    return stored
 
 
 async def import_document(
@@ -261,9 +412,14 @@ async def import_document(
         title=title,
         metadata=metadata or {},
     )
-    await _prepare_and_title(client, document, docling_document)
+    deferred = await _prepare_and_title(client, document, docling_document)
 
-    return await _store_document_with_chunks(client, document, chunks, docling_document)
+    stored = await _store_document_with_chunks(
+        client, document, chunks, docling_document
+    )
+    if deferred:
+        _backfill_title(client, stored)
+    return stored
 
 
 async def _store_documents_with_chunks(
@@ -275,10 +431,12 @@ async def _store_documents_with_chunks(
     Embeds any chunks that lack embeddings, then writes the documents, chunks,
     and document_items tables once apiece. Restores all tables on any failure.
     """
+    pending = [chunk for _, chunks, _ in prepared for chunk in chunks]
     flat = await ensure_chunks_embedded(
         client._config,
-        [chunk for _, chunks, _ in prepared for chunk in chunks],
+        pending,
         client.embedder,
+        await client.picture_blob_repository.get_vectors_for(pending),
     )
     embedded: list[list[Chunk]] = []
     position = 0
@@ -287,7 +445,12 @@ async def _store_documents_with_chunks(
         position += len(chunks)
 
     def _extract_all_items():
-        return [extract_items("", d) for _, _, d in prepared]
+        return [
+            serialization.items
+            if (serialization := doc.docling_serialization(d, release=True)) is not None
+            else extract_items("", d)
+            for doc, _, d in prepared
+        ]
 
     all_item_lists = await asyncio.to_thread(_extract_all_items)
 
@@ -309,7 +472,9 @@ async def _store_documents_with_chunks(
             all_items.extend(item_list)
 
         await client.chunk_repository.create(all_chunks)
-        await client.document_item_repository.create_all(all_items)
+        await client.document_item_repository.create_all(
+            all_items, picture_vectors(all_chunks)
+        )
 
     if client._config.storage.auto_vacuum:
         client._schedule_vacuum()
@@ -331,6 +496,7 @@ async def import_documents(
         return []
 
     prepared: list[tuple[Document, list[Chunk], DoclingDocument]] = []
+    deferred: set[int] = set()
     for item in imports:
         document = Document(
             content="",
@@ -338,10 +504,14 @@ async def import_documents(
             title=item.title,
             metadata=item.metadata or {},
         )
-        await _prepare_and_title(client, document, item.docling_document)
+        if await _prepare_and_title(client, document, item.docling_document):
+            deferred.add(len(prepared))
         prepared.append((document, item.chunks, item.docling_document))
 
-    return await _store_documents_with_chunks(client, prepared)
+    created = await _store_documents_with_chunks(client, prepared)
+    for index in sorted(deferred):
+        _backfill_title(client, created[index])
+    return created
 
 
 async def _refresh_doc_metadata(
@@ -441,32 +611,79 @@ async def _ingest_fetch_result(
         target_path = result.disk_path
         cleanup_path: Path | None = None
     else:
+        assert result.body is not None
         target_path = await _write_fetch_body(result.body, file_extension)
         cleanup_path = target_path
 
     try:
-        with logfire.span("document.convert", uri=result.uri):
-            docling_document = await client.convert(target_path, source_uri=result.uri)
-        with logfire.span("document.chunk", uri=result.uri) as chunk_span:
-            chunks = await client.chunk(docling_document)
-            chunk_span.set_attribute("chunks_created", len(chunks))
+        return await _convert_and_store(
+            client,
+            result,
+            target_path,
+            title=title,
+            user_metadata=user_metadata,
+            source_metadata=source_metadata,
+            stored_uri=stored_uri,
+            existing_doc=existing_doc,
+            depth=depth,
+        )
     finally:
         if cleanup_path is not None:
             cleanup_path.unlink(missing_ok=True)
 
+
+async def _chunk_prepared(
+    client: "HaikuRAG",
+    document: Document,
+    docling_document: "DoclingDocument",
+    uri: str,
+) -> list[Chunk]:
+    """Chunk a DoclingDocument ``document`` was prepared from, reusing its
+    serialization."""
+    with logfire.span("document.chunk", uri=uri) as chunk_span:
+        chunks = await client.chunk(
+            docling_document,
+            serialization=document.docling_serialization(docling_document),
+        )
+        chunk_span.set_attribute("chunks_created", len(chunks))
+    return chunks
+
+
+async def _convert_and_store(
+    client: "HaikuRAG",
+    result: "FetchResult",
+    path: Path,
+    *,
+    title: str | None,
+    user_metadata: dict,
+    source_metadata: dict,
+    stored_uri: str,
+    existing_doc: Document | None,
+    depth: int,
+) -> Document:
+    """The body of ``_ingest_fetch_result``, once the fetched bytes are in the
+    file at ``path``, which stays in place until attachments are reconciled."""
+    with logfire.span("document.convert", uri=result.uri):
+        docling_document = await client.convert(path, source_uri=result.uri)
+
     final_metadata = {**user_metadata, **source_metadata}
 
     if existing_doc:
         existing_doc.metadata = final_metadata
         if title is not None:
             existing_doc.title = title
-        await _prepare_and_title(client, existing_doc, docling_document)
+        deferred = await _prepare_and_title(client, existing_doc, docling_document)
+        chunks = await _chunk_prepared(
+            client, existing_doc, docling_document, result.uri
+        )
         with logfire.span("document.store", uri=result.uri, op="update") as store_span:
             updated = await _update_document_with_chunks(
                 client, existing_doc, chunks, docling_document
             )
             store_span.set_attribute("document_id", updated.id)
-        await _reconcile_pdf_attachments(client, updated, result.body, depth=depth)
+        if deferred:
+            _backfill_title(client, updated)
+        await _reconcile_pdf_attachments(client, updated, path, depth=depth)
         return updated
 
     document = Document(
@@ -475,85 +692,79 @@ async def _ingest_fetch_result(
         title=title,
         metadata=final_metadata,
     )
-    await _prepare_and_title(client, document, docling_document)
+    deferred = await _prepare_and_title(client, document, docling_document)
+    chunks = await _chunk_prepared(client, document, docling_document, result.uri)
     with logfire.span("document.store", uri=result.uri, op="create") as store_span:
         created = await _store_document_with_chunks(
             client, document, chunks, docling_document
         )
         store_span.set_attribute("document_id", created.id)
-    await _reconcile_pdf_attachments(client, created, result.body, depth=depth)
+    if deferred:
+        _backfill_title(client, created)
+    await _reconcile_pdf_attachments(client, created, path, depth=depth)
     return created
 
 
 def _extract_pdf_attachments(
-    parent_body: bytes, parent_uri: str, *, depth: int
+    parent_pdf: Path | bytes, parent_uri: str, *, depth: int, workers: int = 0
 ) -> dict[str, tuple[str, bytes, str, str]] | None:
     """Open the parent PDF and return its embedded attachments keyed by child
     URI. Returns ``None`` when the PDF can't be opened or the recursion depth
     cap is reached — in both cases the caller skips reconciliation entirely.
 
-    Every pdfium call is held under ``PDFIUM_LOCK`` (shared with page slicing)
-    because libpdfium's global C state is not thread-safe; concurrent access
-    from another worker corrupts it and then fails valid PDFs with "Data format
-    error" until the process restarts.
+    The pdfium reads go through ``read_pdf_attachments``: in-process under
+    ``PDFIUM_LOCK`` (shared with page slicing), because libpdfium's global C
+    state is not thread-safe, or in a pool of ``workers`` pdfium helper
+    processes when ``workers`` > 0.
     """
     import pypdfium2 as pdfium
 
-    from haiku.rag.converters.pdf_split import PDFIUM_LOCK
+    from haiku.rag.converters.pdf_split import read_pdf_attachments
 
-    with PDFIUM_LOCK:
-        try:
-            pdf = pdfium.PdfDocument(parent_body)
-        except pdfium.PdfiumError as exc:
+    capped = depth + 1 >= MAX_ATTACHMENT_DEPTH
+    try:
+        attachments = read_pdf_attachments(parent_pdf, data=not capped, workers=workers)
+    except pdfium.PdfiumError as exc:
+        logger.warning("Cannot scan %s for embedded attachments: %s", parent_uri, exc)
+        return None
+
+    if capped:
+        if attachments:
             logger.warning(
-                "Cannot scan %s for embedded attachments: %s", parent_uri, exc
+                "Attachment depth cap (%d) reached at %s; skipping %d nested "
+                "attachment(s).",
+                MAX_ATTACHMENT_DEPTH,
+                parent_uri,
+                len(attachments),
             )
-            return None
-        try:
-            attachment_count = pdf.count_attachments()
-
-            if depth + 1 >= MAX_ATTACHMENT_DEPTH:
-                if attachment_count > 0:
-                    logger.warning(
-                        "Attachment depth cap (%d) reached at %s; skipping %d nested "
-                        "attachment(s).",
-                        MAX_ATTACHMENT_DEPTH,
-                        parent_uri,
-                        attachment_count,
-                    )
-                return None
-
-            new_attachments: dict[str, tuple[str, bytes, str, str]] = {}
-            for i in range(attachment_count):
-                att = pdf.get_attachment(i)
-                name = att.get_name()
-                # A malformed PDF can carry an attachment with an empty /F, so
-                # this is real validation on untrusted input — it just needs a
-                # hand-crafted file to reach, which no fixture here produces.
-                if not name:  # pragma: no cover - needs a malformed PDF
-                    continue
-                data = bytes(att.get_data())
-                child_uri = f"{parent_uri}#attachment={quote(name, safe='')}"
-                content_type = (
-                    mimetypes.guess_type(name)[0] or "application/octet-stream"
-                )
-                content_hash = hashlib.md5(data, usedforsecurity=False).hexdigest()
-                new_attachments[child_uri] = (name, data, content_type, content_hash)
-            return new_attachments
-        finally:
-            pdf.close()
+        return None
+
+    new_attachments: dict[str, tuple[str, bytes, str, str]] = {}
+    for name, data in attachments:
+        # A malformed PDF can carry an attachment with an empty /F, so this is
+        # real validation on untrusted input — it just needs a hand-crafted
+        # file to reach, which no fixture here produces.
+        if not name:  # pragma: no cover - needs a malformed PDF
+            continue
+        child_uri = f"{parent_uri}#attachment={quote(name, safe='')}"
+        content_type = mimetypes.guess_type(name)[0] or "application/octet-stream"
+        content_hash = hashlib.md5(data, usedforsecurity=False).hexdigest()
+        new_attachments[child_uri] = (name, data, content_type, content_hash)
+    return new_attachments
 
 
 async def _reconcile_pdf_attachments(
     client: "HaikuRAG",
     parent_doc: Document,
-    parent_body: bytes,
+    parent_pdf: Path | bytes,
     *,
     depth: int,
 ) -> None:
     """Diff the parent PDF's ``/EmbeddedFiles`` table against any children
     already linked via ``metadata.parent_uri`` and bring the child set in line:
     ingest additions, update changed bytes, cascade-delete removed names.
+    The ingest path passes the fetched file, which pdfium reads in place;
+    in-memory bytes work too.
 
     Re-uses ``_ingest_fetch_result`` for each child so the standard conversion
     path runs uniformly — child PDFs recurse into this helper one level deeper,
@@ -567,12 +778,18 @@ async def _reconcile_pdf_attachments(
         return
 
     new_attachments = await asyncio.to_thread(
-        _extract_pdf_attachments, parent_body, parent_doc.uri, depth=depth
+        _extract_pdf_attachments,
+        parent_pdf,
+        parent_doc.uri,
+        depth=depth,
+        workers=client._config.processing.pdfium_workers,
     )
     if new_attachments is None:
         return
 
-    existing = await client.list_documents(filter=parent_uri_filter(parent_doc.uri))
+    existing = await client.list_documents(
+        filter=parent_uri_filter(parent_doc.uri, client.store.metadata_columns)
+    )
     existing_by_uri: dict[str, Document] = {d.uri: d for d in existing if d.uri}
 
     for child_uri, (name, data, content_type, content_hash) in new_attachments.items():
@@ -587,10 +804,12 @@ async def _reconcile_pdf_attachments(
 
         child_fr = FetchResult(
             uri=child_uri,
-            body=data,
             content_type=content_type,
             content_hash=content_hash,
             extra_metadata={"parent_uri": parent_doc.uri},
+            disk_path=await _write_fetch_body(data, Path(name).suffix.lower()),
+            temporary=True,
+            size=len(data),
         )
         try:
             await _ingest_fetch_result(
@@ -612,10 +831,16 @@ async def _reconcile_pdf_attachments(
                 Path(name).suffix.lower(),
                 content_type,
             )
+        finally:
+            child_fr.discard()
 
-    for child_uri, child in existing_by_uri.items():
-        if child_uri not in new_attachments and child.id:
-            await client.delete_document(child.id)
+    stale = [
+        child.id
+        for child_uri, child in existing_by_uri.items()
+        if child_uri not in new_attachments and child.id
+    ]
+    if stale:
+        await client.delete_documents(stale)
 
 
 async def create_document_from_source(
@@ -757,45 +982,51 @@ async def create_document_from_source(
 
         with logfire.span("document.fetch", uri=source_str) as fetch_span:
             result = await fetcher.fetch(source_str)
-            fetch_span.set_attribute("bytes", len(result.body))
+            if result.size is not None:
+                fetch_span.set_attribute("bytes", result.size)
             fetch_span.set_attribute("content_hash", result.content_hash)
 
-        provider_metadata = await _provider_metadata(
-            metadata_provider, source_id or fetcher.source_id, source_str, result
-        )
-        user_metadata = {**metadata, **provider_metadata}
+        # A remote source's download is a temporary file, kept until the
+        # document and its attachments are stored.
+        try:
+            provider_metadata = await _provider_metadata(
+                metadata_provider, source_id or fetcher.source_id, source_str, result
+            )
+            user_metadata = {**metadata, **provider_metadata}
+
+            # MD5 short-circuit: the bytes are unchanged even if the revision wasn't.
+            # Refresh the source-derived metadata (revision may have rolled) but skip
+            # convert/embed/store entirely.
+            if (
+                existing_doc
+                and not force
+                and existing_doc.metadata.get("md5") == result.content_hash
+            ):
+                source_meta: dict = {
+                    "content_type": result.content_type,
+                    "md5": result.content_hash,
+                    **result.extra_metadata,
+                }
+                if result.revision is not None:
+                    source_meta["source_revision"] = result.revision
+                return await _refresh_doc_metadata(
+                    client,
+                    existing_doc,
+                    title=title,
+                    user_metadata=user_metadata,
+                    source_metadata=source_meta,
+                )
 
-        # MD5 short-circuit: the bytes are unchanged even if the revision wasn't.
-        # Refresh the source-derived metadata (revision may have rolled) but skip
-        # convert/embed/store entirely.
-        if (
-            existing_doc
-            and not force
-            and existing_doc.metadata.get("md5") == result.content_hash
-        ):
-            source_meta: dict = {
-                "content_type": result.content_type,
-                "md5": result.content_hash,
-                **result.extra_metadata,
-            }
-            if result.revision is not None:
-                source_meta["source_revision"] = result.revision
-            return await _refresh_doc_metadata(
+            return await _ingest_fetch_result(
                 client,
-                existing_doc,
+                result,
                 title=title,
                 user_metadata=user_metadata,
-                source_metadata=source_meta,
+                stored_uri=stored_uri,
+                existing_doc=existing_doc,
             )
-
-        return await _ingest_fetch_result(
-            client,
-            result,
-            title=title,
-            user_metadata=user_metadata,
-            stored_uri=stored_uri,
-            existing_doc=existing_doc,
-        )
+        finally:
+            result.discard()
     finally:
         if owns_fetcher:
             await fetcher.aclose()
@@ -852,7 +1083,9 @@ async def update_document(
 
     if chunks is not None:
         if docling_document is not None:
-            await _prepare_document_from_docling(existing_doc, docling_document)
+            await _prepare_document_from_docling(
+                existing_doc, docling_document, client.store.compression_params
+            )
         elif content is not None:
             existing_doc.content = content
 
@@ -861,9 +1094,14 @@ async def update_document(
         )
 
     if docling_document is not None:
-        await _prepare_document_from_docling(existing_doc, docling_document)
+        await _prepare_document_from_docling(
+            existing_doc, docling_document, client.store.compression_params
+        )
 
-        new_chunks = await client.chunk(docling_document)
+        new_chunks = await client.chunk(
+            docling_document,
+            serialization=existing_doc.docling_serialization(docling_document),
+        )
         return await _update_document_with_chunks(
             client, existing_doc, new_chunks, docling_document
         )
@@ -872,9 +1110,14 @@ async def update_document(
     existing_doc.content = content
     converter = get_converter(client._config)
     converted_docling = await converter.convert_text(existing_doc.content, format="md")
-    await _prepare_document_from_docling(existing_doc, converted_docling)
+    await _prepare_document_from_docling(
+        existing_doc, converted_docling, client.store.compression_params
+    )
 
-    new_chunks = await client.chunk(converted_docling)
+    new_chunks = await client.chunk(
+        converted_docling,
+        serialization=existing_doc.docling_serialization(converted_docling),
+    )
     return await _update_document_with_chunks(
         client, existing_doc, new_chunks, converted_docling
     )
@@ -2,6 +2,7 @@ import asyncio
 import io
 import logging
 import tempfile
+from collections.abc import Mapping
 from pathlib import Path
 from typing import TYPE_CHECKING
 from urllib.parse import urlparse
@@ -19,11 +20,20 @@ if TYPE_CHECKING:
     from docling_core.types.doc.document import DoclingDocument, PictureItem
 
     from haiku.rag.embeddings import EmbedderWrapper
+    from haiku.rag.store.docling_serialization import DoclingSerialization
 
 
 logger = logging.getLogger(__name__)
 
 
+def _descriptions_missing(config: AppConfig, doc: "DoclingDocument") -> bool:
+    """Whether picture descriptions were requested for a document with
+    pictures and none came back."""
+    if config.processing.pictures != "description" or not doc.pictures:
+        return False
+    return not any(_picture_description_text(p) for p in doc.pictures)
+
+
 def _warn_if_descriptions_missing(
     config: AppConfig, doc: "DoclingDocument", source: str
 ) -> None:
@@ -37,12 +47,7 @@ def _warn_if_descriptions_missing(
     back, log a clear warning so the user can fix their VLM config before
     a thousand-document ingest produces an empty corpus.
     """
-    if config.processing.pictures != "description":
-        return
-    if not doc.pictures:
-        return
-    described = sum(1 for p in doc.pictures if _picture_description_text(p))
-    if described == 0:
+    if _descriptions_missing(config, doc):
         model = config.processing.conversion_options.picture_description.model
         logger.warning(
             "processing.pictures='description' but no descriptions came back "
@@ -106,13 +111,36 @@ async def convert(
     async def _convert_file(
         file_path: Path, effective_uri: str | None
     ) -> "DoclingDocument":
-        """Dispatch through split-and-merge for large PDFs when configured,
-        otherwise call the converter directly."""
+        """Serve the conversion from the conversion cache when enabled,
+        otherwise dispatch through split-and-merge for large PDFs when
+        configured, or call the converter directly. A conversion whose picture
+        descriptions all failed is not cached, so a retry calls the VLM again."""
+        from haiku.rag.converters.cache import conversion_cache, conversion_key
+
+        cache = conversion_cache(config)
+        if cache is None:
+            return await _run_converter(file_path, effective_uri)
+        key = await asyncio.to_thread(conversion_key, config, file_path, effective_uri)
+        doc = await asyncio.to_thread(cache.get, key, file_path)
+        if doc is None:
+            doc = await _run_converter(file_path, effective_uri)
+            if not _descriptions_missing(config, doc):
+                await asyncio.to_thread(cache.put, key, doc)
+        return doc
+
+    async def _run_converter(
+        file_path: Path, effective_uri: str | None
+    ) -> "DoclingDocument":
         if file_path.suffix.lower() == ".pdf" and config.processing.split_pages > 0:
             from haiku.rag.converters.pdf_split import convert_pdf_with_splitting
 
             return await convert_pdf_with_splitting(
-                converter, file_path, effective_uri, config.processing.split_pages
+                converter,
+                file_path,
+                effective_uri,
+                config.processing.split_pages,
+                concurrency=config.processing.split_concurrency,
+                pdfium_workers=config.processing.pdfium_workers,
             )
         return await converter.convert_file(file_path, source_uri=effective_uri)
 
@@ -138,22 +166,22 @@ async def convert(
         finally:
             await fetcher.aclose()
 
-        file_extension = get_extension_from_content_type_or_url(
-            source, result.content_type
-        )
-        if file_extension not in converter.supported_extensions:
-            raise UnsupportedSourceError(
-                f"Unsupported content type/extension: "
-                f"{result.content_type}/{file_extension}"
-            )
-
-        temp_path = await _write_fetch_body(result.body, file_extension)
         try:
-            doc = await _convert_file(temp_path, source_uri or source)
+            file_extension = get_extension_from_content_type_or_url(
+                source, result.content_type
+            )
+            if file_extension not in converter.supported_extensions:
+                raise UnsupportedSourceError(
+                    f"Unsupported content type/extension: "
+                    f"{result.content_type}/{file_extension}"
+                )
+            # The download is already on disk, named with this extension.
+            assert result.disk_path is not None
+            doc = await _convert_file(result.disk_path, source_uri or source)
             _warn_if_descriptions_missing(config, doc, source)
             return doc
         finally:
-            temp_path.unlink(missing_ok=True)
+            result.discard()
 
     elif parsed.scheme and is_local_uri(source):
         # A file:// URI, or a Windows path whose drive letter urlparse read as
@@ -184,12 +212,14 @@ def _merge_picture_chunks(
     document_id: str | None,
     existing_picture_data: dict[str, bytes] | None,
     min_picture_size: int,
+    serialization: "DoclingSerialization | None" = None,
 ) -> list[Chunk]:
     picture_chunks = build_picture_chunks(
         docling_document,
         document_id=document_id,
         existing_picture_data=existing_picture_data,
         min_picture_size=min_picture_size,
+        decoded_pictures=serialization.pictures if serialization else None,
     )
 
     if not picture_chunks:
@@ -197,10 +227,13 @@ def _merge_picture_chunks(
             c.order = i
         return text_chunks
 
-    positions = {
-        item.self_ref: pos
-        for pos, (item, _level) in enumerate(docling_document.iterate_items())
-    }
+    if serialization is not None:
+        positions = serialization.positions
+    else:
+        positions = {
+            item.self_ref: pos
+            for pos, (item, _level) in enumerate(docling_document.iterate_items())
+        }
 
     def first_pos(c: Chunk) -> int:
         refs = (c.metadata or {}).get("doc_item_refs") or []
@@ -219,6 +252,7 @@ async def chunk(
     embedder: "EmbedderWrapper",
     existing_picture_data: dict[str, bytes] | None = None,
     document_id: str | None = None,
+    serialization: "DoclingSerialization | None" = None,
 ) -> list[Chunk]:
     """Chunk a DoclingDocument into Chunks.
 
@@ -230,6 +264,9 @@ async def chunk(
     ``existing_picture_data`` (snapshot keyed by ``self_ref``) supplies bytes
     for pictures whose ``image.uri`` has been stripped — used by the rebuild
     path where the docling is loaded from the stored blob.
+
+    ``serialization``, the document's ``serialize_docling`` output, supplies
+    decoded picture bytes and item positions instead of another walk.
     """
     from haiku.rag.chunkers import get_chunker
 
@@ -248,6 +285,7 @@ async def chunk(
         document_id,
         existing_picture_data,
         config.processing.min_picture_size,
+        serialization,
     )
 
 
@@ -275,6 +313,7 @@ def build_picture_chunks(
     document_id: str | None = None,
     existing_picture_data: dict[str, bytes] | None = None,
     min_picture_size: int = 0,
+    decoded_pictures: Mapping[str, bytes] | None = None,
 ) -> list[Chunk]:
     """Emit one synthetic ``Chunk`` per distinct ``PictureItem`` with available
     bytes.
@@ -283,6 +322,8 @@ def build_picture_chunks(
     docling) or from ``existing_picture_data`` keyed by ``self_ref`` (snapshot
     taken before a delete-and-re-extract cycle, when the live docling has had
     its picture URIs stripped). Pictures with no available bytes are skipped.
+    ``decoded_pictures`` holds bytes already decoded from the URIs, keyed by
+    ``self_ref``, so they are not decoded again.
 
     Pictures whose bytes were already seen in this document are skipped — the
     first occurrence carries the chunk, so a watermark repeated on every page
@@ -301,11 +342,14 @@ def build_picture_chunks(
     )
 
     existing = existing_picture_data or {}
+    decoded = decoded_pictures or {}
     seen: set[bytes] = set()
     chunks: list[Chunk] = []
 
     for picture in docling_document.pictures:
-        picture_data = _decode_picture_bytes(picture)
+        picture_data = decoded.get(picture.self_ref)
+        if picture_data is None:
+            picture_data = _decode_picture_bytes(picture)
         if picture_data is None:
             picture_data = existing.get(picture.self_ref)
         if picture_data is None:
@@ -345,12 +389,17 @@ def build_picture_chunks(
 
 
 async def ensure_chunks_embedded(
-    config: AppConfig, chunks: list[Chunk], embedder: "EmbedderWrapper"
+    config: AppConfig,
+    chunks: list[Chunk],
+    embedder: "EmbedderWrapper",
+    picture_vectors: Mapping[str, list[float]] | None = None,
 ) -> list[Chunk]:
     """Ensure all chunks have embeddings, embedding any that don't.
 
     Chunks that already have embeddings are passed through unchanged; missing
     embeddings are filled in in-place in the returned list (preserving order).
+    ``picture_vectors`` is passed to ``embed_chunks`` to reuse stored picture
+    vectors.
     """
     from haiku.rag.embeddings import embed_chunks
 
@@ -360,7 +409,9 @@ async def ensure_chunks_embedded(
         return chunks
 
     with logfire.span("document.embed", chunks=len(chunks_to_embed)):
-        embedded = await embed_chunks(chunks_to_embed, embedder, config)
+        embedded = await embed_chunks(
+            chunks_to_embed, embedder, config, picture_vectors
+        )
 
     # embed_chunks preserves input order; fill positionally, since duplicate
     # chunk texts across documents make a content-keyed lookup ambiguous.
@@ -1,5 +1,4 @@
 import asyncio
-import json
 import logging
 from collections.abc import AsyncGenerator
 from datetime import datetime
@@ -13,8 +12,13 @@ from haiku.rag.client.documents import (
     create_document_from_source,
 )
 from haiku.rag.converters import get_converter
-from haiku.rag.store.compression import compress_docling_split
-from haiku.rag.store.models.chunk import Chunk
+from haiku.rag.store.compression import CompressionParams, compress_docling_split
+from haiku.rag.store.models.chunk import (
+    Chunk,
+    chunk_metadata_columns,
+    chunk_metadata_from_row,
+    picture_vectors,
+)
 from haiku.rag.store.models.document import Document
 from haiku.rag.store.models.document_item import extract_items
 from haiku.rag.store.repositories.settings import SettingsRepository
@@ -24,6 +28,7 @@ if TYPE_CHECKING:
     from docling_core.types.doc.document import DoclingDocument
 
     from haiku.rag.client import HaikuRAG, RebuildMode
+    from haiku.rag.embeddings import EmbedderWrapper
 
 logger = logging.getLogger(__name__)
 
@@ -51,10 +56,17 @@ class _StagingChunkRecord(LanceModel):
     id: str
     document_id: str
     content: str
+    doc_item_refs: list[str]
+    headings: list[str] | None
+    labels: list[str]
+    page_numbers: list[int]
     metadata: str
     order: int
 
 
+_STAGING_COLUMNS = list(_StagingChunkRecord.model_fields)
+
+
 class _StagingMarkerRecord(LanceModel):
     """Sentinel marking the staging table as complete.
 
@@ -115,7 +127,7 @@ async def _rebuild_locked(
     await settings_repo.save_current_settings()
 
     # Light listing — id/uri/title/metadata only. Each rebuild function
-    # fetches full content (including the multi-MB docling_pages blob) one
+    # fetches full content (including the multi-MB docling_document blob) one
     # document at a time so a 1000-doc database doesn't pull ~15 GB of
     # blobs into memory before the loop starts.
     documents = await client.list_documents(include_content=False)
@@ -183,7 +195,7 @@ async def _hydrate(
     """Yield fully-loaded documents one at a time from a light listing.
 
     The light listing in ``rebuild_database`` skips the multi-MB
-    ``docling_document``/``docling_pages`` blobs; this helper fetches each
+    ``docling_document`` blob; this helper fetches each
     full record on demand so peak memory stays at ~one document. Documents
     that disappeared between listing and processing are silently skipped.
     """
@@ -306,21 +318,12 @@ async def _populate_staging_table(client: "HaikuRAG") -> None:
 
     stream = (
         await client.store.chunks_table.query()
-        .select(["id", "document_id", "content", "metadata", "order"])
+        .select(_STAGING_COLUMNS)
         .to_batches(max_batch_length=_STAGING_COPY_BATCH_SIZE)
     )
     async for batch in stream:
         rows = batch.to_pylist()
-        records = [
-            _StagingChunkRecord(
-                id=r["id"],
-                document_id=r["document_id"],
-                content=r["content"],
-                metadata=r["metadata"],
-                order=r["order"],
-            )
-            for r in rows
-        ]
+        records = [_StagingChunkRecord(**r) for r in rows]
         await staging.add(records)
 
 
@@ -365,7 +368,7 @@ async def _read_chunks_from_staging(staging_table, document_id: str) -> list[Chu
     rows = (
         await staging_table.query()
         .where(f"document_id = '{document_id}'")
-        .select(["id", "document_id", "content", "metadata", "order"])
+        .select(_STAGING_COLUMNS)
         .to_arrow()
     ).to_pylist()
     chunks: list[Chunk] = []
@@ -375,7 +378,7 @@ async def _read_chunks_from_staging(staging_table, document_id: str) -> list[Chu
                 id=row["id"],
                 document_id=row["document_id"],
                 content=row["content"],
-                metadata=json.loads(row["metadata"]),
+                metadata=chunk_metadata_from_row(row),
                 order=row["order"],
             )
         )
@@ -383,6 +386,29 @@ async def _read_chunks_from_staging(staging_table, document_id: str) -> list[Chu
     return chunks
 
 
+async def _embed_reusing_pictures(
+    client: "HaikuRAG",
+    chunks: list[Chunk],
+    embedder: "EmbedderWrapper",
+    known: dict[str, list[float]],
+    reuse_stored: bool = True,
+) -> list[Chunk]:
+    """Embed chunks, reusing picture vectors embedded earlier in this rebuild
+    and, with `reuse_stored`, those stored on the blobs. Adds the new picture
+    vectors to `known`."""
+    from haiku.rag.embeddings import embed_chunks
+
+    vectors = (
+        await client.picture_blob_repository.get_vectors_for(chunks)
+        if reuse_stored
+        else {}
+    )
+    vectors.update(known)
+    embedded = await embed_chunks(chunks, embedder, client._config, vectors)
+    known.update(picture_vectors(embedded))
+    return embedded
+
+
 async def _rebuild_embed_only(
     client: "HaikuRAG",
     documents: list[Document],
@@ -412,7 +438,7 @@ async def _rebuild_embed_only(
     treats it as a partial phase 1, which is harmless because phase 2 has
     already finished writing the new chunks table.
     """
-    from haiku.rag.embeddings import contextualize, embed_chunks
+    from haiku.rag.embeddings import contextualize
 
     db = client.store.db
     embedder = client.chunk_repository.embedder
@@ -431,6 +457,8 @@ async def _rebuild_embed_only(
     staging_table = await db.open_table(_STAGING_TABLE_NAME)
 
     pending_records: list[ChunkRecordBase] = []
+    known_vectors: dict[str, list[float]] = {}
+    pending_vectors: dict[str, list[float]] = {}
     yielded_docs: set[str] = set()
 
     for doc in documents:
@@ -462,7 +490,12 @@ async def _rebuild_embed_only(
                     )
 
         content_fts_list = contextualize(chunks)
-        embedded_chunks = await embed_chunks(chunks, embedder, client._config)
+        # Embed-only exists to refresh vectors, so stored picture vectors are
+        # recomputed (once per picture) and overwritten rather than reused.
+        embedded_chunks = await _embed_reusing_pictures(
+            client, chunks, embedder, known_vectors, reuse_stored=False
+        )
+        pending_vectors.update(picture_vectors(embedded_chunks))
 
         for chunk, content_fts, embedded in zip(
             chunks, content_fts_list, embedded_chunks
@@ -476,7 +509,7 @@ async def _rebuild_embed_only(
                     document_id=chunk.document_id,
                     content=chunk.content,
                     content_fts=content_fts,
-                    metadata=json.dumps(chunk.metadata),
+                    **chunk_metadata_columns(chunk.metadata),
                     order=chunk.order,
                     vector=embedded.embedding,
                 )
@@ -493,9 +526,16 @@ async def _rebuild_embed_only(
         if len(yielded_docs) % _REBUILD_BATCH_SIZE == 0 and pending_records:
             await client.store.chunks_table.add(pending_records)
             pending_records = []
+            # Record the batch's picture vectors on their blobs, for ingestion
+            # and later rebuilds to reuse.
+            await client.picture_blob_repository.put(
+                {}, pending_vectors, overwrite=True
+            )
+            pending_vectors = {}
 
     if pending_records:
         await client.store.chunks_table.add(pending_records)
+        await client.picture_blob_repository.put({}, pending_vectors, overwrite=True)
 
     # Phase 2 finished. Drop the recovery state — marker first so a crash
     # between the two drops leaves only staging behind, which the next
@@ -517,7 +557,7 @@ async def _flush_rebuild_batch(
     document. Used by RECHUNK and FULL modes after the chunks table has been
     cleared.
     """
-    from haiku.rag.store.schema import DocumentMetaRecord, DocumentRecord
+    from haiku.rag.store.schema import DocumentRecord
 
     if not documents:
         return
@@ -526,7 +566,7 @@ async def _flush_rebuild_batch(
 
     # Batch update documents and document_meta using merge_insert (one LanceDB
     # version per table). Content+blobs go to documents; mutable attributes go
-    # to document_meta.
+    # to document_meta; re-converted page images replace the stored pages.
     doc_records = []
     meta_records = []
     for doc in documents:
@@ -536,21 +576,25 @@ async def _flush_rebuild_batch(
                 id=doc.id,
                 content=doc.content,
                 docling_document=doc.docling_document,
-                docling_pages=doc.docling_pages,
                 docling_version=doc.docling_version,
             )
         )
         meta_records.append(
-            DocumentMetaRecord(
-                id=doc.id,
-                uri=doc.uri,
-                title=doc.title,
-                metadata=json.dumps(doc.metadata),
-                created_at=doc.created_at.isoformat() if doc.created_at else now,
-                updated_at=now,
+            client.document_repository._to_meta_record(
+                doc,
+                doc.id,
+                doc.created_at.isoformat() if doc.created_at else now,
+                now,
             )
         )
 
+    await client.document_page_repository.replace_for_documents(
+        {
+            doc.id: doc.docling_pages
+            for doc in documents
+            if doc.id and doc.docling_pages is not None
+        }
+    )
     await (
         client.store.documents_table.merge_insert("id")
         .when_matched_update_all()
@@ -570,7 +614,8 @@ async def _flush_rebuild_batch(
     # Repopulate document items from stored docling data. The stored docling
     # blob has had its picture URIs stripped (compress_docling_split), so
     # re-extracting from it would lose picture_data — snapshot the existing
-    # bytes per document and merge them back.
+    # bytes per document and merge them back. Replacing rather than deleting
+    # first keeps the picture blobs the document still references.
     for doc in documents:
         assert doc.id is not None
         docling_doc = doc.get_docling_document()
@@ -578,23 +623,24 @@ async def _flush_rebuild_batch(
             existing_picture_data = (
                 await client.document_item_repository.get_all_picture_data(doc.id)
             )
-            await client.document_item_repository.delete_by_document_id(doc.id)
             items = extract_items(
                 doc.id,
                 docling_doc,
                 existing_picture_data=existing_picture_data,
             )
-            await client.document_item_repository.create_items(doc.id, items)
+            await client.document_item_repository.replace_for_document(doc.id, items)
+
+    # Record the batch's picture vectors on their blobs.
+    await client.picture_blob_repository.put({}, picture_vectors(chunks))
 
 
 async def _rebuild_rechunk(
     client: "HaikuRAG", documents: list[Document]
 ) -> AsyncGenerator[str, None]:
     """Re-chunk and re-embed each document from its stored docling blob."""
-    from haiku.rag.embeddings import embed_chunks
-
     pending_chunks: list[Chunk] = []
     pending_docs: list[Document] = []
+    known_vectors: dict[str, list[float]] = {}
     embedder = client.embedder
 
     async for doc in _hydrate(client, documents):
@@ -618,7 +664,9 @@ async def _rebuild_rechunk(
             existing_picture_data=existing_picture_data,
             document_id=doc.id,
         )
-        embedded_chunks = await embed_chunks(chunks, embedder, client._config)
+        embedded_chunks = await _embed_reusing_pictures(
+            client, chunks, embedder, known_vectors
+        )
 
         for order, chunk in enumerate(embedded_chunks):
             chunk.document_id = doc.id
@@ -643,16 +691,19 @@ async def _rebuild_rechunk(
 
 
 def _apply_descriptions_sync(
-    docling_doc: "DoclingDocument", doc: Document, descriptions: dict[str, str]
+    docling_doc: "DoclingDocument",
+    doc: Document,
+    descriptions: dict[str, str],
+    params: CompressionParams | None = None,
 ) -> int:
     """Patch picture descriptions into the docling document and re-compress.
 
-    Updates only docling_document — set_docling would also overwrite
+    Updates only docling_document — set_docling would also set
     docling_pages by routing through compress_docling_split, which
-    extracts pages from the in-memory JSON and finds none (the pages
-    blob is stored separately and is not loaded by get_docling_document).
-    That would silently destroy page rasters for every doc with at
-    least one undescribed picture.
+    extracts pages from the in-memory JSON and finds none (pages are
+    stored in document_pages and are not loaded by get_docling_document).
+    Writing that empty dict would silently destroy page rasters for every
+    doc with at least one undescribed picture.
     """
     for pic in docling_doc.pictures:
         text = descriptions.get(pic.self_ref)
@@ -662,7 +713,9 @@ def _apply_descriptions_sync(
             pic.meta = PictureMeta()
         pic.meta.description = DescriptionMetaField(text=text)
 
-    structure_bytes, _ = compress_docling_split(docling_doc.model_dump(mode="json"))
+    structure_bytes, _ = compress_docling_split(
+        docling_doc.model_dump(mode="json"), params
+    )
     doc.docling_document = structure_bytes
     doc.docling_version = docling_doc.version
     return len(descriptions)
@@ -711,7 +764,11 @@ async def _patch_picture_descriptions(client: "HaikuRAG", doc: Document) -> int:
         return 0
 
     return await asyncio.to_thread(
-        _apply_descriptions_sync, docling_doc, doc, descriptions
+        _apply_descriptions_sync,
+        docling_doc,
+        doc,
+        descriptions,
+        client.store.compression_params,
     )
 
 
@@ -725,8 +782,6 @@ async def _rebuild_descriptions(
     cost remains. Idempotent: pictures whose ``meta.description.text`` is
     already populated are not re-described.
     """
-    from haiku.rag.embeddings import embed_chunks
-
     if client._config.processing.pictures != "description":
         raise ValueError(
             "rebuild --descriptions requires processing.pictures = 'description' "
@@ -735,6 +790,7 @@ async def _rebuild_descriptions(
 
     pending_chunks: list[Chunk] = []
     pending_docs: list[Document] = []
+    known_vectors: dict[str, list[float]] = {}
     embedder = client.embedder
 
     described_total = 0
@@ -763,7 +819,9 @@ async def _rebuild_descriptions(
             existing_picture_data=existing_picture_data,
             document_id=doc.id,
         )
-        embedded_chunks = await embed_chunks(chunks, embedder, client._config)
+        embedded_chunks = await _embed_reusing_pictures(
+            client, chunks, embedder, known_vectors
+        )
 
         for order, chunk in enumerate(embedded_chunks):
             chunk.document_id = doc.id
@@ -792,10 +850,9 @@ async def _rebuild_full(
     client: "HaikuRAG", documents: list[Document]
 ) -> AsyncGenerator[str, None]:
     """Full rebuild: re-convert from source, re-chunk, re-embed."""
-    from haiku.rag.embeddings import embed_chunks
-
     pending_chunks: list[Chunk] = []
     pending_docs: list[Document] = []
+    known_vectors: dict[str, list[float]] = {}
     converter = get_converter(client._config)
     embedder = client.embedder
 
@@ -839,7 +896,7 @@ async def _rebuild_full(
             )
 
         # Fallback: rebuild from stored content. Now we need the full
-        # record (content + docling_pages for the round-trip write).
+        # record (content + docling_document for the round-trip write).
         doc = await client.document_repository.get_by_id(
             light_doc.id, include_blobs=True
         )
@@ -849,9 +906,11 @@ async def _rebuild_full(
 
         docling_document = await converter.convert_text(doc.content, format="md")
         chunks = await client.chunk(docling_document)
-        embedded_chunks = await embed_chunks(chunks, embedder, client._config)
+        embedded_chunks = await _embed_reusing_pictures(
+            client, chunks, embedder, known_vectors
+        )
 
-        doc.set_docling(docling_document)
+        doc.set_docling(docling_document, client.store.compression_params)
 
         for order, chunk in enumerate(embedded_chunks):
             chunk.document_id = doc.id
@@ -18,6 +18,7 @@ async def search(
     search_type: SearchType | None = None,
     filter: str | None = None,
     include_images: bool = True,
+    chunk_filter: str | None = None,
 ) -> list[SearchResult]:
     """Search for relevant chunks with optional reranking.
 
@@ -31,6 +32,10 @@ async def search(
         filter: Optional SQL WHERE clause to filter documents before searching chunks.
         include_images: When True, populate ``SearchResult.image_data`` with
             base64 picture bytes for picture-labeled chunks.
+        chunk_filter: Optional SQL WHERE clause on chunk columns
+            (``labels``, ``page_numbers``, ``headings``, ``doc_item_refs``),
+            evaluated inside LanceDB with the search, e.g.
+            ``array_has(labels, 'table')``.
 
     Returns:
         List of SearchResult objects ordered by relevance.
@@ -46,12 +51,12 @@ async def search(
 
         if reranker is None:
             chunk_results = await client.chunk_repository.search(
-                query, limit, search_type, filter
+                query, limit, search_type, filter, chunk_filter=chunk_filter
             )
         else:
             search_limit = limit * 10
             raw_results = await client.chunk_repository.search(
-                query, search_limit, search_type, filter
+                query, search_limit, search_type, filter, chunk_filter=chunk_filter
             )
             chunks = [chunk for chunk, _ in raw_results]
             if client._config.reranking.multimodal:
@@ -71,6 +76,7 @@ async def search(
             limit=limit,
             filter=filter,
             query_vector=query_vector,
+            chunk_filter=chunk_filter,
         )
 
     results = [SearchResult.from_chunk(chunk, score) for chunk, score in chunk_results]
@@ -313,11 +319,7 @@ async def visualize_chunk(
         return []
     chunks = [c for c in chunks if c.document_id == document_id]
 
-    doc = await client.document_repository.get_docling_data(document_id)
-    if not doc:
-        return []
-
-    docling_doc = doc.get_docling_document()
+    docling_doc = await client.document_repository.get_docling_document(document_id)
     if not docling_doc:
         return []
 
@@ -374,10 +376,9 @@ async def visualize_chunk(
         boxes_by_page[bbox.page_no].append((bbox, is_matched))
 
     # Load only the needed page images
-    pages_doc = await client.document_repository.get_pages_data(document_id)
-    if not pages_doc:
-        return []
-    page_images = pages_doc.get_page_images(list(boxes_by_page.keys()))
+    page_images = await client.document_page_repository.get_pages(
+        document_id, list(boxes_by_page.keys())
+    )
 
     images = []
     for page_no in sorted(boxes_by_page.keys()):
@@ -1,14 +1,23 @@
+import asyncio
 import logging
+from dataclasses import dataclass
 from typing import TYPE_CHECKING
 
 from haiku.rag.config import AppConfig
+from haiku.rag.store.commit import _GroupWorker
+from haiku.rag.store.engine import Store
 from haiku.rag.store.models.document import Document
+from haiku.rag.store.repositories.document import DocumentRepository
+from haiku.rag.telemetry import logfire
 
 if TYPE_CHECKING:
     from docling_core.types.doc.document import DoclingDocument
 
 logger = logging.getLogger(__name__)
 
+# Characters of document content the title model is shown.
+_TITLE_CONTENT_CHARS = 2000
+
 
 def extract_structural_title(docling_document: "DoclingDocument") -> str | None:
     """Extract a title from DoclingDocument structural metadata.
@@ -45,7 +54,7 @@ async def generate_title_with_llm(config: AppConfig, content: str) -> str | None
 
     from haiku.rag.utils import get_model
 
-    truncated = content[:2000]
+    truncated = content[:_TITLE_CONTENT_CHARS]
 
     model = get_model(config.processing.title_model, config)
     agent: Agent[None, str] = Agent(
@@ -103,3 +112,77 @@ async def generate_title(config: AppConfig, document: Document) -> str | None:
             return structural
 
     return await generate_title_with_llm(config, content)
+
+
+@dataclass
+class _TitleRequest:
+    document_id: str
+    content: str
+
+
+class TitleBackfiller(_GroupWorker):
+    """Generates LLM titles for stored documents in the background.
+
+    Ingest stores an untitled document straight away and submits it here, so
+    it never waits on the title model. Submitted documents are collected into
+    batches; each batch is titled with at most `max_concurrency` requests in
+    flight and its titles written with one `document_meta` merge. A title that
+    fails to generate is logged and left empty for
+    `haiku-rag rebuild --title-only`, and a document titled in the meantime
+    keeps its title.
+    """
+
+    def __init__(
+        self,
+        store: Store,
+        config: AppConfig,
+        max_batch_size: int,
+        max_delay_s: float,
+        max_concurrency: int,
+    ) -> None:
+        super().__init__(store, max_batch_size, max_delay_s)
+        self.config = config
+        self.max_concurrency = max_concurrency
+        self.document_repository = DocumentRepository(store)
+
+    def submit(self, document_id: str, content: str) -> None:
+        """Queue a stored document for a title generated from its content."""
+        self._enqueue(_TitleRequest(document_id, content[:_TITLE_CONTENT_CHARS]))
+
+    async def _title(
+        self, request: _TitleRequest, slots: asyncio.Semaphore
+    ) -> str | None:
+        async with slots:
+            try:
+                return await generate_title_with_llm(self.config, request.content)
+            except Exception:
+                logger.warning(
+                    "LLM title generation failed for document %s",
+                    request.document_id,
+                    exc_info=True,
+                )
+                return None
+
+    async def _flush(self, batch: list[_TitleRequest]) -> list[_TitleRequest]:
+        with logfire.span("titles.backfill", documents=len(batch)) as span:
+            slots = asyncio.Semaphore(self.max_concurrency)
+            titles = await asyncio.gather(
+                *(self._title(request, slots) for request in batch)
+            )
+            generated = {
+                request.document_id: title
+                for request, title in zip(batch, titles)
+                if title
+            }
+            if not generated:
+                return []
+            try:
+                span.set_attribute(
+                    "titled",
+                    await self.document_repository.set_missing_titles(generated),
+                )
+            except Exception:
+                logger.warning(
+                    "Failed to store %d generated titles", len(generated), exc_info=True
+                )
+        return []
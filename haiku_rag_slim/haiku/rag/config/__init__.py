@@ -10,14 +10,21 @@ from haiku.rag.config.models import (
     APIConfig,
     AppConfig,
     CircuitBreakerConfig,
+    CompactionConfig,
+    CompressionConfig,
+    ConversionCacheConfig,
     ConversionOptions,
+    ConversionPoolConfig,
+    DiskCacheConfig,
     DoclingServeConfig,
     EmbeddingModelConfig,
     EmbeddingsConfig,
     FSSourceConfig,
+    GroupCommitConfig,
     HTTPSourceConfig,
     IngesterConfig,
     LanceDBConfig,
+    MetadataColumnConfig,
     ModelConfig,
     OllamaConfig,
     PluginSourceConfig,
@@ -31,6 +38,7 @@ from haiku.rag.config.models import (
     S3SourceConfig,
     SourceConfig,
     StorageConfig,
+    TitleBackfillConfig,
     WebDAVSourceConfig,
     WorkerConfig,
 )
@@ -39,14 +47,21 @@ __all__ = [
     "APIConfig",
     "AppConfig",
     "CircuitBreakerConfig",
+    "CompactionConfig",
+    "CompressionConfig",
+    "ConversionCacheConfig",
     "ConversionOptions",
+    "ConversionPoolConfig",
+    "DiskCacheConfig",
     "DoclingServeConfig",
     "EmbeddingModelConfig",
     "EmbeddingsConfig",
     "FSSourceConfig",
+    "GroupCommitConfig",
     "HTTPSourceConfig",
     "IngesterConfig",
     "LanceDBConfig",
+    "MetadataColumnConfig",
     "ModelConfig",
     "OllamaConfig",
     "PluginSourceConfig",
@@ -60,6 +75,7 @@ __all__ = [
     "S3SourceConfig",
     "SourceConfig",
     "StorageConfig",
+    "TitleBackfillConfig",
     "WebDAVSourceConfig",
     "WorkerConfig",
     "MissingEnvVarError",
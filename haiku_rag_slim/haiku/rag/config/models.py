@@ -1,3 +1,4 @@
+from datetime import datetime
 from pathlib import Path
 from typing import Annotated, Any, Literal
 
@@ -65,10 +66,177 @@ class EmbeddingModelConfig(ConfigModel):
     multimodal: bool = False
 
 
+class GroupCommitConfig(ConfigModel):
+    """Batches concurrent document writes so each flush writes one version per
+    table instead of one per document. Worth enabling when several writers
+    ingest at once, such as ingester workers."""
+
+    enabled: bool = False
+    max_batch_size: int = Field(
+        default=16,
+        gt=0,
+        description="Most documents written by a single flush.",
+    )
+    max_delay_s: float = Field(
+        default=0.05,
+        ge=0,
+        description="How long a flush waits for more documents after the first "
+        "one arrives. Bounds the latency group commit adds to a lone write.",
+    )
+
+
+class CompactionConfig(ConfigModel):
+    """Thresholds for the automatic compaction that follows writes when
+    auto_vacuum is on. A table is compacted when it crosses any threshold;
+    tables below all of them are left alone. `haiku-rag vacuum` still
+    optimizes every table."""
+
+    min_small_fragments: int = Field(
+        default=16,
+        gt=0,
+        description="Small fragments a table must have before the small "
+        "fragment ratio is considered.",
+    )
+    small_fragment_ratio: float = Field(
+        default=0.5,
+        ge=0,
+        le=1,
+        description="Compact when at least this share of a table's fragments "
+        "are small.",
+    )
+    deleted_row_ratio: float = Field(
+        default=0.2,
+        gt=0,
+        le=1,
+        description="Compact when at least this share of a table's stored rows "
+        "are deleted.",
+    )
+    max_stale_versions: int = Field(
+        default=100,
+        gt=0,
+        description="Compact when more versions than this are older than "
+        "vacuum_retention_seconds and so can be cleaned up.",
+    )
+    max_concurrency: int = Field(
+        default=2,
+        gt=0,
+        description="Tables compacted at the same time.",
+    )
+    peak_hours: list[str] = Field(
+        default_factory=list,
+        description="Local-time windows, as HH:MM-HH:MM, in which automatic "
+        "compaction does not run. A window may wrap midnight.",
+    )
+
+    @field_validator("peak_hours")
+    @classmethod
+    def _check_peak_hours(cls, value: list[str]) -> list[str]:
+        for window in value:
+            start, sep, end = window.partition("-")
+            try:
+                if not sep:
+                    raise ValueError
+                datetime.strptime(start.strip(), "%H:%M")
+                datetime.strptime(end.strip(), "%H:%M")
+            except ValueError:
+                raise ValueError(
+                    f"peak_hours entry {window!r} is not HH:MM-HH:MM"
+                ) from None
+        return value
+
+
+class CompressionConfig(ConfigModel):
+    """How docling blobs are compressed when written. Changing these affects
+    new writes only; stored blobs keep decompressing as they are."""
+
+    level: int = Field(
+        default=3,
+        ge=1,
+        le=22,
+        description="zstd compression level. Higher levels write smaller "
+        "blobs more slowly; decompression speed barely changes.",
+    )
+    threads: int = Field(
+        default=0,
+        ge=0,
+        description="Worker threads used to compress blobs of 4 MiB or more. "
+        "0 compresses on the calling thread.",
+    )
+    dictionary: bool = Field(
+        default=True,
+        description="Compress docling structure with the dictionary trained by "
+        "`haiku-rag train-dictionary`, when the database has one.",
+    )
+
+
+MetadataColumnType = Literal["string", "integer", "float", "boolean", "string_list"]
+
+
+class MetadataColumnConfig(ConfigModel):
+    """A document metadata key materialized as its own `document_meta` column.
+
+    The column is named `meta_<key>` and holds the key's value when it has the
+    declared type, NULL otherwise. The `metadata` JSON keeps every key either
+    way. Filters on the column use its index instead of matching the JSON.
+    """
+
+    key: str = Field(pattern=r"^[A-Za-z_][A-Za-z0-9_]*$")
+    type: MetadataColumnType = "string"
+    index: Literal["btree", "bitmap", "label_list"] | None = Field(
+        default=None,
+        description="Index on the column. By default a bitmap for booleans, a "
+        "label list for string lists and a B-tree otherwise. Use a bitmap for "
+        "strings with few distinct values.",
+    )
+
+    @model_validator(mode="after")
+    def _default_index(self) -> "MetadataColumnConfig":
+        if self.index is None:
+            if self.type == "boolean":
+                self.index = "bitmap"
+            elif self.type == "string_list":
+                self.index = "label_list"
+            else:
+                self.index = "btree"
+        elif (self.index == "label_list") != (self.type == "string_list"):
+            raise ValueError(
+                f"metadata column {self.key!r}: a label_list index is for "
+                "string_list columns only"
+            )
+        return self
+
+
+def _default_metadata_columns() -> list[MetadataColumnConfig]:
+    return [
+        MetadataColumnConfig(key="parent_uri"),
+        MetadataColumnConfig(key="content_type", index="bitmap"),
+    ]
+
+
 class StorageConfig(ConfigModel):
     data_dir: Path = Field(default_factory=get_default_data_dir)
     auto_vacuum: bool = True
     vacuum_retention_seconds: int = Field(default=86400, ge=0)
+    group_commit: GroupCommitConfig = Field(default_factory=GroupCommitConfig)
+    compaction: CompactionConfig = Field(default_factory=CompactionConfig)
+    compression: CompressionConfig = Field(default_factory=CompressionConfig)
+    docling_cache_size_bytes: int = Field(default=256 * 1024 * 1024, ge=0)
+    metadata_columns: list[MetadataColumnConfig] = Field(
+        default_factory=_default_metadata_columns,
+        description="Document metadata keys stored as indexed `meta_<key>` "
+        "columns. Run `haiku-rag migrate` after changing them.",
+    )
+
+    @field_validator("metadata_columns")
+    @classmethod
+    def _unique_metadata_keys(
+        cls, value: list[MetadataColumnConfig]
+    ) -> list[MetadataColumnConfig]:
+        keys = [column.key for column in value]
+        duplicates = sorted({key for key in keys if keys.count(key) > 1})
+        if duplicates:
+            raise ValueError(f"duplicate metadata columns: {', '.join(duplicates)}")
+        return value
 
     @field_validator("data_dir", mode="before")
     @classmethod
@@ -84,6 +252,25 @@ class StorageConfig(ConfigModel):
         return value
 
 
+class DiskCacheConfig(ConfigModel):
+    """Local disk cache for a database on object storage. Read-only
+    connections read data and index files through it, so a restarted process
+    serves cached files from local disk instead of refetching them."""
+
+    enabled: bool = False
+    path: Path | None = Field(
+        default=None,
+        description="Cache directory. Defaults to lancedb-cache under "
+        "storage.data_dir. Processes may share it.",
+    )
+    max_size_bytes: int = Field(
+        default=10 * 1024**3,
+        gt=0,
+        description="Size the cached blocks are kept under by evicting the "
+        "least recently used.",
+    )
+
+
 class LanceDBConfig(ConfigModel):
     """LanceDB connection settings.
 
@@ -100,6 +287,7 @@ class LanceDBConfig(ConfigModel):
     read_consistency_interval_seconds: float | None = Field(default=30, ge=0)
     index_cache_size_bytes: int | None = Field(default=None, ge=0)
     metadata_cache_size_bytes: int | None = Field(default=None, ge=0)
+    disk_cache: DiskCacheConfig = Field(default_factory=DiskCacheConfig)
 
 
 class EmbeddingsConfig(ConfigModel):
@@ -215,6 +403,79 @@ class ConversionOptions(ConfigModel):
 PicturesMode = Literal["none", "description", "image"]
 
 
+class ConversionPoolConfig(ConfigModel):
+    """Runs docling-local conversions in worker processes instead of the
+    calling process. Each worker loads and caches its own models and converts
+    one file at a time, so PDF conversion scales with cores rather than being
+    serialized behind one shared converter."""
+
+    workers: int = Field(
+        default=0,
+        ge=0,
+        description="Worker processes converting files. 0 converts in-process.",
+    )
+    max_task_memory_mb: int | None = Field(
+        default=None,
+        gt=0,
+        description="Data-segment limit of each worker, including the models it "
+        "loads. A conversion that exceeds it fails on its own instead of taking "
+        "the caller down. Ignored on Windows.",
+    )
+    max_tasks_per_worker: int | None = Field(
+        default=None,
+        gt=0,
+        description="Conversions after which a worker is replaced by a fresh "
+        "one, returning memory docling leaks. None keeps workers for the life "
+        "of the pool.",
+    )
+
+
+class ConversionCacheConfig(ConfigModel):
+    """On-disk cache of converted documents, keyed by the file's bytes, the
+    converter, the conversion options and the docling version. Converting
+    bytes already converted with the same settings reads the cached document
+    instead of running docling again."""
+
+    enabled: bool = False
+    path: Path | None = Field(
+        default=None,
+        description="Cache directory. Defaults to conversion-cache under "
+        "storage.data_dir. Processes may share it.",
+    )
+    max_size_bytes: int = Field(
+        default=5 * 1024**3,
+        gt=0,
+        description="Size the compressed documents are kept under by evicting "
+        "the least recently used.",
+    )
+
+
+class TitleBackfillConfig(ConfigModel):
+    """Generates auto_title LLM titles after documents are stored instead of
+    during ingest. Documents are stored with their structural title, or none,
+    and a background task of the client asks the title model for the missing
+    ones in batches and writes them to document_meta alone."""
+
+    enabled: bool = True
+    max_batch_size: int = Field(
+        default=16,
+        gt=0,
+        description="Most documents titled by a single flush, whose titles are "
+        "written together.",
+    )
+    max_delay_s: float = Field(
+        default=1.0,
+        ge=0,
+        description="How long a flush waits for more documents after the first "
+        "one arrives.",
+    )
+    max_concurrency: int = Field(
+        default=4,
+        gt=0,
+        description="Title model requests in flight at once.",
+    )
+
+
 class ProcessingConfig(ConfigModel):
     chunk_size: int = Field(default=256, gt=0)
     converter: Literal["docling-local", "docling-serve"] = "docling-local"
@@ -224,6 +485,10 @@ class ProcessingConfig(ConfigModel):
     chunking_merge_peers: bool = True
     chunking_use_markdown_tables: bool = False
     conversion_options: ConversionOptions = Field(default_factory=ConversionOptions)
+    conversion_pool: ConversionPoolConfig = Field(default_factory=ConversionPoolConfig)
+    conversion_cache: ConversionCacheConfig = Field(
+        default_factory=ConversionCacheConfig
+    )
     split_pages: int = Field(
         default=0,
         ge=0,
@@ -234,6 +499,25 @@ class ProcessingConfig(ConfigModel):
             "for memory-bound or large (>100 page) PDFs."
         ),
     )
+    split_concurrency: int = Field(
+        default=1,
+        ge=1,
+        description=(
+            "Slices of one split PDF converted at once. Worth raising to the "
+            "number of docling-serve instances or conversion_pool workers; "
+            "peak memory grows with the slices in flight."
+        ),
+    )
+    pdfium_workers: int = Field(
+        default=0,
+        ge=0,
+        description=(
+            "Helper processes running pdfium work: PDF page slicing, page "
+            "counts and embedded-attachment scans. Each has its own pdfium "
+            "state, so they run in parallel. 0 runs it in-process, one "
+            "operation at a time across all workers."
+        ),
+    )
     pictures: PicturesMode = "image"
     """How embedded pictures are handled at ingest.
 
@@ -268,6 +552,7 @@ class ProcessingConfig(ConfigModel):
             max_tokens=100,
         )
     )
+    title_backfill: TitleBackfillConfig = Field(default_factory=TitleBackfillConfig)
 
 
 class SearchConfig(ConfigModel):
@@ -325,6 +610,24 @@ class DoclingServeConfig(ConfigModel):
         gt=0,
         description="Per-request timeout in seconds for submit, poll and result calls.",
     )
+    poll_wait_s: float = Field(
+        default=10.0,
+        ge=0,
+        description="How long docling-serve holds a status request open waiting "
+        "for the task to finish, so completion is seen as it happens. Keep it "
+        "below timeout. 0 polls without waiting.",
+    )
+    poll_interval_s: float = Field(
+        default=0.05,
+        gt=0,
+        description="First delay between status requests when the server answers "
+        "without waiting. Doubles per request up to max_poll_interval_s.",
+    )
+    max_poll_interval_s: float = Field(
+        default=1.0,
+        gt=0,
+        description="Longest delay between status requests.",
+    )
     circuit_breaker: CircuitBreakerConfig = Field(
         default_factory=lambda: CircuitBreakerConfig(
             failure_threshold=3, cooldown_s=30.0
@@ -551,6 +854,23 @@ class S3SourceConfig(_SourceBase):
     storage_options: dict[str, str] = Field(default_factory=dict)
     ignore_patterns: list[str] = []
     include_patterns: list[str] = []
+    multipart_threshold: int = Field(
+        default=64 * 1024 * 1024,
+        gt=0,
+        description="Objects of at least this many bytes are downloaded as "
+        "concurrent ranged GETs instead of one stream.",
+    )
+    part_size: int = Field(
+        default=8 * 1024 * 1024,
+        gt=0,
+        description="Bytes per ranged GET of a large object.",
+    )
+    max_concurrency: int = Field(
+        default=8,
+        ge=1,
+        description="Ranged GETs in flight per large object. Each holds up to "
+        "part_size bytes in memory.",
+    )
 
 
 class WebDAVSourceConfig(_SourceBase):
@@ -20,6 +20,11 @@ def get_converter(config: AppConfig | None = None) -> DocumentConverter:
     """
     config = config if config is not None else get_config()
     if config.processing.converter == "docling-local":
+        if config.processing.conversion_pool.workers > 0:
+            from haiku.rag.converters.docling_pool import DoclingPoolConverter
+
+            return DoclingPoolConverter(config)
+
         from haiku.rag.converters.docling_local import DoclingLocalConverter
 
         return DoclingLocalConverter(config)
@@ -0,0 +1,254 @@
+"""On-disk cache of conversion results.
+
+Converting a file is by far the most expensive step of ingest, and the same
+bytes are converted again whenever they turn up under another URI, a failed
+ingest is retried, or a document is rebuilt. The cache stores each converted
+DoclingDocument, zstd-compressed, under a key of the file's bytes and
+everything that shapes the conversion: the converter, the conversion options
+and the docling version. A change to any of them misses the cache rather than
+serving a stale document.
+
+The entry index and hit counters live in a SQLite file beside the entries, so
+processes sharing the directory share the cache, and the least recently used
+entries are evicted once the cache outgrows its size bound.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from importlib import metadata
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from haiku.rag.store.compression import compress_json, decompress_json
+from haiku.rag.store.disk_cache import DiskCacheStats
+
+if TYPE_CHECKING:
+    from docling_core.types.doc.document import DoclingDocument
+
+    from haiku.rag.config import AppConfig
+
+# HTML and Markdown conversions resolve relative image references against the
+# source URI, so for them the URI is part of the key.
+_URI_AWARE_EXTENSIONS = frozenset({".html", ".xhtml", ".md", ".qmd", ".rmd"})
+
+_INDEX_SCHEMA = """
+PRAGMA journal_mode = WAL;
+PRAGMA synchronous = NORMAL;
+CREATE TABLE IF NOT EXISTS entries (
+    key TEXT PRIMARY KEY,
+    size INTEGER NOT NULL,
+    last_used REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS entries_last_used ON entries (last_used);
+CREATE TABLE IF NOT EXISTS counters (
+    name TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+INSERT OR IGNORE INTO counters VALUES ('hits', 0), ('misses', 0);
+"""
+
+_CACHES_LOCK = threading.Lock()
+_CACHES: dict[Path, "ConversionCache"] = {}
+
+
+def conversion_cache_path(config: "AppConfig") -> Path:
+    """The configured cache directory, defaulting under storage.data_dir."""
+    path = config.processing.conversion_cache.path
+    return path if path is not None else config.storage.data_dir / "conversion-cache"
+
+
+def _docling_version(converter: str) -> str:
+    """The version of the docling that converts. docling-serve's own version
+    is not exposed, so the client's docling-core stands in for it."""
+    if converter == "docling-local":
+        return f"docling {metadata.version('docling')}"
+    return f"docling-core {metadata.version('docling-core')}"
+
+
+def _options_fingerprint(config: "AppConfig") -> dict:
+    processing = config.processing
+    options: dict = {
+        "conversion_options": processing.conversion_options.model_dump(mode="json"),
+        "pictures": processing.pictures,
+        # Split documents are merged from independently converted slices.
+        "split_pages": processing.split_pages,
+    }
+    if processing.pictures == "description":
+        options["picture_prompt"] = config.prompts.picture_description
+    return options
+
+
+def _file_md5(path: Path) -> str:
+    digest = hashlib.md5(usedforsecurity=False)
+    with path.open("rb") as f:
+        while block := f.read(1024 * 1024):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def read_conversion_cache_stats(config: "AppConfig") -> DiskCacheStats | None:
+    """Counters of the configured cache directory, or None if it was never
+    used. Reads the index without taking part in the cache."""
+    path = conversion_cache_path(config)
+    index = path / "index.sqlite"
+    if not index.exists():
+        return None
+    db = sqlite3.connect(f"file:{index}?mode=ro", uri=True)
+    try:
+        counters = dict(db.execute("SELECT name, value FROM counters").fetchall())
+        (size,) = db.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()
+    finally:
+        db.close()
+    return DiskCacheStats(
+        path=str(path),
+        hits=counters.get("hits", 0),
+        misses=counters.get("misses", 0),
+        size_bytes=size,
+        max_size_bytes=config.processing.conversion_cache.max_size_bytes,
+    )
+
+
+def conversion_key(
+    config: "AppConfig", path: Path, source_uri: str | None = None
+) -> str:
+    """The cache key of converting `path` with this configuration: its bytes,
+    its extension, the converter, the conversion options and the docling
+    version, plus `source_uri` for HTML and Markdown."""
+    suffix = path.suffix.lower()
+    parts = {
+        "content_md5": _file_md5(path),
+        "suffix": suffix,
+        "converter": config.processing.converter,
+        "options": _options_fingerprint(config),
+        "docling": _docling_version(config.processing.converter),
+        "source_uri": source_uri if suffix in _URI_AWARE_EXTENSIONS else None,
+    }
+    return hashlib.sha256(json.dumps(parts, sort_keys=True).encode()).hexdigest()
+
+
+class ConversionCache:
+    """Converted documents in a directory, shared by threads and processes."""
+
+    def __init__(self, path: Path, max_size_bytes: int) -> None:
+        self.path = path
+        self.max_size_bytes = max_size_bytes
+        (path / "entries").mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(
+            path / "index.sqlite",
+            check_same_thread=False,
+            isolation_level=None,
+            timeout=30,
+        )
+        self._db.executescript(_INDEX_SCHEMA)
+        self._lock = threading.Lock()
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
+
+    def _entry_file(self, key: str) -> Path:
+        return self.path / "entries" / key[:2] / f"{key}.json.zst"
+
+    def _count(self, name: str) -> None:
+        self._db.execute(
+            "UPDATE counters SET value = value + 1 WHERE name = ?", (name,)
+        )
+
+    def get(self, key: str, path: Path | None = None) -> "DoclingDocument | None":
+        """The cached conversion under `key`, or None.
+
+        Args:
+            key: A key from `conversion_key`.
+            path: The file being converted. The document's name and origin
+                filename are set from it, as a fresh conversion would set them.
+        """
+        from docling_core.types.doc.document import DoclingDocument
+
+        with self._lock:
+            row = self._db.execute(
+                "SELECT size FROM entries WHERE key = ?", (key,)
+            ).fetchone()
+        data: bytes | None = None
+        if row is not None:
+            try:
+                data = self._entry_file(key).read_bytes()
+            except FileNotFoundError:
+                # Evicted by another process between the lookup and the read.
+                data = None
+        with self._lock:
+            if data is None:
+                self._count("misses")
+                return None
+            self._db.execute("BEGIN")
+            self._db.execute(
+                "UPDATE entries SET last_used = ? WHERE key = ?", (time.time(), key)
+            )
+            self._count("hits")
+            self._db.execute("COMMIT")
+
+        document = DoclingDocument.model_validate_json(decompress_json(data))
+        if path is not None:
+            document.name = path.stem
+            if document.origin is not None:
+                document.origin.filename = path.name
+        return document
+
+    def put(self, key: str, document: "DoclingDocument") -> None:
+        """Store `document` under `key`, then evict down to the size bound."""
+        data = compress_json(document.model_dump_json())
+        target = self._entry_file(key)
+        target.parent.mkdir(exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=target.parent, prefix=".tmp-")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp, target)
+        except BaseException:
+            Path(tmp).unlink(missing_ok=True)
+            raise
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO entries VALUES (?, ?, ?)",
+                (key, len(data), time.time()),
+            )
+        self._evict()
+
+    def _evict(self) -> None:
+        """Drop least recently used entries until the cache fits its bound."""
+        with self._lock:
+            (total,) = self._db.execute(
+                "SELECT COALESCE(SUM(size), 0) FROM entries"
+            ).fetchone()
+            if total <= self.max_size_bytes:
+                return
+            victims = []
+            for key, size in self._db.execute(
+                "SELECT key, size FROM entries ORDER BY last_used"
+            ):
+                if total <= self.max_size_bytes:
+                    break
+                victims.append((key,))
+                total -= size
+            self._db.executemany("DELETE FROM entries WHERE key = ?", victims)
+        for (key,) in victims:
+            self._entry_file(key).unlink(missing_ok=True)
+
+
+def conversion_cache(config: "AppConfig") -> ConversionCache | None:
+    """The configured cache, shared within the process, or None when it is
+    disabled."""
+    settings = config.processing.conversion_cache
+    if not settings.enabled:
+        return None
+    path = conversion_cache_path(config)
+    with _CACHES_LOCK:
+        cache = _CACHES.get(path)
+        if cache is None:
+            cache = _CACHES[path] = ConversionCache(path, settings.max_size_bytes)
+        cache.max_size_bytes = settings.max_size_bytes
+        return cache
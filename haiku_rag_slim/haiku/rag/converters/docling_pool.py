@@ -0,0 +1,137 @@
+"""Local docling conversion in a pool of worker processes.
+
+`DoclingLocalConverter` shares one docling converter per process and holds a
+lock for each conversion, so a process converts one file at a time however many
+ingest workers feed it, and the layout models hold the GIL while they run.
+`DoclingPoolConverter` sends each file to one of `processing.conversion_pool`
+worker processes instead. Every worker caches its own models, converts one file
+at a time, and returns the result as DoclingDocument JSON.
+"""
+
+import asyncio
+import hashlib
+import logging
+import sys
+import threading
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from haiku.rag.config import AppConfig
+from haiku.rag.converters.docling_local import DoclingLocalConverter
+from haiku.rag.converters.worker_pool import WorkerPool
+from haiku.rag.telemetry import logfire
+
+if TYPE_CHECKING:
+    from docling_core.types.doc.document import DoclingDocument
+
+logger = logging.getLogger(__name__)
+
+# Pools outlive the converters using them, which are created per document.
+_POOLS_LOCK = threading.Lock()
+_POOLS: dict[str, "ConversionPool"] = {}
+
+# Set in each worker process by `_init_worker`.
+_worker_converter: DoclingLocalConverter | None = None
+
+
+def _limit_memory(limit_mb: int) -> None:
+    if sys.platform == "win32":
+        logger.warning("conversion_pool.max_task_memory_mb is ignored on Windows")
+        return
+    import resource
+
+    limit = limit_mb * 1024 * 1024
+    resource.setrlimit(resource.RLIMIT_DATA, (limit, limit))
+
+
+def _init_worker(config: AppConfig, max_memory_mb: int | None) -> None:
+    global _worker_converter
+    if max_memory_mb is not None:
+        _limit_memory(max_memory_mb)
+    _worker_converter = DoclingLocalConverter(config)
+
+
+def _convert_in_worker(path: str, source_uri: str | None) -> str:
+    assert _worker_converter is not None
+    document = _worker_converter._sync_convert_docling_file(Path(path), source_uri)
+    return document.model_dump_json()
+
+
+class ConversionPool(WorkerPool):
+    """Worker processes converting files with one configuration.
+
+    Each worker loads the docling models once, runs under
+    `max_task_memory_mb` and is replaced after `max_tasks_per_worker`
+    conversions. A conversion caught in another's crash is retried as
+    `WorkerPool` describes.
+    """
+
+    def __init__(self, config: AppConfig):
+        settings = config.processing.conversion_pool
+        super().__init__(
+            "Conversion worker",
+            settings.workers,
+            initializer=_init_worker,
+            initargs=(config, settings.max_task_memory_mb),
+            max_tasks_per_child=settings.max_tasks_per_worker,
+        )
+        self.config = config
+
+    async def convert(
+        self, path: Path, source_uri: str | None = None
+    ) -> "DoclingDocument":
+        """Convert `path` in a worker process.
+
+        Raises:
+            BrokenProcessPool: If the conversion crashed its worker twice.
+            Exception: Whatever the conversion raised in the worker.
+        """
+        from docling_core.types.doc.document import DoclingDocument
+
+        with logfire.span("document.convert_in_pool", uri=source_uri):
+            payload = await self.arun(_convert_in_worker, str(path), source_uri)
+            return await asyncio.to_thread(DoclingDocument.model_validate_json, payload)
+
+
+def conversion_pool(config: AppConfig) -> ConversionPool:
+    """The pool shared by every converter built from this configuration."""
+    key = hashlib.md5(
+        config.model_dump_json().encode("utf-8"), usedforsecurity=False
+    ).hexdigest()
+    with _POOLS_LOCK:
+        pool = _POOLS.get(key)
+        if pool is None:
+            pool = _POOLS[key] = ConversionPool(config.model_copy(deep=True))
+        return pool
+
+
+def shutdown_conversion_pools() -> None:
+    """Stop every pool's workers. Pools start again on their next conversion."""
+    with _POOLS_LOCK:
+        pools = list(_POOLS.values())
+        _POOLS.clear()
+    for pool in pools:
+        pool.shutdown()
+
+
+class DoclingPoolConverter(DoclingLocalConverter):
+    """Local docling converter that converts files in worker processes.
+
+    Text passed to `convert_text`, and text files, are still converted
+    in-process: they run docling's SimplePipeline, which loads no models.
+    """
+
+    async def convert_file(
+        self, path: Path, source_uri: str | None = None
+    ) -> "DoclingDocument":
+        """Convert a file to DoclingDocument in a conversion worker.
+
+        Raises:
+            ValueError: If the file cannot be converted or crashes its worker.
+        """
+        if path.suffix.lower() not in self.docling_extensions:
+            return await super().convert_file(path, source_uri)
+        try:
+            return await conversion_pool(self.config).convert(path, source_uri)
+        except Exception as e:
+            raise ValueError(f"Failed to parse file: {path}") from e
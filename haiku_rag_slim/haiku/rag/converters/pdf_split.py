@@ -1,14 +1,16 @@
 import asyncio
 import io
+import logging
 import tempfile
 import threading
-from collections.abc import Generator
+from collections.abc import Callable, Generator
 from pathlib import Path
 from typing import TYPE_CHECKING
 
 import pypdfium2 as pdfium
 
 from haiku.rag.client.exceptions import UnsupportedSourceError
+from haiku.rag.converters.worker_pool import WorkerPool
 from haiku.rag.telemetry import logfire
 
 # pypdfium2 wraps libpdfium, which has global C state and is not thread-safe.
@@ -16,10 +18,14 @@ from haiku.rag.telemetry import logfire
 # it — the first error surfaces as e.g. "Failed to import pages", and after
 # that every subsequent PDF load fails with "Data format error" until the
 # process restarts. This is the single process-wide lock around *all* in-process
-# pdfium access (page slicing here and embedded-attachment scanning in
-# client.documents); every pdfium call must hold it so only one runs at a time.
-# Slicing releases it between slices so other callers can interleave; the heavy
-# work (docling convert) happens between yields with the lock free.
+# pdfium access (page slicing, page counts and embedded-attachment scanning);
+# every pdfium call must hold it so only one runs at a time. Slicing releases
+# it between slices so other callers can interleave; the heavy work (docling
+# convert) happens between yields with the lock free.
+#
+# With `processing.pdfium_workers` set, the same operations run in helper
+# processes instead, each with its own pdfium state, so they proceed in
+# parallel and the lock is only ever taken inside a helper, uncontended.
 PDFIUM_LOCK = threading.Lock()
 
 if TYPE_CHECKING:
@@ -27,44 +33,161 @@ if TYPE_CHECKING:
 
     from haiku.rag.converters.base import DocumentConverter
 
+logger = logging.getLogger(__name__)
+
+# Pools are shared by every caller asking for the same number of workers.
+_POOLS_LOCK = threading.Lock()
+_POOLS: dict[int, WorkerPool] = {}
+
 _SENTINEL: object = object()
 
 
+def _open_pdf(path: Path) -> pdfium.PdfDocument:
+    try:
+        return pdfium.PdfDocument(str(path))
+    except pdfium.PdfiumError as exc:
+        raise UnsupportedSourceError(
+            f"pypdfium2 cannot open PDF {path}: {exc}"
+        ) from exc
+
+
+def _page_count(path: Path) -> int:
+    with PDFIUM_LOCK:
+        src = _open_pdf(path)
+        try:
+            return len(src)
+        finally:
+            src.close()
+
+
+def _extract_pages(src: pdfium.PdfDocument, start: int, end: int) -> bytes:
+    dst = pdfium.PdfDocument.new()
+    try:
+        dst.import_pages(src, list(range(start, end)))
+        buf = io.BytesIO()
+        dst.save(buf)
+        return buf.getvalue()
+    finally:
+        dst.close()
+
+
+def _slice_pages(path: Path, start: int, end: int) -> bytes:
+    # A helper gets the slices of one PDF interleaved with other callers' work,
+    # so it opens the source for each slice rather than keeping a handle (and
+    # the file) open between calls. Opening reads only the trailer and xref.
+    with PDFIUM_LOCK:
+        src = _open_pdf(path)
+        try:
+            return _extract_pages(src, start, end)
+        finally:
+            src.close()
+
+
+def _read_attachments(source: Path | bytes, data: bool) -> list[tuple[str, bytes]]:
+    with PDFIUM_LOCK:
+        pdf = pdfium.PdfDocument(source)
+        try:
+            attachments = []
+            for i in range(pdf.count_attachments()):
+                attachment = pdf.get_attachment(i)
+                name = attachment.get_name()
+                payload = bytes(attachment.get_data()) if data and name else b""
+                attachments.append((name, payload))
+            return attachments
+        finally:
+            pdf.close()
+
+
+def pdfium_pool(workers: int) -> WorkerPool:
+    """The pool of pdfium helper processes shared by every caller using
+    `workers` helpers.
+
+    Every helper has its own libpdfium state, so operations in different
+    helpers run in parallel instead of queueing behind `PDFIUM_LOCK`. An
+    operation caught in a helper's crash, e.g. on a malformed PDF, is retried
+    as `WorkerPool` describes.
+    """
+    with _POOLS_LOCK:
+        pool = _POOLS.get(workers)
+        if pool is None:
+            pool = _POOLS[workers] = WorkerPool("pdfium helper", workers)
+        return pool
+
+
+def shutdown_pdfium_pools() -> None:
+    """Stop every pool's helpers. Pools start again on their next operation."""
+    with _POOLS_LOCK:
+        pools = list(_POOLS.values())
+        _POOLS.clear()
+    for pool in pools:
+        pool.shutdown()
+
+
+def _run_pdfium[T](workers: int, fn: Callable[..., T], *args: object) -> T:
+    if workers <= 0:
+        return fn(*args)
+    return pdfium_pool(workers).run(fn, *args)
+
+
+def pdf_page_count(path: Path, *, workers: int = 0) -> int:
+    """Number of pages in the PDF at ``path``.
+
+    ``workers`` > 0 counts in a pool of that many pdfium helper processes
+    instead of in-process under ``PDFIUM_LOCK``.
+
+    Raises:
+        UnsupportedSourceError: If pdfium cannot open the file.
+    """
+    return _run_pdfium(workers, _page_count, path)
+
+
+def read_pdf_attachments(
+    source: Path | bytes, *, data: bool = True, workers: int = 0
+) -> list[tuple[str, bytes]]:
+    """Return ``(name, bytes)`` for each entry of the PDF's ``/EmbeddedFiles``
+    table, in table order. Entries without a name are included with empty
+    bytes, as are all entries when ``data`` is false.
+
+    ``workers`` > 0 reads them in a pool of that many pdfium helper processes
+    instead of in-process under ``PDFIUM_LOCK``.
+
+    Raises:
+        pdfium.PdfiumError: If pdfium cannot open the PDF.
+    """
+    return _run_pdfium(workers, _read_attachments, source, data)
+
+
 def iter_pdf_slices(
-    path: Path, slice_size: int
+    path: Path, slice_size: int, *, workers: int = 0
 ) -> Generator[tuple[int, int, bytes], None, None]:
     """Yield ``(start_page, end_page_inclusive, pdf_bytes)`` for each
     ``slice_size``-page slice of ``path``. Page numbers are 1-based to match
     docling's ``prov.page_no`` convention. Each yielded byte string is a
     standalone PDF that docling can convert.
 
-    The pdfium lock is held only around each pdfium call (open, slice
-    extraction, close) — never across a ``yield``. The source ``PdfDocument``
-    handle stays open across yields; per-document handles coexist safely as
-    long as no two pdfium calls execute concurrently.
+    In-process, the pdfium lock is held only around each pdfium call (open,
+    slice extraction, close) — never across a ``yield``. The source
+    ``PdfDocument`` handle stays open across yields; per-document handles
+    coexist safely as long as no two pdfium calls execute concurrently.
+    ``workers`` > 0 cuts each slice in a pool of that many pdfium helper
+    processes instead, so slicing never waits on other callers' pdfium work.
     """
     if slice_size <= 0:
         raise ValueError(f"slice_size must be >= 1, got {slice_size}")
+    if workers > 0:
+        total = pdf_page_count(path, workers=workers)
+        for start in range(0, total, slice_size):
+            end = min(start + slice_size, total)
+            yield (start + 1, end, _run_pdfium(workers, _slice_pages, path, start, end))
+        return
     with PDFIUM_LOCK:
-        try:
-            src = pdfium.PdfDocument(str(path))
-        except pdfium.PdfiumError as exc:
-            raise UnsupportedSourceError(
-                f"pypdfium2 cannot open PDF {path}: {exc}"
-            ) from exc
+        src = _open_pdf(path)
         total = len(src)
     try:
         for start in range(0, total, slice_size):
             end = min(start + slice_size, total)
             with PDFIUM_LOCK:
-                dst = pdfium.PdfDocument.new()
-                try:
-                    dst.import_pages(src, list(range(start, end)))
-                    buf = io.BytesIO()
-                    dst.save(buf)
-                    slice_bytes = buf.getvalue()
-                finally:
-                    dst.close()
+                slice_bytes = _extract_pages(src, start, end)
             yield (start + 1, end, slice_bytes)
     finally:
         with PDFIUM_LOCK:
@@ -76,66 +199,94 @@ async def convert_pdf_with_splitting(
     path: Path,
     source_uri: str | None,
     slice_size: int,
+    concurrency: int = 1,
+    pdfium_workers: int = 0,
 ) -> "DoclingDocument":
     """Split a PDF, convert each slice through ``converter``, return the
     merged ``DoclingDocument``.
 
-    Slices are produced lazily — only one slice's bytes live in memory at a
-    time, so peak working set stays bounded regardless of page count. A
-    single slice failure aborts the whole job (raised as ``ValueError`` so
-    the ingester pipeline classifies it as ``TransientError`` and the queue
-    retries the entire document). Per-slice retry would risk interleaved
-    partial state with subsequent runs and is not worth the complexity.
+    Slices are produced lazily and up to ``concurrency`` of them are converted
+    at once, so a converter that spreads calls over several docling-serve
+    instances or conversion workers converts one large PDF in parallel. The
+    next slice is cut only when a conversion slot is free, so at most
+    ``concurrency`` slices' bytes live in memory at a time regardless of page
+    count. Converted slices are merged in page order. A single slice failure
+    cancels the slices in flight and aborts the whole job (raised as
+    ``ValueError`` so the ingester pipeline classifies it as
+    ``TransientError`` and the queue retries the entire document). Per-slice
+    retry would risk interleaved partial state with subsequent runs and is not
+    worth the complexity. ``pdfium_workers`` > 0 cuts the slices in pdfium
+    helper processes (see ``iter_pdf_slices``).
     """
     from docling_core.types.doc.document import DoclingDocument
 
+    if concurrency <= 0:
+        raise ValueError(f"concurrency must be >= 1, got {concurrency}")
+
     def _next(it):
         return next(it, _SENTINEL)
 
-    it = iter_pdf_slices(path, slice_size)
-    converted: list[DoclingDocument] = []
+    async def _convert_slice(start: int, end: int, pdf_bytes: bytes) -> DoclingDocument:
+        tmp_path: Path | None = None
+        try:
+            with tempfile.NamedTemporaryFile(
+                mode="wb", suffix=".pdf", delete=False
+            ) as tmp:
+                tmp_path = Path(tmp.name)
+                tmp.write(pdf_bytes)
+                tmp.flush()
+            # The slice is on disk; don't hold its bytes for the conversion.
+            del pdf_bytes
+            with logfire.span(
+                "document.convert_slice",
+                uri=source_uri,
+                start_page=start,
+                end_page=end,
+            ):
+                try:
+                    return await converter.convert_file(tmp_path, source_uri=source_uri)
+                except Exception as exc:
+                    raise ValueError(
+                        f"Failed to convert slice pages {start}-{end} of {path}: {exc}"
+                    ) from exc
+        finally:
+            # `delete=False` is required so the converter (which opens
+            # tmp_path itself) sees a fully written, closed file. Unlink
+            # in finally so a mid-write disk-full / mid-convert failure
+            # doesn't leak the slice on disk.
+            if tmp_path is not None:
+                tmp_path.unlink(missing_ok=True)
+
+    it = iter_pdf_slices(path, slice_size, workers=pdfium_workers)
+    slices: list[asyncio.Task[DoclingDocument]] = []
+    in_flight: set[asyncio.Task[DoclingDocument]] = set()
     try:
         while True:
+            # Wait for a free slot before cutting the next slice, surfacing a
+            # failed slice before any more are started.
+            while len(in_flight) >= concurrency:
+                done, in_flight = await asyncio.wait(
+                    in_flight, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    task.result()
             slice_item = await asyncio.to_thread(_next, it)
             if slice_item is _SENTINEL:
                 break
-            start, end, pdf_bytes = slice_item
-            tmp_path: Path | None = None
-            try:
-                with tempfile.NamedTemporaryFile(
-                    mode="wb", suffix=".pdf", delete=False
-                ) as tmp:
-                    tmp_path = Path(tmp.name)
-                    tmp.write(pdf_bytes)
-                    tmp.flush()
-                with logfire.span(
-                    "document.convert_slice",
-                    uri=source_uri,
-                    start_page=start,
-                    end_page=end,
-                ):
-                    try:
-                        slice_doc = await converter.convert_file(
-                            tmp_path, source_uri=source_uri
-                        )
-                    except Exception as exc:
-                        raise ValueError(
-                            f"Failed to convert slice pages {start}-{end} of {path}: {exc}"
-                        ) from exc
-                converted.append(slice_doc)
-            finally:
-                # `delete=False` is required so the converter (which opens
-                # tmp_path itself) sees a fully written, closed file. Unlink
-                # in finally so a mid-write disk-full / mid-convert failure
-                # doesn't leak the slice on disk.
-                if tmp_path is not None:
-                    tmp_path.unlink(missing_ok=True)
+            task = asyncio.create_task(_convert_slice(*slice_item))
+            slices.append(task)
+            in_flight.add(task)
+        await asyncio.gather(*in_flight)
     finally:
+        for task in in_flight:
+            task.cancel()
+        await asyncio.gather(*slices, return_exceptions=True)
         # Close the generator under the pdfium lock so src.close() runs
         # even when we abort mid-stream (slice failure, cancellation).
         # Off the event loop because the close path acquires the lock.
         await asyncio.to_thread(it.close)
 
+    converted = [task.result() for task in slices]
     # Merge off the event loop: concatenating slice documents that carry
     # inlined base64 page/picture images is CPU-heavy and proportional to the
     # total document size, so running it inline would block other coroutines.
@@ -0,0 +1,147 @@
+"""Pools of spawned worker processes that survive a worker's death.
+
+The docling conversion pool and the pdfium helpers are built on `WorkerPool`. Pools are shared across
+the clients of a process and outlive each one; `release_worker_pools`, called
+as the last open client closes, stops the workers of every pool.
+"""
+
+import asyncio
+import logging
+import multiprocessing
+import threading
+import weakref
+from collections.abc import Callable
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+# Every pool created in this process, for `release_worker_pools`.
+_ALL_POOLS: "weakref.WeakSet[WorkerPool]" = weakref.WeakSet()
+_USERS_LOCK = threading.Lock()
+_users = 0
+
+
+class WorkerPool:
+    """Worker processes running tasks submitted from any thread or event loop.
+
+    A worker that dies, whether killed for memory or crashing in native code,
+    breaks the executor and every task in flight with it. The executor is
+    replaced, and each task caught in the crash is run again alone in a fresh
+    worker, so only the task that crashes that worker too fails. At most
+    `workers` of those retries run at once, so a crash under load starts no
+    more processes than the pool itself has.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        workers: int,
+        *,
+        initializer: Callable[..., None] | None = None,
+        initargs: tuple[Any, ...] = (),
+        max_tasks_per_child: int | None = None,
+    ):
+        self.name = name
+        self.workers = workers
+        self._initializer = initializer
+        self._initargs = initargs
+        self._max_tasks_per_child = max_tasks_per_child
+        self._lock = threading.Lock()
+        self._executor: ProcessPoolExecutor | None = None
+        self._retry_slots = threading.BoundedSemaphore(workers)
+        _ALL_POOLS.add(self)
+
+    def _new_executor(self, workers: int) -> ProcessPoolExecutor:
+        # Spawned rather than forked: the caller runs threads, and a forked
+        # child inherits their held locks.
+        return ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=self._initializer,
+            initargs=self._initargs,
+            max_tasks_per_child=self._max_tasks_per_child,
+        )
+
+    def _current_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = self._new_executor(self.workers)
+            return self._executor
+
+    def _discard(self, executor: ProcessPoolExecutor, fn: Callable[..., Any]) -> None:
+        logger.warning(
+            "%s died running %s; retrying it alone",
+            self.name,
+            getattr(fn, "__name__", "a task"),
+        )
+        with self._lock:
+            if self._executor is executor:
+                self._executor = None
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    def _isolated[T](self, fn: Callable[..., T], args: tuple[Any, ...]) -> T:
+        with self._retry_slots:
+            executor = self._new_executor(1)
+            try:
+                return executor.submit(fn, *args).result()
+            finally:
+                executor.shutdown(wait=False)
+
+    def run[T](self, fn: Callable[..., T], *args: Any) -> T:
+        """Run `fn(*args)` in a worker and wait for its result.
+
+        Raises:
+            BrokenProcessPool: If the task crashed its worker twice.
+            Exception: Whatever the task raised in the worker.
+        """
+        executor = self._current_executor()
+        try:
+            return executor.submit(fn, *args).result()
+        except BrokenProcessPool:
+            self._discard(executor, fn)
+        return self._isolated(fn, args)
+
+    async def arun[T](self, fn: Callable[..., T], *args: Any) -> T:
+        """Run `fn(*args)` in a worker without blocking the event loop.
+
+        Raises:
+            BrokenProcessPool: If the task crashed its worker twice.
+            Exception: Whatever the task raised in the worker.
+        """
+        executor = self._current_executor()
+        try:
+            return await asyncio.wrap_future(executor.submit(fn, *args))
+        except BrokenProcessPool:
+            self._discard(executor, fn)
+        return await asyncio.to_thread(lambda: self._isolated(fn, args))
+
+    def shutdown(self) -> None:
+        """Stop the workers once they finish their current task. The pool
+        starts new workers on its next task."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+
+def acquire_worker_pools() -> None:
+    """Register a user of the process's worker pools, e.g. an open client."""
+    global _users
+    with _USERS_LOCK:
+        _users += 1
+
+
+def release_worker_pools() -> None:
+    """Unregister a user added with `acquire_worker_pools`. When the last one
+    leaves, every pool's workers are stopped."""
+    global _users
+    # Held while stopping, so a client opening meanwhile waits rather than
+    # submitting to an executor being shut down.
+    with _USERS_LOCK:
+        _users = max(_users - 1, 0)
+        if _users:
+            return
+        for pool in list(_ALL_POOLS):
+            pool.shutdown()
@@ -486,6 +486,58 @@ def _check_orphaned_items(item_doc_ids: set[str], doc_ids: set[str]) -> CheckRes
     )
 
 
+def _check_orphaned_pages(page_doc_ids: set[str], doc_ids: set[str]) -> CheckResult:
+    """Page images referencing a document that no longer exists."""
+    orphans = page_doc_ids - doc_ids
+    return CheckResult(
+        name="orphaned_document_pages",
+        severity=Severity.FAIL if orphans else Severity.OK,
+        message=(
+            "Document pages reference missing documents."
+            if orphans
+            else "No orphaned document pages."
+        ),
+        remediation="haiku-rag rebuild" if orphans else None,
+        details=_sample(sorted(orphans)),
+    )
+
+
+def _check_missing_picture_blobs(
+    referenced: set[str], blob_hashes: set[str]
+) -> CheckResult:
+    """Picture items referencing a blob that does not exist."""
+    missing = referenced - blob_hashes
+    return CheckResult(
+        name="missing_picture_blobs",
+        severity=Severity.FAIL if missing else Severity.OK,
+        message=(
+            f"{len(missing)} picture blob(s) referenced by document items are missing."
+            if missing
+            else "Every referenced picture blob exists."
+        ),
+        remediation="haiku-rag rebuild" if missing else None,
+        details=_sample(sorted(missing)),
+    )
+
+
+def _check_orphaned_picture_blobs(
+    referenced: set[str], blob_hashes: set[str]
+) -> CheckResult:
+    """Picture blobs no document item references. Harmless to reads, but their
+    bytes are never reclaimed."""
+    orphans = blob_hashes - referenced
+    return CheckResult(
+        name="orphaned_picture_blobs",
+        severity=Severity.WARN if orphans else Severity.OK,
+        message=(
+            f"{len(orphans)} picture blob(s) are referenced by no document item."
+            if orphans
+            else "No orphaned picture blobs."
+        ),
+        details=_sample(sorted(orphans)),
+    )
+
+
 def _check_documents_without_items(
     doc_ids: set[str], chunk_doc_ids: set[str], item_doc_ids: set[str]
 ) -> CheckResult:
@@ -511,7 +563,7 @@ def _check_dangling_item_refs(
     """Chunk metadata may reference self_refs that do not exist for that document."""
     dangling: list[str] = []
     for row in chunk_rows:
-        refs = json.loads(row.get("metadata") or "{}").get("doc_item_refs") or []
+        refs = row["doc_item_refs"] or []
         known = self_refs_by_doc.get(row["document_id"], set())
         if any(ref not in known for ref in refs):
             dangling.append(row["id"])
@@ -686,7 +738,7 @@ async def run_db_checks(
     notify("Reading chunks")
     chunk_rows = (
         await store.chunks_table.query()
-        .select(["id", "document_id", "metadata"])
+        .select(["id", "document_id", "doc_item_refs"])
         .to_list()
     )
     chunk_doc_ids = {row["document_id"] for row in chunk_rows}
@@ -704,10 +756,14 @@ async def run_db_checks(
         self_refs_by_doc.setdefault(row["document_id"], set()).add(row["self_ref"])
         labels_by_doc.setdefault(row["document_id"], set()).add(row["label"])
 
+    notify("Reading document pages")
+    page_doc_ids = set(await _column_values(store.document_pages_table, "document_id"))
+
     notify("Checking referential integrity")
     results.append(_check_document_meta_parity(doc_ids, meta_doc_ids))
     results.append(_check_orphaned_chunks(chunk_doc_ids, doc_ids))
     results.append(_check_orphaned_items(item_doc_ids, doc_ids))
+    results.append(_check_orphaned_pages(page_doc_ids, doc_ids))
 
     notify("Checking document chunking")
     results += _classify_unchunked(
@@ -760,14 +816,20 @@ async def run_db_checks(
     )
 
     notify("Checking picture data")
-    missing_picture_docs = [
-        row["document_id"]
-        for row in await store.document_items_table.query()
-        .select(["document_id"])
-        .where("label = 'picture' AND picture_data IS NULL")
+    picture_rows = (
+        await store.document_items_table.query()
+        .select(["document_id", "picture_hash"])
+        .where("label = 'picture' OR picture_hash IS NOT NULL")
         .to_list()
+    )
+    missing_picture_docs = [
+        row["document_id"] for row in picture_rows if row["picture_hash"] is None
     ]
     results.append(_check_picture_data(missing_picture_docs, content_type_by_doc))
+    referenced = {row["picture_hash"] for row in picture_rows} - {None}
+    blob_hashes = set(await _column_values(store.picture_blobs_table, "hash"))
+    results.append(_check_missing_picture_blobs(referenced, blob_hashes))
+    results.append(_check_orphaned_picture_blobs(referenced, blob_hashes))
 
     notify("Checking settings and indexes")
     total_settings = await store.settings_table.count_rows()
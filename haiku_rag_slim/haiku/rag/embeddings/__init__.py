@@ -1,5 +1,6 @@
 import base64
 import io
+from collections.abc import Mapping
 from typing import TYPE_CHECKING, Any
 
 from pydantic_ai.embeddings import Embedder
@@ -121,19 +122,24 @@ async def embed_chunks(
     chunks: list["Chunk"],
     embedder: "EmbedderWrapper",
     config: AppConfig | None = None,
+    picture_vectors: Mapping[str, list[float]] | None = None,
 ) -> list["Chunk"]:
     """Generate embeddings for chunks, dispatching text vs picture variants.
 
     Text chunks are contextualized (headings prepended) and routed through
     ``embed_documents``. Picture chunks (those carrying ``_picture_data``)
     are routed through ``embed_images`` and require a multimodal embedder.
-    Vectors land in the original chunk order.
+    Each distinct picture is embedded once; ``picture_vectors`` supplies
+    known vectors by picture hash, which are reused rather than re-embedded.
+    Vectors land in the original chunk order, and picture chunks keep their
+    ``_picture_data``.
     """
     config = config if config is not None else get_config()
     if not chunks:
         return []
 
     from haiku.rag.store.models.chunk import Chunk
+    from haiku.rag.store.models.document_item import picture_hash
 
     text_chunks: list[Chunk] = []
     picture_chunks: list[Chunk] = []
@@ -151,20 +157,26 @@ async def embed_chunks(
             batch = texts[i : i + batch_size]
             text_embeddings.extend(await embedder.embed_documents(batch))
 
-    picture_embeddings: list[list[float]] = []
-    if picture_chunks:
+    vectors = dict(picture_vectors or {})
+    picture_hashes: list[str] = []
+    for chunk in picture_chunks:
+        data = chunk._picture_data
+        assert data is not None
+        h = picture_hash(data)
+        picture_hashes.append(h)
+        if h in vectors:
+            continue
         if not embedder.supports_images:
             raise ValueError(
                 "Picture chunks require a multimodal embedder. Set "
                 "embeddings.model.multimodal: true on a vllm, voyageai, or cohere "
                 "model, or omit picture chunks."
             )
-        for chunk in picture_chunks:
-            picture_embeddings.append(await embedder.embed_image(chunk._picture_data))
+        vectors[h] = await embedder.embed_image(data)
 
     text_iter = iter(text_embeddings)
-    picture_iter = iter(picture_embeddings)
-    return [
+    picture_iter = iter([vectors[h] for h in picture_hashes])
+    embedded = [
         Chunk(
             id=chunk.id,
             document_id=chunk.document_id,
@@ -182,6 +194,9 @@ async def embed_chunks(
         )
         for chunk in chunks
     ]
+    for original, chunk in zip(chunks, embedded, strict=True):
+        chunk._picture_data = original._picture_data
+    return embedded
 
 
 def get_embedder(config: AppConfig | None = None) -> EmbedderWrapper:
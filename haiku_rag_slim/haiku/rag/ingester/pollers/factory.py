@@ -55,6 +55,9 @@ def build_source(
             supported_extensions=supported_extensions,
             source_id=cfg.id,
             max_file_size=cfg.max_file_size,
+            multipart_threshold=cfg.multipart_threshold,
+            part_size=cfg.part_size,
+            max_concurrency=cfg.max_concurrency,
         )
     if isinstance(cfg, WebDAVSourceConfig):
         return WebDAVSource(
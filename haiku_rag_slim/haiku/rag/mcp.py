@@ -1,10 +1,13 @@
 import asyncio
+import logging
 from collections.abc import AsyncIterator
 from contextlib import AsyncExitStack, asynccontextmanager
 from pathlib import Path
 from typing import Any
 
 from fastmcp import FastMCP
+from starlette.requests import Request
+from starlette.responses import JSONResponse
 
 from haiku.rag.client import HaikuRAG
 from haiku.rag.config import AppConfig, get_config
@@ -12,6 +15,8 @@ from haiku.rag.store.models import Document, SearchResult
 from haiku.rag.tools.document import DocumentInfo
 from haiku.rag.utils import format_citations
 
+logger = logging.getLogger(__name__)
+
 
 def _decode_images(images_base64: list[str] | None) -> list[bytes] | None:
     if not images_base64:
@@ -22,7 +27,11 @@ def _decode_images(images_base64: list[str] | None) -> list[bytes] | None:
 
 
 def create_mcp_server(
-    db_path: Path, config: AppConfig | None = None, read_only: bool = False
+    db_path: Path,
+    config: AppConfig | None = None,
+    read_only: bool = False,
+    warm: bool = False,
+    warm_blocking: bool = False,
 ) -> FastMCP:
     """Create an MCP server with the specified database path.
 
@@ -30,11 +39,17 @@ def create_mcp_server(
         db_path: Path to the database file.
         config: Configuration to use.
         read_only: If True, write tools (add_document_*, delete_document) are not registered.
+        warm: If True, load the search indexes at startup (see Store.warm) in
+            the background; GET /health answers 503 until they are loaded.
+        warm_blocking: If True, finish loading the indexes before the server
+            starts accepting connections. Implies warm.
     """
     config = config if config is not None else get_config()
     client: HaikuRAG | None = None
     stack = AsyncExitStack()
     client_lock = asyncio.Lock()
+    ready = asyncio.Event()
+    warm_task: asyncio.Task | None = None
 
     async def _client() -> HaikuRAG:
         """The server's client, opened once.
@@ -51,15 +66,36 @@ def create_mcp_server(
                 )
         return client
 
+    async def _warm(rag: HaikuRAG) -> None:
+        # A failed warm-up leaves the server slower, not broken, so it still
+        # reports ready.
+        try:
+            await rag.store.warm()
+        except Exception as e:
+            logger.warning(f"Index warm-up failed: {e}")
+        finally:
+            ready.set()
+
     @asynccontextmanager
     async def lifespan(_server: FastMCP) -> AsyncIterator[None]:
         # Open eagerly so an unopenable database fails startup rather than
         # every tool call.
-        nonlocal client
-        await _client()
+        nonlocal client, warm_task
+        ready.clear()
+        rag = await _client()
+        if warm_blocking:
+            await _warm(rag)
+        elif warm:
+            warm_task = asyncio.create_task(_warm(rag))
+        else:
+            ready.set()
         try:
             yield
         finally:
+            if warm_task is not None:
+                warm_task.cancel()
+                await asyncio.gather(warm_task, return_exceptions=True)
+                warm_task = None
             # The lifespan can be re-entered; without the reset the next cycle
             # hands out the closed client, including when aclose itself fails.
             try:
@@ -69,6 +105,13 @@ def create_mcp_server(
 
     mcp = FastMCP("haiku-rag", lifespan=lifespan)
 
+    @mcp.custom_route("/health", methods=["GET"])
+    async def health(_request: Request) -> JSONResponse:
+        """Readiness for load balancers: 503 until startup warm-up is done."""
+        if ready.is_set():
+            return JSONResponse({"status": "ready"})
+        return JSONResponse({"status": "warming"}, status_code=503)
+
     # Write tools - only registered when not in read-only mode
     if not read_only:
 
@@ -70,6 +70,9 @@ class DoclingServeClient:
         max_attempts: int = 3,
         retry_base_delay: float = 0.5,
         retry_max_delay: float = 8.0,
+        poll_wait: float = 10.0,
+        poll_interval: float = 0.05,
+        max_poll_interval: float = 1.0,
         now_fn: Callable[[], float] = time.monotonic,
     ):
         urls = [base_urls] if isinstance(base_urls, str) else list(base_urls)
@@ -84,6 +87,9 @@ class DoclingServeClient:
         self._max_attempts = max(1, max_attempts)
         self._retry_base_delay = retry_base_delay
         self._retry_max_delay = retry_max_delay
+        self._poll_wait = poll_wait
+        self._poll_interval = poll_interval
+        self._max_poll_interval = max_poll_interval
         self._now = now_fn
         # setdefault is atomic under the GIL — concurrent constructors with
         # the same instance set will end up sharing one rotator.
@@ -100,6 +106,9 @@ class DoclingServeClient:
             timeout=config.timeout,
             circuit_breaker=config.circuit_breaker,
             max_attempts=config.max_attempts,
+            poll_wait=config.poll_wait_s,
+            poll_interval=config.poll_interval_s,
+            max_poll_interval=config.max_poll_interval_s,
         )
 
     def _httpx_client(self) -> httpx.AsyncClient:
@@ -211,35 +220,75 @@ class DoclingServeClient:
         """Submit a task and poll until success. Returns the task_id.
 
         Shared by submit_and_poll (JSON results) and submit_and_poll_zip
-        (binary zip results) — only the result-fetching step differs.
+        (binary zip results) — only the result-fetching step differs. Each
+        task's submit time, wait for completion and number of status requests
+        are recorded on a `docling_serve.task` span.
+        """
+        with logfire.span("docling_serve.task", name=name, url=base_url) as span:
+            started = time.monotonic()
+            submit_url = f"{base_url}{endpoint}"
+            response = await client.post(
+                submit_url,
+                files=files,
+                data=data,
+                headers=headers,
+            )
+            response.raise_for_status()
+            submit_result = response.json()
+            task_id = submit_result.get("task_id")
+
+            if not task_id:
+                raise ValueError("docling-serve did not return a task_id")
+
+            submitted = time.monotonic()
+            polls = await self._wait_for_task(client, base_url, task_id, headers, name)
+            span.set_attribute("task_id", task_id)
+            span.set_attribute("submit_s", submitted - started)
+            span.set_attribute("wait_s", time.monotonic() - submitted)
+            span.set_attribute("polls", polls)
+            return task_id
+
+    async def _wait_for_task(
+        self,
+        client: httpx.AsyncClient,
+        base_url: str,
+        task_id: str,
+        headers: dict[str, str],
+        name: str,
+    ) -> int:
+        """Poll the task's status until it succeeds. Returns the number of
+        status requests made.
+
+        Each request asks docling-serve to hold it open for up to `poll_wait`
+        seconds until the task finishes, so a finished task is seen at once
+        rather than on the next tick of a fixed interval. A server that ignores
+        `wait` answers straight away; the client then sleeps between requests,
+        starting at `poll_interval` and doubling up to `max_poll_interval`, so
+        small documents are seen quickly and long tasks aren't polled hard.
         """
-        submit_url = f"{base_url}{endpoint}"
-        response = await client.post(
-            submit_url,
-            files=files,
-            data=data,
-            headers=headers,
-        )
-        response.raise_for_status()
-        submit_result = response.json()
-        task_id = submit_result.get("task_id")
-
-        if not task_id:
-            raise ValueError("docling-serve did not return a task_id")
-
         poll_url = f"{base_url}/v1/status/poll/{task_id}"
+        params = {"wait": self._poll_wait} if self._poll_wait else None
+        delay = self._poll_interval
+        polls = 0
         while True:
-            poll_response = await client.get(poll_url, headers=headers)
+            asked = time.monotonic()
+            poll_response = await client.get(poll_url, params=params, headers=headers)
+            polls += 1
             poll_response.raise_for_status()
             poll_result = poll_response.json()
             status = poll_result.get("task_status")
 
             if status == "success":
-                return task_id
+                return polls
             elif status in ("failure", "error"):
                 raise ValueError(f"docling-serve task failed for {name}: {poll_result}")
 
-            await asyncio.sleep(1)
+            # A server honouring `wait` held the request open, so the next one
+            # can go straight out.
+            held = self._poll_wait and time.monotonic() - asked >= self._poll_wait / 2
+            if not held:
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, self._max_poll_interval)
 
     async def submit_and_poll(
         self,
@@ -1,7 +1,9 @@
 from typing import Any
 
 
-def make_s3_store(bucket: str, storage_options: dict[str, str] | None) -> Any:
+def make_s3_store(
+    bucket: str, storage_options: dict[str, str] | None, prefix: str | None = None
+) -> Any:
     """Build an obstore `S3Store` from LanceDB-style storage_options.
 
     Accepts the same dict shape as `LanceDBConfig.storage_options` (the same
@@ -9,7 +11,8 @@ def make_s3_store(bucket: str, storage_options: dict[str, str] | None) -> Any:
     line up). Recognized keys include aws_access_key_id, aws_secret_access_key,
     aws_session_token, region (or aws_region), endpoint (or aws_endpoint),
     allow_http. Empty/missing keys fall back to the AWS default credential
-    chain (environment variables, IAM role, AWS profile).
+    chain (environment variables, IAM role, AWS profile). `prefix` roots the
+    store at a key prefix inside the bucket.
     """
     try:
         from obstore.store import (
@@ -29,6 +32,8 @@ def make_s3_store(bucket: str, storage_options: dict[str, str] | None) -> Any:
     has_custom_endpoint = bool(options.get("endpoint") or options.get("aws_endpoint"))
 
     kwargs: dict[str, Any] = {}
+    if prefix:
+        kwargs["prefix"] = prefix
     if options:
         kwargs["config"] = options
     if allow_http:
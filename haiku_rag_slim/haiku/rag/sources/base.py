@@ -1,10 +1,13 @@
-from collections.abc import AsyncIterator, Mapping
+import hashlib
+import os
+import tempfile
+from collections.abc import AsyncIterable, AsyncIterator, Mapping
 from datetime import datetime
 from enum import StrEnum
 from pathlib import Path
 from typing import Protocol, runtime_checkable
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, model_validator
 
 # uri -> revision. Captures what revisions of which URIs we had last seen
 # for a given source. Passed to discover() so the source can yield only
@@ -32,19 +35,45 @@ class SourceEvent(BaseModel):
 
 class FetchResult(BaseModel):
     uri: str
-    body: bytes
+    # In-memory bytes, for sources that have them anyway (e.g. a PDF
+    # attachment, or a third-party source). The built-in sources leave this
+    # None and point `disk_path` at the bytes instead, so a fetch holds no
+    # more of the file in memory than one read buffer.
+    body: bytes | None = None
     content_type: str
-    # MD5 of body. Stored in document metadata as the dedup key — lets the
+    # MD5 of the fetched bytes. Stored in document metadata as the dedup key — lets the
     # pipeline short-circuit when bytes are identical but the revision differs
     # (e.g. S3 multipart re-upload landing a new ETag on the same content).
     content_hash: str
     revision: str | None = None
     extra_metadata: dict[str, str] = Field(default_factory=dict)
-    # When the body is already on disk (FSSource), points at the original
-    # file so the pipeline can hand it to docling without copying through a
-    # tempfile. Remote sources (HTTP/S3) leave this None — their bytes only
-    # exist in memory.
+    # The fetched bytes on disk, handed to docling without copying. FSSource
+    # points at the original file; remote sources stream the download into a
+    # temporary file (`temporary`) that `discard()` deletes.
     disk_path: Path | None = None
+    temporary: bool = False
+    # Size of the fetched bytes, when known without reading them.
+    size: int | None = None
+
+    @model_validator(mode="after")
+    def _has_bytes(self) -> "FetchResult":
+        if self.body is None and self.disk_path is None:
+            raise ValueError("FetchResult needs a body or a disk_path")
+        if self.size is None and self.body is not None:
+            self.size = len(self.body)
+        return self
+
+    def read_body(self) -> bytes:
+        """The fetched bytes, read from `disk_path` if there is no body."""
+        if self.body is not None:
+            return self.body
+        assert self.disk_path is not None
+        return self.disk_path.read_bytes()
+
+    def discard(self) -> None:
+        """Delete the temporary download, if this result owns one."""
+        if self.temporary and self.disk_path is not None:
+            self.disk_path.unlink(missing_ok=True)
 
 
 class FileTooLargeError(Exception):
@@ -59,6 +88,62 @@ def check_file_size(size: int, max_file_size: int | None, uri: str) -> None:
         )
 
 
+def create_download_file(uri: str, content_type: str) -> tuple[int, Path]:
+    """Open a temporary file for a download of `uri`, named with the
+    extension the pipeline derives from `uri` and `content_type`, which
+    docling detects formats by. Returns the open descriptor and the path."""
+    from haiku.rag.client.processing import get_extension_from_content_type_or_url
+
+    suffix = get_extension_from_content_type_or_url(uri, content_type)
+    fd, name = tempfile.mkstemp(prefix="haiku-rag-fetch-", suffix=suffix)
+    return fd, Path(name)
+
+
+def file_md5(path: Path) -> str:
+    """MD5 of a file, read in 1 MiB blocks."""
+    digest = hashlib.md5(usedforsecurity=False)
+    with path.open("rb") as f:
+        while block := f.read(1024 * 1024):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+async def spool_download(
+    chunks: AsyncIterable[bytes],
+    *,
+    uri: str,
+    content_type: str,
+    max_file_size: int | None,
+) -> tuple[Path, str, int]:
+    """Write a download to a temporary file as it arrives.
+
+    The MD5 is computed and the size checked chunk by chunk, so a download
+    never sits in memory whole, and one without a Content-Length still stops
+    at `max_file_size`. The file comes from `create_download_file`.
+
+    Returns:
+        The file's path, the MD5 of its bytes and its size.
+
+    Raises:
+        FileTooLargeError: Once the download passes `max_file_size`. The
+            partial file is deleted.
+    """
+    fd, path = create_download_file(uri, content_type)
+    digest = hashlib.md5(usedforsecurity=False)
+    size = 0
+    try:
+        with os.fdopen(fd, "wb") as f:
+            async for chunk in chunks:
+                size += len(chunk)
+                check_file_size(size, max_file_size, uri)
+                digest.update(chunk)
+                f.write(chunk)
+    except BaseException:
+        path.unlink(missing_ok=True)
+        raise
+    return path, digest.hexdigest(), size
+
+
 @runtime_checkable
 class Source(Protocol):
     source_id: str
@@ -1,4 +1,3 @@
-import hashlib
 import logging
 from collections.abc import AsyncIterator
 from datetime import UTC, datetime
@@ -12,6 +11,7 @@ from haiku.rag.sources.base import (
     SourceEvent,
     SourceEventKind,
     check_file_size,
+    spool_download,
 )
 
 logger = logging.getLogger(__name__)
@@ -70,23 +70,30 @@ class HTTPSource:
             content_length = head.headers.get("content-length")
             if content_length is not None:
                 check_file_size(int(content_length), self._max_file_size, uri)
-        response = await self._http.get(uri)
-        response.raise_for_status()
-        body = response.content
-        content_type = (
-            response.headers.get("content-type", "application/octet-stream")
-            .split(";")[0]
-            .strip()
-            .lower()
-        )
-        revision, extra = _extract_revision(response.headers)
+        async with self._http.stream("GET", uri) as response:
+            response.raise_for_status()
+            content_type = (
+                response.headers.get("content-type", "application/octet-stream")
+                .split(";")[0]
+                .strip()
+                .lower()
+            )
+            revision, extra = _extract_revision(response.headers)
+            path, content_hash, size = await spool_download(
+                response.aiter_bytes(),
+                uri=uri,
+                content_type=content_type,
+                max_file_size=self._max_file_size,
+            )
         return FetchResult(
             uri=uri,
-            body=body,
             content_type=content_type,
-            content_hash=hashlib.md5(body, usedforsecurity=False).hexdigest(),
+            content_hash=content_hash,
             revision=revision,
             extra_metadata=extra,
+            disk_path=path,
+            temporary=True,
+            size=size,
         )
 
     async def discover(
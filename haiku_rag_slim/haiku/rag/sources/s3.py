@@ -1,7 +1,12 @@
-import hashlib
+import asyncio
+import logging
 import mimetypes
-from collections.abc import AsyncIterator
+import os
+import threading
+from collections.abc import AsyncIterator, Awaitable, Callable
 from datetime import UTC, datetime
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
 from urllib.parse import urlparse
 
 from haiku.rag.client.exceptions import UnsupportedSourceError
@@ -11,12 +16,35 @@ from haiku.rag.sources.base import (
     SourceEvent,
     SourceEventKind,
     check_file_size,
+    create_download_file,
+    file_md5,
+    spool_download,
 )
 from haiku.rag.sources.filter import (
     FileFilter,
     _default_supported_extensions,
 )
 
+if TYPE_CHECKING:
+    from obstore import GetOptions  # type: ignore[import-not-found]
+
+logger = logging.getLogger(__name__)
+
+# obstore's default of 10 MiB per chunk would hold that much per download.
+_STREAM_CHUNK_SIZE = 1024 * 1024
+
+
+def _is_auth_error(exc: Exception) -> bool:
+    """Whether `exc` is S3 refusing the store's credentials, which a store
+    built afresh may get past: session credentials read from the environment
+    or a profile when the store was built expire."""
+    from obstore.exceptions import (  # type: ignore[import-not-found]
+        PermissionDeniedError,
+        UnauthenticatedError,
+    )
+
+    return isinstance(exc, PermissionDeniedError | UnauthenticatedError)
+
 
 def _parse_s3_uri(uri: str) -> tuple[str, str]:
     parsed = urlparse(uri)
@@ -44,6 +72,9 @@ class S3Source:
         supported_extensions: list[str] | None = None,
         source_id: str | None = None,
         max_file_size: int | None = None,
+        multipart_threshold: int = 64 * 1024 * 1024,
+        part_size: int = 8 * 1024 * 1024,
+        max_concurrency: int = 8,
     ) -> None:
         self.bucket, self.prefix = _parse_s3_uri(uri)
         # uri_prefix is the canonical "everything I own" — used by supports()
@@ -62,53 +93,169 @@ class S3Source:
             supported_extensions=self.supported_extensions,
         )
         self._max_file_size = max_file_size
+        self.multipart_threshold = multipart_threshold
+        self.part_size = part_size
+        self.max_concurrency = max_concurrency
+        # One store per bucket, kept for the life of the source so HEADs and
+        # GETs reuse its connection pool and resolved credentials.
+        self._stores: dict[str, Any] = {}
 
     def supports(self, uri: str) -> bool:
         return uri.startswith(self.uri_prefix)
 
-    async def aclose(self) -> None:  # pragma: no cover - no resources to release
-        pass
+    async def aclose(self) -> None:
+        self._stores.clear()
+
+    def _store(self, bucket: str) -> Any:
+        from haiku.rag.s3 import make_s3_store
+
+        store = self._stores.get(bucket)
+        if store is None:
+            store = self._stores[bucket] = make_s3_store(bucket, self.storage_options)
+        return store
+
+    async def _with_store[T](
+        self, bucket: str, operation: Callable[[Any], Awaitable[T]]
+    ) -> T:
+        """Run `operation` on the bucket's pooled store. If S3 refuses the
+        store's credentials, the store is rebuilt, resolving credentials
+        again, and the operation runs once more on the new one."""
+        store = self._store(bucket)
+        try:
+            return await operation(store)
+        except Exception as exc:
+            if not _is_auth_error(exc):
+                raise
+            logger.info("Rebuilding the S3 store for %s after: %s", bucket, exc)
+        # A concurrent call may have rebuilt it already.
+        if self._stores.get(bucket) is store:
+            del self._stores[bucket]
+        return await operation(self._store(bucket))
 
     async def head(self, uri: str) -> str | None:
         import obstore  # type: ignore[import-not-found]
 
-        from haiku.rag.s3 import make_s3_store
-
         bucket, key = _parse_s3_object_uri(uri)
-        store = make_s3_store(bucket, self.storage_options)
-        head = await obstore.head_async(store, key)
+        head = await self._with_store(
+            bucket, lambda store: obstore.head_async(store, key)
+        )
         return (head.get("e_tag") or "").strip('"').strip() or None
 
-    async def fetch(self, uri: str) -> FetchResult:
+    async def _ranged_download(
+        self,
+        store: Any,
+        key: str,
+        *,
+        uri: str,
+        size: int,
+        e_tag: str | None,
+        content_type: str,
+    ) -> Path:
+        """Download `key` as `part_size` ranges, up to `max_concurrency` at
+        once, each written at its offset in a temporary file. Every range is
+        conditional on `e_tag`, so an object replaced mid-download fails with
+        a PreconditionError instead of mixing versions."""
         import obstore  # type: ignore[import-not-found]
 
-        from haiku.rag.s3 import make_s3_store
+        fd, path = create_download_file(uri, content_type)
+        slots = asyncio.Semaphore(self.max_concurrency)
+        write_lock = threading.Lock()
+
+        def write_at(f, offset: int, data) -> None:
+            with write_lock:
+                f.seek(offset)
+                f.write(data)
+
+        async def download_part(f, start: int) -> None:
+            end = min(start + self.part_size, size)
+            options: GetOptions = {"range": (start, end)}
+            if e_tag is not None:
+                options["if_match"] = e_tag
+            # The slot is held through the write, so at most
+            # max_concurrency parts are in memory.
+            async with slots:
+                resp = await obstore.get_async(store, key, options=options)
+                data = await resp.bytes_async()
+                if len(data) != end - start:
+                    raise ValueError(
+                        f"{uri}: range {start}-{end} returned {len(data)} bytes"
+                    )
+                await asyncio.to_thread(write_at, f, start, data)
+
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.truncate(size)
+                parts = [
+                    asyncio.ensure_future(download_part(f, start))
+                    for start in range(0, size, self.part_size)
+                ]
+                try:
+                    await asyncio.gather(*parts)
+                finally:
+                    for part in parts:
+                        part.cancel()
+                    await asyncio.gather(*parts, return_exceptions=True)
+        except BaseException:
+            path.unlink(missing_ok=True)
+            raise
+        return path
+
+    async def fetch(self, uri: str) -> FetchResult:
+        import obstore  # type: ignore[import-not-found]
 
         bucket, key = _parse_s3_object_uri(uri)
-        store = make_s3_store(bucket, self.storage_options)
 
-        head = await obstore.head_async(store, key)
-        etag = (head.get("e_tag") or "").strip('"').strip() or None
+        head = await self._with_store(
+            bucket, lambda store: obstore.head_async(store, key)
+        )
+        e_tag = head.get("e_tag") or None
+        etag = (e_tag or "").strip('"').strip() or None
         size = head.get("size") or head.get("content_length")
         if size is not None:
             check_file_size(int(size), self._max_file_size, uri)
 
-        resp = await obstore.get_async(store, key)
-        body = await resp.bytes_async()
-        # obstore returns a Bytes view; convert to plain bytes so the rest of
-        # the pipeline (hashing, tempfile write) doesn't have to know.
-        body = bytes(body)
-
         content_type, _ = mimetypes.guess_type(key)
         if not content_type:
             content_type = "application/octet-stream"
 
+        if size is not None and int(size) >= self.multipart_threshold:
+            # Large objects: concurrent ranged GETs, hashed once on disk.
+            downloaded = int(size)
+            path = await self._with_store(
+                bucket,
+                lambda store: self._ranged_download(
+                    store,
+                    key,
+                    uri=uri,
+                    size=downloaded,
+                    e_tag=e_tag,
+                    content_type=content_type,
+                ),
+            )
+            try:
+                content_hash = await asyncio.to_thread(file_md5, path)
+            except BaseException:
+                path.unlink(missing_ok=True)
+                raise
+        else:
+            resp = await self._with_store(
+                bucket, lambda store: obstore.get_async(store, key)
+            )
+            path, content_hash, downloaded = await spool_download(
+                resp.stream(min_chunk_size=_STREAM_CHUNK_SIZE),
+                uri=uri,
+                content_type=content_type,
+                max_file_size=self._max_file_size,
+            )
+
         return FetchResult(
             uri=uri,
-            body=body,
             content_type=content_type,
-            content_hash=hashlib.md5(body, usedforsecurity=False).hexdigest(),
+            content_hash=content_hash,
             revision=etag,
+            disk_path=path,
+            temporary=True,
+            size=downloaded,
         )
 
     async def discover(
@@ -119,13 +266,11 @@ class S3Source:
     ) -> AsyncIterator[SourceEvent]:
         import obstore  # type: ignore[import-not-found]
 
-        from haiku.rag.s3 import make_s3_store
-
         snapshot: dict[str, str] = dict(since) if since else {}
         known = known_uris or set()
         now = datetime.now(UTC)
         seen: set[str] = set()
-        store = make_s3_store(self.bucket, self.storage_options)
+        store = self._store(self.bucket)
 
         async for batch in obstore.list(store, prefix=self.prefix or None):
             for obj in batch:
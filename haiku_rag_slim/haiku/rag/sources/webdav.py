@@ -1,4 +1,3 @@
-import hashlib
 import re
 from collections.abc import AsyncIterator
 from datetime import UTC, datetime
@@ -13,6 +12,7 @@ from haiku.rag.sources.base import (
     SourceEvent,
     SourceEventKind,
     check_file_size,
+    spool_download,
 )
 from haiku.rag.sources.filter import (
     FileFilter,
@@ -269,33 +269,40 @@ class WebDAVSource:
             content_length = head.headers.get("content-length")
             if content_length is not None:
                 check_file_size(int(content_length), self._max_file_size, uri)
-        response = await self._http.get(uri)
-        response.raise_for_status()
-        body = response.content
-        content_type = (
-            response.headers.get("content-type", "application/octet-stream")
-            .split(";")[0]
-            .strip()
-            .lower()
-        )
-        # ETag from the GET response is the freshest revision; fall back to
-        # Last-Modified, matching HTTPSource's preference order.
-        revision = (
-            _strip_etag(response.headers.get("etag"))
-            or (response.headers.get("last-modified") or "").strip()
-            or None
-        )
-        extra: dict[str, str] = {}
-        last_modified = (response.headers.get("last-modified") or "").strip()
-        if last_modified:
-            extra["last_modified"] = last_modified
+        async with self._http.stream("GET", uri) as response:
+            response.raise_for_status()
+            content_type = (
+                response.headers.get("content-type", "application/octet-stream")
+                .split(";")[0]
+                .strip()
+                .lower()
+            )
+            # ETag from the GET response is the freshest revision; fall back to
+            # Last-Modified, matching HTTPSource's preference order.
+            revision = (
+                _strip_etag(response.headers.get("etag"))
+                or (response.headers.get("last-modified") or "").strip()
+                or None
+            )
+            extra: dict[str, str] = {}
+            last_modified = (response.headers.get("last-modified") or "").strip()
+            if last_modified:
+                extra["last_modified"] = last_modified
+            path, content_hash, size = await spool_download(
+                response.aiter_bytes(),
+                uri=uri,
+                content_type=content_type,
+                max_file_size=self._max_file_size,
+            )
         return FetchResult(
             uri=uri,
-            body=body,
             content_type=content_type,
-            content_hash=hashlib.md5(body, usedforsecurity=False).hexdigest(),
+            content_hash=content_hash,
             revision=revision,
             extra_metadata=extra,
+            disk_path=path,
+            temporary=True,
+            size=size,
         )
 
     async def discover(
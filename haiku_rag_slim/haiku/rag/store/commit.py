@@ -0,0 +1,397 @@
+"""Group commit for concurrent document writers.
+
+Every ingest writes the documents, document_meta, chunks and document_items
+tables under the store's write lock, so N concurrent ingests queue on the lock
+and leave N versions (and N small fragments) per table behind them. The
+`GroupCommitter` collects the bundles those writers submit within a short
+window and writes each table once for the whole group. The `GroupDeleter` does
+the same for concurrent deletes.
+"""
+
+import asyncio
+import logging
+from abc import ABC, abstractmethod
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any
+
+from haiku.rag.store.engine import Store
+from haiku.rag.store.models.chunk import Chunk, picture_vectors
+from haiku.rag.store.models.document import Document
+from haiku.rag.store.models.document_item import DocumentItem
+from haiku.rag.store.repositories.chunk import ChunkRepository
+from haiku.rag.store.repositories.document import DocumentRepository
+from haiku.rag.store.repositories.document_item import DocumentItemRepository
+from haiku.rag.store.schema import DocumentMetaRecord, query_to_pydantic
+from haiku.rag.telemetry import logfire
+from haiku.rag.utils import escape_sql_string
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class CommitBundle:
+    """One document's write: the document with its embedded chunks and items.
+
+    A document without an id is created, or updated in place when a stored
+    document already has its uri. A document with an id is updated, and the
+    bundle fails if that document was deleted meanwhile. `items` None keeps the
+    stored items of an updated document.
+    """
+
+    document: Document
+    chunks: list[Chunk]
+    items: list[DocumentItem] | None
+
+
+@dataclass
+class _Pending:
+    bundle: CommitBundle
+    future: asyncio.Future[Document]
+    # The caller's id, restored before a failed group is retried bundle by
+    # bundle so a document the failed write assigned an id is created again.
+    document_id: str | None
+
+
+class _GroupWorker(ABC):
+    """The queue and flush task shared by the group committer and deleter, and
+    by the client's title backfiller.
+
+    Subclasses queue entries and implement `_flush`, which handles a batch of
+    them, resolving the `future` an entry carries if it has one, and returns
+    the entries deferred to the next flush.
+    """
+
+    def __init__(self, store: Store, max_batch_size: int, max_delay_s: float) -> None:
+        self.store = store
+        self.max_batch_size = max_batch_size
+        self.max_delay_s = max_delay_s
+        self._queue: asyncio.Queue[Any] = asyncio.Queue()
+        self._task: asyncio.Task | None = None
+        self._closed = False
+
+    def _enqueue(self, pending: Any) -> None:
+        self.store._assert_writable()
+        if self._closed:
+            raise RuntimeError(f"{type(self).__name__} is closed")
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+        self._queue.put_nowait(pending)
+
+    async def aclose(self) -> None:
+        """Process every queued entry, then stop the flush task."""
+        if self._closed:
+            return
+        self._closed = True
+        if self._task is None:
+            return
+        self._queue.put_nowait(None)
+        await self._task
+
+    async def _run(self) -> None:
+        carried: list[Any] = []
+        closing = False
+        while carried or not closing:
+            batch = carried
+            if not batch:
+                first = await self._queue.get()
+                if first is None:
+                    break
+                batch = [first]
+            closing = await self._fill(batch) or closing
+            carried = await self._flush(batch)
+
+    async def _fill(self, batch: list[Any]) -> bool:
+        """Add queued entries to `batch` until it is full or the window closes.
+        Returns True when the close sentinel was taken."""
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.max_delay_s
+        while len(batch) < self.max_batch_size:
+            try:
+                pending = self._queue.get_nowait()
+            except asyncio.QueueEmpty:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    pending = await asyncio.wait_for(self._queue.get(), remaining)
+                except TimeoutError:
+                    break
+            if pending is None:
+                return True
+            batch.append(pending)
+        return False
+
+    @abstractmethod
+    async def _flush(self, batch: list[Any]) -> list[Any]:
+        """Handle a batch and return the entries deferred to the next flush."""
+
+
+class GroupCommitter(_GroupWorker):
+    """Batch concurrent document writes into one version per table.
+
+    `submit` queues a bundle and waits for the flush that writes it. A flush
+    starts once `max_batch_size` bundles are queued or `max_delay_s` after the
+    first one arrived, and runs inside `Store.write_transaction`, so a failed
+    flush leaves no partial write. The group is then retried one bundle at a
+    time so each caller sees its own outcome. Two bundles for the same uri
+    never share a flush: the later one waits for the next. A group mixing new
+    and updated documents writes `documents` and `document_meta` twice, adding
+    the new rows and merging the updated ones into rows that still exist.
+
+    Flushes run on a task the committer owns, so cancelling a waiting caller
+    never cancels a write shared with other callers. A caller cancelled before
+    its flush starts drops its bundle; one cancelled later may still see it
+    written.
+    """
+
+    def __init__(
+        self, store: Store, max_batch_size: int = 16, max_delay_s: float = 0.05
+    ) -> None:
+        super().__init__(store, max_batch_size, max_delay_s)
+        self.document_repository = DocumentRepository(store)
+        self.chunk_repository = ChunkRepository(store)
+        self.document_item_repository = DocumentItemRepository(store)
+
+    async def submit(self, bundle: CommitBundle) -> Document:
+        """Queue a bundle and return its stored document once written.
+
+        Raises:
+            ReadOnlyError: If the store is in read-only mode.
+            RuntimeError: If the committer is closed.
+            ValueError: If the bundle updates a document that no longer exists.
+        """
+        future: asyncio.Future[Document] = asyncio.get_running_loop().create_future()
+        self._enqueue(_Pending(bundle, future, bundle.document.id))
+        return await future
+
+    async def _flush(self, batch: list[_Pending]) -> list[_Pending]:
+        """Write `batch`, resolving each caller's future. Returns the bundles
+        deferred to the next flush because their uri repeats in this one."""
+        group: list[_Pending] = []
+        deferred: list[_Pending] = []
+        keys: set[str] = set()
+        for pending in batch:
+            if pending.future.done():
+                continue
+            document = pending.bundle.document
+            key = document.id or document.uri
+            if key is not None and key in keys:
+                deferred.append(pending)
+                continue
+            if key is not None:
+                keys.add(key)
+            group.append(pending)
+
+        if not group:
+            return deferred
+        with logfire.span("store.group_commit", bundles=len(group)):
+            try:
+                await self._write(group)
+            except Exception as exc:
+                if len(group) == 1:
+                    _fail(group[0], exc)
+                    return deferred
+                logger.debug(
+                    "Group commit of %d bundles failed; retrying one at a time",
+                    len(group),
+                    exc_info=True,
+                )
+                for pending in group:
+                    if pending.future.done():
+                        continue
+                    pending.bundle.document.id = pending.document_id
+                    try:
+                        await self._write([pending])
+                    except Exception as bundle_exc:
+                        _fail(pending, bundle_exc)
+                        continue
+                    _succeed(pending)
+                return deferred
+        for pending in group:
+            _succeed(pending)
+        return deferred
+
+    async def _write(self, group: list[_Pending]) -> None:
+        async with self.store.write_transaction():
+            # A document deleted since its update was submitted must not be
+            # written back, chunks and all.
+            stored = await self._stored_ids(
+                [p.document_id for p in group if p.document_id is not None]
+            )
+            live: list[_Pending] = []
+            for pending in group:
+                if pending.document_id is None or pending.document_id in stored:
+                    live.append(pending)
+                else:
+                    _fail(
+                        pending,
+                        ValueError(f"Document with ID {pending.document_id} not found"),
+                    )
+            group = live
+            if not group:
+                return
+
+            # LanceDB has no unique constraint on `uri`, so a new bundle whose
+            # uri is already stored updates that document in place.
+            by_uri = await self._stored_by_uri(
+                [
+                    p.bundle.document.uri
+                    for p in group
+                    if p.bundle.document.id is None
+                    and p.bundle.document.uri is not None
+                ]
+            )
+            replaced: list[str] = []
+            items_replaced: list[str] = []
+            for pending in group:
+                document = pending.bundle.document
+                if document.id is None and document.uri in by_uri:
+                    meta = by_uri[document.uri]
+                    document.id = meta.id
+                    document.created_at = datetime.fromisoformat(meta.created_at)
+                if document.id is not None:
+                    replaced.append(document.id)
+                    if pending.bundle.items is not None:
+                        items_replaced.append(document.id)
+
+            documents = await self.document_repository.save(
+                [p.bundle.document for p in group]
+            )
+
+            chunks: list[Chunk] = []
+            items: list[DocumentItem] = []
+            for pending, document in zip(group, documents):
+                assert document.id is not None
+                for order, chunk in enumerate(pending.bundle.chunks):
+                    chunk.document_id = document.id
+                    chunk.order = order
+                chunks.extend(pending.bundle.chunks)
+                for item in pending.bundle.items or []:
+                    item.document_id = document.id
+                    items.append(item)
+
+            await self.chunk_repository.replace_for_documents(replaced, chunks)
+            await self.document_item_repository.replace_for_documents(
+                items_replaced, items, picture_vectors(chunks)
+            )
+
+    async def _stored_ids(self, ids: list[str]) -> set[str]:
+        if not ids:
+            return set()
+        quoted = ", ".join(f"'{escape_sql_string(i)}'" for i in ids)
+        rows = await (
+            self.store.document_meta_table.query()
+            .select(["id"])
+            .where(f"id IN ({quoted})")
+            .to_list()
+        )
+        return {row["id"] for row in rows}
+
+    async def _stored_by_uri(self, uris: list[str]) -> dict[str, DocumentMetaRecord]:
+        if not uris:
+            return {}
+        quoted = ", ".join(f"'{escape_sql_string(uri)}'" for uri in uris)
+        records = await query_to_pydantic(
+            self.store.document_meta_table.query().where(f"uri IN ({quoted})"),
+            DocumentMetaRecord,
+        )
+        by_uri: dict[str, DocumentMetaRecord] = {}
+        for record in records:
+            if record.uri is not None:
+                by_uri.setdefault(record.uri, record)
+        return by_uri
+
+
+@dataclass
+class _PendingDelete:
+    document_id: str
+    future: asyncio.Future[bool]
+
+
+class GroupDeleter(_GroupWorker):
+    """Batch concurrent document deletes into one version per table.
+
+    `submit` queues a document id and waits for the flush that deletes it. A
+    flush passes the group's ids to `delete`, which deletes them in one go and
+    returns the ids it found; flushes start and fail over exactly like the
+    `GroupCommitter`'s, and an id repeated within a window waits for the next
+    flush.
+    """
+
+    def __init__(
+        self,
+        store: Store,
+        delete: Callable[[list[str]], Awaitable[set[str]]],
+        max_batch_size: int = 16,
+        max_delay_s: float = 0.05,
+    ) -> None:
+        super().__init__(store, max_batch_size, max_delay_s)
+        self._delete = delete
+
+    async def submit(self, document_id: str) -> bool:
+        """Queue a document id; True once it was deleted, False if it did not
+        exist.
+
+        Raises:
+            ReadOnlyError: If the store is in read-only mode.
+            RuntimeError: If the deleter is closed.
+        """
+        future: asyncio.Future[bool] = asyncio.get_running_loop().create_future()
+        self._enqueue(_PendingDelete(document_id, future))
+        return await future
+
+    async def _flush(self, batch: list[_PendingDelete]) -> list[_PendingDelete]:
+        group: list[_PendingDelete] = []
+        deferred: list[_PendingDelete] = []
+        ids: set[str] = set()
+        for pending in batch:
+            if pending.future.done():
+                continue
+            if pending.document_id in ids:
+                deferred.append(pending)
+                continue
+            ids.add(pending.document_id)
+            group.append(pending)
+
+        if not group:
+            return deferred
+        with logfire.span("store.group_delete", documents=len(group)):
+            try:
+                deleted = await self._delete([p.document_id for p in group])
+            except Exception as exc:
+                if len(group) == 1:
+                    _fail(group[0], exc)
+                    return deferred
+                logger.debug(
+                    "Group delete of %d documents failed; retrying one at a time",
+                    len(group),
+                    exc_info=True,
+                )
+                for pending in group:
+                    try:
+                        found = await self._delete([pending.document_id])
+                    except Exception as delete_exc:
+                        _fail(pending, delete_exc)
+                        continue
+                    _resolve(pending, pending.document_id in found)
+                return deferred
+        for pending in group:
+            _resolve(pending, pending.document_id in deleted)
+        return deferred
+
+
+def _succeed(pending: _Pending) -> None:
+    if not pending.future.done():
+        pending.future.set_result(pending.bundle.document)
+
+
+def _resolve(pending: _PendingDelete, deleted: bool) -> None:
+    if not pending.future.done():
+        pending.future.set_result(deleted)
+
+
+def _fail(pending: _Pending | _PendingDelete, exc: BaseException) -> None:
+    if not pending.future.done():
+        pending.future.set_exception(exc)
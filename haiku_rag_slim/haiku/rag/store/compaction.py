@@ -0,0 +1,178 @@
+"""Fragment-aware compaction decisions.
+
+`Store.vacuum` runs `optimize()` on every table. Compaction rewrites every
+candidate fragment of a table, and in the blob-bearing documents table every
+fragment is a candidate, so optimizing after each write re-merges the whole
+table. The background pass that follows writes instead reads each table's
+layout and compacts only the tables that crossed a `storage.compaction`
+threshold. The functions here decide; `Store.compact` runs the pass.
+"""
+
+import asyncio
+from collections.abc import Awaitable, Callable
+from datetime import datetime, time, timedelta
+from time import monotonic
+
+import lancedb
+from pydantic import BaseModel, Field
+
+from haiku.rag.config.models import CompactionConfig
+
+
+class TableLayout(BaseModel):
+    """Physical layout of a table, as its compaction thresholds see it."""
+
+    num_rows: int = 0
+    num_fragments: int = 0
+    num_small_fragments: int = 0
+    deleted_rows: int = 0
+    num_versions: int = 0
+    stale_versions: int = 0
+
+    @property
+    def small_fragment_ratio(self) -> float:
+        if not self.num_fragments:
+            return 0.0
+        return self.num_small_fragments / self.num_fragments
+
+    @property
+    def deleted_row_ratio(self) -> float:
+        stored = self.num_rows + self.deleted_rows
+        if not stored:
+            return 0.0
+        return self.deleted_rows / stored
+
+
+class TableCompaction(BaseModel):
+    """One table's outcome in a compaction pass."""
+
+    name: str
+    layout: TableLayout
+    reasons: list[str] = Field(default_factory=list)
+    compacted: bool = False
+    duration_s: float | None = None
+
+
+class CompactionRun(BaseModel):
+    """A completed compaction pass: what was decided per table and how long
+    each compaction took. The latest run is stored in the settings blob."""
+
+    started_at: datetime
+    duration_s: float
+    tables: list[TableCompaction] = Field(default_factory=list)
+
+
+def table_layout(stats: dict, versions: list[dict], cutoff: datetime) -> TableLayout:
+    """Build a layout from `AsyncTable.stats()` and `list_versions()`.
+
+    Deleted rows are estimated: fragment lengths count stored rows including
+    deleted ones, and only their mean is reported. Versions older than
+    `cutoff` (naive local time, as LanceDB reports it), other than the
+    latest, are stale.
+    """
+    fragments = stats.get("fragment_stats") or {}
+    num_fragments = fragments.get("num_fragments", 0)
+    num_rows = stats.get("num_rows", 0)
+    mean_length = (fragments.get("lengths") or {}).get("mean", 0)
+    stored_rows = round(mean_length * num_fragments)
+    latest = max((v["version"] for v in versions), default=None)
+    stale = sum(
+        1
+        for v in versions
+        if v["version"] != latest and v["timestamp"].replace(tzinfo=None) < cutoff
+    )
+    return TableLayout(
+        num_rows=num_rows,
+        num_fragments=num_fragments,
+        num_small_fragments=fragments.get("num_small_fragments", 0),
+        deleted_rows=max(stored_rows - num_rows, 0),
+        num_versions=len(versions),
+        stale_versions=stale,
+    )
+
+
+def compaction_reasons(layout: TableLayout, config: CompactionConfig) -> list[str]:
+    """The thresholds `layout` crosses; empty when the table needs nothing."""
+    reasons = []
+    if (
+        layout.num_small_fragments >= config.min_small_fragments
+        and layout.small_fragment_ratio >= config.small_fragment_ratio
+    ):
+        reasons.append(
+            f"{layout.num_small_fragments}/{layout.num_fragments} small fragments"
+        )
+    if layout.deleted_rows and layout.deleted_row_ratio >= config.deleted_row_ratio:
+        reasons.append(f"{layout.deleted_row_ratio:.0%} deleted rows")
+    if layout.stale_versions > config.max_stale_versions:
+        reasons.append(f"{layout.stale_versions} stale versions")
+    return reasons
+
+
+def _parse_window(window: str) -> tuple[time, time]:
+    start, _, end = window.partition("-")
+    return (
+        datetime.strptime(start.strip(), "%H:%M").time(),
+        datetime.strptime(end.strip(), "%H:%M").time(),
+    )
+
+
+def in_peak_window(windows: list[str], now: datetime) -> bool:
+    """Whether `now` falls in any HH:MM-HH:MM window; a window whose end is
+    before its start wraps midnight."""
+    current = now.time()
+    for window in windows:
+        start, end = _parse_window(window)
+        if start <= end:
+            if start <= current < end:
+                return True
+        elif current >= start or current < end:
+            return True
+    return False
+
+
+async def run_compaction(
+    tables: dict[str, lancedb.AsyncTable],
+    config: CompactionConfig,
+    retention: Callable[[lancedb.AsyncTable], Awaitable[timedelta]],
+) -> CompactionRun:
+    """Compact the tables that cross a threshold, at most
+    `config.max_concurrency` at a time.
+
+    `retention` gives each table's cleanup window. Every table is attempted;
+    the first failure is raised once all have finished.
+    """
+    started_at = datetime.now()
+    start = monotonic()
+    semaphore = asyncio.Semaphore(config.max_concurrency)
+
+    async def compact_table(name: str, table: lancedb.AsyncTable) -> TableCompaction:
+        keep = await retention(table)
+        # lancedb's .stats() stub claims TableStatistics but returns a plain dict at runtime.
+        stats: dict = await table.stats()  # type: ignore[assignment]  # ty: ignore[invalid-assignment]
+        layout = table_layout(stats, await table.list_versions(), datetime.now() - keep)
+        reasons = compaction_reasons(layout, config)
+        if not reasons:
+            return TableCompaction(name=name, layout=layout)
+        async with semaphore:
+            table_start = monotonic()
+            await table.optimize(cleanup_older_than=keep)
+            return TableCompaction(
+                name=name,
+                layout=layout,
+                reasons=reasons,
+                compacted=True,
+                duration_s=monotonic() - table_start,
+            )
+
+    results = await asyncio.gather(
+        *(compact_table(name, table) for name, table in tables.items()),
+        return_exceptions=True,
+    )
+    for result in results:
+        if isinstance(result, BaseException):
+            raise result
+    return CompactionRun(
+        started_at=started_at,
+        duration_s=monotonic() - start,
+        tables=[r for r in results if isinstance(r, TableCompaction)],
+    )
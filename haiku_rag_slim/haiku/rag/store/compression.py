@@ -1,14 +1,75 @@
 import json
+import threading
+from collections.abc import Callable, Iterable, Iterator
+from dataclasses import dataclass, replace
+from typing import TYPE_CHECKING, Protocol, cast
+
+if TYPE_CHECKING:
+    from docling_core.types.doc.document import DoclingDocument
+    from pydantic import BaseModel
 
 try:  # pragma: no cover
     from compression.zstd import (  # ty: ignore[unresolved-import]
-        compress as _zstd_compress,  # type: ignore[import-not-found]
+        CompressionParameter,  # type: ignore[import-not-found]
+        ZstdDict,  # type: ignore[import-not-found]
+        get_frame_info,  # type: ignore[import-not-found]
+    )
+    from compression.zstd import (  # ty: ignore[unresolved-import]
+        ZstdCompressor as _StdlibCompressor,  # type: ignore[import-not-found]
+    )
+    from compression.zstd import (  # ty: ignore[unresolved-import]
+        compress as _stdlib_compress,  # type: ignore[import-not-found]
     )
     from compression.zstd import (  # ty: ignore[unresolved-import]
-        decompress as _zstd_decompress,  # type: ignore[import-not-found]
+        decompress as _stdlib_decompress,  # type: ignore[import-not-found]
     )
+    from compression.zstd import (  # ty: ignore[unresolved-import]
+        train_dict as _stdlib_train,  # type: ignore[import-not-found]
+    )
+
+    def _zstd_compress(
+        data: bytes, level: int, threads: int, zstd_dict: "ZstdDict | None"
+    ) -> bytes:
+        if threads:
+            options = {
+                CompressionParameter.compression_level: level,
+                CompressionParameter.nb_workers: threads,
+            }
+            return _stdlib_compress(data, options=options, zstd_dict=zstd_dict)
+        return _stdlib_compress(data, level=level, zstd_dict=zstd_dict)
+
+    def _zstd_stream_compressor(
+        level: int, threads: int, zstd_dict: "ZstdDict | None"
+    ) -> "_StreamCompressor":
+        if threads:
+            options = {
+                CompressionParameter.compression_level: level,
+                CompressionParameter.nb_workers: threads,
+            }
+            return _StdlibCompressor(options=options, zstd_dict=zstd_dict)
+        return _StdlibCompressor(level=level, zstd_dict=zstd_dict)
+
+    def _zstd_decompress(data: bytes, zstd_dict: "ZstdDict | None") -> bytes:
+        return _stdlib_decompress(data, zstd_dict=zstd_dict)
+
+    def _frame_dict_id(data: bytes) -> int:
+        return get_frame_info(data).dictionary_id
+
+    def _load_dict(content: bytes) -> "ZstdDict":
+        return ZstdDict(content)
+
+    def _train_dict(samples: list[bytes], dict_size: int) -> bytes:
+        return _stdlib_train(samples, dict_size).dict_content
+
 except ImportError:
-    from zstandard import ZstdCompressor, ZstdDecompressor, get_frame_parameters
+    from zstandard import (
+        CONTENTSIZE_UNKNOWN,
+        ZstdCompressionDict,
+        ZstdCompressor,
+        ZstdDecompressor,
+        get_frame_parameters,
+    )
+    from zstandard import train_dictionary as _zstandard_train
 
     # ZstdCompressor/ZstdDecompressor are not thread-safe: each wraps a single
     # reused ZSTD_CCtx/ZSTD_DCtx, and concurrent .compress()/.decompress() calls
@@ -16,30 +77,237 @@ except ImportError:
     # path from multiple worker threads (asyncio.to_thread in
     # _prepare_document_from_docling), so construct a fresh instance per call
     # rather than sharing a module-level singleton.
-    def _zstd_compress(data: bytes) -> bytes:
-        return ZstdCompressor().compress(data)
+    def _zstd_compress(
+        data: bytes, level: int, threads: int, zstd_dict: ZstdCompressionDict | None
+    ) -> bytes:
+        return ZstdCompressor(
+            level=level, dict_data=zstd_dict, threads=threads
+        ).compress(data)
+
+    def _zstd_stream_compressor(
+        level: int, threads: int, zstd_dict: ZstdCompressionDict | None
+    ) -> "_StreamCompressor":
+        return ZstdCompressor(
+            level=level, dict_data=zstd_dict, threads=threads
+        ).compressobj()
 
-    def _zstd_decompress(data: bytes) -> bytes:
+    def _zstd_decompress(data: bytes, zstd_dict: ZstdCompressionDict | None) -> bytes:
         content_size = get_frame_parameters(data).content_size
-        return ZstdDecompressor().decompress(data, max_output_size=content_size)
+        decompressor = ZstdDecompressor(dict_data=zstd_dict)
+        if content_size == CONTENTSIZE_UNKNOWN:
+            # A streamed frame (see compress_json_pieces) records no size.
+            return decompressor.decompressobj().decompress(data)
+        return decompressor.decompress(data, max_output_size=content_size)
+
+    def _frame_dict_id(data: bytes) -> int:
+        return get_frame_parameters(data).dict_id
+
+    def _load_dict(content: bytes) -> ZstdCompressionDict:
+        return ZstdCompressionDict(content)
 
+    def _train_dict(samples: list[bytes], dict_size: int) -> bytes:
+        buffers: list[bytes | bytearray | memoryview] = list(samples)
+        return _zstandard_train(dict_size, buffers).as_bytes()
 
-def compress_json(json_str: str) -> bytes:
-    """Compress a JSON string with zstd."""
-    return _zstd_compress(json_str.encode("utf-8"))
+
+# zstd's own default level.
+DEFAULT_LEVEL = 3
+
+# Blobs at least this large use the configured worker threads; below it,
+# starting the workers costs more than they save.
+THREADED_MIN_BYTES = 4 * 1024 * 1024
+
+# JSON written in pieces is compressed in one shot up to this size, so its
+# frame records the size as before. Larger JSON is streamed through the
+# compressor instead of being joined, and its frame records no size, which
+# haiku.rag versions before streaming cannot decompress.
+STREAMED_MIN_BYTES = 16 * 1024 * 1024
+
+
+class _StreamCompressor(Protocol):
+    def compress(self, data: bytes, /) -> bytes: ...
+
+    def flush(self) -> bytes: ...
+
+
+# Trained dictionary contents by dictionary id. A zstd frame records the id of
+# the dictionary it was compressed with, so decompression finds it here.
+_dictionaries: dict[int, bytes] = {}
+# Loaded dictionary objects are per thread, for the same reason compressors
+# are per call: their lazily built contexts are not safe to share.
+_loaded = threading.local()
+# Looked up when a frame names a dictionary missing from `_dictionaries`: each
+# open store adds one that reads dictionaries trained after it opened.
+_dictionary_loaders: list[Callable[[int], bytes | None]] = []
+
+
+@dataclass(frozen=True)
+class CompressionParams:
+    """How new blobs are compressed. `dictionary_id` names a dictionary added
+    with `register_dictionary`, used for docling structure blobs only."""
+
+    level: int = DEFAULT_LEVEL
+    threads: int = 0
+    dictionary_id: int | None = None
+
+
+class UnknownDictionaryError(ValueError):
+    """Raised when a blob was compressed with a dictionary this process has not
+    loaded and no open store has stored."""
+
+
+def register_dictionary(content: bytes) -> int:
+    """Make a trained dictionary available for compression and decompression.
+
+    Returns:
+        The dictionary id recorded in its header and in every frame it
+        compresses.
+    """
+    dict_id = dictionary_id(content)
+    _dictionaries[dict_id] = content
+    return dict_id
+
+
+def add_dictionary_loader(loader: Callable[[int], bytes | None]) -> None:
+    """Consult `loader` for dictionaries not registered yet. It is called with
+    the missing id and returns the dictionary content, or None."""
+    _dictionary_loaders.append(loader)
+
+
+def remove_dictionary_loader(loader: Callable[[int], bytes | None]) -> None:
+    """Stop consulting a loader added with `add_dictionary_loader`."""
+    if loader in _dictionary_loaders:
+        _dictionary_loaders.remove(loader)
+
+
+def _load_missing_dictionary(dict_id: int) -> bytes | None:
+    for loader in list(_dictionary_loaders):
+        content = loader(dict_id)
+        if content is not None:
+            register_dictionary(content)
+            return content
+    return None
+
+
+def dictionary_id(content: bytes) -> int:
+    """The id recorded in a trained dictionary's header."""
+    # A zstd dictionary starts with a 4-byte magic number, then its id.
+    return int.from_bytes(content[4:8], "little")
+
+
+def train_dictionary(samples: list[bytes], dict_size: int) -> bytes:
+    """Train a zstd dictionary of at most `dict_size` bytes from samples.
+
+    Raises:
+        ValueError: If the samples are too few or too small to train from.
+    """
+    try:
+        return _train_dict(samples, dict_size)
+    except Exception as e:
+        raise ValueError(f"Could not train a dictionary: {e}") from e
+
+
+def _dict_object(dict_id: int):
+    cache = getattr(_loaded, "dicts", None)
+    if cache is None:
+        cache = _loaded.dicts = {}
+    loaded = cache.get(dict_id)
+    if loaded is None:
+        content = _dictionaries.get(dict_id) or _load_missing_dictionary(dict_id)
+        if content is None:
+            raise UnknownDictionaryError(
+                f"Data was compressed with zstd dictionary {dict_id}, which is not "
+                "loaded and not stored in any open database."
+            )
+        loaded = cache[dict_id] = _load_dict(content)
+    return loaded
+
+
+def compress_json(json_str: str, params: CompressionParams | None = None) -> bytes:
+    """Compress a JSON string with zstd, using worker threads for large
+    blobs."""
+    params = params or CompressionParams()
+    data = json_str.encode("utf-8")
+    threads = params.threads if len(data) >= THREADED_MIN_BYTES else 0
+    zstd_dict = (
+        _dict_object(params.dictionary_id) if params.dictionary_id is not None else None
+    )
+    return _zstd_compress(data, params.level, threads, zstd_dict)
+
+
+def compress_json_pieces(
+    pieces: Iterable[bytes], params: CompressionParams | None = None
+) -> bytes:
+    """Compress JSON produced in pieces with zstd, without joining them.
+
+    Pieces are buffered up to ``STREAMED_MIN_BYTES`` and compressed in one shot
+    like ``compress_json``. Past that, the buffer and every later piece go
+    through a streaming compressor and are dropped once compressed, so the
+    JSON is never held whole.
+    """
+    params = params or CompressionParams()
+    zstd_dict = (
+        _dict_object(params.dictionary_id) if params.dictionary_id is not None else None
+    )
+    pieces = iter(pieces)
+    buffered: list[bytes] = []
+    size = 0
+    for piece in pieces:
+        buffered.append(piece)
+        size += len(piece)
+        if size >= STREAMED_MIN_BYTES:
+            break
+    else:
+        threads = params.threads if size >= THREADED_MIN_BYTES else 0
+        return _zstd_compress(b"".join(buffered), params.level, threads, zstd_dict)
+
+    compressor = _zstd_stream_compressor(params.level, params.threads, zstd_dict)
+    compressed = [compressor.compress(piece) for piece in buffered]
+    buffered.clear()
+    compressed.extend(compressor.compress(piece) for piece in pieces)
+    compressed.append(compressor.flush())
+    return b"".join(compressed)
 
 
 def decompress_json(data: bytes) -> str:
-    """Decompress zstd-compressed data to a JSON string."""
-    return _zstd_decompress(data).decode("utf-8")
+    """Decompress zstd-compressed data to a JSON string, with the dictionary
+    the frame header names."""
+    dict_id = _frame_dict_id(data)
+    zstd_dict = _dict_object(dict_id) if dict_id else None
+    return _zstd_decompress(data, zstd_dict).decode("utf-8")
+
+
+def compress_pages(
+    pages: dict, params: CompressionParams | None = None
+) -> dict[int, bytes]:
+    """Compress each page of a DoclingDocument's ``pages`` dict on its own.
+
+    Keys are page numbers (strings in the JSON dump). Each value is one
+    page's JSON compressed as its own zstd frame, so a single page can be
+    decompressed without touching the others. Pages are mostly image data,
+    which a dictionary trained on structure does not help, so
+    ``params.dictionary_id`` is ignored.
+    """
+    params = _page_params(params)
+    return {
+        int(page_no): compress_json(json.dumps(page), params)
+        for page_no, page in pages.items()
+    }
 
 
-def compress_docling_split(data: dict) -> tuple[bytes, bytes | None]:
+def _page_params(params: CompressionParams | None) -> CompressionParams | None:
+    return replace(params, dictionary_id=None) if params is not None else None
+
+
+def compress_docling_split(
+    data: dict, params: CompressionParams | None = None
+) -> tuple[bytes, dict[int, bytes]]:
     """Split a DoclingDocument dict into structure and pages, compress both with zstd.
 
-    Picture image URIs are stripped from the structure blob — they are stored on
-    the corresponding ``document_items.picture_data`` rows and don't need to be
-    duplicated inside the structure JSON. ``ImageRef.uri`` is required when the
+    Picture image URIs are stripped from the structure blob — their bytes are
+    stored in ``picture_blobs``, referenced from the corresponding
+    ``document_items`` rows, and don't need to be duplicated inside the
+    structure JSON. ``ImageRef.uri`` is required when the
     field is present, so each picture's ``image`` is set to ``None`` rather than
     partially mutated to keep the JSON re-validating cleanly.
 
@@ -48,16 +316,66 @@ def compress_docling_split(data: dict) -> tuple[bytes, bytes | None]:
     never touches a live DoclingDocument.
 
     Returns:
-        Tuple of (structure_bytes, pages_bytes). pages_bytes is None if the
-        document has no page images.
+        Tuple of (structure_bytes, pages). pages maps each page number to its
+        compressed page (see ``compress_pages``) and is empty if the document
+        has no pages.
     """
-    pages = data.pop("pages", None)
+    pages = data.pop("pages", None) or {}
 
     for picture in data.get("pictures") or []:
         if isinstance(picture, dict):
             picture["image"] = None
 
-    structure_bytes = compress_json(json.dumps(data))
-    pages_bytes = compress_json(json.dumps(pages)) if pages else None
+    structure_bytes = compress_json(json.dumps(data), params)
+
+    return structure_bytes, compress_pages(pages, params)
+
 
-    return structure_bytes, pages_bytes
+def _docling_structure_pieces(docling_doc: "DoclingDocument") -> Iterator[bytes]:
+    """The structure JSON of a DoclingDocument, as ``model_dump_json`` writes it
+    without pages or picture images, in pieces: each item of the item lists
+    on its own and every other field whole."""
+    yield b"{"
+    separator = b""
+    for name in type(docling_doc).model_fields:
+        if name == "pages":
+            continue
+        value = getattr(docling_doc, name)
+        # Empty lists go through the document's own serializer, which leaves
+        # some of them out.
+        if isinstance(value, list) and value:
+            exclude = {"image"} if name == "pictures" else None
+            yield separator + json.dumps(name).encode() + b":["
+            for index, item in enumerate(cast("list[BaseModel]", value)):
+                if index:
+                    yield b","
+                yield item.model_dump_json(exclude=exclude).encode()
+            yield b"]"
+        else:
+            field = docling_doc.model_dump_json(include={name})
+            if field == "{}":
+                continue
+            yield separator + field[1:-1].encode()
+        separator = b","
+    yield b"}"
+
+
+def compress_docling(
+    docling_doc: "DoclingDocument", params: CompressionParams | None = None
+) -> tuple[bytes, dict[int, bytes]]:
+    """Compress a DoclingDocument into structure and pages.
+
+    Produces what ``compress_docling_split(docling_doc.model_dump(mode="json"))``
+    does without building that dict or the whole JSON string: the structure,
+    with pages and picture images left out, is written item by item into the
+    compressor (see ``compress_json_pieces``), and each page's JSON straight
+    from the model. At most one page's JSON, or ``STREAMED_MIN_BYTES`` of
+    structure, is held uncompressed at a time.
+    """
+    structure = compress_json_pieces(_docling_structure_pieces(docling_doc), params)
+    page_params = _page_params(params)
+    pages = {
+        int(page_no): compress_json(page.model_dump_json(), page_params)
+        for page_no, page in docling_doc.pages.items()
+    }
+    return structure, pages
@@ -0,0 +1,137 @@
+"""Training zstd dictionaries for docling structure blobs.
+
+Docling structure JSON repeats the same keys, labels and references in every
+document, which a trained dictionary lets zstd encode once instead of per
+blob. `train_docling_dictionary` trains one from a sample of the stored
+structure, measures it against plain compression on that sample and stores
+it as the database's active dictionary.
+"""
+
+import asyncio
+import random
+from time import perf_counter
+from typing import TYPE_CHECKING
+
+from pydantic import BaseModel
+
+from haiku.rag.store.compression import (
+    CompressionParams,
+    compress_json,
+    decompress_json,
+    register_dictionary,
+    train_dictionary,
+)
+from haiku.rag.utils import escape_sql_string
+
+if TYPE_CHECKING:
+    from haiku.rag.store.engine import Store
+
+
+class DictionaryTrainingReport(BaseModel):
+    """Sizes and decompression times of the sampled structure blobs, compressed
+    without and with the trained dictionary."""
+
+    dictionary_id: int
+    dictionary_bytes: int
+    samples: int
+    raw_bytes: int
+    plain_bytes: int
+    dictionary_compressed_bytes: int
+    plain_decompress_s: float
+    dictionary_decompress_s: float
+
+    @property
+    def size_change(self) -> float:
+        """Relative change in compressed size; negative is smaller."""
+        if not self.plain_bytes:
+            return 0.0
+        return self.dictionary_compressed_bytes / self.plain_bytes - 1
+
+
+async def _sample_structures(store: "Store", sample_size: int) -> list[bytes]:
+    rows = await (
+        store.documents_table.query()
+        .select(["id"])
+        .where("docling_document IS NOT NULL")
+        .to_list()
+    )
+    ids = [row["id"] for row in rows]
+    chosen = random.sample(ids, min(sample_size, len(ids)))
+    structures: list[bytes] = []
+    for start in range(0, len(chosen), 100):
+        batch = ", ".join(
+            f"'{escape_sql_string(doc_id)}'" for doc_id in chosen[start : start + 100]
+        )
+        blobs = await (
+            store.documents_table.query()
+            .select(["docling_document"])
+            .where(f"id IN ({batch})")
+            .to_list()
+        )
+        structures.extend(
+            decompress_json(row["docling_document"]).encode("utf-8") for row in blobs
+        )
+    return structures
+
+
+def _measure(structures: list[bytes], params: CompressionParams) -> tuple[int, float]:
+    blobs = [compress_json(s.decode("utf-8"), params) for s in structures]
+    start = perf_counter()
+    for blob in blobs:
+        decompress_json(blob)
+    return sum(len(b) for b in blobs), perf_counter() - start
+
+
+def _train_and_measure(
+    structures: list[bytes], dict_size: int, params: CompressionParams
+) -> tuple[bytes, DictionaryTrainingReport]:
+    content = train_dictionary(structures, dict_size)
+    dict_id = register_dictionary(content)
+    plain_bytes, plain_s = _measure(structures, params)
+    dict_bytes, dict_s = _measure(
+        structures,
+        CompressionParams(
+            level=params.level, threads=params.threads, dictionary_id=dict_id
+        ),
+    )
+    report = DictionaryTrainingReport(
+        dictionary_id=dict_id,
+        dictionary_bytes=len(content),
+        samples=len(structures),
+        raw_bytes=sum(len(s) for s in structures),
+        plain_bytes=plain_bytes,
+        dictionary_compressed_bytes=dict_bytes,
+        plain_decompress_s=plain_s,
+        dictionary_decompress_s=dict_s,
+    )
+    return content, report
+
+
+async def train_docling_dictionary(
+    store: "Store", sample_size: int = 1000, dict_size: int = 112 * 1024
+) -> DictionaryTrainingReport:
+    """Train a dictionary on up to `sample_size` documents' structure and make
+    it the active dictionary for new writes.
+
+    Blobs already stored keep their compression until they are next written.
+    Processes that opened the database earlier must reopen it before
+    they can read blobs written with the new dictionary.
+
+    Raises:
+        ValueError: If no document has docling structure, or the sample is too
+            small to train from.
+        ReadOnlyError: If the store is in read-only mode.
+    """
+    store._assert_writable()
+    structures = await _sample_structures(store, sample_size)
+    if not structures:
+        raise ValueError("No documents with docling structure to train from")
+    params = store._config.storage.compression
+    content, report = await asyncio.to_thread(
+        _train_and_measure,
+        structures,
+        dict_size,
+        CompressionParams(level=params.level, threads=params.threads),
+    )
+    await store.save_zstd_dictionary(content)
+    return report
@@ -0,0 +1,652 @@
+"""Read-through disk cache for databases on object storage.
+
+LanceDB reads object storage through its own client, which haiku.rag cannot
+hook into, so the cache is a local S3 endpoint that LanceDB connects to in
+place of the bucket. The endpoint serves reads only:
+
+- Data, index, deletion and transaction files are named by UUID and never
+  rewritten. They are cached in fixed-size blocks that are never revalidated,
+  and the least recently used blocks are evicted once the cache outgrows its
+  size bound.
+- Manifests, tags and listings always come from the bucket. A manifest names
+  the files of its version, so a cached block is only ever reached through a
+  current manifest and cannot be stale.
+
+The endpoint listens on the loopback interface, and reads the bucket with this
+process's credentials, so it only answers requests signed (AWS SigV4) with a
+key pair generated for it and handed to this process's LanceDB connections.
+
+The block index and hit counters live in a SQLite file beside the blocks, so a
+restarted process starts warm and `haiku-rag info` reports the hit ratio of
+every process sharing the directory.
+"""
+
+import hashlib
+import hmac
+import logging
+import os
+import secrets
+import sqlite3
+import tempfile
+import threading
+import time
+from datetime import UTC, datetime
+from email.utils import format_datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, cast
+from urllib.parse import parse_qs, parse_qsl, quote, unquote, urlparse
+from xml.sax.saxutils import escape
+
+from pydantic import BaseModel
+
+if TYPE_CHECKING:
+    from haiku.rag.config import AppConfig
+
+logger = logging.getLogger(__name__)
+
+# Unit of caching and eviction. Large enough that a cold query fetches a few
+# blocks per file rather than many small ranges, small enough that a point
+# lookup does not drag in much it will not read.
+BLOCK_SIZE = 1024 * 1024
+
+# Directories of a Lance table whose files are immutable once written.
+_IMMUTABLE_DIRS = frozenset({"data", "_indices", "_deletions", "_transactions"})
+
+# Bucket and root under which the local endpoint serves the database.
+_BUCKET = "haiku-rag-cache"
+_ROOT = "db"
+_REGION = "us-east-1"
+
+# How far a request's signing time may be from now, as S3 allows.
+_MAX_CLOCK_SKEW_S = 15 * 60
+
+_INDEX_SCHEMA = """
+PRAGMA journal_mode = WAL;
+PRAGMA synchronous = NORMAL;
+CREATE TABLE IF NOT EXISTS objects (
+    key TEXT PRIMARY KEY,
+    size INTEGER NOT NULL,
+    e_tag TEXT,
+    last_modified REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS blocks (
+    key TEXT NOT NULL,
+    block INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    last_used REAL NOT NULL,
+    PRIMARY KEY (key, block)
+);
+CREATE INDEX IF NOT EXISTS blocks_last_used ON blocks (last_used);
+CREATE TABLE IF NOT EXISTS counters (
+    name TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+INSERT OR IGNORE INTO counters VALUES ('hits', 0), ('misses', 0);
+"""
+
+
+class DiskCacheStats(BaseModel):
+    """Cumulative counters of a disk cache directory, across processes."""
+
+    path: str
+    hits: int = 0
+    misses: int = 0
+    size_bytes: int = 0
+    max_size_bytes: int = 0
+
+    @property
+    def hit_ratio(self) -> float | None:
+        """Share of block reads served from disk; None before the first read."""
+        total = self.hits + self.misses
+        return self.hits / total if total else None
+
+
+def disk_cache_path(config: "AppConfig") -> Path:
+    """The configured cache directory, defaulting under storage.data_dir."""
+    path = config.lancedb.disk_cache.path
+    return path if path is not None else config.storage.data_dir / "lancedb-cache"
+
+
+def read_disk_cache_stats(config: "AppConfig") -> DiskCacheStats | None:
+    """Counters of the configured cache directory, or None if it was never
+    used. Reads the index without taking part in the cache."""
+    path = disk_cache_path(config)
+    index = path / "index.sqlite"
+    if not index.exists():
+        return None
+    db = sqlite3.connect(f"file:{index}?mode=ro", uri=True)
+    try:
+        counters = dict(db.execute("SELECT name, value FROM counters").fetchall())
+        (size,) = db.execute("SELECT COALESCE(SUM(size), 0) FROM blocks").fetchone()
+    finally:
+        db.close()
+    return DiskCacheStats(
+        path=str(path),
+        hits=counters.get("hits", 0),
+        misses=counters.get("misses", 0),
+        size_bytes=size,
+        max_size_bytes=config.lancedb.disk_cache.max_size_bytes,
+    )
+
+
+def _is_immutable(key: str) -> bool:
+    return any(part in _IMMUTABLE_DIRS for part in key.split("/")[:-1])
+
+
+def _upstream_store(uri: str, storage_options: dict[str, str]) -> Any:
+    """An obstore store rooted at the database URI."""
+    try:
+        from obstore.store import from_url  # type: ignore[import-not-found]
+    except ImportError as e:
+        raise ImportError(
+            "obstore is required for lancedb.disk_cache. "
+            "Install with: pip install haiku.rag-slim[s3]"
+        ) from e
+
+    parsed = urlparse(uri)
+    if parsed.scheme == "s3":
+        from haiku.rag.s3 import make_s3_store
+
+        return make_s3_store(
+            parsed.netloc, storage_options, prefix=parsed.path.strip("/") or None
+        )
+    if storage_options:
+        return from_url(uri, config=cast(Any, storage_options))
+    return from_url(uri)
+
+
+class DiskCache:
+    """Block cache over an obstore store, shared by the endpoint's threads."""
+
+    def __init__(
+        self, path: Path, max_size_bytes: int, uri: str, upstream: Any
+    ) -> None:
+        self.path = path
+        self.max_size_bytes = max_size_bytes
+        self.upstream = upstream
+        # Blocks are keyed by the full object URI, so databases sharing a
+        # directory never collide.
+        self._namespace = uri.rstrip("/") + "/"
+        (path / "blocks").mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(
+            path / "index.sqlite",
+            check_same_thread=False,
+            isolation_level=None,
+            timeout=30,
+        )
+        self._db.executescript(_INDEX_SCHEMA)
+        self._lock = threading.Lock()
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
+
+    def head(self, key: str) -> dict[str, Any]:
+        """Size, e_tag and last_modified of an object, from the index when
+        the object is immutable and already known."""
+        import obstore  # type: ignore[import-not-found]
+
+        if not _is_immutable(key):
+            return cast(dict[str, Any], obstore.head(self.upstream, key))
+        cache_key = self._namespace + key
+        with self._lock:
+            row = self._db.execute(
+                "SELECT size, e_tag, last_modified FROM objects WHERE key = ?",
+                (cache_key,),
+            ).fetchone()
+        if row is not None:
+            return {
+                "size": row[0],
+                "e_tag": row[1],
+                "last_modified": datetime.fromtimestamp(row[2], UTC),
+            }
+        meta = cast(dict[str, Any], obstore.head(self.upstream, key))
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO objects VALUES (?, ?, ?, ?)",
+                (
+                    cache_key,
+                    meta["size"],
+                    meta.get("e_tag"),
+                    meta["last_modified"].timestamp(),
+                ),
+            )
+        return meta
+
+    def read(self, key: str, start: int, end: int, size: int) -> bytes:
+        """Bytes [start, end) of an object of the given size."""
+        import obstore  # type: ignore[import-not-found]
+
+        if start >= end:
+            return b""
+        if not _is_immutable(key):
+            return bytes(obstore.get_range(self.upstream, key, start=start, end=end))
+
+        cache_key = self._namespace + key
+        first, last = start // BLOCK_SIZE, (end - 1) // BLOCK_SIZE
+        blocks: dict[int, bytes] = {}
+        for block in range(first, last + 1):
+            expected = min(BLOCK_SIZE, size - block * BLOCK_SIZE)
+            data = self._read_block(cache_key, block, expected)
+            if data is not None:
+                blocks[block] = data
+        hits = list(blocks)
+        missing = [b for b in range(first, last + 1) if b not in blocks]
+        if missing:
+            fetched = obstore.get_ranges(
+                self.upstream,
+                key,
+                starts=[b * BLOCK_SIZE for b in missing],
+                ends=[min((b + 1) * BLOCK_SIZE, size) for b in missing],
+            )
+            for block, data in zip(missing, fetched, strict=True):
+                blocks[block] = bytes(data)
+                self._write_block(cache_key, block, blocks[block])
+        self._record(cache_key, hits, len(missing))
+        if missing:
+            self._evict()
+
+        offset = first * BLOCK_SIZE
+        joined = b"".join(blocks[b] for b in range(first, last + 1))
+        return joined[start - offset : end - offset]
+
+    def _block_file(self, cache_key: str, block: int) -> Path:
+        digest = hashlib.sha256(cache_key.encode()).hexdigest()
+        return self.path / "blocks" / digest[:2] / f"{digest}.{block}"
+
+    def _read_block(self, cache_key: str, block: int, expected: int) -> bytes | None:
+        with self._lock:
+            row = self._db.execute(
+                "SELECT size FROM blocks WHERE key = ? AND block = ?",
+                (cache_key, block),
+            ).fetchone()
+        if row is None or row[0] != expected:
+            return None
+        try:
+            data = self._block_file(cache_key, block).read_bytes()
+        except FileNotFoundError:
+            # Evicted by another process between the lookup and the read.
+            return None
+        return data if len(data) == expected else None
+
+    def _write_block(self, cache_key: str, block: int, data: bytes) -> None:
+        target = self._block_file(cache_key, block)
+        target.parent.mkdir(exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=target.parent, prefix=".tmp-")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp, target)
+        except BaseException:
+            Path(tmp).unlink(missing_ok=True)
+            raise
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO blocks VALUES (?, ?, ?, ?)",
+                (cache_key, block, len(data), time.time()),
+            )
+
+    def _record(self, cache_key: str, hits: list[int], misses: int) -> None:
+        now = time.time()
+        with self._lock:
+            self._db.execute("BEGIN")
+            self._db.executemany(
+                "UPDATE blocks SET last_used = ? WHERE key = ? AND block = ?",
+                [(now, cache_key, block) for block in hits],
+            )
+            self._db.execute(
+                "UPDATE counters SET value = value + ? WHERE name = 'hits'",
+                (len(hits),),
+            )
+            self._db.execute(
+                "UPDATE counters SET value = value + ? WHERE name = 'misses'",
+                (misses,),
+            )
+            self._db.execute("COMMIT")
+
+    def _evict(self) -> None:
+        """Drop least recently used blocks until the cache fits its bound."""
+        with self._lock:
+            (total,) = self._db.execute(
+                "SELECT COALESCE(SUM(size), 0) FROM blocks"
+            ).fetchone()
+            if total <= self.max_size_bytes:
+                return
+            victims = []
+            for key, block, size in self._db.execute(
+                "SELECT key, block, size FROM blocks ORDER BY last_used"
+            ):
+                if total <= self.max_size_bytes:
+                    break
+                victims.append((key, block))
+                total -= size
+            self._db.execute("BEGIN")
+            self._db.executemany(
+                "DELETE FROM blocks WHERE key = ? AND block = ?", victims
+            )
+            self._db.execute(
+                "DELETE FROM objects WHERE key NOT IN (SELECT key FROM blocks)"
+            )
+            self._db.execute("COMMIT")
+        for key, block in victims:
+            self._block_file(key, block).unlink(missing_ok=True)
+
+
+class _S3Handler(BaseHTTPRequestHandler):
+    """The subset of the S3 API LanceDB reads with: GET (ranged), HEAD and
+    ListObjectsV2. Writes are refused; the endpoint only serves read-only
+    stores."""
+
+    protocol_version = "HTTP/1.1"
+    server: "_DiskCacheServer"
+
+    def log_message(self, format: str, *args: Any) -> None:
+        logger.debug("disk cache: " + format, *args)
+
+    def do_GET(self) -> None:
+        self._dispatch(send_body=True)
+
+    def do_HEAD(self) -> None:
+        self._dispatch(send_body=False)
+
+    def _refuse(self) -> None:
+        self._send_error(405, "MethodNotAllowed", "The disk cache is read-only")
+
+    do_PUT = do_POST = do_DELETE = _refuse
+
+    def _dispatch(self, send_body: bool) -> None:
+        if not self._signed():
+            self._send_error(
+                403, "SignatureDoesNotMatch", "The request signature is not valid."
+            )
+            return
+        parsed = urlparse(self.path)
+        path = unquote(parsed.path)
+        try:
+            if path.rstrip("/") == f"/{_BUCKET}":
+                self._list(parse_qs(parsed.query), send_body)
+                return
+            prefix = f"/{_BUCKET}/{_ROOT}/"
+            if not path.startswith(prefix):
+                self._send_error(404, "NoSuchKey", "The specified key does not exist.")
+                return
+            self._get(path.removeprefix(prefix), send_body)
+        except FileNotFoundError:
+            # obstore raises FileNotFoundError for a missing object.
+            self._send_error(404, "NoSuchKey", "The specified key does not exist.")
+        except Exception as exc:
+            logger.warning("Disk cache request %s failed: %s", self.path, exc)
+            self._send_error(503, "SlowDown", str(exc))
+
+    def _signed(self) -> bool:
+        header = self.headers.get("Authorization", "")
+        amz_date = self.headers.get("x-amz-date", "")
+        if not header or not amz_date:
+            return False
+        try:
+            signed_at = datetime.strptime(amz_date, "%Y%m%dT%H%M%SZ")
+        except ValueError:
+            return False
+        skew = abs(time.time() - signed_at.replace(tzinfo=UTC).timestamp())
+        if skew > _MAX_CLOCK_SKEW_S:
+            return False
+        path, _, query = self.path.partition("?")
+        headers = {
+            name: ",".join(self.headers.get_all(name) or [])
+            for name in self.headers.keys()
+        }
+        return _verify_sigv4(
+            header,
+            self.command,
+            path,
+            query,
+            headers,
+            amz_date,
+            self.server.access_key_id,
+            self.server.secret_access_key,
+        )
+
+    def _get(self, key: str, send_body: bool) -> None:
+        cache = self.server.cache
+        meta = cache.head(key)
+        size = int(meta["size"])
+        headers = {
+            "Accept-Ranges": "bytes",
+            "Content-Type": "application/octet-stream",
+            "Last-Modified": format_datetime(
+                meta["last_modified"].astimezone(UTC), usegmt=True
+            ),
+        }
+        if meta.get("e_tag"):
+            headers["ETag"] = f'"{str(meta["e_tag"]).strip(chr(34))}"'
+
+        status, start, end = 200, 0, size
+        range_header = self.headers.get("Range")
+        if range_header and send_body:
+            byte_range = _parse_range(range_header, size)
+            if byte_range is None:
+                self.send_response(416)
+                self.send_header("Content-Range", f"bytes */{size}")
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+            start, end = byte_range
+            status = 206
+            headers["Content-Range"] = f"bytes {start}-{end - 1}/{size}"
+
+        body = cache.read(key, start, end, size) if send_body else b""
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(end - start))
+        self.end_headers()
+        if send_body:
+            self.wfile.write(body)
+
+    def _list(self, query: dict[str, list[str]], send_body: bool) -> None:
+        import obstore  # type: ignore[import-not-found]
+
+        prefix = query.get("prefix", [""])[0]
+        delimiter = query.get("delimiter", [""])[0]
+        start_after = query.get("start-after", [""])[0]
+
+        objects: list[dict[str, Any]] = []
+        common_prefixes: list[str] = []
+        root = f"{_ROOT}/"
+        if prefix in ("", _ROOT) or prefix.startswith(root):
+            upstream_prefix = prefix.removeprefix(root).removeprefix(_ROOT).strip("/")
+            upstream_prefix = upstream_prefix or None
+            store = self.server.cache.upstream
+            if delimiter:
+                listing = obstore.list_with_delimiter(store, upstream_prefix)
+                objects = cast(list[dict[str, Any]], list(listing["objects"]))
+                common_prefixes = [
+                    f"{root}{p.rstrip('/')}/" for p in listing["common_prefixes"]
+                ]
+            else:
+                offset = start_after.removeprefix(root) if start_after else None
+                for batch in obstore.list(store, upstream_prefix, offset=offset):
+                    objects.extend(cast(list[dict[str, Any]], batch))
+
+        # S3 lists in key order, which Lance relies on to find the latest
+        # manifest; not every obstore backend does.
+        objects.sort(key=lambda obj: obj["path"])
+        common_prefixes.sort()
+        entries = [
+            "<Contents>"
+            f"<Key>{escape(root + obj['path'])}</Key>"
+            f"<LastModified>{_iso(obj['last_modified'])}</LastModified>"
+            f"<ETag>&quot;{escape(str(obj.get('e_tag') or ''))}&quot;</ETag>"
+            f"<Size>{obj['size']}</Size>"
+            "</Contents>"
+            for obj in objects
+        ]
+        entries += [
+            f"<CommonPrefixes><Prefix>{escape(p)}</Prefix></CommonPrefixes>"
+            for p in common_prefixes
+        ]
+        body = (
+            '<?xml version="1.0" encoding="UTF-8"?>'
+            '<ListBucketResult xmlns="http://s3.amazonaws.com/doc/2006-03-01/">'
+            f"<Name>{_BUCKET}</Name><Prefix>{escape(prefix)}</Prefix>"
+            f"<KeyCount>{len(entries)}</KeyCount><MaxKeys>1000</MaxKeys>"
+            f"<IsTruncated>false</IsTruncated>{''.join(entries)}"
+            "</ListBucketResult>"
+        ).encode()
+        self._send_xml(200, body, send_body)
+
+    def _send_error(self, status: int, code: str, message: str) -> None:
+        body = (
+            '<?xml version="1.0" encoding="UTF-8"?>'
+            f"<Error><Code>{code}</Code><Message>{escape(message)}</Message></Error>"
+        ).encode()
+        self._send_xml(status, body, self.command != "HEAD")
+
+    def _send_xml(self, status: int, body: bytes, send_body: bool) -> None:
+        self.send_response(status)
+        self.send_header("Content-Type", "application/xml")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if send_body:
+            self.wfile.write(body)
+
+
+def _iso(value: datetime) -> str:
+    return value.astimezone(UTC).strftime("%Y-%m-%dT%H:%M:%S.%f")[:-3] + "Z"
+
+
+def _parse_range(header: str, size: int) -> tuple[int, int] | None:
+    """[start, end) of a single `bytes=` range, or None if unsatisfiable."""
+    spec = header.strip().removeprefix("bytes=")
+    first, _, last = spec.partition("-")
+    if not first:
+        if not last or int(last) == 0:
+            return None
+        return max(size - int(last), 0), size
+    start = int(first)
+    end = min(int(last) + 1, size) if last else size
+    if start >= size or start >= end:
+        return None
+    return start, end
+
+
+def _hmac(key: bytes, message: str) -> bytes:
+    return hmac.new(key, message.encode(), hashlib.sha256).digest()
+
+
+def _verify_sigv4(
+    authorization: str,
+    method: str,
+    path: str,
+    query: str,
+    headers: dict[str, str],
+    amz_date: str,
+    access_key_id: str,
+    secret_access_key: str,
+) -> bool:
+    """Whether `authorization` is a valid AWS SigV4 header-based signature of
+    the request by the given key pair."""
+    algorithm, _, params = authorization.partition(" ")
+    if algorithm != "AWS4-HMAC-SHA256":
+        return False
+    fields = dict(
+        part.strip().partition("=")[::2] for part in params.split(",") if "=" in part
+    )
+    scope = fields.get("Credential", "").split("/")
+    signed_headers = fields.get("SignedHeaders", "")
+    signature = fields.get("Signature", "")
+    if len(scope) != 5 or not signed_headers or not signature:
+        return False
+    key_id, date, region, service, terminator = scope
+    if not hmac.compare_digest(key_id, access_key_id):
+        return False
+    if terminator != "aws4_request" or not amz_date.startswith(date):
+        return False
+
+    lower = {name.lower(): value for name, value in headers.items()}
+    names = signed_headers.split(";")
+    if "host" not in names or any(name not in lower for name in names):
+        return False
+    canonical_headers = "".join(
+        f"{name}:{' '.join(lower[name].split())}\n" for name in names
+    )
+    canonical_query = "&".join(
+        sorted(
+            f"{quote(k, safe='-_.~')}={quote(v, safe='-_.~')}"
+            for k, v in parse_qsl(query, keep_blank_values=True)
+        )
+    )
+    payload_hash = lower.get("x-amz-content-sha256", hashlib.sha256(b"").hexdigest())
+    canonical_request = "\n".join(
+        [
+            method,
+            path,
+            canonical_query,
+            canonical_headers,
+            signed_headers,
+            payload_hash,
+        ]
+    )
+    credential_scope = f"{date}/{region}/{service}/aws4_request"
+    string_to_sign = "\n".join(
+        [
+            algorithm,
+            amz_date,
+            credential_scope,
+            hashlib.sha256(canonical_request.encode()).hexdigest(),
+        ]
+    )
+    key = f"AWS4{secret_access_key}".encode()
+    for part in (date, region, service, "aws4_request"):
+        key = _hmac(key, part)
+    expected = hmac.new(key, string_to_sign.encode(), hashlib.sha256).hexdigest()
+    return hmac.compare_digest(expected, signature)
+
+
+class _DiskCacheServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, cache: DiskCache) -> None:
+        super().__init__(("127.0.0.1", 0), _S3Handler)
+        self.cache = cache
+        self.access_key_id = f"HAIKU{secrets.token_hex(8).upper()}"
+        self.secret_access_key = secrets.token_urlsafe(30)
+
+
+_servers: dict[tuple[str, Path], _DiskCacheServer] = {}
+_servers_lock = threading.Lock()
+
+
+def disk_cache_endpoint(config: "AppConfig") -> tuple[str, dict[str, str]]:
+    """The URI and storage options that read config's database through its
+    disk cache.
+
+    The endpoint starts on first use and is shared by every connection in the
+    process to the same database and cache directory.
+    """
+    path = disk_cache_path(config)
+    key = (config.lancedb.uri, path)
+    with _servers_lock:
+        server = _servers.get(key)
+        if server is None:
+            cache = DiskCache(
+                path,
+                config.lancedb.disk_cache.max_size_bytes,
+                config.lancedb.uri,
+                _upstream_store(config.lancedb.uri, config.lancedb.storage_options),
+            )
+            server = _DiskCacheServer(cache)
+            threading.Thread(
+                target=server.serve_forever, name="haiku-rag-disk-cache", daemon=True
+            ).start()
+            _servers[key] = server
+    host, port = server.server_address[:2]
+    return f"s3://{_BUCKET}/{_ROOT}", {
+        "aws_endpoint": f"http://{host}:{port}",
+        "allow_http": "true",
+        "aws_access_key_id": server.access_key_id,
+        "aws_secret_access_key": server.secret_access_key,
+        "aws_region": _REGION,
+        "aws_virtual_hosted_style_request": "false",
+    }
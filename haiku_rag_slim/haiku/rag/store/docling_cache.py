@@ -0,0 +1,71 @@
+"""LRU cache of parsed DoclingDocuments.
+
+Parsing a stored docling structure means decompressing it and validating the
+whole tree with pydantic, which takes seconds on a large document. Repeat
+visualizations of the same document reuse the parsed object instead.
+"""
+
+from collections import OrderedDict
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from docling_core.types.doc.document import DoclingDocument
+
+# A parsed DoclingDocument holds about this many bytes of Python objects per
+# byte of its JSON; text-heavy documents measure around 5.5.
+PARSED_BYTES_PER_JSON_BYTE = 6
+
+
+class DoclingDocumentCache:
+    """Parsed DoclingDocuments keyed by document id and the `documents` table
+    version they were read at, bounded by estimated memory.
+
+    An entry read at an older version is a miss and is replaced, so a write to
+    `documents` never serves a stale structure. Cached documents are shared:
+    callers must not mutate them.
+    """
+
+    def __init__(self, max_bytes: int) -> None:
+        self.max_bytes = max_bytes
+        self.size_bytes = 0
+        self._entries: OrderedDict[str, tuple[int, DoclingDocument, int]] = (
+            OrderedDict()
+        )
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, document_id: str, version: int) -> "DoclingDocument | None":
+        entry = self._entries.get(document_id)
+        if entry is None or entry[0] != version:
+            return None
+        self._entries.move_to_end(document_id)
+        return entry[1]
+
+    def put(
+        self,
+        document_id: str,
+        version: int,
+        document: "DoclingDocument",
+        json_size: int,
+    ) -> None:
+        """Cache a document parsed from `json_size` bytes of JSON. A document
+        estimated larger than the whole budget is not cached."""
+        self.discard(document_id)
+        size = json_size * PARSED_BYTES_PER_JSON_BYTE
+        if size > self.max_bytes:
+            return
+        self._entries[document_id] = (version, document, size)
+        self.size_bytes += size
+        while self.size_bytes > self.max_bytes:
+            _, (_, _, evicted) = self._entries.popitem(last=False)
+            self.size_bytes -= evicted
+
+    def discard(self, document_id: str) -> None:
+        entry = self._entries.pop(document_id, None)
+        if entry is not None:
+            self.size_bytes -= entry[2]
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self.size_bytes = 0
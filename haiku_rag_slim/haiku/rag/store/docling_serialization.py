@@ -0,0 +1,62 @@
+"""Everything ingest stores for a converted DoclingDocument, in one pass.
+
+Storing a document needs its markdown, its compressed structure and pages, its
+`document_items` rows with their decoded picture bytes, and, to order picture
+chunks among text chunks, each item's position. Produced separately, each of
+these walked the document again and the structure went through a full
+`model_dump` dict first. `serialize_docling` produces them together: the item
+rows, positions and picture bytes come from one `iterate_items()` walk, and the
+structure and pages are written by pydantic straight to JSON.
+"""
+
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+from haiku.rag.store.compression import CompressionParams, compress_docling
+from haiku.rag.store.models.document_item import DocumentItem, extract_items
+
+if TYPE_CHECKING:
+    from docling_core.types.doc.document import DoclingDocument
+
+
+@dataclass
+class DoclingSerialization:
+    """The stored forms of one DoclingDocument."""
+
+    markdown: str
+    # Compressed structure without pages or picture images, and each page
+    # compressed on its own (see compress_docling_split).
+    structure: bytes
+    pages: dict[int, bytes]
+    version: str
+    # Item rows in iterate_items() order, with no document_id yet.
+    items: list[DocumentItem]
+    # Each item's index in iterate_items() order, by self_ref.
+    positions: dict[str, int]
+    # Decoded picture bytes by self_ref, shared with the picture items.
+    pictures: dict[str, bytes]
+
+
+def serialize_docling(
+    docling_doc: "DoclingDocument", params: CompressionParams | None = None
+) -> DoclingSerialization:
+    """Serialize a DoclingDocument for storage.
+
+    CPU-bound and proportional to the document's size: async callers run it
+    in a thread.
+    """
+    items = extract_items("", docling_doc)
+    structure, pages = compress_docling(docling_doc, params)
+    return DoclingSerialization(
+        markdown=docling_doc.export_to_markdown(),
+        structure=structure,
+        pages=pages,
+        version=docling_doc.version,
+        items=items,
+        positions={item.self_ref: item.position for item in items},
+        pictures={
+            item.self_ref: item.picture_data
+            for item in items
+            if item.picture_data is not None
+        },
+    )
@@ -1,21 +1,33 @@
 import asyncio
+import base64
+import copy
 import json
 import logging
-from collections.abc import AsyncIterator, Coroutine
+from collections.abc import AsyncIterator, Callable, Coroutine
 from contextlib import asynccontextmanager
 from dataclasses import dataclass
 from datetime import UTC, datetime, timedelta
 from enum import Enum
 from importlib import metadata
 from pathlib import Path
-from typing import Any
+from time import monotonic
+from typing import TYPE_CHECKING, Any
 
 import lancedb
+import pyarrow as pa
 from lancedb.index import IvfPq
 from packaging.version import parse
 
 from haiku.rag.config import AppConfig, get_config
 from haiku.rag.embeddings import get_embedder
+from haiku.rag.store.compaction import CompactionRun, in_peak_window, run_compaction
+from haiku.rag.store.compression import (
+    CompressionParams,
+    add_dictionary_loader,
+    register_dictionary,
+    remove_dictionary_loader,
+)
+from haiku.rag.store.disk_cache import disk_cache_endpoint
 from haiku.rag.store.exceptions import MigrationRequiredError, ReadOnlyError
 from haiku.rag.store.schema import (
     REQUIRED_TABLES,
@@ -23,12 +35,21 @@ from haiku.rag.store.schema import (
     DocumentMetaRecord,
     SettingsRecord,
     create_chunk_model,
+    create_document_meta_model,
     ensure_indexes,
     get_document_items_arrow_schema,
+    get_document_pages_arrow_schema,
     get_documents_arrow_schema,
+    get_picture_blobs_arrow_schema,
+    metadata_column_field,
+    metadata_column_name,
+    metadata_column_values,
     query_to_pydantic,
 )
 
+if TYPE_CHECKING:
+    from haiku.rag.config.models import MetadataColumnConfig
+
 logger = logging.getLogger(__name__)
 
 
@@ -47,6 +68,9 @@ class ConnectionMode(Enum):
         return ConnectionMode.OBJECT_STORAGE
 
 
+# document_meta rows per backfill write of newly declared metadata columns.
+_METADATA_BACKFILL_BATCH = 10_000
+
 _sessions: dict[tuple[int | None, int | None], lancedb.Session] = {}
 
 
@@ -72,8 +96,13 @@ def _session(config: AppConfig) -> lancedb.Session:
 
 
 async def connect_lancedb(
-    config: AppConfig, db_path: Path | None = None
+    config: AppConfig, db_path: Path | None = None, read_only: bool = False
 ) -> lancedb.AsyncConnection:
+    """Connect to the configured database.
+
+    A read-only connection to object storage goes through the local disk
+    cache when lancedb.disk_cache is enabled.
+    """
     interval = config.lancedb.read_consistency_interval_seconds
     kwargs: dict[str, Any] = {
         "session": _session(config),
@@ -90,6 +119,9 @@ async def connect_lancedb(
             **kwargs,
         )
     elif mode == ConnectionMode.OBJECT_STORAGE:
+        if read_only and config.lancedb.disk_cache.enabled:
+            uri, kwargs["storage_options"] = disk_cache_endpoint(config)
+            return await lancedb.connect_async(uri=uri, **kwargs)
         if config.lancedb.storage_options:
             kwargs["storage_options"] = config.lancedb.storage_options
         return await lancedb.connect_async(uri=config.lancedb.uri, **kwargs)
@@ -189,6 +221,11 @@ class Store:
         # and fail fast instead of snapshotting a half-rebuilt database.
         self._rebuild_lock = asyncio.Lock()
         self._is_new_db = False
+        # Set on the read-only views pin_versions hands out; they share this
+        # store's connection and must not close it.
+        self._pinned = False
+        # Id of the stored dictionary new docling structure is compressed with.
+        self._zstd_dictionary_id: int | None = None
 
         if self._connection_mode == ConnectionMode.LOCAL:
             if not self.db_path.exists():
@@ -208,7 +245,7 @@ class Store:
     async def _initialize(self):
         """Perform async initialization: connect to LanceDB, init tables, validate."""
         self.db: lancedb.AsyncConnection = await connect_lancedb(
-            self._config, self.db_path
+            self._config, self.db_path, read_only=self._read_only
         )
 
         # Read once and thread onward: on object storage each of these is a
@@ -221,6 +258,7 @@ class Store:
         if not is_new_db and "settings" in existing_tables:
             self.settings_table = await self.db.open_table("settings")
             stored_settings = await self._read_stored_settings()
+            self._load_zstd_dictionaries(stored_settings)
 
         # An existing database's chunks can only be read with the dimension they
         # were written at.
@@ -241,6 +279,9 @@ class Store:
         if not self._skip_validation:
             await self._validate_configuration(stored_settings)
 
+        # Dictionaries trained by another process after this one opened.
+        add_dictionary_loader(self._fetch_zstd_dictionary)
+
     async def __aenter__(self):
         # If _initialize connects to LanceDB but then fails (e.g. migration
         # check, config validation), close the connection so it doesn't
@@ -261,18 +302,19 @@ class Store:
         """Whether the store is in read-only mode."""
         return self._read_only
 
-    async def _read_stored_settings(self) -> dict:
+    async def _read_stored_settings(
+        self, table: lancedb.AsyncTable | None = None
+    ) -> dict:
         """The stored settings blob, or {} if it is absent or not a JSON object.
+        Read from `table` when given, otherwise from `settings_table`.
 
         Only decoding failures are tolerated. A storage failure must propagate:
         read as empty settings it would look like version 0.0.0, and the
         migration check would declare every migration pending.
         """
+        table = table if table is not None else self.settings_table
         rows = (
-            await self.settings_table.query()
-            .where("id = 'settings'")
-            .limit(1)
-            .to_arrow()
+            await table.query().where("id = 'settings'").limit(1).to_arrow()
         ).to_pylist()
         if not rows or not rows[0].get("settings"):
             return {}
@@ -282,6 +324,69 @@ class Store:
             return {}
         return decoded if isinstance(decoded, dict) else {}
 
+    def _load_zstd_dictionaries(self, settings: dict) -> None:
+        """Register every dictionary stored under the settings blob's
+        `zstd_dictionaries` key. Superseded dictionaries stay registered:
+        blobs written with them still name them in their frame headers."""
+        stored = settings.get("zstd_dictionaries") or {}
+        for content in (stored.get("dictionaries") or {}).values():
+            register_dictionary(base64.b64decode(content))
+        self._zstd_dictionary_id = stored.get("active")
+
+    def _fetch_zstd_dictionary(self, dict_id: int) -> bytes | None:
+        """Read a dictionary stored since this store opened, e.g. by
+        `haiku-rag train-dictionary` in another process.
+
+        Decompression is synchronous and may run on the event loop's thread,
+        so the settings row is read on LanceDB's own background loop, through
+        a freshly opened table that sees the latest version.
+        """
+        from lancedb.background_loop import LOOP
+
+        async def read() -> dict:
+            return await self._read_stored_settings(
+                await self.db.open_table("settings")
+            )
+
+        try:
+            settings = LOOP.run(read())
+        except Exception:
+            logger.warning("Could not read zstd dictionaries", exc_info=True)
+            return None
+        stored = (settings.get("zstd_dictionaries") or {}).get("dictionaries") or {}
+        content = stored.get(str(dict_id))
+        return base64.b64decode(content) if content is not None else None
+
+    async def save_zstd_dictionary(self, content: bytes) -> int:
+        """Store a trained dictionary and make it the one new docling
+        structure is compressed with.
+
+        Returns:
+            The dictionary id.
+        """
+        self._assert_writable()
+        dict_id = register_dictionary(content)
+        settings = await self._read_stored_settings()
+        stored = settings.setdefault("zstd_dictionaries", {"dictionaries": {}})
+        stored["dictionaries"][str(dict_id)] = base64.b64encode(content).decode()
+        stored["active"] = dict_id
+        await self.settings_table.update(
+            {"settings": json.dumps(settings)}, where="id = 'settings'"
+        )
+        self._zstd_dictionary_id = dict_id
+        return dict_id
+
+    @property
+    def compression_params(self) -> CompressionParams:
+        """How new docling blobs are compressed, from the storage config and
+        the database's active dictionary."""
+        config = self._config.storage.compression
+        return CompressionParams(
+            level=config.level,
+            threads=config.threads,
+            dictionary_id=self._zstd_dictionary_id if config.dictionary else None,
+        )
+
     def _assert_writable(self) -> None:
         """Raise ReadOnlyError if the store is in read-only mode."""
         if self._read_only:
@@ -338,6 +443,70 @@ class Store:
                 # a silently skipped cleanup hides tag-interaction bugs.
                 logger.debug(f"Vacuum skipped due to resource constraints: {e}")
 
+    async def compact(
+        self, retention_seconds: int | None = None
+    ) -> CompactionRun | None:
+        """Compact only the tables whose layout crossed a `storage.compaction`
+        threshold, and record the run in the settings blob if it compacted any.
+
+        This is the pass that follows writes when auto_vacuum is on. Unlike
+        `vacuum`, a table below every threshold is not touched. The pass is
+        skipped in LanceDB Cloud, inside a configured peak window, and while
+        another vacuum or compaction is running.
+
+        Args:
+            retention_seconds: Retention threshold in seconds. If None, uses
+                config.storage.vacuum_retention_seconds.
+
+        Returns:
+            The run, or None when the pass was skipped.
+
+        Raises:
+            ReadOnlyError: If the store is in read-only mode.
+            RuntimeError: On lance errors during optimize; only OSError
+                (resource pressure) skips the pass.
+        """
+        self._assert_writable()
+
+        if self._connection_mode == ConnectionMode.CLOUD:
+            return None
+
+        config = self._config.storage.compaction
+        if in_peak_window(config.peak_hours, datetime.now()):
+            logger.debug("Compaction deferred: inside a configured peak window")
+            return None
+
+        if self._vacuum_lock.locked():
+            return None
+
+        async with self._vacuum_lock, self._write_lock:
+            if retention_seconds is None:
+                retention_seconds = self._config.storage.vacuum_retention_seconds
+            retention = timedelta(seconds=retention_seconds)
+            try:
+                run = await run_compaction(
+                    self._tables(),
+                    config,
+                    lambda table: self._tag_safe_retention(table, retention),
+                )
+            except OSError as e:
+                logger.debug(f"Compaction skipped due to resource constraints: {e}")
+                return None
+            # A pass that touched nothing is not recorded: writing the settings
+            # row would add the very table version compaction exists to prune.
+            if any(table.compacted for table in run.tables):
+                await self._record_compaction(run)
+            return run
+
+    async def _record_compaction(self, run: CompactionRun) -> None:
+        """Store the latest run under the settings blob's `compaction` key,
+        where `haiku-rag info` reads it."""
+        settings = await self._read_stored_settings()
+        settings["compaction"] = run.model_dump(mode="json")
+        await self.settings_table.update(
+            {"settings": json.dumps(settings)}, where="id = 'settings'"
+        )
+
     async def _tag_safe_retention(
         self, table: lancedb.AsyncTable, retention: timedelta
     ) -> timedelta:
@@ -411,6 +580,31 @@ class Store:
         except Exception as e:
             logger.warning(f"Could not create vector index: {e}")
 
+    async def warm(self) -> list[str]:
+        """Load the search indexes and the document_meta table ahead of queries.
+
+        A fresh process otherwise pays for loading vector index partitions and
+        FTS posting lists on its first searches, from object storage when the
+        database lives there. Every index on the chunks, documents and
+        document_meta tables is prewarmed into the session's index cache, and
+        document_meta, which filtered searches resolve against, is scanned once
+        (through the disk cache when one is enabled). Tables without indexes
+        yet are skipped.
+
+        Returns:
+            The warmed indexes as "table.index" names.
+        """
+        started = monotonic()
+        warmed: list[str] = []
+        for name in ("chunks", "documents", "document_meta"):
+            table: lancedb.AsyncTable = getattr(self, f"{name}_table")
+            for index in await table.list_indices():
+                await table.prewarm_index(index.name)
+                warmed.append(f"{name}.{index.name}")
+        await self.document_meta_table.query().to_arrow()
+        logger.info(f"Warmed {len(warmed)} indexes in {monotonic() - started:.1f}s")
+        return warmed
+
     async def _validate_configuration(
         self, stored_settings: dict | None = None
     ) -> None:
@@ -456,13 +650,15 @@ class Store:
 
         # Create or open document_meta table (mutable attributes kept out of the
         # blob-bearing documents row).
+        declared = self._config.storage.metadata_columns
         if "document_meta" in existing_tables:
             self.document_meta_table = await self.db.open_table("document_meta")
         else:
             self.document_meta_table = await self.db.create_table(
-                "document_meta", schema=DocumentMetaRecord
+                "document_meta", schema=create_document_meta_model(declared)
             )
-            await ensure_indexes(self.document_meta_table, "document_meta")
+            await ensure_indexes(self.document_meta_table, "document_meta", declared)
+        self._resolve_metadata_columns(await self.document_meta_table.schema())
 
         # Create or open chunks table
         if "chunks" in existing_tables:
@@ -482,6 +678,24 @@ class Store:
             )
             await ensure_indexes(self.document_items_table, "document_items")
 
+        # Create or open document_pages table (page images, one row per page)
+        if "document_pages" in existing_tables:
+            self.document_pages_table = await self.db.open_table("document_pages")
+        else:
+            self.document_pages_table = await self.db.create_table(
+                "document_pages", schema=get_document_pages_arrow_schema()
+            )
+            await ensure_indexes(self.document_pages_table, "document_pages")
+
+        # Create or open picture_blobs table (picture bytes, one row per content)
+        if "picture_blobs" in existing_tables:
+            self.picture_blobs_table = await self.db.open_table("picture_blobs")
+        else:
+            self.picture_blobs_table = await self.db.create_table(
+                "picture_blobs", schema=get_picture_blobs_arrow_schema()
+            )
+            await ensure_indexes(self.picture_blobs_table, "picture_blobs")
+
         # _initialize opened the settings table when the database had one.
         if "settings" not in existing_tables:
             self.settings_table = await self.db.create_table(
@@ -516,9 +730,128 @@ class Store:
                 "Run 'haiku-rag migrate' to upgrade."
             )
 
-    async def migrate(self) -> list[str]:
+    def _resolve_metadata_columns(self, schema: pa.Schema) -> None:
+        """Write and read the declared metadata columns that `document_meta`
+        has with the declared type. The others wait for `migrate`."""
+        materialized: list[MetadataColumnConfig] = []
+        pending: list[str] = []
+        for column in self._config.storage.metadata_columns:
+            name = metadata_column_name(column.key)
+            if name in schema.names and schema.field(name).type == (
+                metadata_column_field(column).type
+            ):
+                materialized.append(column)
+            else:
+                pending.append(name)
+        if pending and not self._skip_migration_check:
+            logger.warning(
+                "Metadata columns %s are declared but not in the database; "
+                "run `haiku-rag migrate` to add them.",
+                ", ".join(pending),
+            )
+        self.metadata_columns = materialized
+        self.DocumentMetaRecord: type[DocumentMetaRecord] = create_document_meta_model(
+            materialized
+        )
+
+    async def materialize_metadata_columns(self) -> list[str]:
+        """Bring the `meta_<key>` columns of `document_meta` in line with
+        `storage.metadata_columns`.
+
+        Adds and backfills declared columns from each document's metadata
+        JSON, drops columns no longer declared or declared with another type,
+        and indexes them. Rows without a value are left NULL and not
+        rewritten.
+
+        Returns:
+            Descriptions of the changes made.
+
+        Raises:
+            ReadOnlyError: If the store is in read-only mode.
+        """
+        self._assert_writable()
+        declared = self._config.storage.metadata_columns
+        wanted = {
+            metadata_column_name(c.key): metadata_column_field(c) for c in declared
+        }
+        schema = await self.document_meta_table.schema()
+        changes: list[str] = []
+
+        stale = [
+            name
+            for name in schema.names
+            if name.startswith("meta_")
+            and (name not in wanted or schema.field(name).type != wanted[name].type)
+        ]
+        if stale:
+            await self.document_meta_table.drop_columns(stale)
+            changes += [f"Dropped metadata column {name}" for name in stale]
+
+        present = set(schema.names) - set(stale)
+        missing = [c for c in declared if metadata_column_name(c.key) not in present]
+        if missing:
+            await self.document_meta_table.add_columns(
+                pa.schema([metadata_column_field(c) for c in missing])
+            )
+            await self._backfill_metadata_columns(missing)
+            changes += [
+                f"Added metadata column {metadata_column_name(c.key)}" for c in missing
+            ]
+
+        indexed = await ensure_indexes(
+            self.document_meta_table, "document_meta", declared
+        )
+        changes += [f"Indexed metadata column {name}" for name in indexed]
+        self._resolve_metadata_columns(await self.document_meta_table.schema())
+        return changes
+
+    async def _backfill_metadata_columns(
+        self, columns: "list[MetadataColumnConfig]"
+    ) -> None:
+        schema = pa.schema(
+            [pa.field("id", pa.string(), nullable=False)]
+            + [metadata_column_field(c) for c in columns]
+        )
+        stream = (
+            await self.document_meta_table.query()
+            .select(["id", "metadata"])
+            .to_batches(max_batch_length=_METADATA_BACKFILL_BATCH)
+        )
+        async for batch in stream:
+            rows = []
+            for row in batch.to_pylist():
+                try:
+                    metadata = json.loads(row["metadata"] or "{}")
+                except json.JSONDecodeError:
+                    continue
+                if not isinstance(metadata, dict):
+                    continue
+                values = metadata_column_values(metadata, columns)
+                if any(v is not None for v in values.values()):
+                    rows.append({"id": row["id"], **values})
+            if rows:
+                await (
+                    self.document_meta_table.merge_insert("id")
+                    .when_matched_update_all()
+                    .execute(pa.Table.from_pylist(rows, schema=schema))
+                )
+
+    async def migrate(
+        self,
+        concurrency: int = 4,
+        on_progress: Callable[[str, int, int], None] | None = None,
+    ) -> list[str]:
         """Run pending database migrations.
 
+        An interrupted migration resumes after its last completed step. See
+        `haiku.rag.store.upgrades.run_pending_upgrades`.
+
+        Args:
+            concurrency: Maximum number of upgrade steps writing disjoint
+                tables that run at once.
+            on_progress: Called as a step advances with its label, the units
+                processed so far and its total.
+
         Returns:
             List of descriptions of applied upgrades.
 
@@ -527,17 +860,23 @@ class Store:
         """
         self._assert_writable()
 
-        from haiku.rag.store.upgrades import run_pending_upgrades
+        from haiku.rag.store.upgrades import clear_checkpoint, run_pending_upgrades
 
         db_version = await self.get_haiku_version()
         current_version = metadata.version("haiku.rag-slim")
 
-        applied = await run_pending_upgrades(self, db_version)
+        applied = await run_pending_upgrades(
+            self, db_version, concurrency=concurrency, on_progress=on_progress
+        )
+        # Declared metadata columns are configuration, not a version step:
+        # reconcile them on every migrate.
+        applied += await self.materialize_metadata_columns()
 
         # Advance the schema marker only forward — never downgrade a database
         # opened with an older build than last stamped it.
         if parse(current_version) > parse(db_version):
             await self.set_haiku_version(current_version)
+        await clear_checkpoint(self)
 
         return applied
 
@@ -608,7 +947,8 @@ class Store:
     def close(self):
         """Close the database connection."""
         # AsyncConnection.close() is synchronous
-        if hasattr(self, "db"):
+        if hasattr(self, "db") and not self._pinned:
+            remove_dictionary_loader(self._fetch_zstd_dictionary)
             self.db.close()
 
     def _tables(self) -> dict[str, lancedb.AsyncTable]:
@@ -618,6 +958,8 @@ class Store:
             "document_meta": self.document_meta_table,
             "chunks": self.chunks_table,
             "document_items": self.document_items_table,
+            "document_pages": self.document_pages_table,
+            "picture_blobs": self.picture_blobs_table,
             "settings": self.settings_table,
         }
 
@@ -625,6 +967,71 @@ class Store:
         """Capture current versions of key tables for rollback using LanceDB's API."""
         return {name: await table.version() for name, table in self._tables().items()}
 
+    @asynccontextmanager
+    async def pin_versions(
+        self, versions: dict[str, int] | None = None, *, tag: str | None = None
+    ) -> AsyncIterator["Store"]:
+        """A read-only view of the store with every table checked out at one
+        set of versions.
+
+        Queries through the view read those versions for as long as the block
+        runs, whatever writers commit meanwhile, and skip the per-query
+        read-consistency check. Without arguments the latest version of every
+        table is pinned, read under the write lock so no in-process write lands
+        between tables. A writer in another process can still commit between
+        the per-table reads; pin a tag created with writers stopped when that
+        matters.
+
+        Args:
+            versions: Table name mapped to the version to read, as returned by
+                current_table_versions.
+            tag: Name of a complete tag whose versions to read.
+
+        Raises:
+            ValueError: If both versions and tag are given, versions omits a
+                table, or the tag does not exist or is partial.
+        """
+        if versions is not None and tag is not None:
+            raise ValueError("Pass either versions or tag, not both")
+        if tag is not None:
+            info = (await self.list_tags()).get(tag)
+            if info is None:
+                raise ValueError(f"Tag '{tag}' does not exist")
+            if not info.complete:
+                raise ValueError(
+                    f"Tag '{tag}' is partial (missing tables: "
+                    f"{', '.join(info.missing_tables)}) and cannot be read"
+                )
+            versions = info.tables
+        if versions is not None:
+            missing = [name for name in self._tables() if name not in versions]
+            if missing:
+                raise ValueError(f"No version given for tables: {', '.join(missing)}")
+
+        # Fresh handles: checkout pins the handle it is called on, and the
+        # store's own handles must keep following the latest version.
+        tables: dict[str, lancedb.AsyncTable] = {}
+        try:
+            async with self._write_lock:
+                for name in self._tables():
+                    table = await self.db.open_table(name)
+                    tables[name] = table
+                    await table.checkout(
+                        versions[name]
+                        if versions is not None
+                        else await table.version()
+                    )
+
+            view = copy.copy(self)
+            view._read_only = True
+            view._pinned = True
+            for name, table in tables.items():
+                setattr(view, f"{name}_table", table)
+            yield view
+        finally:
+            for table in tables.values():
+                table.close()
+
     @asynccontextmanager
     async def write_transaction(self) -> AsyncIterator[None]:
         """Hold the write lock for a multi-table mutation, restoring every table
@@ -896,7 +1303,8 @@ class Store:
 
         Args:
             table_name: Name of the table ("documents", "document_meta",
-                "chunks", "document_items", or "settings")
+                "chunks", "document_items", "document_pages", "picture_blobs",
+                or "settings")
 
         Returns:
             List of version info dicts with "version" and "timestamp" keys
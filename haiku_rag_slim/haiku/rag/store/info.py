@@ -5,23 +5,35 @@ is configured, and never writes a table or a version.
 """
 
 import json
+from datetime import datetime, timedelta
 from pathlib import Path
 
 import lancedb
 from pydantic import BaseModel, Field
 
 from haiku.rag.config import AppConfig
+from haiku.rag.converters.cache import read_conversion_cache_stats
+from haiku.rag.store.compaction import (
+    CompactionRun,
+    TableLayout,
+    compaction_reasons,
+    table_layout,
+)
+from haiku.rag.store.disk_cache import DiskCacheStats, read_disk_cache_stats
 from haiku.rag.store.engine import connect_lancedb
 from haiku.rag.store.schema import REQUIRED_TABLES
 
 
-async def get_database_stats(db: lancedb.AsyncConnection) -> dict:
+async def get_database_stats(
+    db: lancedb.AsyncConnection, retention: timedelta = timedelta(days=1)
+) -> dict:
     """Collect stats for every haiku.rag table on the connection.
 
     Missing tables return ``{"exists": False}``. Present tables include
-    ``num_rows``, ``total_bytes``, and ``num_versions``. The ``chunks``
-    entry additionally reports vector index status and, when an index
-    exists, ``num_indexed_rows`` and ``num_unindexed_rows``.
+    ``num_rows``, ``total_bytes``, ``num_versions`` and ``layout``, the
+    table's `TableLayout` with versions older than ``retention`` counted as
+    stale. The ``chunks`` entry additionally reports vector index status and,
+    when an index exists, ``num_indexed_rows`` and ``num_unindexed_rows``.
     """
     existing = set((await db.list_tables()).tables)
     stats: dict = {}
@@ -35,11 +47,13 @@ async def get_database_stats(db: lancedb.AsyncConnection) -> dict:
         tables[name] = tbl
         # lancedb's .stats() stub claims TableStatistics but returns a plain dict at runtime.
         tbl_stats: dict = await tbl.stats()  # type: ignore[assignment]  # ty: ignore[invalid-assignment]
+        versions = await tbl.list_versions()
         stats[name] = {
             "exists": True,
             "num_rows": tbl_stats.get("num_rows", 0),
             "total_bytes": tbl_stats.get("total_bytes", 0),
-            "num_versions": len(await tbl.list_versions()),
+            "num_versions": len(versions),
+            "layout": table_layout(tbl_stats, versions, datetime.now() - retention),
         }
 
     if stats["chunks"]["exists"]:
@@ -68,6 +82,10 @@ class TableInfo(BaseModel):
     num_rows: int = 0
     total_bytes: int = 0
     num_versions: int = 0
+    layout: TableLayout = Field(default_factory=TableLayout)
+    # Thresholds the table currently crosses; automatic compaction acts on it
+    # at its next pass when this is non-empty.
+    compaction_due: list[str] = Field(default_factory=list)
 
 
 class VectorIndexInfo(BaseModel):
@@ -93,6 +111,11 @@ class DatabaseInfo(BaseModel):
     tables: list[TableInfo] = Field(default_factory=list)
     vector_index: VectorIndexInfo = Field(default_factory=VectorIndexInfo)
     pending_migrations: list[PendingMigration] = Field(default_factory=list)
+    last_compaction: CompactionRun | None = None
+    # Set when lancedb.disk_cache is enabled and the cache has been used.
+    disk_cache: DiskCacheStats | None = None
+    # Set when processing.conversion_cache is enabled and has been used.
+    conversion_cache: DiskCacheStats | None = None
     packages: dict[str, str] = Field(default_factory=dict)
 
 
@@ -105,13 +128,16 @@ async def gather_database_info(config: AppConfig, db_path: Path) -> DatabaseInfo
     display_path = config.lancedb.uri or str(db_path)
 
     db = await connect_lancedb(config, db_path)
-    stats = await get_database_stats(db)
+    stats = await get_database_stats(
+        db, timedelta(seconds=config.storage.vacuum_retention_seconds)
+    )
 
     if not any(entry["exists"] for entry in stats.values()):
         return DatabaseInfo(path=display_path, exists=False)
 
     stored_version = "unknown"
     embeddings = EmbeddingsInfo()
+    last_compaction = None
     if stats["settings"]["exists"]:
         settings_tbl = await db.open_table("settings")
         rows = (
@@ -127,6 +153,8 @@ async def gather_database_info(config: AppConfig, db_path: Path) -> DatabaseInfo
                 name=model.get("name", "unknown"),
                 vector_dim=model.get("vector_dim"),
             )
+            if data.get("compaction"):
+                last_compaction = CompactionRun.model_validate(data["compaction"])
 
     tables = [
         TableInfo(
@@ -135,8 +163,19 @@ async def gather_database_info(config: AppConfig, db_path: Path) -> DatabaseInfo
             num_rows=stats[name].get("num_rows", 0),
             total_bytes=stats[name].get("total_bytes", 0),
             num_versions=stats[name].get("num_versions", 0),
+            layout=stats[name].get("layout", TableLayout()),
+            compaction_due=compaction_reasons(
+                stats[name].get("layout", TableLayout()), config.storage.compaction
+            ),
+        )
+        for name in (
+            "documents",
+            "document_meta",
+            "chunks",
+            "document_items",
+            "document_pages",
+            "picture_blobs",
         )
-        for name in ("documents", "document_meta", "chunks", "document_items")
     ]
 
     vector_index = VectorIndexInfo()
@@ -162,5 +201,14 @@ async def gather_database_info(config: AppConfig, db_path: Path) -> DatabaseInfo
             PendingMigration(version=step.version, description=step.description or "")
             for step in pending
         ],
+        last_compaction=last_compaction,
+        disk_cache=(
+            read_disk_cache_stats(config) if config.lancedb.disk_cache.enabled else None
+        ),
+        conversion_cache=(
+            read_conversion_cache_stats(config)
+            if config.processing.conversion_cache.enabled
+            else None
+        ),
         packages=get_package_versions(),
     )
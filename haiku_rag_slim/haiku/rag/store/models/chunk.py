@@ -1,7 +1,11 @@
-from typing import TYPE_CHECKING, Literal
+import json
+from collections.abc import Iterable, Mapping
+from typing import TYPE_CHECKING, Any, Literal
 
 from pydantic import BaseModel, PrivateAttr
 
+from haiku.rag.store.models.document_item import picture_hash
+
 if TYPE_CHECKING:
     from docling_core.types.doc.document import DocItem, DoclingDocument
 
@@ -113,6 +117,47 @@ class Chunk(BaseModel):
         return ChunkMetadata.model_validate(self.metadata)
 
 
+def picture_vectors(chunks: Iterable[Chunk]) -> dict[str, list[float]]:
+    """Embeddings of the embedded picture chunks, keyed by picture hash."""
+    return {
+        picture_hash(chunk._picture_data): chunk.embedding
+        for chunk in chunks
+        if chunk._picture_data is not None and chunk.embedding is not None
+    }
+
+
+def chunk_metadata_columns(metadata: Mapping[str, Any]) -> dict[str, Any]:
+    """Split a chunk's metadata dict into chunks table columns.
+
+    The `ChunkMetadata` fields get native list columns, so searches can filter
+    on them inside LanceDB. Any other key is kept as JSON in `metadata`.
+    `order` has its own column and is dropped.
+    """
+    meta = ChunkMetadata.model_validate(metadata)
+    extra = {
+        k: v
+        for k, v in metadata.items()
+        if k not in ChunkMetadata.model_fields and k != "order"
+    }
+    return {**meta.model_dump(), "metadata": json.dumps(extra)}
+
+
+def chunk_metadata_from_row(row: Mapping[str, Any]) -> dict[str, Any]:
+    """Rebuild a chunk's metadata dict from its chunks table columns, the
+    inverse of `chunk_metadata_columns`."""
+    headings = row["headings"]
+    metadata: dict[str, Any] = {
+        "doc_item_refs": list(row["doc_item_refs"] or []),
+        "headings": list(headings) if headings is not None else None,
+        "labels": list(row["labels"] or []),
+        "page_numbers": list(row["page_numbers"] or []),
+    }
+    extra = row.get("metadata") or "{}"
+    if extra != "{}":
+        metadata.update(json.loads(extra))
+    return metadata
+
+
 SearchType = Literal["vector", "fts", "hybrid"]
 
 
@@ -1,13 +1,18 @@
-import json
 from datetime import datetime
 from typing import TYPE_CHECKING
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, PrivateAttr
 
-from haiku.rag.store.compression import compress_docling_split, decompress_json
+from haiku.rag.store.compression import (
+    CompressionParams,
+    compress_docling,
+    decompress_json,
+)
 
 if TYPE_CHECKING:
-    from docling_core.types.doc.document import DoclingDocument, PageItem
+    from docling_core.types.doc.document import DoclingDocument
+
+    from haiku.rag.store.docling_serialization import DoclingSerialization
 
 
 class Document(BaseModel):
@@ -21,59 +26,87 @@ class Document(BaseModel):
     title: str | None = None
     metadata: dict = {}
     docling_document: bytes | None = Field(default=None, exclude=True)
-    docling_pages: bytes | None = Field(default=None, exclude=True)
+    # Compressed page images by page number, written to `document_pages`.
+    # None leaves the stored pages as they are; a dict replaces them.
+    docling_pages: dict[int, bytes] | None = Field(default=None, exclude=True)
     docling_version: str | None = Field(default=None, exclude=True)
     created_at: datetime = Field(default_factory=datetime.now)
     updated_at: datetime = Field(default_factory=datetime.now)
-
-    def set_docling(self, docling_doc: "DoclingDocument") -> None:
+    # The blob last parsed by get_docling_document and its result.
+    _parsed_docling: "tuple[bytes, DoclingDocument] | None" = PrivateAttr(default=None)
+    # The serialization set by set_serialized_docling and the DoclingDocument
+    # it came from, until the store path releases it.
+    _serialization: "tuple[DoclingDocument, DoclingSerialization] | None" = PrivateAttr(
+        default=None
+    )
+
+    def set_docling(
+        self,
+        docling_doc: "DoclingDocument",
+        params: CompressionParams | None = None,
+    ) -> None:
         """Serialize and store a DoclingDocument, splitting structure and pages.
 
         Sets docling_document (zstd-compressed structure without pages),
-        docling_pages (zstd-compressed page images), and docling_version.
+        docling_pages (each page's image zstd-compressed on its own), and
+        docling_version. ``params`` is usually the store's
+        ``compression_params``; without it zstd defaults are used.
         """
-        structure, pages = compress_docling_split(docling_doc.model_dump(mode="json"))
+        structure, pages = compress_docling(docling_doc, params)
         self.docling_document = structure
         self.docling_pages = pages
         self.docling_version = docling_doc.version
+        self._serialization = None
+
+    def set_serialized_docling(
+        self, docling_doc: "DoclingDocument", serialization: "DoclingSerialization"
+    ) -> None:
+        """Set content and docling blobs from ``serialize_docling`` output.
+
+        The serialization is kept, so its item rows, positions and picture
+        bytes are reused by chunking and storing ``docling_doc`` instead of
+        being extracted again. See ``docling_serialization``.
+        """
+        self.content = serialization.markdown
+        self.docling_document = serialization.structure
+        self.docling_pages = serialization.pages
+        self.docling_version = serialization.version
+        self._serialization = (docling_doc, serialization)
+
+    def docling_serialization(
+        self, docling_doc: "DoclingDocument", *, release: bool = False
+    ) -> "DoclingSerialization | None":
+        """The serialization set from ``docling_doc``.
+
+        Returns None when the document was set from another DoclingDocument,
+        or not from a serialization. ``release`` drops the kept serialization,
+        and the picture bytes it holds, once the caller is its last user.
+        """
+        kept = self._serialization
+        if release:
+            self._serialization = None
+        if kept is None or kept[0] is not docling_doc:
+            return None
+        return kept[1]
 
     def get_docling_document(self) -> "DoclingDocument | None":
         """Parse and return the stored DoclingDocument (without page images).
 
+        The result is kept until `docling_document` is reassigned, so repeat
+        calls return the same object instead of parsing the blob again.
+
         Returns:
             The parsed DoclingDocument, or None if not stored.
         """
         if self.docling_document is None:
             return None
+        parsed = self._parsed_docling
+        if parsed is not None and parsed[0] is self.docling_document:
+            return parsed[1]
 
         from docling_core.types.doc.document import DoclingDocument
 
         json_str = decompress_json(self.docling_document)
-        return DoclingDocument.model_validate_json(json_str)
-
-    def get_page_images(self, page_numbers: list[int]) -> "dict[int, PageItem]":
-        """Decompress and return page images for the requested page numbers.
-
-        Loads only the docling_pages blob — does not need the structure.
-        Validates only the requested pages through Pydantic (for pil_image property).
-
-        Args:
-            page_numbers: Page numbers to retrieve.
-
-        Returns:
-            Dict mapping page number to validated PageItem.
-        """
-        if self.docling_pages is None:
-            return {}
-
-        from docling_core.types.doc.document import PageItem
-
-        pages_json = decompress_json(self.docling_pages)
-        all_pages = json.loads(pages_json)
-
-        result: dict[int, PageItem] = {}
-        for page_no in page_numbers:
-            page_data = all_pages.get(str(page_no))
-            if page_data is not None:
-                result[page_no] = PageItem.model_validate(page_data)
-        return result
+        docling_doc = DoclingDocument.model_validate_json(json_str)
+        self._parsed_docling = (self.docling_document, docling_doc)
+        return docling_doc
@@ -1,4 +1,5 @@
 import base64
+import hashlib
 from collections.abc import Callable
 from typing import TYPE_CHECKING, Any
 
@@ -23,6 +24,12 @@ class DocumentItem(BaseModel):
     tree_depth: int = 0
 
 
+def picture_hash(data: bytes) -> str:
+    """The content address of picture bytes: the key of their `picture_blobs`
+    row."""
+    return hashlib.sha256(data).hexdigest()
+
+
 def _picture_description_text(item: "PictureItem") -> str | None:
     """Return the VLM-generated description text for a PictureItem, if any.
 
@@ -1,11 +1,15 @@
 from haiku.rag.store.repositories.chunk import ChunkRepository
 from haiku.rag.store.repositories.document import DocumentRepository
 from haiku.rag.store.repositories.document_item import DocumentItemRepository
+from haiku.rag.store.repositories.document_page import DocumentPageRepository
+from haiku.rag.store.repositories.picture_blob import PictureBlobRepository
 from haiku.rag.store.repositories.settings import SettingsRepository
 
 __all__ = [
     "ChunkRepository",
     "DocumentItemRepository",
+    "DocumentPageRepository",
     "DocumentRepository",
+    "PictureBlobRepository",
     "SettingsRepository",
 ]
@@ -1,5 +1,8 @@
+import hashlib
 import json
 import logging
+from collections import defaultdict, deque
+from collections.abc import Collection
 from typing import TYPE_CHECKING
 from uuid import uuid4
 
@@ -9,13 +12,39 @@ if TYPE_CHECKING:
 from lancedb.index import FTS
 from lancedb.rerankers import RRFReranker
 
+from haiku.rag.embeddings import contextualize
 from haiku.rag.store.engine import Store
-from haiku.rag.store.models.chunk import Chunk, SearchType
+from haiku.rag.store.models.chunk import (
+    Chunk,
+    SearchType,
+    chunk_metadata_columns,
+    chunk_metadata_from_row,
+)
 from haiku.rag.store.schema import ensure_indexes, query_to_pydantic
 from haiku.rag.utils import escape_sql_string
 
 logger = logging.getLogger(__name__)
 
+# Columns compared to tell whether a stored chunk row would be rewritten as is.
+_ROW_COLUMNS = (
+    "content",
+    "content_fts",
+    "doc_item_refs",
+    "headings",
+    "labels",
+    "page_numbers",
+    "metadata",
+    "order",
+    "vector",
+)
+
+
+def embedding_key(chunk: Chunk) -> str:
+    """Hash of the text a chunk is embedded from, as `contextualize` builds it.
+    Two text chunks with the same key get the same vector from the same
+    embedder."""
+    return hashlib.sha256(contextualize([chunk])[0].encode()).hexdigest()
+
 
 class ChunkRepository:
     """Repository for Chunk operations."""
@@ -37,10 +66,7 @@ class ChunkRepository:
 
     def _contextualize_content(self, chunk: Chunk) -> str:
         """Generate contextualized content for FTS by prepending headings."""
-        meta = chunk.get_chunk_metadata()
-        if meta.headings:
-            return "\n".join(meta.headings) + "\n" + chunk.content
-        return chunk.content
+        return contextualize([chunk])[0]
 
     def _to_record(self, chunk: Chunk, chunk_id: str):
         assert chunk.document_id is not None
@@ -50,9 +76,7 @@ class ChunkRepository:
             document_id=chunk.document_id,
             content=chunk.content,
             content_fts=self._contextualize_content(chunk),
-            metadata=json.dumps(
-                {k: v for k, v in chunk.metadata.items() if k != "order"}
-            ),
+            **chunk_metadata_columns(chunk.metadata),
             order=int(chunk.order),
             vector=chunk.embedding,
         )
@@ -98,10 +122,59 @@ class ChunkRepository:
 
         return chunks
 
+    async def reuse_embeddings(self, document_id: str, chunks: list[Chunk]) -> int:
+        """Carry stored vectors over to the unchanged chunks of an update.
+
+        Each text chunk without an embedding whose `embedding_key` matches a
+        stored text chunk of the document takes that chunk's id and vector, so
+        only new or edited chunks are embedded and `replace_for_document` keeps
+        the row. Repeated texts pair up with stored repeats in order. Picture
+        chunks are left alone; their vectors come from their picture blobs.
+
+        Returns:
+            The number of chunks given a stored vector.
+        """
+        pending = [c for c in chunks if c.embedding is None and c._picture_data is None]
+        if not pending:
+            return 0
+        safe_id = escape_sql_string(document_id)
+        rows = (
+            await self.store.chunks_table.query()
+            .where(f"document_id = '{safe_id}'")
+            .select(["id", "content", "headings", "labels", "order", "vector"])
+            .to_list()
+        )
+        stored: dict[str, deque[dict]] = defaultdict(deque)
+        for row in sorted(rows, key=lambda r: r["order"]):
+            if "picture" not in (row["labels"] or []):
+                key = embedding_key(
+                    Chunk(
+                        content=row["content"], metadata={"headings": row["headings"]}
+                    )
+                )
+                stored[key].append(row)
+
+        reused = 0
+        for chunk in pending:
+            key = embedding_key(chunk)
+            if stored[key]:
+                row = stored[key].popleft()
+                chunk.id = row["id"]
+                chunk.embedding = list(row["vector"])
+                reused += 1
+        return reused
+
     async def replace_for_document(
         self, document_id: str, chunks: list[Chunk]
     ) -> list[Chunk]:
-        """Replace all chunks for a document with one scoped merge operation."""
+        """Replace all chunks for a document with one scoped merge operation.
+
+        A chunk carrying the id of one of the document's stored chunks, as
+        `reuse_embeddings` leaves it, updates that row in place, and is not
+        written at all when the row would not change. Other chunks get new ids
+        and are inserted, and stored chunks no longer present are deleted, so
+        an edit writes only the chunks it touched.
+        """
         self.store._assert_writable()
 
         if not chunks:
@@ -114,18 +187,83 @@ class ChunkRepository:
             )
             assert chunk.embedding is not None, "All chunks must have embeddings"
 
+        safe_id = escape_sql_string(document_id)
+        stored = {
+            row["id"]: row
+            for row in await self.store.chunks_table.query()
+            .where(f"document_id = '{safe_id}'")
+            .select(["id", *_ROW_COLUMNS])
+            .to_list()
+        }
+
         records = []
+        kept: set[str] = set()
         for chunk in chunks:
+            if chunk.id in stored and chunk.id not in kept:
+                kept.add(chunk.id)
+                record = self._to_record(chunk, chunk.id)
+                row = stored[chunk.id]
+                if all(getattr(record, c) == row[c] for c in _ROW_COLUMNS):
+                    continue
+            else:
+                chunk.id = str(uuid4())
+                record = self._to_record(chunk, chunk.id)
+            records.append(record)
+
+        removed = [chunk_id for chunk_id in stored if chunk_id not in kept]
+        # Name whichever of the kept and removed ids is the shorter list.
+        if len(kept) < len(removed):
+            keep = ", ".join(f"'{escape_sql_string(i)}'" for i in kept)
+            stale = f"document_id = '{safe_id}'" + (
+                f" AND id NOT IN ({keep})" if keep else ""
+            )
+        else:
+            stale = f"id IN ({', '.join(f"'{escape_sql_string(i)}'" for i in removed)})"
+
+        if records:
+            merge = (
+                self.store.chunks_table.merge_insert("id")
+                .when_matched_update_all()
+                .when_not_matched_insert_all()
+            )
+            if removed:
+                merge = merge.when_not_matched_by_source_delete(stale)
+            await merge.execute(records)
+        elif removed:
+            await self.store.chunks_table.delete(stale)
+        return chunks
+
+    async def replace_for_documents(
+        self, document_ids: list[str], chunks: list[Chunk]
+    ) -> list[Chunk]:
+        """Write chunks spanning many documents in a single table version.
+
+        Chunks of the documents in `document_ids` replace whatever those
+        documents had; chunks of any other document are inserted as new.
+        """
+        self.store._assert_writable()
+        if not document_ids:
+            await self.create(chunks)
+            return chunks
+
+        ids = ", ".join(f"'{escape_sql_string(d)}'" for d in document_ids)
+        if not chunks:
+            await self.store.chunks_table.delete(f"document_id IN ({ids})")
+            return []
+
+        records = []
+        for chunk in chunks:
+            assert chunk.document_id, "All chunks must have a document_id"
+            assert chunk.embedding is not None, "All chunks must have embeddings"
             chunk_id = str(uuid4())
             records.append(self._to_record(chunk, chunk_id))
             chunk.id = chunk_id
 
-        safe_id = escape_sql_string(document_id)
         await (
             self.store.chunks_table.merge_insert(["document_id", "order"])
             .when_matched_update_all()
             .when_not_matched_insert_all()
-            .when_not_matched_by_source_delete(f"document_id = '{safe_id}'")
+            .when_not_matched_by_source_delete(f"document_id IN ({ids})")
             .execute(records)
         )
         return chunks
@@ -141,12 +279,11 @@ class ChunkRepository:
             return None
 
         chunk_record = results[0]
-        md = json.loads(chunk_record.metadata)
         return Chunk(
             id=chunk_record.id,
             document_id=chunk_record.document_id,
             content=chunk_record.content,
-            metadata=md,
+            metadata=chunk_metadata_from_row(dict(chunk_record)),
             order=chunk_record.order,
         )
 
@@ -165,13 +302,12 @@ class ChunkRepository:
 
         chunks: list[Chunk] = []
         for rec in results:
-            md = json.loads(rec.metadata)
             chunks.append(
                 Chunk(
                     id=rec.id,
                     document_id=rec.document_id,
                     content=rec.content,
-                    metadata=md,
+                    metadata=chunk_metadata_from_row(dict(rec)),
                     order=rec.order,
                 )
             )
@@ -190,14 +326,22 @@ class ChunkRepository:
     async def delete_by_document_id(self, document_id: str) -> bool:
         """Delete all chunks for a document."""
         self.store._assert_writable()
-        chunks = await self.get_by_document_id(document_id)
-
-        if not chunks:
+        predicate = f"document_id = '{escape_sql_string(document_id)}'"
+        if not await self.store.chunks_table.count_rows(filter=predicate):
             return False
 
-        await self.store.chunks_table.delete(f"document_id = '{document_id}'")
+        await self.store.chunks_table.delete(predicate)
         return True
 
+    async def delete_by_document_ids(self, document_ids: Collection[str]) -> None:
+        """Delete the chunks of every document in `document_ids` in a single
+        table version."""
+        if not document_ids:
+            return
+        self.store._assert_writable()
+        ids = ", ".join(f"'{escape_sql_string(d)}'" for d in document_ids)
+        await self.store.chunks_table.delete(f"document_id IN ({ids})")
+
     async def search(
         self,
         query: str = "",
@@ -205,6 +349,7 @@ class ChunkRepository:
         search_type: SearchType = "hybrid",
         filter: str | None = None,
         query_vector: list[float] | None = None,
+        chunk_filter: str | None = None,
     ) -> list[tuple[Chunk, float]]:
         """Search for relevant chunks using the specified search method.
 
@@ -214,6 +359,9 @@ class ChunkRepository:
             search_type: "vector", "fts", or "hybrid" (default).
             filter: Optional SQL WHERE clause to filter documents before searching chunks.
             query_vector: Pre-computed query embedding; forces vector-only search.
+            chunk_filter: Optional SQL WHERE clause on chunk columns, e.g.
+                ``array_has(labels, 'table')`` or
+                ``array_has_any(page_numbers, [10, 11, 12])``.
 
         Returns:
             List of (chunk, score) tuples ordered by relevance.
@@ -221,7 +369,7 @@ class ChunkRepository:
         if query_vector is None and not query.strip():
             return []
 
-        chunk_filter: str | None = None
+        conditions = [f"({chunk_filter})"] if chunk_filter else []
         if filter:
             # Translate the document-level filter into a chunk-level
             # document_id IN (...) clause so LanceDB can combine it with
@@ -237,7 +385,7 @@ class ChunkRepository:
             if docs_df.empty:
                 return []
             id_list = ", ".join(f"'{d}'" for d in docs_df["id"])
-            chunk_filter = f"document_id IN ({id_list})"
+            conditions.append(f"document_id IN ({id_list})")
 
         if query_vector is not None:
             # Image-as-query: vector-only against the pre-computed embedding.
@@ -271,8 +419,8 @@ class ChunkRepository:
                 .rerank(reranker)
             )
 
-        if chunk_filter is not None:
-            results = results.where(chunk_filter)
+        if conditions:
+            results = results.where(" AND ".join(conditions))
         results = results.limit(limit)
         return await self._process_search_results(results)
 
@@ -315,13 +463,12 @@ class ChunkRepository:
 
         chunks: list[Chunk] = []
         for rec in results:
-            md = json.loads(rec.metadata)
             chunks.append(
                 Chunk(
                     id=rec.id,
                     document_id=rec.document_id,
                     content=rec.content,
-                    metadata=md,
+                    metadata=chunk_metadata_from_row(dict(rec)),
                     order=rec.order,
                     document_uri=doc_uri,
                     document_title=doc_title,
@@ -349,7 +496,7 @@ class ChunkRepository:
         safe_ids = ", ".join(f"'{escape_sql_string(did)}'" for did in document_ids)
         rows = await (
             self.store.chunks_table.query()
-            .select(["id", "document_id", "metadata"])
+            .select(["id", "document_id", "doc_item_refs"])
             .where(f"document_id IN ({safe_ids})")
             .to_list()
         )
@@ -357,8 +504,7 @@ class ChunkRepository:
         index: dict[str, dict[str, list[str]]] = {}
         for row in rows:
             did = row["document_id"]
-            md = json.loads(row.get("metadata") or "{}")
-            refs = md.get("doc_item_refs") or []
+            refs = row["doc_item_refs"] or []
             doc_index = index.setdefault(did, {})
             for ref in refs:
                 doc_index.setdefault(ref, []).append(row["id"])
@@ -378,40 +524,37 @@ class ChunkRepository:
         self, query_result: "AsyncQueryBase"
     ) -> list[tuple[Chunk, float]]:
         """Process search results into chunks with document info and scores."""
-        import pandas as pd
+        import pyarrow as pa
 
-        def extract_scores(df: pd.DataFrame) -> list[float]:
-            """Extract scores from DataFrame columns based on search type."""
-            if "_distance" in df.columns:
+        def extract_scores(table: pa.Table) -> list[float]:
+            """Extract scores from result columns based on search type."""
+            if "_distance" in table.column_names:
                 # Vector search - convert distance to similarity
-                return ((df["_distance"] + 1).rdiv(1)).clip(lower=0.0).tolist()
-            elif "_relevance_score" in df.columns:
+                return [
+                    max(1.0 / (d + 1), 0.0)
+                    for d in table.column("_distance").to_pylist()
+                ]
+            elif "_relevance_score" in table.column_names:
                 # Hybrid search - relevance score (higher is better)
-                return df["_relevance_score"].tolist()
-            elif "_score" in df.columns:
+                return table.column("_relevance_score").to_pylist()
+            elif "_score" in table.column_names:
                 # FTS search - score (higher is better)
-                return df["_score"].tolist()
+                return table.column("_score").to_pylist()
             else:
                 raise ValueError("Unknown search result format, cannot extract scores")
 
-        df = await query_result.to_pandas()
+        table = await query_result.to_arrow()
 
-        scores = extract_scores(df)
+        scores = extract_scores(table)
 
-        pydantic_results = [
-            self.store.ChunkRecord(
-                id=str(row["id"]),
-                document_id=str(row["document_id"]),
-                content=str(row["content"]),
-                content_fts=str(row.get("content_fts", "")),
-                metadata=str(row["metadata"]),
-                order=int(row["order"]) if "order" in row else 0,
-            )
-            for _, row in df.iterrows()
-        ]
+        # Metadata lists come back as Python lists; the vector column is left
+        # unboxed.
+        rows = table.select(
+            [name for name in table.column_names if name != "vector"]
+        ).to_pylist()
 
         # Collect all unique document IDs for batch lookup
-        document_ids = list(set(chunk.document_id for chunk in pydantic_results))
+        document_ids = list({str(row["document_id"]) for row in rows})
 
         # Batch fetch document metadata (skip content/docling blobs)
         documents_map: dict[str, dict] = {}
@@ -427,14 +570,14 @@ class ChunkRepository:
             documents_map = {str(row["id"]): row for row in doc_rows}
 
         chunks_with_scores = []
-        for i, chunk_record in enumerate(pydantic_results):
-            doc = documents_map.get(chunk_record.document_id)
+        for i, row in enumerate(rows):
+            doc = documents_map.get(str(row["document_id"]))
             chunk = Chunk(
-                id=chunk_record.id,
-                document_id=chunk_record.document_id,
-                content=chunk_record.content,
-                metadata=json.loads(chunk_record.metadata),
-                order=chunk_record.order,
+                id=str(row["id"]),
+                document_id=str(row["document_id"]),
+                content=str(row["content"]),
+                metadata=chunk_metadata_from_row(row),
+                order=int(row.get("order") or 0),
                 document_uri=doc["uri"] if doc else None,
                 document_title=doc["title"] if doc else None,
                 document_meta=json.loads(doc.get("metadata", "{}") if doc else "{}"),
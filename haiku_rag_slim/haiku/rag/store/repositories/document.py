@@ -1,8 +1,13 @@
 import json
+from collections.abc import Mapping, Sequence
 from datetime import datetime
-from typing import overload
+from typing import TYPE_CHECKING, overload
 from uuid import uuid4
 
+import pyarrow as pa
+
+from haiku.rag.store.compression import decompress_json
+from haiku.rag.store.docling_cache import DoclingDocumentCache
 from haiku.rag.store.engine import Store
 from haiku.rag.store.models.document import Document
 from haiku.rag.store.schema import (
@@ -10,15 +15,34 @@ from haiku.rag.store.schema import (
     DocumentRecord,
     ensure_indexes,
     get_document_items_arrow_schema,
+    get_document_pages_arrow_schema,
     get_documents_arrow_schema,
+    get_picture_blobs_arrow_schema,
+    metadata_column_values,
     query_to_pydantic,
 )
 from haiku.rag.utils import escape_sql_string
 
+if TYPE_CHECKING:
+    from docling_core.types.doc.document import DoclingDocument
+
 # Ids per `id IN (...)` content lookup. Keeps the filter string bounded on an
 # unpaginated listing of a large database.
 _CONTENT_BATCH = 512
 
+# Ids per batch of a bulk delete, metadata or title update: each batch is one
+# `IN (...)` predicate, or one merge, per table.
+_DELETE_BATCH = 512
+
+# The columns a title backfill writes: the rest of each row is left as stored.
+_TITLE_SCHEMA = pa.schema(
+    [
+        pa.field("id", pa.string(), nullable=False),
+        pa.field("title", pa.string()),
+        pa.field("updated_at", pa.string()),
+    ]
+)
+
 
 class DocumentRepository:
     """Repository for Document operations.
@@ -34,12 +58,19 @@ class DocumentRepository:
     the meta row if the documents write fails; `update_meta` updates matched
     rows only (no insert — an insert on a missing id would create a ghost
     surfaced by `list_all`/`count`); `delete` removes both rows.
+
+    Page images live in `document_pages`, a row per page, written alongside
+    the meta row whenever `Document.docling_pages` is set.
     """
 
     def __init__(self, store: Store) -> None:
         self.store = store
         self._chunk_repository = None
         self._document_item_repository = None
+        self._document_page_repository = None
+        self._docling_cache = DoclingDocumentCache(
+            store._config.storage.docling_cache_size_bytes
+        )
 
     @property
     def chunk_repository(self):
@@ -61,6 +92,17 @@ class DocumentRepository:
             self._document_item_repository = DocumentItemRepository(self.store)
         return self._document_item_repository
 
+    @property
+    def document_page_repository(self):
+        """Lazy-load DocumentPageRepository when needed."""
+        if self._document_page_repository is None:
+            from haiku.rag.store.repositories.document_page import (
+                DocumentPageRepository,
+            )
+
+            self._document_page_repository = DocumentPageRepository(self.store)
+        return self._document_page_repository
+
     def _merge_to_document(
         self, doc: DocumentRecord, meta: DocumentMetaRecord | None
     ) -> Document:
@@ -75,7 +117,6 @@ class DocumentRepository:
             title=meta.title if meta else None,
             metadata=json.loads(meta.metadata) if meta else {},
             docling_document=doc.docling_document,
-            docling_pages=doc.docling_pages,
             docling_version=doc.docling_version,
             created_at=datetime.fromisoformat(created) if created else datetime.now(),
             updated_at=datetime.fromisoformat(updated) if updated else datetime.now(),
@@ -86,7 +127,6 @@ class DocumentRepository:
             id=doc_id,
             content=entity.content,
             docling_document=entity.docling_document,
-            docling_pages=entity.docling_pages,
             docling_version=entity.docling_version,
         )
 
@@ -97,13 +137,14 @@ class DocumentRepository:
         created_at: str,
         updated_at: str,
     ) -> DocumentMetaRecord:
-        return DocumentMetaRecord(
+        return self.store.DocumentMetaRecord(
             id=doc_id,
             uri=entity.uri,
             title=entity.title,
             metadata=json.dumps(entity.metadata),
             created_at=created_at,
             updated_at=updated_at,
+            **metadata_column_values(entity.metadata, self.store.metadata_columns),
         )
 
     async def _meta_by_id(self, doc_id: str) -> DocumentMetaRecord | None:
@@ -129,13 +170,13 @@ class DocumentRepository:
         """
         self.store._assert_writable()
 
-        # document_meta is written before documents so the documents row write
-        # is the commit point: time-travel to any documents version always sees
-        # the matching (earlier-written) document_meta row. If the documents
-        # write then fails, delete just the rows we added (not a table-version
-        # restore, which would clobber a concurrent writer's meta write) so a
-        # failed create can't leave a ghost row that list_all/count (which read
-        # document_meta) would surface.
+        # document_meta and document_pages are written before documents so the
+        # documents row write is the commit point: time-travel to any documents
+        # version always sees the matching (earlier-written) rows. If the
+        # documents write then fails, delete just the rows we added (not a
+        # table-version restore, which would clobber a concurrent writer's
+        # write) so a failed create can't leave a ghost row that list_all/count
+        # (which read document_meta) would surface.
         if isinstance(entity, Document):
             doc_id = str(uuid4())
             now = datetime.now().isoformat()
@@ -143,12 +184,18 @@ class DocumentRepository:
                 [self._to_meta_record(entity, doc_id, now, now)]
             )
             try:
+                await self.document_page_repository.create_all(
+                    {doc_id: entity.docling_pages or {}}
+                )
                 await self.store.documents_table.add(
                     [self._to_documents_record(entity, doc_id)]
                 )
             except Exception:
                 safe_id = escape_sql_string(doc_id)
                 await self.store.document_meta_table.delete(f"id = '{safe_id}'")
+                await self.store.document_pages_table.delete(
+                    f"document_id = '{safe_id}'"
+                )
                 raise
             entity.id = doc_id
             entity.created_at = datetime.fromisoformat(now)
@@ -175,13 +222,75 @@ class DocumentRepository:
 
         await self.store.document_meta_table.add(meta_records)
         try:
+            await self.document_page_repository.create_all(
+                {d.id: d.docling_pages for d in documents if d.id and d.docling_pages}
+            )
             await self.store.documents_table.add(doc_records)
         except Exception:
             ids = ", ".join(f"'{escape_sql_string(d)}'" for d in doc_ids)
             await self.store.document_meta_table.delete(f"id IN ({ids})")
+            await self.store.document_pages_table.delete(f"document_id IN ({ids})")
             raise
         return documents
 
+    async def save(self, documents: list[Document]) -> list[Document]:
+        """Create the documents without an id and update those with one.
+
+        An all-new list is a plain `create`. Otherwise the new documents are
+        added and the others take one matched-only merge per table, so a
+        document deleted since it was read is not written back; callers check
+        that the updated documents still exist. Call it inside
+        `Store.write_transaction`, which restores the tables if a later write
+        fails after the earlier ones landed.
+        """
+        self.store._assert_writable()
+        if all(document.id is None for document in documents):
+            return await self.create(documents)
+
+        now = datetime.now().isoformat()
+        new_docs: list[DocumentRecord] = []
+        new_metas: list[DocumentMetaRecord] = []
+        updated_docs: list[DocumentRecord] = []
+        updated_metas: list[DocumentMetaRecord] = []
+        for document in documents:
+            docs, metas = updated_docs, updated_metas
+            if document.id is None:
+                docs, metas = new_docs, new_metas
+                document.id = str(uuid4())
+                document.created_at = datetime.fromisoformat(now)
+            document.updated_at = datetime.fromisoformat(now)
+            docs.append(self._to_documents_record(document, document.id))
+            metas.append(
+                self._to_meta_record(
+                    document, document.id, document.created_at.isoformat(), now
+                )
+            )
+
+        if new_metas:
+            await self.store.document_meta_table.add(new_metas)
+        if updated_metas:
+            await (
+                self.store.document_meta_table.merge_insert("id")
+                .when_matched_update_all()
+                .execute(updated_metas)
+            )
+        await self.document_page_repository.replace_for_documents(
+            {
+                d.id: d.docling_pages
+                for d in documents
+                if d.id and d.docling_pages is not None
+            }
+        )
+        if new_docs:
+            await self.store.documents_table.add(new_docs)
+        if updated_docs:
+            await (
+                self.store.documents_table.merge_insert("id")
+                .when_matched_update_all()
+                .execute(updated_docs)
+            )
+        return documents
+
     _LIGHT_COLUMNS = ["id", "content"]
 
     async def _record_by_id(
@@ -243,26 +352,29 @@ class DocumentRepository:
             docling_version=row.get("docling_version"),
         )
 
-    async def get_pages_data(self, entity_id: str) -> Document | None:
-        """Get a document with only page image data loaded."""
-        safe_id = escape_sql_string(entity_id)
-        results = await (
-            self.store.documents_table.query()
-            .select(["id", "docling_pages"])
-            .where(f"id = '{safe_id}'")
-            .limit(1)
-            .to_list()
-        )
+    async def get_docling_document(self, entity_id: str) -> "DoclingDocument | None":
+        """Parse a document's stored DoclingDocument (without page images).
 
-        if not results:
+        Parsed documents are cached per `documents` table version, bounded by
+        `storage.docling_cache_size_bytes`, so repeat calls on a hot document
+        skip decompression and validation. The returned document may be
+        shared with other callers and must not be mutated.
+        """
+        version = await self.store.documents_table.version()
+        cached = self._docling_cache.get(entity_id, version)
+        if cached is not None:
+            return cached
+
+        doc = await self.get_docling_data(entity_id)
+        if doc is None or doc.docling_document is None:
             return None
 
-        row = results[0]
-        return Document(
-            id=row["id"],
-            content="",
-            docling_pages=row.get("docling_pages"),
-        )
+        from docling_core.types.doc.document import DoclingDocument
+
+        json_str = decompress_json(doc.docling_document)
+        docling_doc = DoclingDocument.model_validate_json(json_str)
+        self._docling_cache.put(entity_id, version, docling_doc, len(json_str))
+        return docling_doc
 
     async def update_meta(self, entity: Document) -> Document:
         """Update only the mutable attributes (uri/title/metadata/updated_at) in
@@ -290,10 +402,15 @@ class DocumentRepository:
         """Update a document's content+blobs (genuine re-conversion) and its
         mutable attributes. Rewrites the `documents` row, so use only when the
         docling content actually changed; for metadata/title-only changes use
-        `update_meta`."""
+        `update_meta`. Stored pages are replaced only when `docling_pages` is
+        set."""
         self.store._assert_writable()
         assert entity.id, "Document ID is required for update"
 
+        if entity.docling_pages is not None:
+            await self.document_page_repository.replace_for_documents(
+                {entity.id: entity.docling_pages}
+            )
         doc_record = self._to_documents_record(entity, entity.id)
         await (
             self.store.documents_table.merge_insert("id")
@@ -305,21 +422,122 @@ class DocumentRepository:
 
     async def delete(self, entity_id: str) -> bool:
         """Delete a document by its ID."""
+        return bool(await self.delete_many([entity_id]))
+
+    async def delete_many(self, entity_ids: Sequence[str]) -> list[str]:
+        """Delete documents by ID, returning the IDs that existed.
+
+        Every table is written with one `IN (...)` predicate per batch of
+        `_DELETE_BATCH` ids rather than once per document, so deleting N
+        documents adds a handful of table versions instead of ~5N. Unknown ids
+        are skipped.
+        """
         self.store._assert_writable()
+        deleted: list[str] = []
+        unique = list(dict.fromkeys(entity_ids))
+        for start in range(0, len(unique), _DELETE_BATCH):
+            batch = unique[start : start + _DELETE_BATCH]
+            ids = ", ".join(f"'{escape_sql_string(i)}'" for i in batch)
+            rows = await (
+                self.store.documents_table.query()
+                .select(["id"])
+                .where(f"id IN ({ids})")
+                .to_list()
+            )
+            existing = [row["id"] for row in rows]
+            if not existing:
+                continue
+
+            # Delete associated chunks, items and pages first
+            await self.chunk_repository.delete_by_document_ids(existing)
+            await self.document_item_repository.delete_by_document_ids(existing)
+            await self.document_page_repository.delete_by_document_ids(existing)
+
+            # Delete the document rows, then their mutable attributes
+            ids = ", ".join(f"'{escape_sql_string(i)}'" for i in existing)
+            await self.store.documents_table.delete(f"id IN ({ids})")
+            await self.store.document_meta_table.delete(f"id IN ({ids})")
+            for entity_id in existing:
+                self._docling_cache.discard(entity_id)
+            deleted.extend(existing)
+        return deleted
 
-        doc = await self.get_by_id(entity_id)
-        if doc is None:
-            return False
+    async def update_metadata(
+        self,
+        entity_ids: Sequence[str],
+        metadata: dict,
+        replace: bool = False,
+    ) -> int:
+        """Set metadata on many documents, returning how many were updated.
+
+        `metadata` is merged into each document's metadata, or replaces it when
+        `replace` is set; promoted metadata columns are recomputed to match.
+        Like `update_meta`, only `document_meta` is written, with one matched-only
+        merge per batch of `_DELETE_BATCH` ids. Unknown ids are skipped.
+        """
+        self.store._assert_writable()
+        updated = 0
+        now = datetime.now().isoformat()
+        unique = list(dict.fromkeys(entity_ids))
+        for start in range(0, len(unique), _DELETE_BATCH):
+            batch = unique[start : start + _DELETE_BATCH]
+            ids = ", ".join(f"'{escape_sql_string(i)}'" for i in batch)
+            metas = await query_to_pydantic(
+                self.store.document_meta_table.query().where(f"id IN ({ids})"),
+                DocumentMetaRecord,
+            )
+            if not metas:
+                continue
+
+            records = []
+            for meta in metas:
+                merged = (
+                    dict(metadata)
+                    if replace
+                    else {**json.loads(meta.metadata), **metadata}
+                )
+                records.append(
+                    self.store.DocumentMetaRecord(
+                        id=meta.id,
+                        uri=meta.uri,
+                        title=meta.title,
+                        metadata=json.dumps(merged),
+                        created_at=meta.created_at or now,
+                        updated_at=now,
+                        **metadata_column_values(merged, self.store.metadata_columns),
+                    )
+                )
+            await (
+                self.store.document_meta_table.merge_insert("id")
+                .when_matched_update_all()
+                .execute(records)
+            )
+            updated += len(records)
+        return updated
 
-        # Delete associated chunks and items first
-        await self.chunk_repository.delete_by_document_id(entity_id)
-        await self.document_item_repository.delete_by_document_id(entity_id)
+    async def set_missing_titles(self, titles: Mapping[str, str]) -> int:
+        """Set the titles of untitled documents, returning how many were set.
 
-        # Delete the document row, its mutable attributes
-        safe_id = escape_sql_string(entity_id)
-        await self.store.documents_table.delete(f"id = '{safe_id}'")
-        await self.store.document_meta_table.delete(f"id = '{safe_id}'")
-        return True
+        Only the `title` and `updated_at` columns of `document_meta` are
+        written, with one matched-only merge per batch of `_DELETE_BATCH` ids
+        inside a write transaction, so metadata changed since the titles were
+        generated is kept. Documents that were titled in the meantime, and
+        unknown ids, are skipped.
+        """
+        now = datetime.now().isoformat()
+        unique = list(titles)
+        updated = 0
+        async with self.store.write_transaction():
+            for start in range(0, len(unique), _DELETE_BATCH):
+                batch = unique[start : start + _DELETE_BATCH]
+                rows = [{"id": i, "title": titles[i], "updated_at": now} for i in batch]
+                result = await (
+                    self.store.document_meta_table.merge_insert("id")
+                    .when_matched_update_all(where="target.title IS NULL")
+                    .execute(pa.Table.from_pylist(rows, schema=_TITLE_SCHEMA))
+                )
+                updated += result.num_updated_rows
+        return updated
 
     async def list_all(
         self,
@@ -335,7 +553,7 @@ class DocumentRepository:
         is set, `content` is projected out of `documents` and merged in. The
         docling blobs are left out: a single document's page rasters run to
         hundreds of MB, so reading whole rows stalls a listing. Load them per
-        document with `get_docling_data` / `get_pages_data`.
+        document with `get_docling_data` / `DocumentPageRepository.get_pages`.
 
         Args:
             limit: Maximum number of documents to return.
@@ -406,6 +624,9 @@ class DocumentRepository:
     async def delete_all(self) -> None:
         """Delete all documents from the database."""
         self.store._assert_writable()
+        # Recreating `documents` restarts its version numbering, which the
+        # parsed-document cache keys on.
+        self._docling_cache.clear()
 
         # Delete all chunks and items first
         await self.chunk_repository.delete_all()
@@ -414,6 +635,16 @@ class DocumentRepository:
             "document_items", schema=get_document_items_arrow_schema()
         )
         await ensure_indexes(self.store.document_items_table, "document_items")
+        await self.store.db.drop_table("document_pages")
+        self.store.document_pages_table = await self.store.db.create_table(
+            "document_pages", schema=get_document_pages_arrow_schema()
+        )
+        await ensure_indexes(self.store.document_pages_table, "document_pages")
+        await self.store.db.drop_table("picture_blobs")
+        self.store.picture_blobs_table = await self.store.db.create_table(
+            "picture_blobs", schema=get_picture_blobs_arrow_schema()
+        )
+        await ensure_indexes(self.store.picture_blobs_table, "picture_blobs")
 
         count = len(
             await query_to_pydantic(
@@ -429,6 +660,10 @@ class DocumentRepository:
             await ensure_indexes(self.store.documents_table, "documents")
             await self.store.db.drop_table("document_meta")
             self.store.document_meta_table = await self.store.db.create_table(
-                "document_meta", schema=DocumentMetaRecord
+                "document_meta", schema=self.store.DocumentMetaRecord
+            )
+            await ensure_indexes(
+                self.store.document_meta_table,
+                "document_meta",
+                self.store.metadata_columns,
             )
-            await ensure_indexes(self.store.document_meta_table, "document_meta")
@@ -1,13 +1,14 @@
 import json
-from collections.abc import Mapping, Sequence
+from collections.abc import Collection, Mapping, Sequence
 
 from haiku.rag.store.engine import Store
-from haiku.rag.store.models.document_item import DocumentItem
+from haiku.rag.store.models.document_item import DocumentItem, picture_hash
+from haiku.rag.store.repositories.picture_blob import PictureBlobRepository
 from haiku.rag.store.schema import DocumentItemRecord
 from haiku.rag.utils import escape_sql_string
 
-# Per-item metadata columns. The payload column ``picture_data`` is fetched
-# explicitly via ``get_picture_bytes`` / ``get_pictures_for_chunk`` /
+# Per-item metadata columns. Picture bytes live in ``picture_blobs`` and are
+# fetched explicitly via ``get_picture_bytes`` / ``get_pictures_for_chunk`` /
 # ``get_all_picture_data`` so bulk scans don't pull MB-scale image bytes.
 _METADATA_COLUMNS = [
     "document_id",
@@ -22,10 +23,16 @@ _METADATA_COLUMNS = [
 
 
 class DocumentItemRepository:
-    """Repository for DocumentItem operations."""
+    """Repository for DocumentItem operations.
+
+    Writes store the items' picture bytes in ``picture_blobs`` first, so a row
+    never references a missing blob. Replacing or deleting a document's items
+    releases the blobs they referenced, deleting those no other item shares.
+    """
 
     def __init__(self, store: Store) -> None:
         self.store = store
+        self.picture_blobs = PictureBlobRepository(store)
 
     def _record_to_item(self, row: dict) -> DocumentItem:
         return DocumentItem(
@@ -47,32 +54,73 @@ class DocumentItemRepository:
             label=item.label,
             text=item.text,
             page_numbers=json.dumps(item.page_numbers),
-            picture_data=item.picture_data,
+            picture_hash=(
+                picture_hash(item.picture_data) if item.picture_data else None
+            ),
             heading_level=item.heading_level,
             tree_depth=item.tree_depth,
         )
 
-    async def create_items(self, document_id: str, items: list[DocumentItem]) -> None:
-        """Bulk insert items for a document."""
+    async def _put_blobs(
+        self,
+        items: list[DocumentItem],
+        picture_vectors: Mapping[str, list[float]] | None,
+    ) -> None:
+        blobs = {
+            picture_hash(item.picture_data): item.picture_data
+            for item in items
+            if item.picture_data
+        }
+        await self.picture_blobs.put(blobs, picture_vectors)
+
+    async def _referenced_hashes(self, predicate: str) -> set[str]:
+        rows = await (
+            self.store.document_items_table.query()
+            .select(["picture_hash"])
+            .where(f"({predicate}) AND picture_hash IS NOT NULL")
+            .to_list()
+        )
+        return {row["picture_hash"] for row in rows}
+
+    async def create_items(
+        self,
+        document_id: str,
+        items: list[DocumentItem],
+        picture_vectors: Mapping[str, list[float]] | None = None,
+    ) -> None:
+        """Bulk insert items for a document.
+
+        `picture_vectors` maps picture hashes to their embeddings, stored on
+        the blobs for later documents with the same pictures to reuse.
+        """
         if not items:
             return
 
         self.store._assert_writable()
+        await self._put_blobs(items, picture_vectors)
         records = [self._to_record(document_id, item) for item in items]
         await self.store.document_items_table.add(records)
 
-    async def create_all(self, items: list[DocumentItem]) -> None:
+    async def create_all(
+        self,
+        items: list[DocumentItem],
+        picture_vectors: Mapping[str, list[float]] | None = None,
+    ) -> None:
         """Bulk insert items spanning any number of documents in a single
         table version, keyed by each item's own ``document_id``."""
         if not items:
             return
 
         self.store._assert_writable()
+        await self._put_blobs(items, picture_vectors)
         records = [self._to_record(item.document_id, item) for item in items]
         await self.store.document_items_table.add(records)
 
     async def replace_for_document(
-        self, document_id: str, items: list[DocumentItem]
+        self,
+        document_id: str,
+        items: list[DocumentItem],
+        picture_vectors: Mapping[str, list[float]] | None = None,
     ) -> None:
         """Replace all items for a document with one scoped merge operation."""
         self.store._assert_writable()
@@ -87,6 +135,8 @@ class DocumentItemRepository:
             )
 
         safe_id = escape_sql_string(document_id)
+        previous = await self._referenced_hashes(f"document_id = '{safe_id}'")
+        await self._put_blobs(items, picture_vectors)
         records = [self._to_record(document_id, item) for item in items]
         await (
             self.store.document_items_table.merge_insert(["document_id", "self_ref"])
@@ -95,6 +145,41 @@ class DocumentItemRepository:
             .when_not_matched_by_source_delete(f"document_id = '{safe_id}'")
             .execute(records)
         )
+        await self.picture_blobs.release(previous)
+
+    async def replace_for_documents(
+        self,
+        document_ids: list[str],
+        items: list[DocumentItem],
+        picture_vectors: Mapping[str, list[float]] | None = None,
+    ) -> None:
+        """Write items spanning many documents in a single table version.
+
+        Items of the documents in `document_ids` replace whatever those
+        documents had; items of any other document are inserted as new.
+        """
+        self.store._assert_writable()
+        if not document_ids:
+            await self.create_all(items, picture_vectors)
+            return
+
+        ids = ", ".join(f"'{escape_sql_string(d)}'" for d in document_ids)
+        previous = await self._referenced_hashes(f"document_id IN ({ids})")
+        if not items:
+            await self.store.document_items_table.delete(f"document_id IN ({ids})")
+            await self.picture_blobs.release(previous)
+            return
+
+        await self._put_blobs(items, picture_vectors)
+        records = [self._to_record(item.document_id, item) for item in items]
+        await (
+            self.store.document_items_table.merge_insert(["document_id", "self_ref"])
+            .when_matched_update_all()
+            .when_not_matched_insert_all()
+            .when_not_matched_by_source_delete(f"document_id IN ({ids})")
+            .execute(records)
+        )
+        await self.picture_blobs.release(previous)
 
     async def get_all_items(self, document_id: str) -> list[DocumentItem]:
         """Get all items for a document, sorted by position."""
@@ -169,10 +254,24 @@ class DocumentItemRepository:
         )
 
     async def delete_by_document_id(self, document_id: str) -> None:
-        """Delete all items for a document."""
+        """Delete all items for a document, and the picture blobs only they
+        referenced."""
         self.store._assert_writable()
         safe_id = escape_sql_string(document_id)
+        previous = await self._referenced_hashes(f"document_id = '{safe_id}'")
         await self.store.document_items_table.delete(f"document_id = '{safe_id}'")
+        await self.picture_blobs.release(previous)
+
+    async def delete_by_document_ids(self, document_ids: Collection[str]) -> None:
+        """Delete the items of every document in `document_ids` in a single
+        table version, and the picture blobs only they referenced."""
+        if not document_ids:
+            return
+        self.store._assert_writable()
+        ids = ", ".join(f"'{escape_sql_string(d)}'" for d in document_ids)
+        previous = await self._referenced_hashes(f"document_id IN ({ids})")
+        await self.store.document_items_table.delete(f"document_id IN ({ids})")
+        await self.picture_blobs.release(previous)
 
     async def get_picture_bytes(self, document_id: str, self_ref: str) -> bytes | None:
         """Fetch raw picture bytes for a single picture item by self_ref."""
@@ -180,36 +279,41 @@ class DocumentItemRepository:
         safe_ref = escape_sql_string(self_ref)
         rows = await (
             self.store.document_items_table.query()
-            .select(["picture_data"])
+            .select(["picture_hash"])
             .where(f"document_id = '{safe_id}' AND self_ref = '{safe_ref}'")
             .limit(1)
             .to_list()
         )
-        if not rows:
+        if not rows or not rows[0].get("picture_hash"):
             return None
-        return rows[0].get("picture_data")
+        h = rows[0]["picture_hash"]
+        return (await self.picture_blobs.get_data([h])).get(h)
+
+    async def _bytes_by_ref(self, rows: list[dict]) -> dict[str, bytes]:
+        """`{self_ref: bytes}` for rows selected with `self_ref` and
+        `picture_hash`. Pictures repeated within the rows are fetched once."""
+        hashes = {row["self_ref"]: row["picture_hash"] for row in rows}
+        data = await self.picture_blobs.get_data(
+            {h for h in hashes.values() if h is not None}
+        )
+        return {ref: data[h] for ref, h in hashes.items() if h in data and data[h]}
 
     async def get_all_picture_data(self, document_id: str) -> dict[str, bytes]:
         """Snapshot every picture row's bytes for a single document.
 
-        Returns ``{self_ref: picture_data}`` for every row whose
-        ``picture_data`` is non-null. Used by rebuild / update flows to
+        Returns ``{self_ref: bytes}`` for every row that references a
+        picture blob. Used by rebuild / update flows to
         preserve picture bytes across a delete-and-re-extract cycle when the
         live docling document has already been stripped of its picture URIs.
         """
         safe_id = escape_sql_string(document_id)
         rows = await (
             self.store.document_items_table.query()
-            .select(["self_ref", "picture_data"])
-            .where(f"document_id = '{safe_id}'")
+            .select(["self_ref", "picture_hash"])
+            .where(f"document_id = '{safe_id}' AND picture_hash IS NOT NULL")
             .to_list()
         )
-        result: dict[str, bytes] = {}
-        for row in rows:
-            data = row.get("picture_data")
-            if data:
-                result[row["self_ref"]] = data
-        return result
+        return await self._bytes_by_ref(rows)
 
     async def get_pictures_for_chunk(
         self, document_id: str, refs: list[str]
@@ -217,7 +321,7 @@ class DocumentItemRepository:
         """Fetch picture bytes for multiple self_refs within a single document.
 
         Returns a mapping of self_ref → bytes, including only refs that have
-        non-null picture_data. Refs without bytes (or unknown refs) are omitted.
+        a picture blob. Refs without bytes (or unknown refs) are omitted.
         """
         if not refs:
             return {}
@@ -226,16 +330,11 @@ class DocumentItemRepository:
         refs_sql = ", ".join(f"'{escape_sql_string(r)}'" for r in refs)
         rows = await (
             self.store.document_items_table.query()
-            .select(["self_ref", "picture_data"])
+            .select(["self_ref", "picture_hash"])
             .where(f"document_id = '{safe_id}' AND self_ref IN ({refs_sql})")
             .to_list()
         )
-        result: dict[str, bytes] = {}
-        for row in rows:
-            data = row.get("picture_data")
-            if data:
-                result[row["self_ref"]] = data
-        return result
+        return await self._bytes_by_ref(rows)
 
     @staticmethod
     def _per_document_predicate(
@@ -245,7 +344,7 @@ class DocumentItemRepository:
 
         Per-document rather than `col IN (union)`: self_ref and position values
         repeat across documents, so a union predicate would return other
-        documents' rows, which for picture_data means fetching blobs nobody asked
+        documents' rows, which for pictures means fetching blobs nobody asked
         for. Returns None when nothing is asked for.
         """
         clauses = []
@@ -266,7 +365,8 @@ class DocumentItemRepository:
         *,
         with_text: bool = False,
     ) -> tuple[dict[str, dict[str, bytes]], dict[str, dict[str, str]]]:
-        """Picture bytes across documents in one query.
+        """Picture bytes across documents in two queries: the items, then
+        their distinct blobs.
 
         Returns `(bytes_by_document, text_by_document)`, each
         `{document_id: {self_ref: value}}` and each omitting refs whose value is
@@ -277,19 +377,22 @@ class DocumentItemRepository:
         predicate = self._per_document_predicate(refs_by_document, "self_ref")
         if predicate is None:
             return {}, {}
-        columns = ["document_id", "self_ref", "picture_data"]
+        columns = ["document_id", "self_ref", "picture_hash"]
         if with_text:
             columns.append("text")
         rows = await (
             self.store.document_items_table.query()
             .select(columns)
-            .where(predicate)
+            .where(f"picture_hash IS NOT NULL AND ({predicate})")
             .to_list()
         )
+        data_by_hash = await self.picture_blobs.get_data(
+            {row["picture_hash"] for row in rows}
+        )
         blobs: dict[str, dict[str, bytes]] = {}
         texts: dict[str, dict[str, str]] = {}
         for row in rows:
-            data = row.get("picture_data")
+            data = data_by_hash.get(row["picture_hash"])
             if not data:
                 continue
             blobs.setdefault(row["document_id"], {})[row["self_ref"]] = data
@@ -0,0 +1,110 @@
+from collections.abc import Collection, Mapping
+from typing import TYPE_CHECKING
+
+from haiku.rag.store.compression import decompress_json
+from haiku.rag.store.engine import Store
+from haiku.rag.store.schema import DocumentPageRecord
+from haiku.rag.utils import escape_sql_string
+
+if TYPE_CHECKING:
+    from docling_core.types.doc.document import PageItem
+
+
+class DocumentPageRepository:
+    """Repository for a document's page images, one row per page."""
+
+    def __init__(self, store: Store) -> None:
+        self.store = store
+
+    def _to_records(
+        self, pages_by_document: Mapping[str, Mapping[int, bytes]]
+    ) -> list[DocumentPageRecord]:
+        return [
+            DocumentPageRecord(document_id=document_id, page_no=page_no, page=page)
+            for document_id, pages in pages_by_document.items()
+            for page_no, page in pages.items()
+        ]
+
+    async def create_all(
+        self, pages_by_document: Mapping[str, Mapping[int, bytes]]
+    ) -> None:
+        """Insert the pages of any number of documents in a single table
+        version."""
+        records = self._to_records(pages_by_document)
+        if not records:
+            return
+
+        self.store._assert_writable()
+        await self.store.document_pages_table.add(records)
+
+    async def replace_for_documents(
+        self, pages_by_document: Mapping[str, Mapping[int, bytes]]
+    ) -> None:
+        """Replace the pages of every document in `pages_by_document` in a
+        single table version. An empty mapping for a document removes its
+        pages."""
+        if not pages_by_document:
+            return
+
+        self.store._assert_writable()
+        ids = ", ".join(f"'{escape_sql_string(d)}'" for d in pages_by_document)
+        records = self._to_records(pages_by_document)
+        if not records:
+            await self.store.document_pages_table.delete(f"document_id IN ({ids})")
+            return
+
+        await (
+            self.store.document_pages_table.merge_insert(["document_id", "page_no"])
+            .when_matched_update_all()
+            .when_not_matched_insert_all()
+            .when_not_matched_by_source_delete(f"document_id IN ({ids})")
+            .execute(records)
+        )
+
+    async def get_pages(
+        self, document_id: str, page_numbers: list[int]
+    ) -> "dict[int, PageItem]":
+        """Decompress and validate the requested pages of a document.
+
+        Reads only the rows of the requested pages. Pages the document does
+        not have are left out of the result.
+        """
+        if not page_numbers:
+            return {}
+
+        from docling_core.types.doc.document import PageItem
+
+        safe_id = escape_sql_string(document_id)
+        wanted = ", ".join(str(int(page_no)) for page_no in set(page_numbers))
+        rows = await (
+            self.store.document_pages_table.query()
+            .select(["page_no", "page"])
+            .where(f"document_id = '{safe_id}' AND page_no IN ({wanted})")
+            .to_list()
+        )
+        return {
+            row["page_no"]: PageItem.model_validate_json(decompress_json(row["page"]))
+            for row in rows
+        }
+
+    async def get_page_count(self, document_id: str) -> int:
+        """Count the stored pages of a document."""
+        safe_id = escape_sql_string(document_id)
+        return await self.store.document_pages_table.count_rows(
+            filter=f"document_id = '{safe_id}'"
+        )
+
+    async def delete_by_document_id(self, document_id: str) -> None:
+        """Delete all pages of a document."""
+        self.store._assert_writable()
+        safe_id = escape_sql_string(document_id)
+        await self.store.document_pages_table.delete(f"document_id = '{safe_id}'")
+
+    async def delete_by_document_ids(self, document_ids: Collection[str]) -> None:
+        """Delete the pages of every document in `document_ids` in a single
+        table version."""
+        if not document_ids:
+            return
+        self.store._assert_writable()
+        ids = ", ".join(f"'{escape_sql_string(d)}'" for d in document_ids)
+        await self.store.document_pages_table.delete(f"document_id IN ({ids})")
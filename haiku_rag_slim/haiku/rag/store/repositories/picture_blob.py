@@ -0,0 +1,158 @@
+from collections.abc import Collection, Iterable, Mapping
+
+import pyarrow as pa
+
+from haiku.rag.store.engine import Store
+from haiku.rag.store.models.chunk import Chunk
+from haiku.rag.store.models.document_item import picture_hash
+from haiku.rag.store.schema import get_picture_blobs_arrow_schema
+from haiku.rag.utils import escape_sql_string
+
+_VECTOR_SCHEMA = pa.schema(
+    [
+        pa.field("hash", pa.string(), nullable=False),
+        pa.field("vector", pa.list_(pa.float32())),
+        pa.field("embedder", pa.string()),
+    ]
+)
+
+
+def _in_list(hashes: Iterable[str]) -> str:
+    return ", ".join(f"'{escape_sql_string(h)}'" for h in hashes)
+
+
+class PictureBlobRepository:
+    """Repository for picture bytes stored once per distinct content.
+
+    `document_items` rows reference a blob by its hash. A blob is deleted once
+    no row references it, which `release` checks after the rows of replaced
+    or deleted documents are gone.
+    """
+
+    def __init__(self, store: Store) -> None:
+        self.store = store
+
+    @property
+    def embedder_identity(self) -> str:
+        """The embedder a stored vector must come from to be reused."""
+        model = self.store._config.embeddings.model
+        return f"{model.provider}:{model.name}:{model.vector_dim}"
+
+    async def _stored_embedders(self, hashes: Collection[str]) -> dict[str, str | None]:
+        if not hashes:
+            return {}
+        rows = await (
+            self.store.picture_blobs_table.query()
+            .select(["hash", "embedder"])
+            .where(f"hash IN ({_in_list(hashes)})")
+            .to_list()
+        )
+        return {row["hash"]: row["embedder"] for row in rows}
+
+    async def put(
+        self,
+        blobs: Mapping[str, bytes],
+        vectors: Mapping[str, list[float]] | None = None,
+        *,
+        overwrite: bool = False,
+    ) -> None:
+        """Store the blobs not stored yet and record vectors for stored blobs.
+
+        A vector is written only where the blob has none from the current
+        embedder, unless `overwrite`, so storing a document whose pictures are
+        all known writes nothing. Vectors for hashes neither stored nor in
+        `blobs` are dropped.
+        """
+        vectors = vectors or {}
+        stored = await self._stored_embedders(set(blobs) | set(vectors))
+        identity = self.embedder_identity
+
+        new_rows = [
+            {
+                "hash": h,
+                "data": data,
+                "vector": vectors.get(h),
+                "embedder": identity if h in vectors else None,
+            }
+            for h, data in blobs.items()
+            if h not in stored
+        ]
+        vector_rows = [
+            {"hash": h, "vector": vector, "embedder": identity}
+            for h, vector in vectors.items()
+            if h in stored and (overwrite or stored[h] != identity)
+        ]
+        if not new_rows and not vector_rows:
+            return
+
+        self.store._assert_writable()
+        if new_rows:
+            await (
+                self.store.picture_blobs_table.merge_insert("hash")
+                .when_not_matched_insert_all()
+                .execute(
+                    pa.Table.from_pylist(
+                        new_rows, schema=get_picture_blobs_arrow_schema()
+                    )
+                )
+            )
+        if vector_rows:
+            # Only the vector columns: the stored bytes are not rewritten.
+            await (
+                self.store.picture_blobs_table.merge_insert("hash")
+                .when_matched_update_all()
+                .execute(pa.Table.from_pylist(vector_rows, schema=_VECTOR_SCHEMA))
+            )
+
+    async def get_data(self, hashes: Collection[str]) -> dict[str, bytes]:
+        """Picture bytes by hash. Hashes with no stored blob are left out."""
+        if not hashes:
+            return {}
+        rows = await (
+            self.store.picture_blobs_table.query()
+            .select(["hash", "data"])
+            .where(f"hash IN ({_in_list(hashes)})")
+            .to_list()
+        )
+        return {row["hash"]: row["data"] for row in rows}
+
+    async def get_vectors(self, hashes: Collection[str]) -> dict[str, list[float]]:
+        """Stored vectors from the current embedder, by hash."""
+        if not hashes:
+            return {}
+        identity = escape_sql_string(self.embedder_identity)
+        rows = await (
+            self.store.picture_blobs_table.query()
+            .select(["hash", "vector"])
+            .where(f"hash IN ({_in_list(hashes)}) AND embedder = '{identity}'")
+            .to_list()
+        )
+        return {row["hash"]: row["vector"] for row in rows if row["vector"]}
+
+    async def get_vectors_for(self, chunks: Iterable[Chunk]) -> dict[str, list[float]]:
+        """Stored vectors for the pictures of chunks that still need one, to
+        pass to `embed_chunks` as `picture_vectors`."""
+        return await self.get_vectors(
+            {
+                picture_hash(chunk._picture_data)
+                for chunk in chunks
+                if chunk._picture_data is not None and chunk.embedding is None
+            }
+        )
+
+    async def release(self, hashes: Collection[str]) -> None:
+        """Delete the blobs among `hashes` that no document item references."""
+        if not hashes:
+            return
+        self.store._assert_writable()
+        rows = await (
+            self.store.document_items_table.query()
+            .select(["picture_hash"])
+            .where(f"picture_hash IN ({_in_list(hashes)})")
+            .to_list()
+        )
+        unreferenced = set(hashes) - {row["picture_hash"] for row in rows}
+        if unreferenced:
+            await self.store.picture_blobs_table.delete(
+                f"hash IN ({_in_list(unreferenced)})"
+            )
@@ -42,10 +42,14 @@ class SettingsRepository:
         )
 
         if existing:
-            # Preserve existing version if present to avoid interfering with upgrade flow
+            # Preserve the keys the store writes itself: the version and the
+            # checkpoint of an unfinished migration, to avoid interfering with
+            # the upgrade flow, the last compaction run and the trained zstd
+            # dictionaries.
             existing_settings = json.loads(existing[0].settings)
-            if "version" in existing_settings:
-                current_config["version"] = existing_settings["version"]
+            for key in ("version", "migration", "compaction", "zstd_dictionaries"):
+                if key in existing_settings:
+                    current_config[key] = existing_settings[key]
 
             if existing_settings != current_config:
                 await self.store.settings_table.update(
@@ -5,15 +5,19 @@ table, or imports a client layer.
 """
 
 import logging
-from typing import cast
+from collections.abc import Mapping, Sequence
+from typing import TYPE_CHECKING, Any, cast
 from uuid import uuid4
 
 import lancedb
 import pyarrow as pa
-from lancedb.index import FTS, Bitmap, BTree
+from lancedb.index import FTS, Bitmap, BTree, LabelList
 from lancedb.pydantic import LanceModel, Vector
 from lancedb.query import AsyncQueryBase
-from pydantic import Field
+from pydantic import Field, create_model
+
+if TYPE_CHECKING:
+    from haiku.rag.config.models import MetadataColumnConfig
 
 logger = logging.getLogger(__name__)
 
@@ -35,7 +39,6 @@ class DocumentRecord(LanceModel):
     id: str = Field(default_factory=lambda: str(uuid4()))
     content: str
     docling_document: bytes | None = None
-    docling_pages: bytes | None = None
     docling_version: str | None = None
 
 
@@ -52,6 +55,75 @@ class DocumentMetaRecord(LanceModel):
     updated_at: str = Field(default_factory=lambda: "")
 
 
+# Python and Arrow type of each MetadataColumnConfig.type.
+_METADATA_COLUMN_TYPES: dict[str, tuple[Any, pa.DataType]] = {
+    "string": (str, pa.string()),
+    "integer": (int, pa.int64()),
+    "float": (float, pa.float64()),
+    "boolean": (bool, pa.bool_()),
+    "string_list": (list[str], pa.list_(pa.string())),
+}
+
+
+def metadata_column_name(key: str) -> str:
+    """The `document_meta` column a promoted metadata key is stored in."""
+    return f"meta_{key}"
+
+
+def metadata_column_field(column: "MetadataColumnConfig") -> pa.Field:
+    """The nullable Arrow field of a promoted metadata key."""
+    return pa.field(
+        metadata_column_name(column.key), _METADATA_COLUMN_TYPES[column.type][1]
+    )
+
+
+def create_document_meta_model(
+    columns: Sequence["MetadataColumnConfig"],
+) -> type[DocumentMetaRecord]:
+    """Create a DocumentMetaRecord model with a nullable `meta_<key>` field per
+    promoted metadata key."""
+    if not columns:
+        return DocumentMetaRecord
+    fields: dict[str, Any] = {
+        metadata_column_name(column.key): (
+            _METADATA_COLUMN_TYPES[column.type][0] | None,
+            None,
+        )
+        for column in columns
+    }
+    return create_model("DocumentMetaRecord", __base__=DocumentMetaRecord, **fields)
+
+
+def _metadata_value(value: Any, type_: str) -> Any:
+    match type_:
+        case "string":
+            return value if isinstance(value, str) else None
+        case "integer":
+            is_int = isinstance(value, int) and not isinstance(value, bool)
+            return value if is_int else None
+        case "float":
+            is_number = isinstance(value, int | float) and not isinstance(value, bool)
+            return float(value) if is_number else None
+        case "boolean":
+            return value if isinstance(value, bool) else None
+        case _:
+            is_list = isinstance(value, list) and all(isinstance(v, str) for v in value)
+            return value if is_list else None
+
+
+def metadata_column_values(
+    metadata: Mapping[str, Any], columns: Sequence["MetadataColumnConfig"]
+) -> dict[str, Any]:
+    """The promoted columns' values for a document's metadata. A key that is
+    absent or not of its declared type is NULL."""
+    return {
+        metadata_column_name(column.key): _metadata_value(
+            metadata.get(column.key), column.type
+        )
+        for column in columns
+    }
+
+
 def get_documents_arrow_schema() -> pa.Schema:
     """Generate Arrow schema for documents table with large_binary for docling_document.
 
@@ -64,7 +136,7 @@ def get_documents_arrow_schema() -> pa.Schema:
     which has 64-bit offsets and no practical size limit.
     """
     base_schema = DocumentRecord.to_arrow_schema()
-    large_binary_columns = {"docling_document", "docling_pages"}
+    large_binary_columns = {"docling_document"}
     fields = []
     for field in base_schema:
         if field.name in large_binary_columns:
@@ -85,6 +157,12 @@ class ChunkRecordBase(LanceModel):
     document_id: str
     content: str
     content_fts: str = Field(default="")
+    # The ChunkMetadata fields, as native lists. `metadata` holds any other
+    # key as JSON.
+    doc_item_refs: list[str] = Field(default_factory=list)
+    headings: list[str] | None = None
+    labels: list[str] = Field(default_factory=list)
+    page_numbers: list[int] = Field(default_factory=list)
     metadata: str = Field(default="{}")
     order: int = Field(default=0)
     vector: list[float] = Field(default_factory=list)
@@ -100,28 +178,79 @@ def create_chunk_model(vector_dim: int) -> type[ChunkRecordBase]:
 
 
 class DocumentItemRecord(LanceModel):
+    """One docling item of a document. A picture's bytes live in
+    `picture_blobs`, referenced by `picture_hash`."""
+
     document_id: str
     position: int
     self_ref: str
     label: str = Field(default="")
     text: str = Field(default="")
     page_numbers: str = Field(default="[]")
-    picture_data: bytes | None = None
+    picture_hash: str | None = None
     heading_level: int = Field(default=0)
     tree_depth: int = Field(default=0)
 
 
 def get_document_items_arrow_schema() -> pa.Schema:
-    """Generate Arrow schema for document_items with large_binary for picture_data.
+    """Generate Arrow schema for document_items."""
+    return DocumentItemRecord.to_arrow_schema()
 
-    LanceDB maps Python `bytes` to Arrow's `binary` type, which uses 32-bit offsets
-    and is limited to ~2GB per column in a fragment. Many embedded picture PNGs in
-    one fragment can exceed that limit. `large_binary` uses 64-bit offsets and has
-    no practical size limit — same reasoning as `docling_document` on the
-    documents table.
+
+class PictureBlobRecord(LanceModel):
+    """Picture bytes stored once per distinct content, keyed by their SHA-256.
+
+    Logos and watermarks repeat across many documents; every `document_items`
+    row showing the same picture references one row here. `vector` is the
+    picture's embedding under the `embedder` identity that produced it, so the
+    image is embedded once for the whole corpus.
+    """
+
+    hash: str
+    data: bytes
+    vector: list[float] | None = None
+    embedder: str | None = None
+
+
+def get_picture_blobs_arrow_schema() -> pa.Schema:
+    """Generate Arrow schema for picture_blobs with large_binary for data and
+    a variable-length vector.
+
+    A fragment of embedded picture PNGs can overflow `binary`'s 32-bit
+    offsets — same reasoning as `docling_document` on the documents table. The
+    vector is not fixed-size: it outlives an embedder change, and a vector
+    from another embedder is ignored rather than migrated.
     """
-    base_schema = DocumentItemRecord.to_arrow_schema()
-    large_binary_columns = {"picture_data"}
+    fields = []
+    for field in PictureBlobRecord.to_arrow_schema():
+        if field.name == "data":
+            fields.append(pa.field("data", pa.large_binary(), nullable=False))
+        elif field.name == "vector":
+            fields.append(pa.field("vector", pa.list_(pa.float32())))
+        else:
+            fields.append(field)
+    return pa.schema(fields)
+
+
+class DocumentPageRecord(LanceModel):
+    """One page of a document: its docling `PageItem` (size and rendered
+    image) as zstd-compressed JSON. Stored a row per page so drawing on page N
+    reads page N alone, not every raster of a scanned PDF."""
+
+    document_id: str
+    page_no: int
+    page: bytes
+
+
+def get_document_pages_arrow_schema() -> pa.Schema:
+    """Generate Arrow schema for document_pages with large_binary for page.
+
+    A page raster at a high `images_scale` runs to megabytes, so a fragment of
+    them overflows `binary`'s 32-bit offsets — same reasoning as
+    `docling_document` on the documents table.
+    """
+    base_schema = DocumentPageRecord.to_arrow_schema()
+    large_binary_columns = {"page"}
     fields = []
     for field in base_schema:
         if field.name in large_binary_columns:
@@ -131,19 +260,31 @@ def get_document_items_arrow_schema() -> pa.Schema:
     return pa.schema(fields)
 
 
-def index_specs(table_name: str) -> list[tuple[str, Bitmap | BTree | FTS]]:
-    """The index set each table carries."""
+_METADATA_INDEXES = {"btree": BTree, "bitmap": Bitmap, "label_list": LabelList}
+
+
+def index_specs(
+    table_name: str, metadata_columns: Sequence["MetadataColumnConfig"] = ()
+) -> list[tuple[str, Bitmap | BTree | FTS | LabelList]]:
+    """The index set each table carries. `metadata_columns` adds the promoted
+    metadata columns of `document_meta`."""
     match table_name:
         case "documents":
             return [("id", BTree())]
         case "document_meta":
-            return [("id", BTree()), ("uri", BTree())]
+            return [("id", BTree()), ("uri", BTree())] + [
+                (metadata_column_name(c.key), _METADATA_INDEXES[c.index or "btree"]())
+                for c in metadata_columns
+            ]
         case "chunks":
             return [
                 # Positions and stop words are required for phrase queries.
                 ("content_fts", FTS(with_position=True, remove_stop_words=False)),
                 ("id", BTree()),
                 ("document_id", BTree()),
+                # Serve array_has / array_has_any filters on chunk search.
+                ("labels", LabelList()),
+                ("page_numbers", LabelList()),
             ]
         case "document_items":
             return [
@@ -151,25 +292,39 @@ def index_specs(table_name: str) -> list[tuple[str, Bitmap | BTree | FTS]]:
                 ("position", BTree()),
                 ("self_ref", BTree()),
                 ("label", Bitmap()),
+                ("picture_hash", BTree()),
             ]
+        case "document_pages":
+            return [("document_id", BTree())]
+        case "picture_blobs":
+            return [("hash", BTree())]
         case _:
             return []
 
 
-async def ensure_indexes(table: lancedb.AsyncTable, table_name: str) -> list[str]:
+async def ensure_indexes(
+    table: lancedb.AsyncTable,
+    table_name: str,
+    metadata_columns: Sequence["MetadataColumnConfig"] = (),
+) -> list[str]:
     """Create any declared index missing from a column. Returns the columns indexed.
 
     Matches on index type, not column coverage, so a BTree does not satisfy a
     declared Bitmap. Never drops or converts an index it did not declare.
-    Re-creating is not free: `create_index(replace=True)` rebuilds.
+    Re-creating is not free: `create_index(replace=True)` rebuilds. Columns
+    the table does not have yet are skipped: a migration that adds one
+    indexes it.
     """
+    names = set((await table.schema()).names)
     covering: dict[str, set[str]] = {}
     for index in await table.list_indices():
         for column in index.columns:
             covering.setdefault(column, set()).add(index.index_type)
 
     applied: list[str] = []
-    for column, config in index_specs(table_name):
+    for column, config in index_specs(table_name, metadata_columns):
+        if column not in names:
+            continue
         declared = type(config).__name__
         present = covering.get(column, set())
         if declared in present:
@@ -194,5 +349,7 @@ REQUIRED_TABLES: tuple[str, ...] = (
     "document_meta",
     "chunks",
     "document_items",
+    "document_pages",
+    "picture_blobs",
     "settings",
 )
@@ -0,0 +1,339 @@
+"""Streaming export and import of a whole database.
+
+`export_database` writes every table, read at one pinned set of versions, to a
+directory of Parquet or Arrow IPC files plus a `manifest.json`, one record
+batch at a time. `import_database` loads such a directory into an empty
+database with one `create_table` per table and builds the indexes once the
+rows are in. Only the exported versions travel: history, tags and old data
+files stay behind, which is what makes this cheaper than copying the LanceDB
+directory.
+"""
+
+import asyncio
+import base64
+import json
+from collections.abc import Callable, Iterator
+from datetime import UTC, datetime
+from enum import StrEnum
+from importlib import metadata
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+from pydantic import BaseModel
+
+from haiku.rag.store.schema import REQUIRED_TABLES, ensure_indexes, metadata_column_name
+
+if TYPE_CHECKING:
+    from haiku.rag.config import AppConfig
+    from haiku.rag.store.engine import Store
+
+MANIFEST_NAME = "manifest.json"
+EXPORT_FORMAT_VERSION = 1
+
+# Rows per record batch. Tables holding compressed documents, page images or
+# picture bytes carry up to megabytes per row, so they move in small batches to
+# keep memory bounded.
+_BATCH_ROWS = 8192
+_BLOB_BATCH_ROWS = 64
+_BLOB_TABLES = frozenset({"documents", "document_pages", "picture_blobs"})
+
+# Columns dropped by include_vectors=False, per table.
+_VECTOR_COLUMNS = {"chunks": "vector", "picture_blobs": "vector"}
+
+# Called with a table name, the rows moved so far and the table's total.
+ProgressCallback = Callable[[str, int, int], None]
+
+
+class ExportFormat(StrEnum):
+    PARQUET = "parquet"
+    ARROW = "arrow"
+
+
+class ExportedTable(BaseModel):
+    """One table of an export. `file` is None when the table's rows were left
+    out; its schema is still recorded so the import can create it empty."""
+
+    name: str
+    file: str | None
+    rows: int
+    version: int
+    excluded_columns: list[str] = []
+    schema_ipc: str
+
+    @property
+    def arrow_schema(self) -> pa.Schema:
+        """The table's full schema, including excluded columns."""
+        return pa.ipc.read_schema(pa.py_buffer(base64.b64decode(self.schema_ipc)))
+
+
+class ExportManifest(BaseModel):
+    format_version: int = EXPORT_FORMAT_VERSION
+    format: ExportFormat
+    haiku_rag_version: str
+    created_at: datetime
+    include_vectors: bool
+    include_pages: bool
+    tables: list[ExportedTable]
+
+
+def _batch_rows(table_name: str) -> int:
+    return _BLOB_BATCH_ROWS if table_name in _BLOB_TABLES else _BATCH_ROWS
+
+
+def _file_writer(path: Path, schema: pa.Schema, format: ExportFormat):
+    if format == ExportFormat.PARQUET:
+        return pq.ParquetWriter(path, schema, compression="zstd")
+    return pa.ipc.new_file(
+        path, schema, options=pa.ipc.IpcWriteOptions(compression="zstd")
+    )
+
+
+async def _export_table(
+    store: "Store",
+    name: str,
+    destination: Path,
+    format: ExportFormat,
+    excluded: list[str],
+    include_rows: bool,
+    on_progress: ProgressCallback | None,
+) -> ExportedTable:
+    table = getattr(store, f"{name}_table")
+    schema = await table.schema()
+    entry = ExportedTable(
+        name=name,
+        file=None,
+        rows=0,
+        version=await table.version(),
+        excluded_columns=excluded,
+        schema_ipc=base64.b64encode(schema.serialize().to_pybytes()).decode(),
+    )
+    if not include_rows:
+        return entry
+
+    total = await table.count_rows()
+    columns = [column for column in schema.names if column not in excluded]
+    file_schema = pa.schema(
+        [schema.field(column) for column in columns], metadata=schema.metadata
+    )
+    entry.file = f"{name}.{'parquet' if format == ExportFormat.PARQUET else 'arrow'}"
+    stream = (
+        await table.query()
+        .select(columns)
+        .to_batches(max_batch_length=_batch_rows(name))
+    )
+    writer = _file_writer(destination / entry.file, file_schema, format)
+    try:
+        async for batch in stream:
+            # Writing and compressing runs off the event loop so tables export
+            # in parallel.
+            await asyncio.to_thread(
+                writer.write_batch,
+                pa.RecordBatch.from_arrays(batch.columns, schema=file_schema),
+            )
+            entry.rows += batch.num_rows
+            if on_progress is not None:
+                on_progress(name, entry.rows, total)
+    finally:
+        writer.close()
+    return entry
+
+
+async def export_database(
+    store: "Store",
+    destination: Path,
+    format: ExportFormat = ExportFormat.PARQUET,
+    include_vectors: bool = True,
+    include_pages: bool = True,
+    concurrency: int = 4,
+    on_progress: ProgressCallback | None = None,
+) -> ExportManifest:
+    """Write every table to `destination`, one file per table.
+
+    Tables are read at one pinned set of versions, so writes landing during the
+    export are not in it. Each table streams in record batches and up to
+    `concurrency` tables export at once. The manifest is written last; a
+    directory without one is an incomplete export.
+
+    Args:
+        store: The store to export.
+        destination: A directory that does not exist yet or is empty.
+        format: Parquet or Arrow IPC files, zstd-compressed.
+        include_vectors: If False, chunk and picture vectors are left out; the
+            imported database needs `haiku-rag rebuild --embed-only`.
+        include_pages: If False, page images are left out; `visualize` has no
+            pages to draw on in the imported database.
+        concurrency: Maximum number of tables exported at once.
+        on_progress: Called after each batch with the table name, the rows
+            written so far and the table's row count.
+
+    Raises:
+        ValueError: If `destination` exists and is not an empty directory.
+    """
+    if destination.exists() and (
+        not destination.is_dir() or any(destination.iterdir())
+    ):
+        raise ValueError(f"Export destination {destination} is not empty")
+    destination.mkdir(parents=True, exist_ok=True)
+
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def export(view: "Store", name: str) -> ExportedTable:
+        excluded = []
+        if not include_vectors and name in _VECTOR_COLUMNS:
+            excluded.append(_VECTOR_COLUMNS[name])
+        async with semaphore:
+            return await _export_table(
+                view,
+                name,
+                destination,
+                format,
+                excluded,
+                include_pages or name != "document_pages",
+                on_progress,
+            )
+
+    async with store.pin_versions() as view:
+        tables = await asyncio.gather(*(export(view, n) for n in REQUIRED_TABLES))
+
+    manifest = ExportManifest(
+        format=format,
+        haiku_rag_version=metadata.version("haiku.rag-slim"),
+        created_at=datetime.now(UTC),
+        include_vectors=include_vectors,
+        include_pages=include_pages,
+        tables=list(tables),
+    )
+    (destination / MANIFEST_NAME).write_text(manifest.model_dump_json(indent=2))
+    return manifest
+
+
+def read_manifest(source: Path) -> ExportManifest:
+    """The manifest of the export at `source`.
+
+    Raises:
+        ValueError: If `source` is not a complete export or was written by a
+            newer export format.
+    """
+    path = source / MANIFEST_NAME
+    if not path.is_file():
+        raise ValueError(f"{source} is not a haiku.rag export (no {MANIFEST_NAME})")
+    manifest = ExportManifest.model_validate(json.loads(path.read_text()))
+    if manifest.format_version > EXPORT_FORMAT_VERSION:
+        raise ValueError(
+            f"Export format {manifest.format_version} is newer than this "
+            f"haiku.rag supports ({EXPORT_FORMAT_VERSION}); upgrade haiku.rag"
+        )
+    return manifest
+
+
+def _default_column(field: pa.Field, rows: int) -> pa.Array:
+    """Values for a column the export left out: zero vectors for a fixed-size
+    vector, the chunk model's default, and nulls otherwise."""
+    if pa.types.is_fixed_size_list(field.type):
+        size = field.type.list_size
+        values = pa.array([0.0] * (rows * size), field.type.value_type)
+        return pa.FixedSizeListArray.from_arrays(values, size)
+    return pa.nulls(rows, field.type)
+
+
+def _file_batches(
+    path: Path, format: ExportFormat, rows: int
+) -> Iterator[pa.RecordBatch]:
+    if format == ExportFormat.PARQUET:
+        yield from pq.ParquetFile(path).iter_batches(batch_size=rows)
+        return
+    with pa.memory_map(str(path)) as source:
+        reader = pa.ipc.open_file(source)
+        for i in range(reader.num_record_batches):
+            yield reader.get_batch(i)
+
+
+def _table_reader(
+    source: Path,
+    manifest: ExportManifest,
+    entry: ExportedTable,
+    on_progress: ProgressCallback | None,
+) -> pa.RecordBatchReader:
+    """The exported rows of one table in its full schema, batch by batch."""
+    schema = entry.arrow_schema
+
+    def batches() -> Iterator[pa.RecordBatch]:
+        done = 0
+        path = source / str(entry.file)
+        for batch in _file_batches(path, manifest.format, _batch_rows(entry.name)):
+            columns = [
+                batch.column(field.name)
+                if field.name in batch.schema.names
+                else _default_column(field, batch.num_rows)
+                for field in schema
+            ]
+            yield pa.RecordBatch.from_arrays(columns, schema=schema)
+            done += batch.num_rows
+            if on_progress is not None:
+                on_progress(entry.name, done, entry.rows)
+
+    return pa.RecordBatchReader.from_batches(schema, batches())
+
+
+async def import_database(
+    config: "AppConfig",
+    db_path: Path,
+    source: Path,
+    concurrency: int = 4,
+    on_progress: ProgressCallback | None = None,
+) -> ExportManifest:
+    """Load the export at `source` into an empty database.
+
+    Each table is created from a stream of the exported batches, up to
+    `concurrency` at once, and its indexes are built after its rows are in
+    rather than updated per write. The settings table is imported with the
+    rest, so the database keeps the exporting database's embedder and version;
+    opening it with a different embedder configuration fails as it would for
+    the original, and an export from an older version needs `haiku-rag
+    migrate`.
+
+    Raises:
+        ValueError: If `source` is not a readable export or the target database
+            already has tables.
+    """
+    from haiku.rag.store.engine import Store, connect_lancedb
+
+    manifest = read_manifest(source)
+    db = await connect_lancedb(config, db_path)
+    try:
+        if (await db.list_tables()).tables:
+            raise ValueError(
+                f"Database at {db_path} already has tables; import needs an "
+                "empty database"
+            )
+
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def load(entry: ExportedTable) -> None:
+            async with semaphore:
+                if entry.file is None or not entry.rows:
+                    table = await db.create_table(entry.name, schema=entry.arrow_schema)
+                else:
+                    table = await db.create_table(
+                        entry.name,
+                        data=_table_reader(source, manifest, entry, on_progress),
+                    )
+                declared = [
+                    column
+                    for column in config.storage.metadata_columns
+                    if metadata_column_name(column.key) in entry.arrow_schema.names
+                ]
+                await ensure_indexes(table, entry.name, declared)
+
+        await asyncio.gather(*(load(entry) for entry in manifest.tables))
+    finally:
+        db.close()
+
+    if manifest.include_vectors:
+        async with Store(
+            db_path, config=config, skip_validation=True, skip_migration_check=True
+        ) as store:
+            await store._ensure_vector_index()
+    return manifest
@@ -1,6 +1,21 @@
+"""Versioned database upgrades and the runner that applies them.
+
+`run_pending_upgrades` applies every step newer than the database's version.
+After each step it records the step in a checkpoint under the settings blob's
+`migration` key, so an interrupted `haiku-rag migrate` resumes after the last
+completed step instead of starting over; `Store.migrate` clears the checkpoint
+once it stamps the new version. Consecutive steps of one version that declare
+disjoint `tables` run concurrently. A step reports its progress through
+`step_progress`, which logs rows per second and an ETA.
+"""
+
+import asyncio
+import json
 import logging
 from collections.abc import Callable, Coroutine
+from contextvars import ContextVar
 from dataclasses import dataclass
+from time import monotonic
 from typing import TYPE_CHECKING, Any
 
 from packaging.version import Version, parse
@@ -10,14 +25,110 @@ if TYPE_CHECKING:
 
 logger = logging.getLogger(__name__)
 
+# Called with a step's label, the units it has processed and its total.
+ProgressCallback = Callable[[str, int, int], None]
+
+# The settings blob key holding an unfinished migration's checkpoint.
+MIGRATION_CHECKPOINT_KEY = "migration"
+
+# Seconds between two progress log lines of one step.
+_PROGRESS_LOG_INTERVAL_S = 10.0
+
 
 @dataclass
 class Upgrade:
-    """Represents a database upgrade step."""
+    """Represents a database upgrade step.
+
+    `tables` names the tables the step writes. Consecutive steps of the same
+    version with disjoint, non-empty `tables` run concurrently; a step that
+    declares none runs on its own.
+    """
 
     version: str
     apply: Callable[["Store"], Coroutine[Any, Any, None]]
     description: str = ""
+    tables: tuple[str, ...] = ()
+
+    @property
+    def key(self) -> str:
+        """The step's name in the migration checkpoint."""
+        return f"{self.version}:{getattr(self.apply, '__name__', self.description)}"
+
+    @property
+    def label(self) -> str:
+        return (
+            f"{self.version}: {self.description}" if self.description else self.version
+        )
+
+
+class StepProgress:
+    """Progress of one running upgrade step.
+
+    `advance` forwards the count to the runner's progress callback and logs
+    the rate and estimated time left at most every `_PROGRESS_LOG_INTERVAL_S`
+    seconds, and once at the end.
+    """
+
+    def __init__(
+        self,
+        label: str,
+        total: int,
+        unit: str = "rows",
+        on_progress: ProgressCallback | None = None,
+    ) -> None:
+        self.label = label
+        self.total = total
+        self.unit = unit
+        self.done = 0
+        self._on_progress = on_progress
+        self._started = monotonic()
+        self._logged_at = self._started
+
+    @property
+    def rate(self) -> float:
+        """Units per second since the step started."""
+        elapsed = monotonic() - self._started
+        return self.done / elapsed if elapsed > 0 else 0.0
+
+    @property
+    def eta_s(self) -> float | None:
+        """Estimated seconds left, or None before any progress."""
+        rate = self.rate
+        if not rate:
+            return None
+        return max(self.total - self.done, 0) / rate
+
+    def advance(self, count: int) -> None:
+        self.done += count
+        if self._on_progress is not None:
+            self._on_progress(self.label, self.done, self.total)
+        now = monotonic()
+        if self.done < self.total and now - self._logged_at < _PROGRESS_LOG_INTERVAL_S:
+            return
+        self._logged_at = now
+        eta = self.eta_s
+        logger.info(
+            "%s: %d/%d %s (%.0f %s/s, ETA %s)",
+            self.label,
+            self.done,
+            self.total,
+            self.unit,
+            self.rate,
+            self.unit,
+            f"{eta:.0f}s" if eta is not None else "unknown",
+        )
+
+
+# The label and progress callback of the step running in this task.
+_current_step: ContextVar[tuple[str, ProgressCallback | None]] = ContextVar(
+    "_current_step", default=("upgrade", None)
+)
+
+
+def step_progress(total: int, unit: str = "rows") -> StepProgress:
+    """Progress for the upgrade step running in the current task."""
+    label, on_progress = _current_step.get()
+    return StepProgress(label, total, unit, on_progress)
 
 
 # Registry of upgrade steps (ordered by version)
@@ -36,35 +147,131 @@ def get_pending_upgrades(from_version: str) -> list[Upgrade]:
     return [s for s in sorted_steps if v_from < parse(s.version)]
 
 
-async def run_pending_upgrades(store: "Store", from_version: str) -> list[str]:
+def _parallel_groups(steps: list[Upgrade]) -> list[list[Upgrade]]:
+    """Split `steps` into consecutive groups that may run concurrently. A step
+    that declares no tables may touch any of them, so it runs alone."""
+    groups: list[list[Upgrade]] = []
+    written: set[str] = set()
+    for step in steps:
+        current = groups[-1] if groups else None
+        if (
+            current is not None
+            and step.tables
+            and current[0].tables
+            and current[0].version == step.version
+            and not written.intersection(step.tables)
+        ):
+            current.append(step)
+        else:
+            groups.append([step])
+            written = set()
+        written.update(step.tables)
+    return groups
+
+
+async def _read_checkpoint(store: "Store", from_version: str) -> set[str]:
+    """Keys of the steps an interrupted migration from `from_version`
+    completed. A checkpoint left from another starting version is ignored."""
+    checkpoint = (await store._read_stored_settings()).get(MIGRATION_CHECKPOINT_KEY)
+    if not isinstance(checkpoint, dict) or checkpoint.get("from") != from_version:
+        return set()
+    return set(checkpoint.get("completed") or [])
+
+
+async def _write_checkpoint(
+    store: "Store", from_version: str, completed: list[str]
+) -> None:
+    settings = await store._read_stored_settings()
+    settings[MIGRATION_CHECKPOINT_KEY] = {"from": from_version, "completed": completed}
+    await store.settings_table.update(
+        {"settings": json.dumps(settings)}, where="id = 'settings'"
+    )
+
+
+async def clear_checkpoint(store: "Store") -> None:
+    """Remove the migration checkpoint, if any."""
+    settings = await store._read_stored_settings()
+    if settings.pop(MIGRATION_CHECKPOINT_KEY, None) is not None:
+        await store.settings_table.update(
+            {"settings": json.dumps(settings)}, where="id = 'settings'"
+        )
+
+
+async def run_pending_upgrades(
+    store: "Store",
+    from_version: str,
+    concurrency: int = 4,
+    on_progress: ProgressCallback | None = None,
+) -> list[str]:
     """Run upgrades where from_version < step.version.
 
+    Steps an interrupted run from the same version already completed are
+    skipped. Up to `concurrency` steps of a parallel group run at once; if one
+    fails, the others still finish and are checkpointed before the failure is
+    raised.
+
+    Args:
+        store: The store to upgrade.
+        from_version: The database's stored version.
+        concurrency: Maximum number of steps running at once.
+        on_progress: Called as steps advance with the step's label, the units
+            processed so far and its total.
+
     Returns:
-        List of descriptions of applied upgrades.
+        List of descriptions of applied upgrades, including those a previous
+        interrupted run completed.
     """
     applicable = get_pending_upgrades(from_version)
+    completed = await _read_checkpoint(store, from_version)
+    done = [step.key for step in applicable if step.key in completed]
+    pending = [step for step in applicable if step.key not in completed]
 
-    if applicable:
-        logger.info("%d upgrade step(s) pending", len(applicable))
-
-    applied: list[str] = []
-
-    # Apply in ascending order
-    for idx, step in enumerate(applicable, start=1):
+    if done:
         logger.info(
-            "Applying upgrade %s: %s (%d/%d)",
-            step.version,
-            step.description or "",
-            idx,
+            "Resuming migration: %d of %d upgrade step(s) already applied",
+            len(done),
             len(applicable),
         )
-        await step.apply(store)
-        logger.info("Completed upgrade %s", step.version)
-        applied.append(
-            f"{step.version}: {step.description}" if step.description else step.version
+    elif pending:
+        logger.info("%d upgrade step(s) pending", len(pending))
+
+    semaphore = asyncio.Semaphore(concurrency)
+    checkpoint_lock = asyncio.Lock()
+    position = {step.key: idx for idx, step in enumerate(applicable, start=1)}
+
+    async def run(step: Upgrade) -> None:
+        async with semaphore:
+            token = _current_step.set((step.label, on_progress))
+            try:
+                logger.info(
+                    "Applying upgrade %s: %s (%d/%d)",
+                    step.version,
+                    step.description or "",
+                    position[step.key],
+                    len(applicable),
+                )
+                await step.apply(store)
+                logger.info("Completed upgrade %s", step.version)
+            finally:
+                _current_step.reset(token)
+        async with checkpoint_lock:
+            done.append(step.key)
+            await _write_checkpoint(store, from_version, done)
+
+    for group in _parallel_groups(pending):
+        if len(group) == 1:
+            await run(group[0])
+            continue
+        # Siblings of a failing step run to completion, so the checkpoint
+        # keeps their work; the first failure is raised afterwards.
+        results = await asyncio.gather(
+            *(run(step) for step in group), return_exceptions=True
         )
+        for result in results:
+            if isinstance(result, BaseException):
+                raise result
 
-    return applied
+    return [step.label for step in applicable]
 
 
 # Import upgrade modules AFTER Upgrade class is defined to avoid circular imports
@@ -102,6 +309,15 @@ from haiku.rag.store.upgrades.v0_64_0 import (
 from haiku.rag.store.upgrades.v0_75_0 import (
     upgrade_index_hot_lookup_keys as upgrade_0_75_0_index_hot_lookup_keys,
 )
+from haiku.rag.store.upgrades.v0_78_0 import (
+    upgrade_deduplicate_pictures as upgrade_0_78_0_deduplicate_pictures,
+)
+from haiku.rag.store.upgrades.v0_78_0 import (
+    upgrade_split_document_pages as upgrade_0_78_0_split_document_pages,
+)
+from haiku.rag.store.upgrades.v0_78_0 import (
+    upgrade_typed_chunk_metadata as upgrade_0_78_0_typed_chunk_metadata,
+)
 
 upgrades.append(upgrade_0_20_0_docling)
 upgrades.append(upgrade_0_23_1_contextualize)
@@ -114,3 +330,6 @@ upgrades.append(upgrade_0_50_0_canonical_metadata_keys)
 upgrades.append(upgrade_0_58_0_split_document_meta)
 upgrades.append(upgrade_0_64_0_rename_document_meta_id)
 upgrades.append(upgrade_0_75_0_index_hot_lookup_keys)
+upgrades.append(upgrade_0_78_0_split_document_pages)
+upgrades.append(upgrade_0_78_0_deduplicate_pictures)
+upgrades.append(upgrade_0_78_0_typed_chunk_metadata)
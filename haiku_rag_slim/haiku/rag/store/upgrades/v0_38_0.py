@@ -7,7 +7,7 @@ import pyarrow as pa
 from lancedb.pydantic import LanceModel
 from pydantic import Field
 
-from haiku.rag.store.compression import compress_docling_split
+from haiku.rag.store.compression import compress_docling_split, compress_json
 from haiku.rag.store.engine import Store
 from haiku.rag.store.upgrades import Upgrade
 
@@ -57,8 +57,12 @@ async def _apply_split_pages_zstd(store: Store) -> None:  # pragma: no cover
                 # May already be zstd or uncompressed — try as-is
                 json_str = docling_blob.decode("utf-8")
 
-            # Split structure and pages, re-compress with zstd
-            structure_bytes, pages_bytes = compress_docling_split(json.loads(json_str))
+            # Split structure and pages, re-compress with zstd. Pages stay a
+            # single frame here: that is the blob v0.78.0 reads and splits.
+            data = json.loads(json_str)
+            pages = data.get("pages")
+            structure_bytes, _ = compress_docling_split(data)
+            pages_bytes = compress_json(json.dumps(pages)) if pages else None
 
         metadata_raw = row.get("metadata")
         metadata_str = (
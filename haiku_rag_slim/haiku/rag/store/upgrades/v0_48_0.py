@@ -4,7 +4,6 @@ import pyarrow as pa
 from lancedb.index import BTree
 
 from haiku.rag.store.engine import Store
-from haiku.rag.store.schema import DocumentItemRecord
 from haiku.rag.store.upgrades import Upgrade
 from haiku.rag.utils import escape_sql_string
 
@@ -12,6 +11,15 @@ logger = logging.getLogger(__name__)
 
 PROGRESS_INTERVAL = 10
 
+_LEVELS_SCHEMA = pa.schema(
+    [
+        pa.field("document_id", pa.string(), nullable=False),
+        pa.field("self_ref", pa.string(), nullable=False),
+        pa.field("heading_level", pa.int64()),
+        pa.field("tree_depth", pa.int64()),
+    ]
+)
+
 
 async def _ensure_columns(store: Store) -> None:
     """Add heading_level + tree_depth (int64) columns if missing. Idempotent."""
@@ -100,6 +108,7 @@ async def _apply_backfill_heading_hierarchy(store: Store) -> None:
 
         existing_rows = await (
             store.document_items_table.query()
+            .select(["self_ref"])
             .where(f"document_id = '{safe_id}'")
             .to_list()
         )
@@ -117,31 +126,24 @@ async def _apply_backfill_heading_hierarchy(store: Store) -> None:
             skipped += 1
             continue
 
-        records: list[DocumentItemRecord] = []
-        for item in fresh_items:
-            row = existing_by_ref.get(item.self_ref)
-            if row is None:  # pragma: no cover
-                continue
-            records.append(
-                DocumentItemRecord(
-                    document_id=doc_id,
-                    position=row["position"],
-                    self_ref=item.self_ref,
-                    label=row.get("label", ""),
-                    text=row.get("text", ""),
-                    page_numbers=row.get("page_numbers", "[]"),
-                    picture_data=row.get("picture_data"),
-                    heading_level=item.heading_level,
-                    tree_depth=item.tree_depth,
-                )
-            )
-
-        if records:
+        # Only the two backfilled columns are written, so the update holds
+        # whatever other columns document_items has at the time.
+        updates = [
+            {
+                "document_id": doc_id,
+                "self_ref": item.self_ref,
+                "heading_level": item.heading_level,
+                "tree_depth": item.tree_depth,
+            }
+            for item in fresh_items
+            if item.self_ref in existing_by_ref
+        ]
+
+        if updates:
             await (
                 store.document_items_table.merge_insert(["document_id", "self_ref"])
                 .when_matched_update_all()
-                .when_not_matched_insert_all()
-                .execute(records)
+                .execute(pa.Table.from_pylist(updates, schema=_LEVELS_SCHEMA))
             )
             backfilled += 1
 
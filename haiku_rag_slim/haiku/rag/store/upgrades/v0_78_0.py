@@ -0,0 +1,401 @@
+import hashlib
+import json
+import logging
+import shutil
+from datetime import timedelta
+
+import pyarrow as pa
+
+from haiku.rag.store.compression import compress_pages, decompress_json
+from haiku.rag.store.engine import Store
+from haiku.rag.store.schema import ensure_indexes
+from haiku.rag.store.upgrades import Upgrade, step_progress
+from haiku.rag.utils import escape_sql_string
+
+logger = logging.getLogger(__name__)
+
+# Compressed page bytes buffered before a write to document_pages. Bounds the
+# migration's memory to about one batch plus the largest document, while a
+# corpus of small documents still lands in few table versions.
+_BATCH_BYTES = 256 * 1024 * 1024
+
+# Chunks read per streamed batch and rewritten per merge into the chunks table.
+_CHUNK_BATCH_ROWS = 10_000
+
+# Pinned to the document_pages columns at v0.78.0 so the migration stays
+# independent of future model changes.
+_V0_78_0_PAGES_SCHEMA = pa.schema(
+    [
+        pa.field("document_id", pa.string(), nullable=False),
+        pa.field("page_no", pa.int64(), nullable=False),
+        pa.field("page", pa.large_binary()),
+    ]
+)
+
+# Pinned to the picture_blobs columns at v0.78.0.
+_V0_78_0_PICTURE_BLOBS_SCHEMA = pa.schema(
+    [
+        pa.field("hash", pa.string(), nullable=False),
+        pa.field("data", pa.large_binary(), nullable=False),
+        pa.field("vector", pa.list_(pa.float32())),
+        pa.field("embedder", pa.string()),
+    ]
+)
+
+# The document_items columns the picture move writes: the merge key and the
+# new reference.
+_V0_78_0_PICTURE_REFS_SCHEMA = pa.schema(
+    [
+        pa.field("document_id", pa.string(), nullable=False),
+        pa.field("self_ref", pa.string(), nullable=False),
+        pa.field("picture_hash", pa.string()),
+    ]
+)
+
+# The chunk metadata columns added at v0.78.0, plus the merge key.
+_V0_78_0_CHUNK_METADATA_SCHEMA = pa.schema(
+    [
+        pa.field("id", pa.string(), nullable=False),
+        pa.field("doc_item_refs", pa.list_(pa.string())),
+        pa.field("headings", pa.list_(pa.string())),
+        pa.field("labels", pa.list_(pa.string())),
+        pa.field("page_numbers", pa.list_(pa.int64())),
+        pa.field("metadata", pa.string(), nullable=False),
+    ]
+)
+
+
+async def _vacuum_if_space(store: Store, table_name: str, moved: str) -> None:
+    """Compact `table_name` and drop its old versions, unless free disk cannot
+    cover compacting it once."""
+    # retention=0 is safe ONLY because migrate is exclusive/single-writer.
+    # Compaction rewrites the live table once, so skip it when free disk
+    # cannot cover that; the user can run `haiku-rag vacuum` later. Only the
+    # step's own table is compacted: steps writing other tables may be
+    # running alongside.
+    # lancedb's .stats() stub claims TableStatistics but returns a plain dict.
+    table = store._tables()[table_name]
+    stats: dict = await table.stats()  # type: ignore[assignment]  # ty: ignore[invalid-assignment]
+    live_bytes = int(stats.get("total_bytes", 0))
+    free_bytes = shutil.disk_usage(store.db_path).free
+    if live_bytes and free_bytes < live_bytes:
+        logger.warning(
+            "Skipping post-migration vacuum: need ~%.2f GB free to compact the "
+            "%s table, have %.2f GB. Run `haiku-rag vacuum` once you have "
+            "space to reclaim the moved %s.",
+            live_bytes / 1e9,
+            table_name,
+            free_bytes / 1e9,
+            moved,
+        )
+        return
+
+    logger.info("Compacting %s to reclaim the moved %s", table_name, moved)
+    await table.optimize(
+        cleanup_older_than=await store._tag_safe_retention(table, timedelta(0))
+    )
+
+
+async def _apply_split_document_pages(store: Store) -> None:
+    """Move page images from the `documents.docling_pages` blob into
+    `document_pages`, a row per page, then drop the column.
+
+    The blob held every page as one zstd frame, so drawing a chunk on one
+    page decompressed and parsed all of them. Each page is re-compressed on
+    its own. Documents are read one at a time, so peak memory is one
+    document's pages plus the pending batch.
+
+    The `document_pages` table itself is created on open by `_init_tables`.
+    Idempotent: a re-run after a partial failure skips documents whose pages
+    already moved, and skips everything once the column is gone.
+    """
+    schema = await store.documents_table.schema()
+    if "docling_pages" not in schema.names:
+        logger.info("documents has no docling_pages column; nothing to move")
+        return
+
+    moved = {
+        row["document_id"]
+        for row in await store.document_pages_table.query()
+        .select(["document_id"])
+        .to_list()
+    }
+    ids = [
+        row["id"]
+        for row in await store.documents_table.query().select(["id"]).to_list()
+        if row["id"] not in moved
+    ]
+    logger.info("Moving page images for %d document(s) into document_pages", len(ids))
+
+    progress = step_progress(len(ids), "documents")
+    batch: list[dict] = []
+    batch_bytes = 0
+    skipped = 0
+    for doc_id in ids:
+        progress.advance(1)
+        safe_id = escape_sql_string(doc_id)
+        rows = await (
+            store.documents_table.query()
+            .select(["docling_pages"])
+            .where(f"id = '{safe_id}'")
+            .limit(1)
+            .to_list()
+        )
+        blob = rows[0].get("docling_pages") if rows else None
+        if blob is None:
+            continue
+        try:
+            pages = json.loads(decompress_json(blob))
+        except Exception:
+            logger.warning(
+                "Could not decompress page images for document %s; skipping", doc_id
+            )
+            skipped += 1
+            continue
+
+        for page_no, page in compress_pages(pages).items():
+            batch.append({"document_id": doc_id, "page_no": page_no, "page": page})
+            batch_bytes += len(page)
+        if batch_bytes >= _BATCH_BYTES:
+            await store.document_pages_table.add(
+                pa.Table.from_pylist(batch, schema=_V0_78_0_PAGES_SCHEMA)
+            )
+            batch, batch_bytes = [], 0
+    if batch:
+        await store.document_pages_table.add(
+            pa.Table.from_pylist(batch, schema=_V0_78_0_PAGES_SCHEMA)
+        )
+    if skipped:
+        logger.warning("Skipped %d document(s) with unreadable page images", skipped)
+
+    # A metadata operation: the blobs stay in the data files until compaction
+    # rewrites them.
+    logger.info("Dropping docling_pages from documents")
+    await store.documents_table.drop_columns(["docling_pages"])
+
+    await _vacuum_if_space(store, "documents", "page images")
+
+
+async def _write_picture_batch(
+    store: Store, blobs: dict[str, bytes], refs: list[dict]
+) -> None:
+    if blobs:
+        await store.picture_blobs_table.add(
+            pa.Table.from_pylist(
+                [{"hash": h, "data": data} for h, data in blobs.items()],
+                schema=_V0_78_0_PICTURE_BLOBS_SCHEMA,
+            )
+        )
+    if refs:
+        await (
+            store.document_items_table.merge_insert(["document_id", "self_ref"])
+            .when_matched_update_all()
+            .execute(pa.Table.from_pylist(refs, schema=_V0_78_0_PICTURE_REFS_SCHEMA))
+        )
+
+
+async def _apply_deduplicate_pictures(store: Store) -> None:
+    """Move picture bytes from `document_items.picture_data` into
+    `picture_blobs`, one row per distinct picture, then drop the column.
+
+    Each item row gets a `picture_hash` referencing its blob, so a picture
+    repeated across documents is stored once. Documents are read one at a
+    time, so peak memory is one document's pictures plus the pending batch.
+
+    The `picture_blobs` table itself is created on open by `_init_tables`.
+    Idempotent: a re-run after a partial failure skips rows that already
+    reference a blob, and skips everything once the column is gone.
+    """
+    schema = await store.document_items_table.schema()
+    if "picture_data" not in schema.names:
+        logger.info("document_items has no picture_data column; nothing to move")
+        return
+    if "picture_hash" not in schema.names:
+        await store.document_items_table.add_columns(
+            {"picture_hash": "CAST(NULL AS STRING)"}
+        )
+
+    stored = {
+        row["hash"]
+        for row in await store.picture_blobs_table.query().select(["hash"]).to_list()
+    }
+    pending = "picture_data IS NOT NULL AND picture_hash IS NULL"
+    ids = sorted(
+        {
+            row["document_id"]
+            for row in await store.document_items_table.query()
+            .select(["document_id"])
+            .where(pending)
+            .to_list()
+        }
+    )
+    logger.info("Moving pictures for %d document(s) into picture_blobs", len(ids))
+
+    progress = step_progress(len(ids), "documents")
+    blobs: dict[str, bytes] = {}
+    refs: list[dict] = []
+    batch_bytes = 0
+    rows_moved = 0
+    for doc_id in ids:
+        safe_id = escape_sql_string(doc_id)
+        rows = await (
+            store.document_items_table.query()
+            .select(["self_ref", "picture_data"])
+            .where(f"document_id = '{safe_id}' AND {pending}")
+            .to_list()
+        )
+        for row in rows:
+            data = row["picture_data"]
+            h = hashlib.sha256(data).hexdigest()
+            if h not in stored:
+                stored.add(h)
+                blobs[h] = data
+                batch_bytes += len(data)
+            refs.append(
+                {"document_id": doc_id, "self_ref": row["self_ref"], "picture_hash": h}
+            )
+        rows_moved += len(rows)
+        if batch_bytes >= _BATCH_BYTES:
+            await _write_picture_batch(store, blobs, refs)
+            blobs, refs, batch_bytes = {}, [], 0
+        progress.advance(1)
+    await _write_picture_batch(store, blobs, refs)
+    logger.info("Moved %d picture(s) into %d distinct blob(s)", rows_moved, len(stored))
+
+    logger.info("Dropping picture_data from document_items")
+    await store.document_items_table.drop_columns(["picture_data"])
+    await ensure_indexes(store.document_items_table, "document_items")
+
+    await _vacuum_if_space(store, "document_items", "pictures")
+
+
+def _typed_chunk_metadata(chunk_id: str, raw: str | None) -> dict:
+    """One chunk's pre-0.78 metadata JSON as the v0.78.0 metadata columns.
+
+    Values of the wrong shape are left in the `metadata` JSON untouched, so
+    nothing is lost; the typed column gets its default.
+    """
+    try:
+        metadata = json.loads(raw or "{}")
+    except json.JSONDecodeError:
+        logger.warning("Chunk %s has unreadable metadata; keeping it as is", chunk_id)
+        metadata = None
+    if not isinstance(metadata, dict):
+        return {
+            "id": chunk_id,
+            "doc_item_refs": [],
+            "headings": None,
+            "labels": [],
+            "page_numbers": [],
+            "metadata": raw or "{}",
+        }
+
+    def as_list(key: str, kind: type) -> list | None:
+        value = metadata.get(key)
+        if isinstance(value, list) and all(isinstance(v, kind) for v in value):
+            del metadata[key]
+            return value
+        return None
+
+    row = {
+        "id": chunk_id,
+        "doc_item_refs": as_list("doc_item_refs", str) or [],
+        "headings": as_list("headings", str),
+        "labels": as_list("labels", str) or [],
+        "page_numbers": as_list("page_numbers", int) or [],
+    }
+    # A null headings column already says "no headings".
+    if "headings" in metadata and metadata["headings"] is None:
+        del metadata["headings"]
+    metadata.pop("order", None)
+    row["metadata"] = json.dumps(metadata)
+    return row
+
+
+async def _apply_typed_chunk_metadata(store: Store) -> None:
+    """Move the `ChunkMetadata` fields out of the `chunks.metadata` JSON into
+    native list columns: `doc_item_refs`, `headings`, `labels` and
+    `page_numbers`.
+
+    Reads no longer parse JSON per row, and searches can filter on labels and
+    pages inside LanceDB. Keys outside `ChunkMetadata` stay in `metadata`.
+    Pending rows are streamed in batches, and each batch is written with one
+    merge.
+
+    Idempotent: rows already moved have a non-null `labels` and are skipped.
+    """
+    schema = await store.chunks_table.schema()
+    missing = [
+        field
+        for field in _V0_78_0_CHUNK_METADATA_SCHEMA
+        if field.name not in schema.names
+    ]
+    if missing:
+        logger.info("Adding %s to chunks", ", ".join(field.name for field in missing))
+        await store.chunks_table.add_columns(pa.schema(missing))
+
+    pending = "labels IS NULL"
+    total = await store.chunks_table.count_rows(filter=pending)
+    if not total:
+        logger.info("All chunks have typed metadata; nothing to move")
+        await ensure_indexes(store.chunks_table, "chunks")
+        return
+    logger.info("Moving metadata of %d chunk(s) into columns", total)
+
+    # Stream the pending rows rather than loading them: the scan reads the
+    # version it started on, so the merges below don't disturb it, and memory
+    # stays at one batch.
+    progress = step_progress(total, "chunks")
+    stream = await (
+        store.chunks_table.query()
+        .select(["id", "metadata"])
+        .where(pending)
+        .to_batches(max_batch_length=_CHUNK_BATCH_ROWS)
+    )
+    async for rows in stream:
+        await _write_chunk_metadata_batch(
+            store,
+            [
+                _typed_chunk_metadata(chunk_id, raw)
+                for chunk_id, raw in zip(
+                    rows.column("id").to_pylist(), rows.column("metadata").to_pylist()
+                )
+            ],
+        )
+        progress.advance(rows.num_rows)
+
+    await ensure_indexes(store.chunks_table, "chunks")
+    # The merges rewrote every chunk row, vector included.
+    await _vacuum_if_space(store, "chunks", "chunk metadata")
+
+
+async def _write_chunk_metadata_batch(store: Store, batch: list[dict]) -> None:
+    if batch:
+        await (
+            store.chunks_table.merge_insert("id")
+            .when_matched_update_all()
+            .execute(pa.Table.from_pylist(batch, schema=_V0_78_0_CHUNK_METADATA_SCHEMA))
+        )
+
+
+upgrade_split_document_pages = Upgrade(
+    version="0.78.0",
+    apply=_apply_split_document_pages,
+    description="Move page images into the document_pages table, one row per page",
+    tables=("documents", "document_pages"),
+)
+
+upgrade_deduplicate_pictures = Upgrade(
+    version="0.78.0",
+    apply=_apply_deduplicate_pictures,
+    description="Store picture bytes once per content in the picture_blobs table",
+    tables=("document_items", "picture_blobs"),
+)
+
+upgrade_typed_chunk_metadata = Upgrade(
+    version="0.78.0",
+    apply=_apply_typed_chunk_metadata,
+    description="Store chunk doc_item_refs, headings, labels and page_numbers "
+    "as native columns",
+    tables=("chunks",),
+)
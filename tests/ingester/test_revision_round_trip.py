@@ -184,7 +184,7 @@ async def test_metadata_provider_applies_to_fresh_create(temp_db_path, tmp_path)
         async def __call__(self, source_id: str, uri: str, result: FetchResult) -> dict:
             seen["source_id"] = source_id
             seen["uri"] = uri
-            seen["body"] = result.body
+            seen["body"] = result.read_body()
             seen["disk_path"] = result.disk_path
             seen["content_type"] = result.content_type
             return {
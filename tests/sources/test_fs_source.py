@@ -42,13 +42,18 @@ async def test_fs_source_fetch_returns_bytes_and_md5(fs_root: Path):
     target = fs_root / "a.md"
     result = await src.fetch(target.as_uri())
     assert result.uri == target.as_uri()
-    assert result.body == b"alpha"
+    assert result.read_body() == b"alpha"
     assert (
         result.content_hash == hashlib.md5(b"alpha", usedforsecurity=False).hexdigest()
     )
     assert result.content_type == "text/markdown"
     assert result.revision == str(target.stat().st_mtime_ns)
     assert result.disk_path == target
+    # The file is hashed in place, not read into memory or copied.
+    assert result.body is None
+    assert result.size == 5
+    result.discard()
+    assert target.exists()
 
 
 @pytest.mark.asyncio
@@ -292,14 +297,14 @@ async def test_fs_source_fetch_rejects_file_exceeding_max_size(fs_root: Path):
 async def test_fs_source_fetch_allows_file_within_max_size(fs_root: Path):
     src = FSSource(root=fs_root, max_file_size=100)
     result = await src.fetch((fs_root / "a.md").as_uri())
-    assert result.body == b"alpha"
+    assert result.read_body() == b"alpha"
 
 
 @pytest.mark.asyncio
 async def test_fs_source_fetch_no_limit_when_max_size_is_none(fs_root: Path):
     src = FSSource(root=fs_root, max_file_size=None)
     result = await src.fetch((fs_root / "a.md").as_uri())
-    assert result.body == b"alpha"
+    assert result.read_body() == b"alpha"
 
 
 @pytest.mark.asyncio
@@ -315,19 +320,19 @@ async def test_fs_source_fetch_reads_off_event_loop_thread(fs_root: Path):
 
     event_loop_thread = threading.current_thread()
     called_from: list[threading.Thread] = []
-    original = src._read_body
+    original = src._hash_file
 
     def spy(path, uri):
         called_from.append(threading.current_thread())
         return original(path, uri)
 
-    src._read_body = spy  # type: ignore[method-assign]  # ty: ignore[invalid-assignment]
+    src._hash_file = spy  # type: ignore[method-assign]  # ty: ignore[invalid-assignment]
 
     result = await src.fetch(target.as_uri())
-    assert result.body == b"alpha"
-    assert called_from, "_read_body was never called"
+    assert result.read_body() == b"alpha"
+    assert called_from, "_hash_file was never called"
     assert called_from[0] is not event_loop_thread, (
-        "FSSource._read_body ran on the event-loop thread; the read+hash must "
+        "FSSource._hash_file ran on the event-loop thread; the read+hash must "
         "be dispatched via asyncio.to_thread"
     )
 
@@ -360,7 +365,7 @@ async def test_fetch_falls_back_to_octet_stream_for_unknown_extension(tmp_path):
     result = await src.fetch(target.as_uri())
 
     assert result.content_type == "application/octet-stream"
-    assert result.body == b"payload"
+    assert result.read_body() == b"payload"
 
 
 @pytest.mark.asyncio
@@ -90,7 +90,7 @@ async def test_fetch_returns_bytes_and_md5_and_etag():
     src = HTTPSource(source_id="default", transport=transport)
     result = await src.fetch("https://example.com/a.md")
     assert result.uri == "https://example.com/a.md"
-    assert result.body == body
+    assert result.read_body() == body
     assert result.content_hash == hashlib.md5(body, usedforsecurity=False).hexdigest()
     assert result.content_type == "text/markdown"
     # etag preferred over last-modified, surrounding quotes stripped
@@ -401,7 +401,52 @@ async def test_fetch_allows_file_within_max_size():
     )
     src = HTTPSource(source_id="default", transport=transport, max_file_size=1000)
     result = await src.fetch("https://example.com/a.md")
-    assert result.body == body
+    assert result.read_body() == body
+
+
+@pytest.mark.asyncio
+async def test_fetch_streams_to_a_temporary_file():
+    body = b"%PDF-1.7 " + b"x" * 100_000
+    transport = _transport(
+        {
+            ("GET", "https://example.com/download"): httpx.Response(
+                200, content=body, headers={"content-type": "application/pdf"}
+            ),
+        }
+    )
+    src = HTTPSource(source_id="default", transport=transport)
+    result = await src.fetch("https://example.com/download")
+
+    assert result.body is None
+    assert result.temporary
+    assert result.disk_path is not None and result.disk_path.suffix == ".pdf"
+    assert result.size == len(body)
+    assert result.read_body() == body
+    result.discard()
+    assert not result.disk_path.exists()
+
+
+@pytest.mark.asyncio
+async def test_fetch_enforces_max_size_without_content_length():
+    """A chunked response carries no Content-Length for the HEAD check; the
+    limit applies while streaming instead."""
+
+    async def chunked():
+        for _ in range(10):
+            yield b"x" * 500
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.method == "HEAD":
+            return httpx.Response(200)
+        return httpx.Response(200, content=chunked())
+
+    src = HTTPSource(
+        source_id="default",
+        transport=httpx.MockTransport(handler),
+        max_file_size=1000,
+    )
+    with pytest.raises(FileTooLargeError):
+        await src.fetch("https://example.com/a.md")
 
 
 @pytest.mark.asyncio
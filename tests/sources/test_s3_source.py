@@ -45,8 +45,12 @@ def _meta(path: str, etag: str = "abc") -> dict:
 
 
 def _get_result(data: bytes) -> MagicMock:
+    async def _stream():
+        for i in range(0, len(data), 4):
+            yield data[i : i + 4]
+
     result = MagicMock()
-    result.bytes_async = AsyncMock(return_value=data)
+    result.stream = MagicMock(side_effect=lambda **_: _stream())
     return result
 
 
@@ -103,7 +107,7 @@ async def test_fetch_returns_bytes_md5_etag(fake_obstore_io):
     result = await src.fetch("s3://bucket/folder/file.txt")
 
     assert result.uri == "s3://bucket/folder/file.txt"
-    assert result.body == body
+    assert result.read_body() == body
     assert result.content_hash == hashlib.md5(body, usedforsecurity=False).hexdigest()
     assert result.content_type == "text/plain"
     assert result.revision == "abc123"
@@ -257,7 +261,7 @@ async def test_fetch_allows_file_within_max_size(fake_obstore_io):
 
     src = S3Source(uri="s3://bucket/", max_file_size=1000)
     result = await src.fetch("s3://bucket/file.txt")
-    assert result.body == body
+    assert result.read_body() == body
 
 
 @pytest.mark.asyncio
@@ -269,4 +273,144 @@ async def test_fetch_no_limit_when_max_size_is_none(fake_obstore_io):
 
     src = S3Source(uri="s3://bucket/", max_file_size=None)
     result = await src.fetch("s3://bucket/file.txt")
-    assert result.body == body
+    assert result.read_body() == body
+
+
+@pytest.fixture
+def store_builds(monkeypatch):
+    """Counts the obstore stores built."""
+    import haiku.rag.s3
+
+    builds: list[str] = []
+
+    def make_s3_store(bucket, storage_options, prefix=None):
+        builds.append(bucket)
+        return object()
+
+    monkeypatch.setattr(haiku.rag.s3, "make_s3_store", make_s3_store)
+    return builds
+
+
+@pytest.mark.asyncio
+async def test_store_is_built_once_per_source(fake_obstore_io, store_builds):
+    head_async, get_async = fake_obstore_io
+    head_async.return_value = {"e_tag": '"abc"', "size": 1}
+    get_async.return_value = _get_result(b"x")
+
+    src = S3Source(uri="s3://bucket/")
+    await src.head("s3://bucket/a.txt")
+    await src.head("s3://bucket/b.txt")
+    result = await src.fetch("s3://bucket/a.txt")
+    result.discard()
+
+    assert store_builds == ["bucket"]
+
+
+@pytest.mark.asyncio
+async def test_store_is_rebuilt_when_credentials_are_refused(
+    fake_obstore_io, store_builds
+):
+    from obstore.exceptions import UnauthenticatedError
+
+    head_async, _ = fake_obstore_io
+    head_async.side_effect = [UnauthenticatedError("token expired"), {"e_tag": '"a"'}]
+
+    src = S3Source(uri="s3://bucket/")
+    assert await src.head("s3://bucket/a.txt") == "a"
+    assert store_builds == ["bucket", "bucket"]
+    first_store = head_async.await_args_list[0].args[0]
+    assert head_async.await_args_list[1].args[0] is not first_store
+
+
+@pytest.mark.asyncio
+async def test_other_errors_keep_the_store(fake_obstore_io, store_builds):
+    from obstore.exceptions import GenericError
+
+    head_async, _ = fake_obstore_io
+    head_async.side_effect = GenericError("connection reset")
+
+    src = S3Source(uri="s3://bucket/")
+    with pytest.raises(GenericError):
+        await src.head("s3://bucket/a.txt")
+    assert store_builds == ["bucket"]
+    head_async.assert_awaited_once()
+
+
+def _ranged_get(body: bytes, requests: list, fail_at: int | None = None):
+    async def get_async(_store, _key, options: dict):
+        requests.append(options)
+        start, end = options["range"]
+        if start == fail_at:
+            from obstore.exceptions import PreconditionError
+
+            raise PreconditionError("object changed")
+        result = MagicMock()
+        result.bytes_async = AsyncMock(return_value=body[start:end])
+        return result
+
+    return get_async
+
+
+@pytest.mark.asyncio
+async def test_large_objects_download_as_ranges(fake_obstore_io):
+    head_async, get_async = fake_obstore_io
+    body = bytes(range(22))
+    head_async.return_value = {"e_tag": '"abc"', "size": len(body)}
+    requests: list[dict] = []
+    get_async.side_effect = _ranged_get(body, requests)
+
+    src = S3Source(
+        uri="s3://bucket/", multipart_threshold=10, part_size=4, max_concurrency=3
+    )
+    result = await src.fetch("s3://bucket/big.pdf")
+
+    assert result.read_body() == body
+    assert result.content_hash == hashlib.md5(body, usedforsecurity=False).hexdigest()
+    assert result.size == len(body)
+    assert result.disk_path is not None and result.disk_path.suffix == ".pdf"
+    assert sorted(r["range"] for r in requests) == [
+        (0, 4),
+        (4, 8),
+        (8, 12),
+        (12, 16),
+        (16, 20),
+        (20, 22),
+    ]
+    # Every range is pinned to the version the HEAD saw.
+    assert {r["if_match"] for r in requests} == {'"abc"'}
+    result.discard()
+
+
+@pytest.mark.asyncio
+async def test_failed_ranged_download_leaves_no_file(
+    fake_obstore_io, tmp_path, monkeypatch
+):
+    import tempfile
+
+    from obstore.exceptions import PreconditionError
+
+    monkeypatch.setattr(tempfile, "tempdir", str(tmp_path))
+    head_async, get_async = fake_obstore_io
+    body = bytes(range(22))
+    head_async.return_value = {"e_tag": '"abc"', "size": len(body)}
+    get_async.side_effect = _ranged_get(body, [], fail_at=8)
+
+    src = S3Source(uri="s3://bucket/", multipart_threshold=10, part_size=4)
+    with pytest.raises(PreconditionError):
+        await src.fetch("s3://bucket/big.pdf")
+    assert list(tmp_path.iterdir()) == []
+
+
+@pytest.mark.asyncio
+async def test_small_objects_stream_in_one_get(fake_obstore_io):
+    head_async, get_async = fake_obstore_io
+    head_async.return_value = {"e_tag": '"abc"', "size": 5}
+    get_async.return_value = _get_result(b"small")
+
+    src = S3Source(uri="s3://bucket/", multipart_threshold=10)
+    result = await src.fetch("s3://bucket/a.txt")
+
+    assert result.read_body() == b"small"
+    get_async.assert_awaited_once()
+    assert "options" not in get_async.await_args.kwargs
+    result.discard()
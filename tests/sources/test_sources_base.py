@@ -1,10 +1,16 @@
+import hashlib
+import tempfile
 from datetime import UTC, datetime
 
+import pytest
+
 from haiku.rag.sources.base import (
     FetchResult,
+    FileTooLargeError,
     Source,
     SourceEvent,
     SourceEventKind,
+    spool_download,
 )
 
 
@@ -52,6 +58,72 @@ def test_fetch_result_defaults_extra_metadata_to_empty():
     assert result.extra_metadata == {}
 
 
+def test_fetch_result_needs_body_or_disk_path():
+    with pytest.raises(ValueError, match="body or a disk_path"):
+        FetchResult(uri="s3://b/a.md", content_type="text/markdown", content_hash="x")
+
+
+def test_discard_deletes_only_temporary_downloads(tmp_path):
+    original = tmp_path / "a.md"
+    download = tmp_path / "download.md"
+    original.write_bytes(b"x")
+    download.write_bytes(b"x")
+
+    def result(path, temporary):
+        return FetchResult(
+            uri="file:///a.md",
+            content_type="text/markdown",
+            content_hash="x",
+            disk_path=path,
+            temporary=temporary,
+        )
+
+    result(original, False).discard()
+    result(download, True).discard()
+
+    assert original.exists()
+    assert not download.exists()
+
+
+async def _chunks(*parts: bytes):
+    for part in parts:
+        yield part
+
+
+async def test_spool_download_hashes_as_it_writes(tmp_path, monkeypatch):
+    monkeypatch.setattr(tempfile, "tempdir", str(tmp_path))
+
+    path, content_hash, size = await spool_download(
+        _chunks(b"%PDF-", b"1.7 body"),
+        uri="https://example.com/download?id=3",
+        content_type="application/pdf",
+        max_file_size=None,
+    )
+
+    assert path.parent == tmp_path
+    # Named by content type, so docling picks the right format.
+    assert path.suffix == ".pdf"
+    assert path.read_bytes() == b"%PDF-1.7 body"
+    assert content_hash == hashlib.md5(b"%PDF-1.7 body").hexdigest()
+    assert size == 13
+
+
+async def test_spool_download_stops_at_max_file_size(tmp_path, monkeypatch):
+    """Without a Content-Length up front, the limit still applies as bytes
+    arrive, and the partial file is removed."""
+    monkeypatch.setattr(tempfile, "tempdir", str(tmp_path))
+
+    with pytest.raises(FileTooLargeError):
+        await spool_download(
+            _chunks(b"12345", b"67890", b"never read"),
+            uri="https://example.com/a.md",
+            content_type="text/markdown",
+            max_file_size=8,
+        )
+
+    assert list(tmp_path.iterdir()) == []
+
+
 def test_source_protocol_runtime_checkable():
     class Dummy:
         source_id = "dummy"
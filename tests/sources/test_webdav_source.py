@@ -105,7 +105,7 @@ async def test_fetch_returns_bytes_md5_revision_and_content_type():
         transport=_transport(handler),
     )
     result = await src.fetch("https://nc.example.com/dav/a.md")
-    assert result.body == body
+    assert result.read_body() == body
     assert result.content_hash == hashlib.md5(body, usedforsecurity=False).hexdigest()
     assert result.content_type == "text/markdown"
     assert result.revision == "rev-1"
@@ -461,7 +461,7 @@ async def test_fetch_follows_redirect():
         transport=_transport(handler),
     )
     result = await src.fetch("https://nc.example.com/dav/a.md")
-    assert result.body == body
+    assert result.read_body() == body
     assert result.revision == "rev-1"
 
 
@@ -611,7 +611,7 @@ async def test_fetch_allows_file_within_max_size():
         max_file_size=1000,
     )
     result = await src.fetch("https://nc.example.com/dav/a.txt")
-    assert result.body == body
+    assert result.read_body() == body
 
 
 @pytest.mark.asyncio
@@ -0,0 +1,263 @@
+import asyncio
+from datetime import datetime, timedelta
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from haiku.rag.config import AppConfig, get_config
+from haiku.rag.config.models import CompactionConfig
+from haiku.rag.store.compaction import (
+    TableLayout,
+    compaction_reasons,
+    in_peak_window,
+    table_layout,
+)
+from haiku.rag.store.engine import Store
+from haiku.rag.store.info import gather_database_info
+from haiku.rag.store.models import Document
+from haiku.rag.store.repositories.document import DocumentRepository
+
+
+def _config(**compaction) -> AppConfig:
+    config = get_config().model_copy(deep=True)
+    config.storage.compaction = CompactionConfig(**compaction)
+    return config
+
+
+def test_table_layout_estimates_deleted_and_stale():
+    now = datetime.now()
+    stats = {
+        "num_rows": 50,
+        "fragment_stats": {
+            "num_fragments": 2,
+            "num_small_fragments": 2,
+            "lengths": {"mean": 50},
+        },
+    }
+    versions = [
+        {"version": 1, "timestamp": now - timedelta(days=3)},
+        {"version": 2, "timestamp": now - timedelta(days=2)},
+        {"version": 3, "timestamp": now - timedelta(days=2)},
+        {"version": 4, "timestamp": now},
+    ]
+
+    layout = table_layout(stats, versions, now - timedelta(days=1))
+
+    assert layout.num_fragments == 2
+    assert layout.deleted_rows == 50
+    assert layout.deleted_row_ratio == 0.5
+    assert layout.small_fragment_ratio == 1.0
+    assert layout.num_versions == 4
+    assert layout.stale_versions == 3
+
+
+def test_table_layout_of_empty_table():
+    layout = table_layout({"num_rows": 0}, [], datetime.now())
+    assert layout == TableLayout()
+    assert layout.small_fragment_ratio == 0.0
+    assert layout.deleted_row_ratio == 0.0
+
+
+def test_compaction_reasons_per_threshold():
+    config = CompactionConfig(
+        min_small_fragments=4,
+        small_fragment_ratio=0.5,
+        deleted_row_ratio=0.2,
+        max_stale_versions=10,
+    )
+    assert compaction_reasons(TableLayout(num_rows=10, num_fragments=1), config) == []
+    assert compaction_reasons(
+        TableLayout(num_fragments=8, num_small_fragments=4), config
+    ) == ["4/8 small fragments"]
+    # Few small fragments never trigger, whatever their share.
+    assert (
+        compaction_reasons(TableLayout(num_fragments=3, num_small_fragments=3), config)
+        == []
+    )
+    assert compaction_reasons(TableLayout(num_rows=70, deleted_rows=30), config) == [
+        "30% deleted rows"
+    ]
+    assert compaction_reasons(TableLayout(stale_versions=11), config) == [
+        "11 stale versions"
+    ]
+
+
+def test_in_peak_window():
+    at = datetime(2026, 1, 1, 9, 30)
+    assert in_peak_window(["09:00-17:00"], at)
+    assert not in_peak_window(["10:00-17:00"], at)
+    assert not in_peak_window([], at)
+    # A window ending before it starts wraps midnight.
+    assert in_peak_window(["22:00-06:00"], datetime(2026, 1, 1, 23, 0))
+    assert in_peak_window(["22:00-06:00"], datetime(2026, 1, 1, 5, 0))
+    assert not in_peak_window(["22:00-06:00"], at)
+
+
+@pytest.mark.parametrize("window", ["09:00", "9-17", "09:00-25:00"])
+def test_peak_hours_must_be_windows(window):
+    with pytest.raises(ValueError, match="HH:MM-HH:MM"):
+        CompactionConfig(peak_hours=[window])
+
+
+async def test_compact_only_tables_over_threshold(temp_db_path):
+    config = _config(min_small_fragments=3)
+    async with Store(temp_db_path, config=config, create=True) as store:
+        repo = DocumentRepository(store)
+        for i in range(3):
+            await repo.create(Document(content=f"body {i}", uri=f"test://doc{i}"))
+        chunks_version = await store.chunks_table.version()
+
+        run = await store.compact()
+
+        assert run is not None
+        decisions = {t.name: t for t in run.tables}
+        assert decisions["documents"].compacted
+        assert decisions["documents"].reasons == ["3/3 small fragments"]
+        assert decisions["documents"].duration_s is not None
+        assert not decisions["chunks"].compacted
+        assert await store.chunks_table.version() == chunks_version
+        assert await repo.count() == 3
+
+        stored = await store._read_stored_settings()
+        assert stored["compaction"]["tables"]
+
+
+async def test_compact_that_changes_nothing_is_not_recorded(temp_db_path):
+    config = _config(min_small_fragments=1000, max_stale_versions=1000)
+    async with Store(temp_db_path, config=config, create=True) as store:
+        before = await store.settings_table.version()
+
+        run = await store.compact()
+
+        assert run is not None
+        assert not any(t.compacted for t in run.tables)
+        assert await store.settings_table.version() == before
+        assert "compaction" not in await store._read_stored_settings()
+
+
+async def test_compact_reported_by_info(temp_db_path):
+    config = _config(min_small_fragments=2)
+    async with Store(temp_db_path, config=config, create=True) as store:
+        repo = DocumentRepository(store)
+        for i in range(2):
+            await repo.create(Document(content=f"body {i}"))
+        info = await gather_database_info(config, temp_db_path)
+        tables = {t.name: t for t in info.tables}
+        assert tables["documents"].compaction_due == ["2/2 small fragments"]
+        assert tables["documents"].layout.num_fragments == 2
+        assert info.last_compaction is None
+
+        await store.compact()
+
+    info = await gather_database_info(config, temp_db_path)
+    tables = {t.name: t for t in info.tables}
+    assert tables["documents"].compaction_due == []
+    assert info.last_compaction is not None
+    compacted = {t.name for t in info.last_compaction.tables if t.compacted}
+    assert "documents" in compacted
+
+
+async def test_compact_runs_tables_concurrently_up_to_cap(temp_db_path):
+    config = _config(max_concurrency=2, max_stale_versions=1)
+    async with Store(temp_db_path, config=config, create=True) as store:
+        running = 0
+        peak = 0
+
+        async def optimize(**_kwargs):
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.05)
+            running -= 1
+
+        stale = TableLayout(stale_versions=2)
+        with (
+            patch("haiku.rag.store.compaction.table_layout", return_value=stale),
+            patch.multiple(
+                store.documents_table, optimize=AsyncMock(side_effect=optimize)
+            ),
+            patch.multiple(
+                store.document_meta_table, optimize=AsyncMock(side_effect=optimize)
+            ),
+            patch.multiple(
+                store.chunks_table, optimize=AsyncMock(side_effect=optimize)
+            ),
+            patch.multiple(
+                store.document_items_table, optimize=AsyncMock(side_effect=optimize)
+            ),
+            patch.multiple(
+                store.document_pages_table, optimize=AsyncMock(side_effect=optimize)
+            ),
+            patch.multiple(
+                store.settings_table, optimize=AsyncMock(side_effect=optimize)
+            ),
+            patch.object(store, "_record_compaction", AsyncMock()),
+        ):
+            run = await store.compact()
+
+        assert run is not None
+        assert all(t.compacted for t in run.tables)
+        assert peak == 2
+
+
+async def test_compact_skips_in_peak_window(temp_db_path):
+    config = _config(peak_hours=["00:00-23:59"], min_small_fragments=1)
+    async with Store(temp_db_path, config=config, create=True) as store:
+        with patch.object(store.documents_table, "optimize", AsyncMock()) as optimize:
+            with patch(
+                "haiku.rag.store.engine.in_peak_window", return_value=True
+            ) as window:
+                assert await store.compact() is None
+            window.assert_called_once()
+            optimize.assert_not_called()
+
+
+async def test_compact_skips_when_a_pass_is_running(temp_db_path):
+    async with Store(temp_db_path, create=True) as store:
+        async with store._vacuum_lock:
+            assert await asyncio.wait_for(store.compact(), timeout=5) is None
+
+
+async def test_compact_skips_in_cloud(temp_db_path):
+    async with Store(temp_db_path, create=True) as store:
+        with (
+            patch.object(get_config().lancedb, "uri", "db://test-database"),
+            patch.object(get_config().lancedb, "api_key", "test-api-key"),
+            patch.object(get_config().lancedb, "region", "us-east-1"),
+        ):
+            assert await store.compact() is None
+
+
+async def test_compact_skips_on_resource_errors(temp_db_path):
+    config = _config(max_stale_versions=1)
+    async with Store(temp_db_path, config=config, create=True) as store:
+        with (
+            patch(
+                "haiku.rag.store.compaction.table_layout",
+                return_value=TableLayout(stale_versions=2),
+            ),
+            patch.object(
+                store.documents_table, "optimize", AsyncMock(side_effect=OSError)
+            ),
+        ):
+            assert await store.compact() is None
+
+
+async def test_compact_raises_lance_errors_after_every_table(temp_db_path):
+    config = _config(max_stale_versions=1)
+    async with Store(temp_db_path, config=config, create=True) as store:
+        with (
+            patch(
+                "haiku.rag.store.compaction.table_layout",
+                return_value=TableLayout(stale_versions=2),
+            ),
+            patch.object(
+                store.documents_table,
+                "optimize",
+                AsyncMock(side_effect=RuntimeError("lance")),
+            ),
+            patch.object(store.chunks_table, "optimize", AsyncMock()) as chunks,
+        ):
+            with pytest.raises(RuntimeError, match="lance"):
+                await store.compact()
+        chunks.assert_awaited_once()
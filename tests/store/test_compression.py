@@ -1,10 +1,19 @@
 import json
+import threading
 from concurrent.futures import ThreadPoolExecutor
 
+import pytest
+
+from haiku.rag.store import compression
 from haiku.rag.store.compression import (
+    CompressionParams,
+    UnknownDictionaryError,
     compress_docling_split,
     compress_json,
+    compress_json_pieces,
     decompress_json,
+    register_dictionary,
+    train_dictionary,
 )
 
 
@@ -57,7 +66,7 @@ class TestDoclingCompressionSplit:
         structure_bytes, pages_bytes = compress_docling_split(data)
 
         assert structure_bytes is not None
-        assert pages_bytes is not None
+        assert set(pages_bytes) == {1, 2}
 
         # Structure should not contain pages
         structure = json.loads(decompress_json(structure_bytes))
@@ -65,17 +74,16 @@ class TestDoclingCompressionSplit:
         assert structure["name"] == "test_doc"
         assert structure["texts"] == [{"text": "hello"}]
 
-        # Pages should contain only pages
-        pages = json.loads(decompress_json(pages_bytes))
-        assert "1" in pages
-        assert "2" in pages
+        # Each page is its own frame
+        assert json.loads(decompress_json(pages_bytes[1])) == {"image": "base64data"}
+        assert json.loads(decompress_json(pages_bytes[2])) == {"image": "more"}
 
     def test_split_without_pages(self):
         data = {"name": "test_doc", "texts": []}
         structure_bytes, pages_bytes = compress_docling_split(data)
 
         assert structure_bytes is not None
-        assert pages_bytes is None
+        assert pages_bytes == {}
 
         structure = json.loads(decompress_json(structure_bytes))
         assert structure["name"] == "test_doc"
@@ -85,4 +93,123 @@ class TestDoclingCompressionSplit:
         structure_bytes, pages_bytes = compress_docling_split(data)
 
         assert structure_bytes is not None
-        assert pages_bytes is None
+        assert pages_bytes == {}
+
+
+def _structure(i: int) -> str:
+    return json.dumps(
+        {
+            "schema_name": "DoclingDocument",
+            "name": f"doc-{i}",
+            "texts": [
+                {"self_ref": f"#/texts/{n}", "label": "text", "text": f"para {i}.{n}"}
+                for n in range(i % 7 + 3)
+            ],
+        }
+    )
+
+
+def _trained_dictionary_id() -> int:
+    samples = [_structure(i).encode() for i in range(300)]
+    return register_dictionary(train_dictionary(samples, 4096))
+
+
+class TestCompressionParams:
+    def test_dictionary_roundtrip_is_smaller(self):
+        dict_id = _trained_dictionary_id()
+        json_str = _structure(1000)
+
+        with_dict = compress_json(json_str, CompressionParams(dictionary_id=dict_id))
+
+        assert decompress_json(with_dict) == json_str
+        assert len(with_dict) < len(compress_json(json_str))
+
+    def test_unknown_dictionary_raises(self, monkeypatch):
+        dict_id = _trained_dictionary_id()
+        blob = compress_json(_structure(1), CompressionParams(dictionary_id=dict_id))
+        monkeypatch.setattr(compression, "_dictionaries", {})
+        monkeypatch.setattr(compression, "_loaded", threading.local())
+
+        with pytest.raises(UnknownDictionaryError, match=str(dict_id)):
+            decompress_json(blob)
+
+    def test_pages_ignore_dictionary(self):
+        dict_id = _trained_dictionary_id()
+        structure, pages = compress_docling_split(
+            {"name": "d", "pages": {"1": {"page_no": 1}}},
+            CompressionParams(dictionary_id=dict_id),
+        )
+
+        assert compression._frame_dict_id(structure) == dict_id
+        assert compression._frame_dict_id(pages[1]) == 0
+
+    def test_level_changes_output(self):
+        json_str = _structure(5) * 50
+        fast = compress_json(json_str, CompressionParams(level=1))
+        small = compress_json(json_str, CompressionParams(level=19))
+
+        assert decompress_json(fast) == decompress_json(small) == json_str
+        assert len(small) < len(fast)
+
+    def test_threads_used_for_large_blobs_only(self, monkeypatch):
+        calls: list[int] = []
+        original = compression._zstd_compress
+
+        def spy(data, level, threads, zstd_dict):
+            calls.append(threads)
+            return original(data, level, threads, zstd_dict)
+
+        monkeypatch.setattr(compression, "_zstd_compress", spy)
+        monkeypatch.setattr(compression, "THREADED_MIN_BYTES", 100)
+        params = CompressionParams(threads=2)
+
+        small = compress_json('{"a": 1}', params)
+        large = compress_json(json.dumps({"text": "x" * 1000}), params)
+
+        assert calls == [0, 2]
+        assert decompress_json(small) == '{"a": 1}'
+        assert json.loads(decompress_json(large)) == {"text": "x" * 1000}
+
+    def test_train_with_too_few_samples_raises(self):
+        with pytest.raises(ValueError, match="Could not train a dictionary"):
+            train_dictionary([b"{}"], 4096)
+
+
+class TestCompressJsonPieces:
+    def _pieces(self) -> list[bytes]:
+        return [b"[", *(b'{"n": %d},' % n for n in range(200)), b"null]"]
+
+    def test_small_json_is_one_frame_with_its_size(self, monkeypatch):
+        calls: list[int] = []
+        monkeypatch.setattr(
+            compression,
+            "_zstd_stream_compressor",
+            lambda *args: calls.append(1),
+        )
+
+        blob = compress_json_pieces(self._pieces())
+
+        assert calls == []
+        assert blob == compress_json(b"".join(self._pieces()).decode())
+
+    @pytest.mark.parametrize("threads", [0, 2])
+    def test_large_json_is_streamed(self, monkeypatch, threads):
+        monkeypatch.setattr(compression, "STREAMED_MIN_BYTES", 100)
+        pieces = self._pieces()
+
+        blob = compress_json_pieces(iter(pieces), CompressionParams(threads=threads))
+
+        assert decompress_json(blob) == b"".join(pieces).decode()
+
+    def test_streamed_json_uses_the_dictionary(self, monkeypatch):
+        monkeypatch.setattr(compression, "STREAMED_MIN_BYTES", 100)
+        dict_id = _trained_dictionary_id()
+        json_str = _structure(1000)
+
+        blob = compress_json_pieces(
+            [json_str[:50].encode(), json_str[50:].encode()],
+            CompressionParams(dictionary_id=dict_id),
+        )
+
+        assert compression._frame_dict_id(blob) == dict_id
+        assert decompress_json(blob) == json_str
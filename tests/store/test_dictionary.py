@@ -0,0 +1,149 @@
+import threading
+
+import pytest
+from docling_core.types.doc.document import DoclingDocument
+from docling_core.types.doc.labels import DocItemLabel
+
+from haiku.rag.config import AppConfig
+from haiku.rag.store import ReadOnlyError, compression
+from haiku.rag.store.dictionary import train_docling_dictionary
+from haiku.rag.store.engine import Store
+from haiku.rag.store.models import Document
+from haiku.rag.store.repositories.document import DocumentRepository
+from haiku.rag.store.repositories.settings import SettingsRepository
+
+
+def _docling(i: int) -> DoclingDocument:
+    doc = DoclingDocument(name=f"doc-{i}")
+    for n in range(i % 5 + 2):
+        doc.add_text(label=DocItemLabel.TEXT, text=f"Paragraph {n} of document {i}")
+    return doc
+
+
+async def _seed(store: Store, count: int) -> None:
+    documents = []
+    for i in range(count):
+        document = Document(content=f"doc {i}")
+        document.set_docling(_docling(i), store.compression_params)
+        documents.append(document)
+    await DocumentRepository(store).create(documents)
+
+
+def _with_docling(document: Document, store: Store) -> Document:
+    document.set_docling(_docling(3), store.compression_params)
+    return document
+
+
+@pytest.mark.asyncio
+async def test_train_stores_active_dictionary(temp_db_path):
+    async with Store(temp_db_path, create=True) as store:
+        await _seed(store, 60)
+        assert store.compression_params.dictionary_id is None
+
+        report = await train_docling_dictionary(store, sample_size=50, dict_size=4096)
+
+        assert report.samples == 50
+        assert report.dictionary_compressed_bytes < report.plain_bytes
+        assert store.compression_params.dictionary_id == report.dictionary_id
+        settings = await store._read_stored_settings()
+        assert settings["zstd_dictionaries"]["active"] == report.dictionary_id
+
+        # Saving the config must not drop the store-written dictionaries.
+        await SettingsRepository(store).save_current_settings()
+        settings = await store._read_stored_settings()
+        assert (
+            str(report.dictionary_id) in settings["zstd_dictionaries"]["dictionaries"]
+        )
+
+
+@pytest.mark.asyncio
+async def test_reopened_store_reads_dictionary_blobs(temp_db_path, monkeypatch):
+    async with Store(temp_db_path, create=True) as store:
+        await _seed(store, 60)
+        report = await train_docling_dictionary(store, sample_size=60, dict_size=4096)
+        created = await DocumentRepository(store).create(
+            _with_docling(Document(content="new"), store)
+        )
+        assert created.id is not None
+
+    # A fresh process knows no dictionaries until it opens the database.
+    monkeypatch.setattr(compression, "_dictionaries", {})
+    monkeypatch.setattr(compression, "_loaded", threading.local())
+
+    async with Store(temp_db_path) as store:
+        assert store.compression_params.dictionary_id == report.dictionary_id
+        loaded = await DocumentRepository(store).get_by_id(
+            created.id, include_blobs=True
+        )
+        assert loaded is not None
+        assert loaded.docling_document is not None
+        assert compression._frame_dict_id(loaded.docling_document) == (
+            report.dictionary_id
+        )
+        docling = loaded.get_docling_document()
+        assert docling is not None
+        assert docling.name == "doc-3"
+
+
+@pytest.mark.asyncio
+async def test_reader_opened_before_training_reads_dictionary_blobs(
+    temp_db_path, monkeypatch
+):
+    async with Store(temp_db_path, create=True) as store:
+        await _seed(store, 60)
+
+    config = AppConfig()
+    config.lancedb.read_consistency_interval_seconds = 0
+    async with Store(temp_db_path, config=config, read_only=True) as reader:
+        async with Store(temp_db_path) as writer:
+            await train_docling_dictionary(writer, sample_size=60, dict_size=4096)
+            created = await DocumentRepository(writer).create(
+                _with_docling(Document(content="new"), writer)
+            )
+            assert created.id is not None
+
+        # The reader's process never saw the training.
+        monkeypatch.setattr(compression, "_dictionaries", {})
+        monkeypatch.setattr(compression, "_loaded", threading.local())
+
+        loaded = await DocumentRepository(reader).get_by_id(
+            created.id, include_blobs=True
+        )
+        assert loaded is not None
+        docling = loaded.get_docling_document()
+        assert docling is not None
+        assert docling.name == "doc-3"
+
+    monkeypatch.setattr(compression, "_dictionaries", {})
+    monkeypatch.setattr(compression, "_loaded", threading.local())
+    assert loaded.docling_document is not None
+    with pytest.raises(compression.UnknownDictionaryError):
+        compression.decompress_json(loaded.docling_document)
+
+
+@pytest.mark.asyncio
+async def test_dictionary_can_be_disabled(temp_db_path):
+    async with Store(temp_db_path, create=True) as store:
+        await _seed(store, 60)
+        await train_docling_dictionary(store, sample_size=60, dict_size=4096)
+
+    config = AppConfig()
+    config.storage.compression.dictionary = False
+    async with Store(temp_db_path, config=config) as store:
+        assert store.compression_params.dictionary_id is None
+
+
+@pytest.mark.asyncio
+async def test_train_without_documents_raises(temp_db_path):
+    async with Store(temp_db_path, create=True) as store:
+        with pytest.raises(ValueError, match="No documents"):
+            await train_docling_dictionary(store)
+
+
+@pytest.mark.asyncio
+async def test_train_read_only_raises(temp_db_path):
+    async with Store(temp_db_path, create=True):
+        pass
+    async with Store(temp_db_path, read_only=True) as store:
+        with pytest.raises(ReadOnlyError):
+            await train_docling_dictionary(store)
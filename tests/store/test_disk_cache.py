@@ -0,0 +1,194 @@
+import urllib.error
+import urllib.request
+
+import pytest
+from obstore.store import MemoryStore, S3Store
+
+from haiku.rag.config.models import AppConfig, DiskCacheConfig, LanceDBConfig
+from haiku.rag.store.disk_cache import (
+    BLOCK_SIZE,
+    DiskCache,
+    _parse_range,
+    disk_cache_endpoint,
+    read_disk_cache_stats,
+)
+from haiku.rag.store.engine import Store
+from haiku.rag.store.info import gather_database_info
+from haiku.rag.store.models import Document
+from haiku.rag.store.repositories.document import DocumentRepository
+
+
+def _cached_config(db_path, cache_path) -> AppConfig:
+    return AppConfig(
+        lancedb=LanceDBConfig(
+            uri=db_path.absolute().as_uri(),
+            disk_cache=DiskCacheConfig(enabled=True, path=cache_path),
+        )
+    )
+
+
+async def _uris(store: Store) -> set[str | None]:
+    return {d.uri for d in await DocumentRepository(store).list_all()}
+
+
+@pytest.mark.asyncio
+async def test_read_only_store_reads_through_the_cache(temp_db_path, tmp_path):
+    async with Store(temp_db_path, create=True) as store:
+        repo = DocumentRepository(store)
+        await repo.create(Document(content="First document", uri="a"))
+        await repo.create(Document(content="Second document", uri="b"))
+        versions = await store.current_table_versions()
+
+    config = _cached_config(temp_db_path, tmp_path / "cache")
+    async with Store(temp_db_path, config=config, read_only=True) as store:
+        assert await _uris(store) == {"a", "b"}
+        assert await store.current_table_versions() == versions
+    cold = read_disk_cache_stats(config)
+    assert cold is not None and cold.misses > 0 and cold.size_bytes > 0
+
+    # A restarted reader serves the same files from disk.
+    async with Store(temp_db_path, config=config, read_only=True) as store:
+        assert await _uris(store) == {"a", "b"}
+    warm = read_disk_cache_stats(config)
+    assert warm is not None
+    assert warm.misses == cold.misses
+    assert warm.hits > cold.hits
+
+
+@pytest.mark.asyncio
+async def test_cached_reader_sees_new_versions(temp_db_path, tmp_path):
+    """Manifests and listings are never cached, so a write made after the
+    cache warmed up is visible to the next reader."""
+    config = _cached_config(temp_db_path, tmp_path / "cache")
+    async with Store(temp_db_path, create=True) as store:
+        repo = DocumentRepository(store)
+        await repo.create(Document(content="First document", uri="a"))
+        async with Store(temp_db_path, config=config, read_only=True) as reader:
+            assert await _uris(reader) == {"a"}
+
+        await repo.create(Document(content="Second document", uri="b"))
+        async with Store(temp_db_path, config=config, read_only=True) as reader:
+            assert await _uris(reader) == {"a", "b"}
+
+
+@pytest.mark.asyncio
+async def test_writable_store_bypasses_the_cache(temp_db_path, tmp_path):
+    async with Store(temp_db_path, create=True):
+        pass
+
+    config = _cached_config(temp_db_path, tmp_path / "cache")
+    async with Store(temp_db_path, config=config) as store:
+        await DocumentRepository(store).create(Document(content="x", uri="a"))
+
+    assert not (tmp_path / "cache").exists()
+    assert read_disk_cache_stats(config) is None
+
+
+@pytest.mark.asyncio
+async def test_info_reports_the_hit_ratio(temp_db_path, tmp_path):
+    async with Store(temp_db_path, create=True) as store:
+        await DocumentRepository(store).create(Document(content="x", uri="a"))
+
+    config = _cached_config(temp_db_path, tmp_path / "cache")
+    for _ in range(2):
+        async with Store(temp_db_path, config=config, read_only=True) as store:
+            await _uris(store)
+
+    info = await gather_database_info(config, temp_db_path)
+
+    assert info.disk_cache is not None
+    assert info.disk_cache.hit_ratio is not None
+    assert 0 < info.disk_cache.hit_ratio < 1
+
+
+def _endpoint_store(options: dict[str, str], secret: str) -> S3Store:
+    return S3Store(
+        "haiku-rag-cache",
+        endpoint=options["aws_endpoint"],
+        access_key_id=options["aws_access_key_id"],
+        secret_access_key=secret,
+        region=options["aws_region"],
+        virtual_hosted_style_request=False,
+        client_options={"allow_http": True},
+        retry_config={"max_retries": 0},
+    )
+
+
+@pytest.mark.asyncio
+async def test_endpoint_only_serves_requests_signed_with_its_key(
+    temp_db_path, tmp_path
+):
+    async with Store(temp_db_path, create=True) as store:
+        await DocumentRepository(store).create(Document(content="x", uri="a"))
+    _, options = disk_cache_endpoint(_cached_config(temp_db_path, tmp_path / "cache"))
+
+    signed = _endpoint_store(options, options["aws_secret_access_key"])
+    assert signed.list_with_delimiter("db")["common_prefixes"]
+
+    forged = _endpoint_store(options, "not-the-secret")
+    with pytest.raises(Exception, match="403"):
+        forged.list_with_delimiter("db")
+
+    request = urllib.request.Request(
+        f"{options['aws_endpoint']}/haiku-rag-cache?list-type=2",
+        headers={"Authorization": "AWS4-HMAC-SHA256 Credential=haiku-rag"},
+    )
+    with pytest.raises(urllib.error.HTTPError) as unsigned:
+        urllib.request.urlopen(request)
+    assert unsigned.value.code == 403
+
+
+def test_evicts_least_recently_used_blocks(tmp_path):
+    upstream = MemoryStore()
+    payload = bytes(range(256)) * (3 * BLOCK_SIZE // 256)
+    upstream.put("t.lance/data/f.lance", payload)
+    cache = DiskCache(tmp_path, 2 * BLOCK_SIZE, "memory:///", upstream)
+    key = "t.lance/data/f.lance"
+    size = len(payload)
+
+    assert cache.read(key, 0, 10, size) == payload[:10]
+    assert (
+        cache.read(key, BLOCK_SIZE, BLOCK_SIZE + 10, size)
+        == payload[BLOCK_SIZE : BLOCK_SIZE + 10]
+    )
+    # Touch block 0 so block 1 is the least recently used.
+    assert cache.read(key, 5, 15, size) == payload[5:15]
+    assert cache.read(key, size - 10, size, size) == payload[-10:]
+
+    blocks = cache._db.execute("SELECT block FROM blocks ORDER BY block").fetchall()
+    assert blocks == [(0,), (2,)]
+    assert not cache._block_file(cache._namespace + key, 1).exists()
+    stats = dict(cache._db.execute("SELECT name, value FROM counters").fetchall())
+    assert stats == {"hits": 1, "misses": 3}
+
+    # A read spanning blocks stitches cached and fetched blocks together.
+    assert cache.read(key, 10, size - 10, size) == payload[10:-10]
+    cache.close()
+
+
+def test_mutable_files_are_not_cached(tmp_path):
+    upstream = MemoryStore()
+    upstream.put("t.lance/_versions/1.manifest", b"manifest")
+    cache = DiskCache(tmp_path, BLOCK_SIZE, "memory:///", upstream)
+
+    assert cache.read("t.lance/_versions/1.manifest", 0, 8, 8) == b"manifest"
+    upstream.put("t.lance/_versions/1.manifest", b"replaced")
+    assert cache.read("t.lance/_versions/1.manifest", 0, 8, 8) == b"replaced"
+
+    assert cache._db.execute("SELECT COUNT(*) FROM blocks").fetchone() == (0,)
+    cache.close()
+
+
+@pytest.mark.parametrize(
+    "header, expected",
+    [
+        ("bytes=0-9", (0, 10)),
+        ("bytes=5-", (5, 100)),
+        ("bytes=90-200", (90, 100)),
+        ("bytes=-10", (90, 100)),
+        ("bytes=100-", None),
+        ("bytes=-0", None),
+    ],
+)
+def test_parse_range(header, expected):
+    assert _parse_range(header, 100) == expected
@@ -0,0 +1,75 @@
+from docling_core.types.doc.document import DoclingDocument
+
+from haiku.rag.store.docling_cache import (
+    PARSED_BYTES_PER_JSON_BYTE,
+    DoclingDocumentCache,
+)
+
+
+def _cache(json_bytes: int) -> DoclingDocumentCache:
+    return DoclingDocumentCache(json_bytes * PARSED_BYTES_PER_JSON_BYTE)
+
+
+def test_hit_requires_same_version():
+    cache = _cache(100)
+    doc = DoclingDocument(name="a")
+    cache.put("a", 3, doc, 10)
+
+    assert cache.get("a", 3) is doc
+    assert cache.get("a", 4) is None
+    assert cache.get("b", 3) is None
+
+
+def test_newer_version_replaces_entry():
+    cache = _cache(100)
+    cache.put("a", 3, DoclingDocument(name="old"), 10)
+    new = DoclingDocument(name="new")
+    cache.put("a", 4, new, 20)
+
+    assert len(cache) == 1
+    assert cache.get("a", 4) is new
+    assert cache.size_bytes == 20 * PARSED_BYTES_PER_JSON_BYTE
+
+
+def test_evicts_least_recently_used_over_budget():
+    cache = _cache(30)
+    for name in ("a", "b", "c"):
+        cache.put(name, 1, DoclingDocument(name=name), 10)
+    # Touch "a" so "b" is the least recently used.
+    assert cache.get("a", 1) is not None
+
+    cache.put("d", 1, DoclingDocument(name="d"), 10)
+
+    assert cache.get("b", 1) is None
+    assert {n for n in "acd" if cache.get(n, 1) is not None} == {"a", "c", "d"}
+    assert cache.size_bytes == 30 * PARSED_BYTES_PER_JSON_BYTE
+
+
+def test_document_over_budget_is_not_cached():
+    cache = _cache(10)
+    cache.put("a", 1, DoclingDocument(name="a"), 5)
+    cache.put("big", 1, DoclingDocument(name="big"), 11)
+
+    assert cache.get("big", 1) is None
+    assert cache.get("a", 1) is not None
+
+
+def test_zero_budget_disables_cache():
+    cache = DoclingDocumentCache(0)
+    cache.put("a", 1, DoclingDocument(name="a"), 1)
+    assert len(cache) == 0
+
+
+def test_discard_and_clear():
+    cache = _cache(100)
+    cache.put("a", 1, DoclingDocument(name="a"), 10)
+    cache.put("b", 1, DoclingDocument(name="b"), 10)
+
+    cache.discard("a")
+    cache.discard("missing")
+    assert cache.get("a", 1) is None
+    assert cache.size_bytes == 10 * PARSED_BYTES_PER_JSON_BYTE
+
+    cache.clear()
+    assert len(cache) == 0
+    assert cache.size_bytes == 0
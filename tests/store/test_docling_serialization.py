@@ -0,0 +1,139 @@
+import base64
+import json
+
+import pytest
+from docling_core.types.doc.base import Size
+from docling_core.types.doc.document import (
+    DoclingDocument,
+    ImageRef,
+    TableCell,
+    TableData,
+)
+from docling_core.types.doc.labels import DocItemLabel
+from PIL import Image
+
+from haiku.rag.client import HaikuRAG
+from haiku.rag.store import compression
+from haiku.rag.store.compression import (
+    compress_docling,
+    compress_docling_split,
+    decompress_json,
+)
+from haiku.rag.store.docling_serialization import serialize_docling
+from haiku.rag.store.models.document_item import extract_items
+
+
+def _picture(color: str) -> ImageRef:
+    return ImageRef.from_pil(Image.new("RGB", (8, 6), color), dpi=72)
+
+
+def _make_docling_doc() -> DoclingDocument:
+    doc = DoclingDocument(name="serialized")
+    doc.add_page(page_no=1, size=Size(width=100, height=100), image=_picture("white"))
+    doc.add_heading(text="Heading", level=1)
+    doc.add_text(label=DocItemLabel.TEXT, text="A paragraph.")
+    cells = [
+        TableCell(
+            text=f"r{row}c{col}",
+            start_row_offset_idx=row,
+            end_row_offset_idx=row + 1,
+            start_col_offset_idx=col,
+            end_col_offset_idx=col + 1,
+        )
+        for row in range(2)
+        for col in range(2)
+    ]
+    doc.add_table(data=TableData(num_rows=2, num_cols=2, table_cells=cells))
+    doc.add_picture(image=_picture("red"))
+    return doc
+
+
+def _picture_bytes(ref: ImageRef) -> bytes:
+    return base64.b64decode(str(ref.uri).split(",", 1)[1])
+
+
+def test_serialization_matches_separate_steps():
+    doc = _make_docling_doc()
+
+    serialization = serialize_docling(doc)
+
+    assert serialization.markdown == doc.export_to_markdown()
+    assert serialization.version == doc.version
+    assert serialization.items == extract_items("", doc)
+    assert serialization.positions == {
+        item.self_ref: position
+        for position, (item, _level) in enumerate(doc.iterate_items())
+    }
+    image = doc.pictures[0].image
+    assert image is not None
+    assert serialization.pictures == {"#/pictures/0": _picture_bytes(image)}
+
+
+def test_compress_docling_matches_the_dict_split():
+    doc = _make_docling_doc()
+    split_structure, split_pages = compress_docling_split(doc.model_dump(mode="json"))
+
+    structure, pages = compress_docling(doc)
+
+    # The dict split nulls picture images; the direct dump leaves them out.
+    expected = json.loads(decompress_json(split_structure))
+    for picture in expected["pictures"]:
+        assert picture.pop("image") is None
+    assert json.loads(decompress_json(structure)) == expected
+    assert {n: json.loads(decompress_json(p)) for n, p in pages.items()} == {
+        n: json.loads(decompress_json(p)) for n, p in split_pages.items()
+    }
+    restored = DoclingDocument.model_validate_json(decompress_json(structure))
+    assert restored.pictures[0].image is None
+    assert restored.export_to_markdown() == doc.export_to_markdown()
+
+
+def test_large_structure_is_streamed_item_by_item(monkeypatch):
+    monkeypatch.setattr(compression, "STREAMED_MIN_BYTES", 64)
+    doc = _make_docling_doc()
+    pieces: list[int] = []
+    original = compression.compress_json_pieces
+
+    def spy(stream, params=None):
+        def counted():
+            for piece in stream:
+                pieces.append(len(piece))
+                yield piece
+
+        return original(counted(), params)
+
+    monkeypatch.setattr(compression, "compress_json_pieces", spy)
+
+    structure, _ = compress_docling(doc)
+
+    assert decompress_json(structure) == doc.model_dump_json(
+        exclude={"pages": True, "pictures": {"__all__": {"image"}}}
+    )
+    items = len(doc.texts) + len(doc.tables) + len(doc.pictures)
+    assert len(pieces) > items
+    assert max(pieces) < len(decompress_json(structure))
+
+
+@pytest.mark.asyncio
+async def test_import_reuses_the_serialized_items(temp_db_path, monkeypatch):
+    def no_second_walk(*args, **kwargs):
+        raise AssertionError("items were extracted again")
+
+    monkeypatch.setattr("haiku.rag.client.documents.extract_items", no_second_walk)
+    doc = _make_docling_doc()
+
+    async with HaikuRAG(temp_db_path, create=True) as rag:
+        created = await rag.import_document(doc, [], uri="test://serialized")
+        assert created.id is not None
+
+        assert created.docling_serialization(doc) is None
+        items = await rag.document_item_repository.get_all_items(created.id)
+        assert [item.self_ref for item in items] == [
+            item.self_ref for item in extract_items("", doc)
+        ]
+        picture = await rag.document_item_repository.get_picture_bytes(
+            created.id, "#/pictures/0"
+        )
+        image = doc.pictures[0].image
+        assert image is not None
+        assert picture == _picture_bytes(image)
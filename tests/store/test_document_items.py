@@ -1,3 +1,4 @@
+import pyarrow as pa
 import pytest
 
 from haiku.rag.client import HaikuRAG
@@ -487,7 +488,7 @@ class TestDocumentItemMigration:
         from haiku.rag.store.upgrades.v0_40_0 import _apply_populate_document_items
 
         docling_doc = _make_docling_doc()
-        structure, pages = compress_docling_split(docling_doc.model_dump(mode="json"))
+        structure, _ = compress_docling_split(docling_doc.model_dump(mode="json"))
 
         # Create a database at a pre-migration version with a document
         async with Store(temp_db_path, create=True, skip_migration_check=True) as store:
@@ -496,7 +497,6 @@ class TestDocumentItemMigration:
                 id="test-doc-1",
                 content="test content",
                 docling_document=structure,
-                docling_pages=pages,
                 docling_version=docling_doc.version,
             )
             await store.documents_table.add([doc_record])
@@ -621,11 +621,14 @@ class TestPictureDataStorage:
             # But the picture-byte accessors still work
             assert (await repo.get_picture_bytes("doc-1", "#/pictures/0")) == heavy
 
-    async def test_fresh_db_has_picture_data_column(self, temp_db_path):
-        """A newly-created DB has picture_data on document_items via _init_tables."""
+    async def test_fresh_db_references_picture_blobs(self, temp_db_path):
+        """A newly-created DB references pictures by hash via _init_tables."""
         async with HaikuRAG(temp_db_path, create=True) as rag:
             schema = await rag.store.document_items_table.schema()
-            assert "picture_data" in {f.name for f in schema}
+            assert "picture_hash" in {f.name for f in schema}
+            assert "picture_data" not in {f.name for f in schema}
+            blobs_schema = await rag.store.picture_blobs_table.schema()
+            assert blobs_schema.field("data").type == pa.large_binary()
 
 
 def _docling_doc_with_picture():
@@ -730,7 +733,7 @@ class TestCompressDoclingSplitStripsPictureUris:
 
         for pic in decoded["pictures"]:
             assert pic["image"] is None
-        assert pages_bytes is None  # no pages in this fixture
+        assert pages_bytes == {}  # no pages in this fixture
 
 
 @pytest.mark.asyncio
@@ -789,8 +792,8 @@ class TestPictureDataMigrationBackfill:
                     )
                 ]
             )
-            # Drop the column so the migration's column-add path is exercised.
-            await store.document_items_table.drop_columns(["picture_data"])
+            # Fresh tables no longer have the column, so the migration's
+            # column-add path is exercised.
             schema_before = await store.document_items_table.schema()
             assert "picture_data" not in {f.name for f in schema_before}
 
@@ -0,0 +1,152 @@
+import pytest
+
+from haiku.rag.store.compression import compress_pages
+from haiku.rag.store.engine import Store
+from haiku.rag.store.models import Document
+from haiku.rag.store.repositories.document import DocumentRepository
+from haiku.rag.store.repositories.document_page import DocumentPageRepository
+
+
+def _pages(*page_numbers: int) -> dict[int, bytes]:
+    return compress_pages(
+        {
+            str(page_no): {
+                "page_no": page_no,
+                "size": {"width": 612.0, "height": 792.0},
+            }
+            for page_no in page_numbers
+        }
+    )
+
+
+async def _stored_pages(store: Store, document_id: str) -> list[int]:
+    rows = await (
+        store.document_pages_table.query()
+        .select(["page_no"])
+        .where(f"document_id = '{document_id}'")
+        .to_list()
+    )
+    return sorted(row["page_no"] for row in rows)
+
+
+@pytest.mark.asyncio
+async def test_create_writes_one_row_per_page(temp_db_path):
+    async with Store(temp_db_path, create=True) as store:
+        repo = DocumentRepository(store)
+        doc = await repo.create(Document(content="x", docling_pages=_pages(1, 2, 3)))
+        assert doc.id is not None
+
+        assert await _stored_pages(store, doc.id) == [1, 2, 3]
+        assert await repo.document_page_repository.get_page_count(doc.id) == 3
+
+
+@pytest.mark.asyncio
+async def test_get_pages_reads_only_requested_pages(temp_db_path):
+    async with Store(temp_db_path, create=True) as store:
+        repo = DocumentRepository(store)
+        doc = await repo.create(Document(content="x", docling_pages=_pages(1, 2, 3)))
+        assert doc.id is not None
+        pages = DocumentPageRepository(store)
+
+        got = await pages.get_pages(doc.id, [2, 3, 9])
+
+        assert set(got) == {2, 3}
+        assert got[2].page_no == 2
+        assert got[2].size.width == 612.0
+        assert await pages.get_pages(doc.id, []) == {}
+        assert await pages.get_pages("missing", [1]) == {}
+
+
+@pytest.mark.asyncio
+async def test_update_replaces_pages_only_when_given(temp_db_path):
+    async with Store(temp_db_path, create=True) as store:
+        repo = DocumentRepository(store)
+        doc = await repo.create(Document(content="x", docling_pages=_pages(1, 2, 3)))
+        assert doc.id is not None
+
+        # Loaded documents carry no pages; updating one keeps the stored set.
+        loaded = await repo.get_by_id(doc.id, include_blobs=True)
+        assert loaded is not None
+        loaded.content = "y"
+        await repo.update(loaded)
+        assert await _stored_pages(store, doc.id) == [1, 2, 3]
+
+        loaded.docling_pages = _pages(1, 4)
+        await repo.update(loaded)
+        assert await _stored_pages(store, doc.id) == [1, 4]
+
+        loaded.docling_pages = {}
+        await repo.update(loaded)
+        assert await _stored_pages(store, doc.id) == []
+
+
+@pytest.mark.asyncio
+async def test_replace_leaves_other_documents_alone(temp_db_path):
+    async with Store(temp_db_path, create=True) as store:
+        repo = DocumentRepository(store)
+        first = await repo.create(Document(content="a", docling_pages=_pages(1, 2)))
+        second = await repo.create(Document(content="b", docling_pages=_pages(1)))
+        assert first.id is not None and second.id is not None
+
+        await DocumentPageRepository(store).replace_for_documents({first.id: _pages(2)})
+
+        assert await _stored_pages(store, first.id) == [2]
+        assert await _stored_pages(store, second.id) == [1]
+
+
+@pytest.mark.asyncio
+async def test_delete_removes_pages(temp_db_path):
+    async with Store(temp_db_path, create=True) as store:
+        repo = DocumentRepository(store)
+        kept = await repo.create(Document(content="a", docling_pages=_pages(1)))
+        gone = await repo.create(Document(content="b", docling_pages=_pages(1, 2)))
+        assert kept.id is not None and gone.id is not None
+
+        assert await repo.delete(gone.id)
+        assert await _stored_pages(store, gone.id) == []
+        assert await _stored_pages(store, kept.id) == [1]
+
+        await repo.delete_all()
+        assert await store.document_pages_table.count_rows() == 0
+
+
+@pytest.mark.asyncio
+async def test_create_rolls_back_pages_when_documents_write_fails(
+    temp_db_path, monkeypatch
+):
+    async with Store(temp_db_path, create=True) as store:
+        repo = DocumentRepository(store)
+
+        async def boom(*_a, **_k):
+            raise RuntimeError("documents add failed")
+
+        monkeypatch.setattr(store.documents_table, "add", boom)
+        with pytest.raises(RuntimeError, match="documents add failed"):
+            await repo.create(Document(content="x", docling_pages=_pages(1)))
+        with pytest.raises(RuntimeError, match="documents add failed"):
+            await repo.create(
+                [
+                    Document(content="y", docling_pages=_pages(1)),
+                    Document(content="z"),
+                ]
+            )
+        monkeypatch.undo()
+
+        assert await store.document_pages_table.count_rows() == 0
+
+
+@pytest.mark.asyncio
+async def test_save_writes_pages_for_new_and_existing_documents(temp_db_path):
+    async with Store(temp_db_path, create=True) as store:
+        repo = DocumentRepository(store)
+        existing = await repo.create(Document(content="a", docling_pages=_pages(1)))
+        assert existing.id is not None
+
+        existing.docling_pages = _pages(2)
+        fresh = Document(content="b", docling_pages=_pages(1, 2))
+        untouched = Document(content="c")
+        await repo.save([existing, fresh, untouched])
+
+        assert fresh.id is not None
+        assert await _stored_pages(store, existing.id) == [2]
+        assert await _stored_pages(store, fresh.id) == [1, 2]
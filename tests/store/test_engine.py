@@ -85,6 +85,9 @@ class TestGetDatabaseStats:
                     "document_id": "doc-1",
                     "content": f"content {i}",
                     "content_fts": "",
+                    "doc_item_refs": [],
+                    "labels": [],
+                    "page_numbers": [],
                     "metadata": "{}",
                     "order": i,
                     "vector": [float(i % 7) + 0.01 * j for j in range(dim)],
@@ -0,0 +1,385 @@
+import asyncio
+
+import pytest
+
+from haiku.rag.store import ReadOnlyError
+from haiku.rag.store.commit import (
+    CommitBundle,
+    GroupCommitter,
+    GroupDeleter,
+    _GroupWorker,
+)
+from haiku.rag.store.engine import Store
+from haiku.rag.store.models import Chunk, Document, DocumentItem
+from haiku.rag.store.repositories.chunk import ChunkRepository
+from haiku.rag.store.repositories.document import DocumentRepository
+from haiku.rag.store.repositories.document_item import DocumentItemRepository
+
+
+def _bundle(
+    store: Store, uri: str | None, texts: list[str], with_items: bool = True
+) -> CommitBundle:
+    dim = store.embedder._vector_dim
+    chunks = [Chunk(content=text, embedding=[0.1] * dim) for text in texts]
+    items = (
+        [
+            DocumentItem(document_id="", position=i, self_ref=f"#/texts/{i}")
+            for i in range(len(texts))
+        ]
+        if with_items
+        else None
+    )
+    return CommitBundle(Document(content=" ".join(texts), uri=uri), chunks, items)
+
+
+async def test_concurrent_submits_share_one_version_per_table(temp_db_path):
+    async with Store(temp_db_path, create=True) as store:
+        committer = GroupCommitter(store, max_batch_size=8, max_delay_s=0.5)
+        before = await store.current_table_versions()
+
+        stored = await asyncio.gather(
+            *(
+                committer.submit(_bundle(store, f"file:///doc{i}.md", [f"c{i}"]))
+                for i in range(4)
+            )
+        )
+        await committer.aclose()
+
+        after = await store.current_table_versions()
+        for table in ("documents", "document_meta", "chunks", "document_items"):
+            assert after[table] == before[table] + 1
+
+        assert all(doc.id is not None for doc in stored)
+        assert await DocumentRepository(store).count() == 4
+        chunks = ChunkRepository(store)
+        for doc in stored:
+            assert doc.id is not None
+            assert [c.content for c in await chunks.get_by_document_id(doc.id)] == [
+                doc.content
+            ]
+
+
+async def test_flush_starts_when_batch_is_full(temp_db_path):
+    async with Store(temp_db_path, create=True) as store:
+        committer = GroupCommitter(store, max_batch_size=2, max_delay_s=60)
+        stored = await asyncio.wait_for(
+            asyncio.gather(
+                committer.submit(_bundle(store, "file:///a.md", ["a"])),
+                committer.submit(_bundle(store, "file:///b.md", ["b"])),
+            ),
+            timeout=30,
+        )
+        await committer.aclose()
+        assert {doc.uri for doc in stored} == {"file:///a.md", "file:///b.md"}
+
+
+async def test_existing_uri_is_updated_in_place(temp_db_path):
+    async with Store(temp_db_path, create=True) as store:
+        committer = GroupCommitter(store, max_delay_s=0)
+        first = await committer.submit(_bundle(store, "file:///a.md", ["a", "b"]))
+        second = await committer.submit(_bundle(store, "file:///a.md", ["c"]))
+        await committer.aclose()
+
+        assert second.id == first.id
+        assert second.created_at == first.created_at
+        assert await DocumentRepository(store).count() == 1
+        assert first.id is not None
+        chunks = await ChunkRepository(store).get_by_document_id(first.id)
+        assert [c.content for c in chunks] == ["c"]
+        assert await DocumentItemRepository(store).get_item_count(first.id) == 1
+
+
+async def test_same_uri_in_one_window_is_deferred(temp_db_path):
+    async with Store(temp_db_path, create=True) as store:
+        committer = GroupCommitter(store, max_batch_size=8, max_delay_s=0.2)
+        first, second = await asyncio.gather(
+            committer.submit(_bundle(store, "file:///a.md", ["old"])),
+            committer.submit(_bundle(store, "file:///a.md", ["new"])),
+        )
+        await committer.aclose()
+
+        assert first.id == second.id
+        assert await DocumentRepository(store).count() == 1
+        assert second.id is not None
+        chunks = await ChunkRepository(store).get_by_document_id(second.id)
+        assert [c.content for c in chunks] == ["new"]
+
+
+async def test_update_without_items_keeps_stored_items(temp_db_path):
+    async with Store(temp_db_path, create=True) as store:
+        committer = GroupCommitter(store, max_delay_s=0)
+        stored = await committer.submit(_bundle(store, "file:///a.md", ["a", "b"]))
+        update = _bundle(store, None, ["c"], with_items=False)
+        update.document.id = stored.id
+        update.document.uri = stored.uri
+        await committer.submit(update)
+        await committer.aclose()
+
+        assert stored.id is not None
+        assert await DocumentItemRepository(store).get_item_count(stored.id) == 2
+        chunks = await ChunkRepository(store).get_by_document_id(stored.id)
+        assert [c.content for c in chunks] == ["c"]
+
+
+async def test_failing_bundle_does_not_fail_the_group(temp_db_path):
+    async with Store(temp_db_path, create=True) as store:
+        committer = GroupCommitter(store, max_batch_size=8, max_delay_s=0.2)
+        bad = _bundle(store, "file:///bad.md", ["bad"])
+        bad.chunks[0].embedding = None
+
+        results = await asyncio.gather(
+            committer.submit(_bundle(store, "file:///a.md", ["a"])),
+            committer.submit(bad),
+            committer.submit(_bundle(store, "file:///b.md", ["b"])),
+            return_exceptions=True,
+        )
+        await committer.aclose()
+
+        assert isinstance(results[1], AssertionError)
+        assert isinstance(results[0], Document) and isinstance(results[2], Document)
+        repo = DocumentRepository(store)
+        assert {d.uri for d in await repo.list_all()} == {
+            "file:///a.md",
+            "file:///b.md",
+        }
+
+
+async def test_lone_failing_bundle_raises(temp_db_path):
+    async with Store(temp_db_path, create=True) as store:
+        committer = GroupCommitter(store, max_delay_s=0)
+        bad = _bundle(store, "file:///bad.md", ["bad"])
+        bad.chunks[0].embedding = None
+        with pytest.raises(AssertionError):
+            await committer.submit(bad)
+        await committer.aclose()
+        assert await DocumentRepository(store).count() == 0
+
+
+async def test_mixed_group_creates_and_updates(temp_db_path):
+    async with Store(temp_db_path, create=True) as store:
+        committer = GroupCommitter(store, max_delay_s=0)
+        stored = await committer.submit(_bundle(store, "file:///a.md", ["a"]))
+
+        committer.max_delay_s = 0.2
+        before = await store.current_table_versions()
+        updated, created = await asyncio.gather(
+            committer.submit(_bundle(store, "file:///a.md", [])),
+            committer.submit(_bundle(store, "file:///b.md", ["b"])),
+        )
+        await committer.aclose()
+
+        after = await store.current_table_versions()
+        # New documents are added and updated ones merged, matched only.
+        for table in ("documents", "document_meta"):
+            assert after[table] == before[table] + 2
+        for table in ("chunks", "document_items"):
+            assert after[table] == before[table] + 1
+        assert updated.id == stored.id
+        assert created.id not in (None, stored.id)
+        assert stored.id is not None and created.id is not None
+        chunks = ChunkRepository(store)
+        assert await chunks.get_by_document_id(stored.id) == []
+        assert await DocumentItemRepository(store).get_item_count(stored.id) == 0
+        assert len(await chunks.get_by_document_id(created.id)) == 1
+
+
+async def test_update_of_document_deleted_before_flush_fails(temp_db_path):
+    async with Store(temp_db_path, create=True) as store:
+        committer = GroupCommitter(store, max_delay_s=0)
+        stored = await committer.submit(_bundle(store, "file:///a.md", ["a"]))
+        assert stored.id is not None
+
+        committer.max_delay_s = 60
+        update = _bundle(store, "file:///a.md", ["new"])
+        update.document.id = stored.id
+        updating = asyncio.create_task(committer.submit(update))
+        creating = asyncio.create_task(
+            committer.submit(_bundle(store, "file:///b.md", ["b"]))
+        )
+        await asyncio.sleep(0.1)
+        async with store.write_transaction():
+            assert await DocumentRepository(store).delete(stored.id)
+        await committer.aclose()
+
+        with pytest.raises(ValueError, match="not found"):
+            await updating
+        created = await creating
+        repo = DocumentRepository(store)
+        assert [d.id for d in await repo.list_all()] == [created.id]
+        assert await repo.get_by_id(stored.id) is None
+        assert await ChunkRepository(store).get_by_document_id(stored.id) == []
+        assert await DocumentItemRepository(store).get_item_count(stored.id) == 0
+
+
+async def test_update_to_empty_document_clears_rows(temp_db_path):
+    async with Store(temp_db_path, create=True) as store:
+        committer = GroupCommitter(store, max_delay_s=0)
+        stored = await committer.submit(_bundle(store, "file:///a.md", ["a"]))
+        await committer.submit(_bundle(store, "file:///a.md", []))
+        await committer.aclose()
+
+        assert stored.id is not None
+        assert await ChunkRepository(store).get_by_document_id(stored.id) == []
+        assert await DocumentItemRepository(store).get_item_count(stored.id) == 0
+
+
+async def test_aclose_writes_queued_bundles(temp_db_path):
+    async with Store(temp_db_path, create=True) as store:
+        committer = GroupCommitter(store, max_delay_s=60)
+        submit = asyncio.create_task(
+            committer.submit(_bundle(store, "file:///a.md", ["a"]))
+        )
+        await asyncio.sleep(0.1)
+        await committer.aclose()
+        assert (await submit).id is not None
+        assert await DocumentRepository(store).count() == 1
+
+
+async def test_cancelled_caller_drops_its_bundle(temp_db_path):
+    async with Store(temp_db_path, create=True) as store:
+        committer = GroupCommitter(store, max_delay_s=60)
+        submit = asyncio.create_task(
+            committer.submit(_bundle(store, "file:///a.md", ["a"]))
+        )
+        await asyncio.sleep(0.1)
+        submit.cancel()
+        await committer.aclose()
+        assert submit.cancelled()
+        assert await DocumentRepository(store).count() == 0
+
+
+async def test_submit_after_close_raises(temp_db_path):
+    async with Store(temp_db_path, create=True) as store:
+        committer = GroupCommitter(store)
+        await committer.aclose()
+        await committer.aclose()
+        with pytest.raises(RuntimeError, match="closed"):
+            await committer.submit(_bundle(store, "file:///a.md", ["a"]))
+
+
+async def test_worker_without_flush_cannot_be_created(temp_db_path):
+    class NoFlush(_GroupWorker):
+        pass
+
+    async with Store(temp_db_path, create=True) as store:
+        with pytest.raises(TypeError, match="_flush"):
+            NoFlush(store, max_batch_size=1, max_delay_s=0)
+
+
+async def test_submit_read_only_raises(temp_db_path):
+    async with Store(temp_db_path, create=True):
+        pass
+    async with Store(temp_db_path, read_only=True) as store:
+        committer = GroupCommitter(store)
+        with pytest.raises(ReadOnlyError):
+            await committer.submit(_bundle(store, "file:///a.md", ["a"]))
+
+
+async def test_client_writes_through_group_committer(temp_db_path):
+    from haiku.rag.client import HaikuRAG
+    from haiku.rag.config import get_config
+
+    config = get_config().model_copy(deep=True)
+    config.storage.group_commit.enabled = True
+    dim = config.embeddings.model.vector_dim
+
+    async with HaikuRAG(temp_db_path, config=config, create=True) as client:
+        assert client.group_committer is not None
+        docling_doc = await client.convert("Grouped document")
+        before = await client.store.current_table_versions()
+        imported = await asyncio.gather(
+            *(
+                client.import_document(
+                    docling_document=docling_doc,
+                    chunks=[Chunk(content=f"chunk {i}", embedding=[0.1] * dim)],
+                    uri=f"file:///doc{i}.md",
+                )
+                for i in range(3)
+            )
+        )
+        after = await client.store.current_table_versions()
+        assert after["chunks"] == before["chunks"] + 1
+
+        doc_id = imported[0].id
+        assert doc_id is not None
+        await client.update_document(
+            document_id=doc_id,
+            chunks=[Chunk(content="replaced", embedding=[0.1] * dim)],
+        )
+        chunks = await client.chunk_repository.get_by_document_id(doc_id)
+        assert [c.content for c in chunks] == ["replaced"]
+        assert client.group_committer is not None
+    assert client.group_committer._closed
+
+
+async def test_concurrent_deletes_share_one_flush(temp_db_path):
+    async with Store(temp_db_path, create=True) as store:
+        repo = DocumentRepository(store)
+        docs = [await repo.create(Document(content=f"d{i}")) for i in range(3)]
+        groups: list[list[str]] = []
+
+        async def delete(ids: list[str]) -> set[str]:
+            groups.append(ids)
+            return set(await repo.delete_many(ids))
+
+        deleter = GroupDeleter(store, delete, max_batch_size=8, max_delay_s=0.5)
+        results = await asyncio.gather(
+            *(deleter.submit(str(doc.id)) for doc in docs),
+            deleter.submit("missing"),
+        )
+        await deleter.aclose()
+
+        assert results == [True, True, True, False]
+        assert len(groups) == 1
+        assert await repo.count() == 0
+
+
+async def test_repeated_delete_is_deferred_and_failures_stay_per_caller(
+    temp_db_path,
+):
+    async with Store(temp_db_path, create=True) as store:
+        repo = DocumentRepository(store)
+        doc = await repo.create(Document(content="d"))
+        assert doc.id is not None
+
+        async def delete(ids: list[str]) -> set[str]:
+            if "bad" in ids:
+                raise RuntimeError("boom")
+            return set(await repo.delete_many(ids))
+
+        deleter = GroupDeleter(store, delete, max_batch_size=8, max_delay_s=0.5)
+        results = await asyncio.gather(
+            deleter.submit(doc.id),
+            deleter.submit(doc.id),
+            deleter.submit("bad"),
+            return_exceptions=True,
+        )
+        await deleter.aclose()
+
+        assert results[:2] == [True, False]
+        assert isinstance(results[2], RuntimeError)
+
+
+async def test_client_deletes_through_group_deleter(temp_db_path):
+    from haiku.rag.client import HaikuRAG
+    from haiku.rag.config import get_config
+
+    config = get_config().model_copy(deep=True)
+    config.storage.group_commit.enabled = True
+
+    async with HaikuRAG(temp_db_path, config=config, create=True) as client:
+        assert client.group_deleter is not None
+        docs = [
+            await client.document_repository.create(Document(content=f"d{i}"))
+            for i in range(3)
+        ]
+        before = await client.store.current_table_versions()
+        deleted = await asyncio.gather(
+            *(client.delete_document(str(doc.id)) for doc in docs)
+        )
+        after = await client.store.current_table_versions()
+
+        assert deleted == [True, True, True]
+        assert after["documents"] == before["documents"] + 1
+        assert await client.count_documents() == 0
+    assert client.group_deleter._closed
@@ -9,9 +9,11 @@ from haiku.rag.store.schema import ensure_indexes
 
 EXPECTED_INDEXED_COLUMNS = {
     "documents": {"id"},
-    "document_meta": {"id", "uri"},
-    "chunks": {"content_fts", "id", "document_id"},
-    "document_items": {"document_id", "position", "self_ref", "label"},
+    "document_meta": {"id", "uri", "meta_parent_uri", "meta_content_type"},
+    "chunks": {"content_fts", "id", "document_id", "labels", "page_numbers"},
+    "document_items": {"document_id", "position", "self_ref", "label", "picture_hash"},
+    "document_pages": {"document_id"},
+    "picture_blobs": {"hash"},
 }
 
 
@@ -121,12 +123,12 @@ async def test_delete_all_restores_the_full_index_set(temp_db_path):
 
 @pytest.mark.asyncio
 async def test_delete_all_keeps_picture_data_as_large_binary(temp_db_path):
-    """picture_data must survive delete_all as large_binary, not binary."""
+    """Picture bytes must survive delete_all as large_binary, not binary."""
     async with Store(temp_db_path, create=True) as store:
         repo = DocumentRepository(store)
         await repo.create(Document(content="A document"))
 
         await repo.delete_all()
 
-        schema = await store.document_items_table.schema()
-        assert schema.field("picture_data").type == pa.large_binary()
+        schema = await store.picture_blobs_table.schema()
+        assert schema.field("data").type == pa.large_binary()
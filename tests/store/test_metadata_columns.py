@@ -0,0 +1,160 @@
+import pytest
+from pydantic import ValidationError
+
+from haiku.rag.client.documents import parent_uri_filter
+from haiku.rag.config import AppConfig, MetadataColumnConfig
+from haiku.rag.store.engine import Store
+from haiku.rag.store.models import Document
+from haiku.rag.store.repositories.document import DocumentRepository
+
+
+def _config(*columns: MetadataColumnConfig) -> AppConfig:
+    config = AppConfig()
+    config.storage.metadata_columns = list(columns)
+    return config
+
+
+TENANT = MetadataColumnConfig(key="tenant", index="bitmap")
+TAGS = MetadataColumnConfig(key="tags", type="string_list")
+PAGES = MetadataColumnConfig(key="pages", type="integer")
+
+
+async def _meta_rows(store: Store) -> dict[str, dict]:
+    rows = await store.document_meta_table.query().to_list()
+    return {row["uri"]: row for row in rows}
+
+
+async def _index_types(store: Store) -> dict[str, str]:
+    return {
+        column: index.index_type
+        for index in await store.document_meta_table.list_indices()
+        for column in index.columns
+    }
+
+
+def test_default_index_follows_the_type():
+    assert MetadataColumnConfig(key="a").index == "btree"
+    assert MetadataColumnConfig(key="a", type="boolean").index == "bitmap"
+    assert MetadataColumnConfig(key="a", type="string_list").index == "label_list"
+
+
+@pytest.mark.parametrize(
+    "columns",
+    [
+        [{"key": "not a column"}],
+        [{"key": "a", "index": "label_list"}],
+        [{"key": "a"}, {"key": "a", "type": "integer"}],
+    ],
+    ids=["bad_key", "label_list_on_scalar", "duplicate"],
+)
+def test_rejects_invalid_columns(columns):
+    with pytest.raises(ValidationError):
+        AppConfig.model_validate({"storage": {"metadata_columns": columns}})
+
+
+@pytest.mark.asyncio
+class TestMetadataColumns:
+    async def test_writes_typed_values_and_indexes_them(self, temp_db_path):
+        config = _config(TENANT, TAGS, PAGES)
+        async with Store(temp_db_path, config=config, create=True) as store:
+            repo = DocumentRepository(store)
+            await repo.create(
+                Document(
+                    content="a",
+                    uri="test://a",
+                    metadata={"tenant": "acme", "tags": ["x", "y"], "pages": 3},
+                )
+            )
+            # Values of another type stay in the JSON only.
+            await repo.create(
+                Document(content="b", uri="test://b", metadata={"pages": "three"})
+            )
+
+            rows = await _meta_rows(store)
+            assert rows["test://a"]["meta_tenant"] == "acme"
+            assert rows["test://a"]["meta_tags"] == ["x", "y"]
+            assert rows["test://a"]["meta_pages"] == 3
+            assert rows["test://b"]["meta_pages"] is None
+            assert await _index_types(store) == {
+                "id": "BTree",
+                "uri": "BTree",
+                "meta_tenant": "Bitmap",
+                "meta_tags": "LabelList",
+                "meta_pages": "BTree",
+            }
+
+            docs = await repo.list_all(filter="array_has(meta_tags, 'y')")
+            assert [d.uri for d in docs] == ["test://a"]
+            [doc] = await repo.list_all(filter="meta_tenant = 'acme'")
+            assert doc.metadata == {"tenant": "acme", "tags": ["x", "y"], "pages": 3}
+
+    async def test_update_meta_rewrites_the_columns(self, temp_db_path):
+        async with Store(temp_db_path, config=_config(TENANT), create=True) as store:
+            repo = DocumentRepository(store)
+            doc = await repo.create(
+                Document(content="a", uri="test://a", metadata={"tenant": "acme"})
+            )
+            doc.metadata = {"tenant": "globex"}
+            await repo.update_meta(doc)
+
+            rows = await _meta_rows(store)
+            assert rows["test://a"]["meta_tenant"] == "globex"
+
+    async def test_migrate_reconciles_a_changed_declaration(self, temp_db_path):
+        async with Store(temp_db_path, config=_config(TENANT), create=True) as store:
+            repo = DocumentRepository(store)
+            await repo.create(
+                Document(
+                    content="a",
+                    uri="test://a",
+                    metadata={"tenant": "acme", "tags": ["x"]},
+                )
+            )
+            await repo.create(Document(content="b", uri="test://b"))
+
+        # tenant is no longer declared; tags is new.
+        config = _config(TAGS)
+        async with Store(temp_db_path, config=config) as store:
+            assert store.metadata_columns == []
+            applied = await store.migrate()
+
+            assert "Dropped metadata column meta_tenant" in applied
+            assert "Added metadata column meta_tags" in applied
+            assert store.metadata_columns == [TAGS]
+            rows = await _meta_rows(store)
+            assert "meta_tenant" not in rows["test://a"]
+            assert rows["test://a"]["meta_tags"] == ["x"]
+            assert rows["test://b"]["meta_tags"] is None
+            assert (await _index_types(store))["meta_tags"] == "LabelList"
+
+            version = await store.document_meta_table.version()
+            assert await store.materialize_metadata_columns() == []
+            assert await store.document_meta_table.version() == version
+
+    async def test_undeclared_column_is_not_written_before_migrate(self, temp_db_path):
+        async with Store(temp_db_path, config=_config(), create=True):
+            pass
+
+        async with Store(temp_db_path, config=_config(TENANT)) as store:
+            assert store.metadata_columns == []
+            repo = DocumentRepository(store)
+            await repo.create(
+                Document(content="a", uri="test://a", metadata={"tenant": "acme"})
+            )
+            [doc] = await repo.list_all()
+            assert doc.metadata == {"tenant": "acme"}
+
+    async def test_parent_uri_filter_uses_the_column(self, temp_db_path):
+        parent = "file:///docs/it's.pdf"
+        async with Store(temp_db_path, create=True) as store:
+            clause = parent_uri_filter(parent, store.metadata_columns)
+            assert clause == "meta_parent_uri = 'file:///docs/it''s.pdf'"
+
+            repo = DocumentRepository(store)
+            await repo.create(
+                Document(content="c", uri="child", metadata={"parent_uri": parent})
+            )
+            assert [d.uri for d in await repo.list_all(filter=clause)] == ["child"]
+            # Without the column the JSON match finds the same documents.
+            fallback = parent_uri_filter(parent)
+            assert [d.uri for d in await repo.list_all(filter=fallback)] == ["child"]
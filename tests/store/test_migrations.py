@@ -1,3 +1,4 @@
+import asyncio
 from importlib import metadata
 
 import pytest
@@ -212,3 +213,149 @@ class TestGetPendingUpgrades:
 
         pending = get_pending_upgrades("100.0.0")
         assert pending == []
+
+
+def _step(version, name, tables=(), calls=None, fail=False, gate=None):
+    from haiku.rag.store.upgrades import Upgrade, step_progress
+
+    async def apply(store):
+        if gate is not None:
+            await asyncio.wait_for(gate(), timeout=5)
+        if fail:
+            raise RuntimeError(f"{name} failed")
+        progress = step_progress(2)
+        progress.advance(1)
+        progress.advance(1)
+        if calls is not None:
+            calls.append(name)
+
+    apply.__name__ = name
+    return Upgrade(version=version, apply=apply, description=name, tables=tables)
+
+
+class TestResumableMigrations:
+    async def _store_at(self, temp_db_path, version):
+        async with Store(temp_db_path, create=True) as store:
+            await store.set_haiku_version(version)
+
+    @pytest.mark.asyncio
+    async def test_interrupted_migration_resumes_after_completed_steps(
+        self, temp_db_path, monkeypatch
+    ):
+        from haiku.rag.store import upgrades
+
+        await self._store_at(temp_db_path, "0.0.1")
+        calls: list[str] = []
+        monkeypatch.setattr(
+            upgrades,
+            "upgrades",
+            [
+                _step("0.0.2", "first", calls=calls),
+                _step("0.0.3", "second", calls=calls, fail=True),
+            ],
+        )
+
+        async with Store(temp_db_path, skip_migration_check=True) as store:
+            with pytest.raises(RuntimeError, match="second failed"):
+                await store.migrate()
+            assert await store.get_haiku_version() == "0.0.1"
+            settings = await store._read_stored_settings()
+            assert settings["migration"] == {
+                "from": "0.0.1",
+                "completed": ["0.0.2:first"],
+            }
+
+            upgrades.upgrades[1] = _step("0.0.3", "second", calls=calls)
+            applied = await store.migrate()
+
+            assert calls == ["first", "second"]
+            assert applied == ["0.0.2: first", "0.0.3: second"]
+            assert "migration" not in await store._read_stored_settings()
+            assert await store.get_haiku_version() == metadata.version("haiku.rag-slim")
+
+    @pytest.mark.asyncio
+    async def test_steps_writing_disjoint_tables_run_concurrently(
+        self, temp_db_path, monkeypatch
+    ):
+        from haiku.rag.store import upgrades
+
+        await self._store_at(temp_db_path, "0.0.1")
+        started = asyncio.Event()
+
+        async def wait_for_the_other():
+            await started.wait()
+
+        async def signal():
+            started.set()
+
+        monkeypatch.setattr(
+            upgrades,
+            "upgrades",
+            [
+                _step("0.0.2", "chunks", ("chunks",), gate=wait_for_the_other),
+                _step("0.0.2", "items", ("document_items",), gate=signal),
+            ],
+        )
+        progress: list[tuple[str, int, int]] = []
+
+        async with Store(temp_db_path, skip_migration_check=True) as store:
+            applied = await store.migrate(on_progress=lambda *a: progress.append(a))
+
+        assert len(applied) == 2
+        assert ("0.0.2: chunks", 2, 2) in progress
+        assert ("0.0.2: items", 2, 2) in progress
+
+    def test_parallel_groups_split_on_shared_tables_and_versions(self):
+        from haiku.rag.store.upgrades import _parallel_groups
+
+        steps = [
+            _step("0.0.2", "a", ("chunks",)),
+            _step("0.0.2", "b", ("documents",)),
+            _step("0.0.2", "c", ("chunks",)),
+            _step("0.0.2", "d"),
+            _step("0.0.3", "e", ("document_items",)),
+        ]
+        groups = _parallel_groups(steps)
+        assert [[s.description for s in group] for group in groups] == [
+            ["a", "b"],
+            ["c"],
+            ["d"],
+            ["e"],
+        ]
+
+    def test_step_without_tables_runs_alone(self):
+        from haiku.rag.store.upgrades import _parallel_groups
+
+        steps = [
+            _step("0.0.2", "d"),
+            _step("0.0.2", "f", ("chunks",)),
+            _step("0.0.2", "g", ("documents",)),
+        ]
+        groups = _parallel_groups(steps)
+        assert [[s.description for s in group] for group in groups] == [
+            ["d"],
+            ["f", "g"],
+        ]
+
+    @pytest.mark.asyncio
+    async def test_failing_parallel_step_keeps_the_others_checkpointed(
+        self, temp_db_path, monkeypatch
+    ):
+        from haiku.rag.store import upgrades
+
+        await self._store_at(temp_db_path, "0.0.1")
+        calls: list[str] = []
+        monkeypatch.setattr(
+            upgrades,
+            "upgrades",
+            [
+                _step("0.0.2", "good", ("chunks",), calls=calls),
+                _step("0.0.2", "bad", ("documents",), fail=True),
+            ],
+        )
+
+        async with Store(temp_db_path, skip_migration_check=True) as store:
+            with pytest.raises(RuntimeError, match="bad failed"):
+                await store.migrate()
+            settings = await store._read_stored_settings()
+            assert settings["migration"]["completed"] == ["0.0.2:good"]
@@ -0,0 +1,129 @@
+import pytest
+
+from haiku.rag.config import AppConfig
+from haiku.rag.store.engine import Store
+from haiku.rag.store.models.document_item import DocumentItem, picture_hash
+from haiku.rag.store.repositories.document_item import DocumentItemRepository
+from haiku.rag.store.repositories.picture_blob import PictureBlobRepository
+
+LOGO = b"\x89PNG\r\n\x1a\nlogo"
+CHART = b"\x89PNG\r\n\x1a\nchart"
+
+
+def _items(document_id: str, *pictures: bytes) -> list[DocumentItem]:
+    return [
+        DocumentItem(
+            document_id=document_id,
+            position=position,
+            self_ref=f"#/pictures/{position}",
+            label="picture",
+            picture_data=data,
+        )
+        for position, data in enumerate(pictures)
+    ]
+
+
+async def _blob_hashes(store: Store) -> set[str]:
+    rows = await store.picture_blobs_table.query().select(["hash"]).to_list()
+    return {row["hash"] for row in rows}
+
+
+@pytest.mark.asyncio
+class TestPictureBlobs:
+    async def test_repeated_picture_is_stored_once(self, temp_db_path):
+        async with Store(temp_db_path, create=True) as store:
+            repo = DocumentItemRepository(store)
+            await repo.create_items("doc-1", _items("doc-1", LOGO, CHART))
+            await repo.create_items("doc-2", _items("doc-2", LOGO))
+
+            assert await _blob_hashes(store) == {
+                picture_hash(LOGO),
+                picture_hash(CHART),
+            }
+            assert await repo.get_picture_bytes("doc-2", "#/pictures/0") == LOGO
+            assert await repo.get_all_picture_data("doc-1") == {
+                "#/pictures/0": LOGO,
+                "#/pictures/1": CHART,
+            }
+            blobs, _ = await repo.get_pictures_grouped(
+                {"doc-1": ["#/pictures/0"], "doc-2": ["#/pictures/0"]}
+            )
+            assert blobs == {
+                "doc-1": {"#/pictures/0": LOGO},
+                "doc-2": {"#/pictures/0": LOGO},
+            }
+
+    async def test_known_pictures_write_no_blob_version(self, temp_db_path):
+        async with Store(temp_db_path, create=True) as store:
+            repo = DocumentItemRepository(store)
+            await repo.create_items("doc-1", _items("doc-1", LOGO))
+            version = await store.picture_blobs_table.version()
+
+            await repo.create_items("doc-2", _items("doc-2", LOGO))
+
+            assert await store.picture_blobs_table.version() == version
+
+    async def test_delete_releases_only_unshared_blobs(self, temp_db_path):
+        async with Store(temp_db_path, create=True) as store:
+            repo = DocumentItemRepository(store)
+            await repo.create_items("doc-1", _items("doc-1", LOGO, CHART))
+            await repo.create_items("doc-2", _items("doc-2", LOGO))
+
+            await repo.delete_by_document_id("doc-1")
+            assert await _blob_hashes(store) == {picture_hash(LOGO)}
+
+            await repo.delete_by_document_id("doc-2")
+            assert await _blob_hashes(store) == set()
+
+    async def test_replace_releases_dropped_pictures(self, temp_db_path):
+        async with Store(temp_db_path, create=True) as store:
+            repo = DocumentItemRepository(store)
+            await repo.create_items("doc-1", _items("doc-1", LOGO, CHART))
+
+            await repo.replace_for_document("doc-1", _items("doc-1", LOGO))
+            assert await _blob_hashes(store) == {picture_hash(LOGO)}
+
+            await repo.replace_for_documents(["doc-1"], _items("doc-1", CHART))
+            assert await _blob_hashes(store) == {picture_hash(CHART)}
+
+    async def test_vectors_are_reused_for_the_same_embedder(self, temp_db_path):
+        async with Store(temp_db_path, create=True) as store:
+            repo = DocumentItemRepository(store)
+            blobs = PictureBlobRepository(store)
+            await repo.create_items(
+                "doc-1",
+                _items("doc-1", LOGO, CHART),
+                picture_vectors={picture_hash(LOGO): [0.5] * 4},
+            )
+
+            assert await blobs.get_vectors(
+                [picture_hash(LOGO), picture_hash(CHART)]
+            ) == {picture_hash(LOGO): [0.5] * 4}
+
+            # A vector recorded later fills in the stored blob.
+            await blobs.put({}, {picture_hash(CHART): [0.25] * 4})
+            assert await blobs.get_vectors([picture_hash(CHART)]) == {
+                picture_hash(CHART): [0.25] * 4
+            }
+            assert (await blobs.get_data([picture_hash(CHART)]))[
+                picture_hash(CHART)
+            ] == CHART
+
+    async def test_vectors_from_another_embedder_are_ignored(self, temp_db_path):
+        async with Store(temp_db_path, create=True) as store:
+            await DocumentItemRepository(store).create_items(
+                "doc-1",
+                _items("doc-1", LOGO),
+                picture_vectors={picture_hash(LOGO): [0.5] * 4},
+            )
+
+        config = AppConfig()
+        config.embeddings.model.name = "another-model"
+        async with Store(temp_db_path, config=config, skip_validation=True) as store:
+            blobs = PictureBlobRepository(store)
+            assert await blobs.get_vectors([picture_hash(LOGO)]) == {}
+
+            await blobs.put({}, {picture_hash(LOGO): [0.75] * 4})
+            assert await blobs.get_vectors([picture_hash(LOGO)]) == {
+                picture_hash(LOGO): [0.75] * 4
+            }
@@ -0,0 +1,116 @@
+import pytest
+
+from haiku.rag.client import HaikuRAG
+from haiku.rag.store import ReadOnlyError
+from haiku.rag.store.engine import Store
+from haiku.rag.store.models import Document
+from haiku.rag.store.repositories.document import DocumentRepository
+
+
+async def _doc_contents(store: Store) -> set[str]:
+    docs = await DocumentRepository(store).list_all(include_content=True)
+    return {d.content for d in docs}
+
+
+@pytest.mark.asyncio
+async def test_pinned_view_ignores_later_writes(temp_db_path):
+    """The view keeps reading the versions it pinned while the live store
+    moves on, and the store stays open after the view exits."""
+    async with Store(temp_db_path, create=True) as store:
+        repo = DocumentRepository(store)
+        await repo.create(Document(content="First document"))
+        versions = await store.current_table_versions()
+
+        async with store.pin_versions() as pinned:
+            await repo.create(Document(content="Second document"))
+
+            assert await pinned.current_table_versions() == versions
+            assert await _doc_contents(pinned) == {"First document"}
+            assert await pinned.document_meta_table.count_rows() == 1
+            assert await _doc_contents(store) == {
+                "First document",
+                "Second document",
+            }
+
+        assert await store.documents_table.count_rows() == 2
+        await repo.create(Document(content="Third document"))
+
+
+@pytest.mark.asyncio
+async def test_pinned_view_is_read_only(temp_db_path):
+    async with Store(temp_db_path, create=True) as store:
+        async with store.pin_versions() as pinned:
+            assert pinned.is_read_only
+            with pytest.raises(ReadOnlyError):
+                await DocumentRepository(pinned).create(Document(content="x"))
+
+        assert not store.is_read_only
+        await DocumentRepository(store).create(Document(content="x"))
+
+
+@pytest.mark.asyncio
+async def test_pin_explicit_versions(temp_db_path):
+    async with Store(temp_db_path, create=True) as store:
+        repo = DocumentRepository(store)
+        await repo.create(Document(content="First document"))
+        versions = await store.current_table_versions()
+        await repo.create(Document(content="Second document"))
+
+        async with store.pin_versions(versions) as pinned:
+            assert await _doc_contents(pinned) == {"First document"}
+
+        with pytest.raises(ValueError, match="No version given for tables"):
+            async with store.pin_versions({"documents": versions["documents"]}):
+                pass
+
+
+@pytest.mark.asyncio
+async def test_pin_tag(temp_db_path):
+    async with Store(temp_db_path, create=True) as store:
+        repo = DocumentRepository(store)
+        await repo.create(Document(content="First document"))
+        await store.create_tag("release-1")
+        await repo.create(Document(content="Second document"))
+
+        async with store.pin_versions(tag="release-1") as pinned:
+            assert await _doc_contents(pinned) == {"First document"}
+
+        with pytest.raises(ValueError, match="does not exist"):
+            async with store.pin_versions(tag="missing"):
+                pass
+
+        with pytest.raises(ValueError, match="not both"):
+            async with store.pin_versions({}, tag="release-1"):
+                pass
+
+
+@pytest.mark.asyncio
+async def test_pin_partial_tag_raises(temp_db_path):
+    async with Store(temp_db_path, create=True) as store:
+        await store.chunks_table.tags.create(
+            "partial", await store.chunks_table.version()
+        )
+
+        with pytest.raises(ValueError, match="is partial"):
+            async with store.pin_versions(tag="partial"):
+                pass
+
+
+@pytest.mark.asyncio
+async def test_client_snapshot(temp_db_path):
+    async with HaikuRAG(temp_db_path, create=True) as client:
+        first = await client.document_repository.create(
+            Document(content="First document")
+        )
+        await client.store.create_tag("release-1")
+
+        async with client.snapshot() as snapshot:
+            await client.document_repository.create(Document(content="Second document"))
+            assert snapshot.is_read_only
+            assert [d.id for d in await snapshot.list_documents()] == [first.id]
+            assert await client.count_documents() == 2
+
+        async with client.snapshot(tag="release-1") as snapshot:
+            assert await snapshot.count_documents() == 1
+
+        assert not client.is_read_only
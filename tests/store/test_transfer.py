@@ -0,0 +1,148 @@
+import asyncio
+
+import pytest
+
+from haiku.rag.config import get_config
+from haiku.rag.store.engine import Store
+from haiku.rag.store.models import Chunk, Document
+from haiku.rag.store.repositories.chunk import ChunkRepository
+from haiku.rag.store.repositories.document import DocumentRepository
+from haiku.rag.store.repositories.document_page import DocumentPageRepository
+from haiku.rag.store.schema import REQUIRED_TABLES
+from haiku.rag.store.transfer import (
+    ExportFormat,
+    export_database,
+    import_database,
+    read_manifest,
+)
+
+
+async def _populate(store: Store) -> str:
+    doc = await DocumentRepository(store).create(
+        Document(content="Alpha beta gamma", uri="a", metadata={"k": "v"})
+    )
+    assert doc.id is not None
+    dim = store.embedder._vector_dim
+    await ChunkRepository(store).create(
+        [
+            Chunk(document_id=doc.id, content="Alpha beta", embedding=[0.5] * dim),
+            Chunk(document_id=doc.id, content="gamma", embedding=[0.25] * dim),
+        ]
+    )
+    await DocumentPageRepository(store).create_all({doc.id: {1: b"page-one"}})
+    return doc.id
+
+
+async def _row_counts(store: Store) -> dict[str, int]:
+    return {
+        name: await getattr(store, f"{name}_table").count_rows()
+        for name in REQUIRED_TABLES
+    }
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("format", list(ExportFormat))
+async def test_round_trip(temp_db_path, tmp_path, format):
+    async with Store(temp_db_path, create=True) as store:
+        doc_id = await _populate(store)
+        counts = await _row_counts(store)
+        progress: list[tuple[str, int, int]] = []
+        manifest = await export_database(
+            store,
+            tmp_path / "export",
+            format=format,
+            on_progress=lambda *args: progress.append(args),
+        )
+
+    assert {t.name: t.rows for t in manifest.tables} == counts
+    assert ("chunks", 2, 2) in progress
+
+    target = tmp_path / "imported.lancedb"
+    await import_database(get_config(), target, tmp_path / "export")
+
+    async with Store(target, read_only=True) as store:
+        assert await _row_counts(store) == counts
+        doc = await DocumentRepository(store).get_by_id(doc_id)
+        assert doc is not None
+        assert doc.content == "Alpha beta gamma"
+        assert doc.metadata == {"k": "v"}
+        chunks = await ChunkRepository(store).get_by_document_id(doc_id)
+        assert {c.content for c in chunks} == {"Alpha beta", "gamma"}
+        results = await ChunkRepository(store).search("gamma", search_type="fts")
+        assert [c.content for c, _ in results] == ["gamma"]
+        indexed = {
+            column
+            for index in await store.chunks_table.list_indices()
+            for column in index.columns
+        }
+        assert "content_fts" in indexed
+
+
+@pytest.mark.asyncio
+async def test_export_without_vectors_and_pages(temp_db_path, tmp_path):
+    async with Store(temp_db_path, create=True) as store:
+        doc_id = await _populate(store)
+        manifest = await export_database(
+            store, tmp_path / "export", include_vectors=False, include_pages=False
+        )
+
+    tables = {t.name: t for t in manifest.tables}
+    assert tables["chunks"].excluded_columns == ["vector"]
+    assert tables["document_pages"].file is None
+    assert not (tmp_path / "export" / "document_pages.parquet").exists()
+
+    target = tmp_path / "imported.lancedb"
+    await import_database(get_config(), target, tmp_path / "export")
+
+    async with Store(target, read_only=True) as store:
+        assert await store.document_pages_table.count_rows() == 0
+        rows = await store.chunks_table.query().select(["vector"]).to_list()
+        assert all(set(row["vector"]) == {0.0} for row in rows)
+        assert len(await ChunkRepository(store).get_by_document_id(doc_id)) == 2
+
+
+@pytest.mark.asyncio
+async def test_export_ignores_writes_made_during_it(temp_db_path, tmp_path):
+    async with Store(temp_db_path, create=True) as store:
+        await _populate(store)
+
+        def write_during_export(table, done, total):
+            if table == "documents":
+                pending.append(
+                    asyncio.ensure_future(
+                        DocumentRepository(store).create(Document(content="late"))
+                    )
+                )
+
+        pending: list = []
+        manifest = await export_database(
+            store, tmp_path / "export", on_progress=write_during_export
+        )
+        await asyncio.gather(*pending)
+        assert await store.documents_table.count_rows() > 1
+
+    assert {t.name: t.rows for t in manifest.tables}["documents"] == 1
+
+
+@pytest.mark.asyncio
+async def test_export_refuses_a_non_empty_destination(temp_db_path, tmp_path):
+    (tmp_path / "export").mkdir()
+    (tmp_path / "export" / "other").write_text("x")
+
+    async with Store(temp_db_path, create=True) as store:
+        with pytest.raises(ValueError, match="is not empty"):
+            await export_database(store, tmp_path / "export")
+
+
+@pytest.mark.asyncio
+async def test_import_refuses_a_database_with_tables(temp_db_path, tmp_path):
+    async with Store(temp_db_path, create=True) as store:
+        await export_database(store, tmp_path / "export")
+
+    with pytest.raises(ValueError, match="already has tables"):
+        await import_database(get_config(), temp_db_path, tmp_path / "export")
+
+
+def test_read_manifest_rejects_incomplete_exports(tmp_path):
+    with pytest.raises(ValueError, match="not a haiku.rag export"):
+        read_manifest(tmp_path)
@@ -30,17 +30,17 @@ async def test_populate_handles_extra_columns_on_items_table(temp_db_path):
     table carries columns added by later migrations.
 
     Mirrors what happens in practice: ``_init_tables`` always creates
-    ``document_items`` with the latest schema (picture_data, heading_level,
+    ``document_items`` with the latest schema (picture_hash, heading_level,
     tree_depth). v0.40.0 then runs against that table — its input must be
     accepted even though it only writes the original 6 columns.
     """
     docling_doc = _simple_docling_doc()
-    structure, pages = compress_docling_split(docling_doc.model_dump(mode="json"))
+    structure, _ = compress_docling_split(docling_doc.model_dump(mode="json"))
 
     async with Store(temp_db_path, create=True, skip_migration_check=True) as store:
         # _init_tables already created document_items with the latest schema.
         names = {f.name for f in await store.document_items_table.schema()}
-        assert {"picture_data", "heading_level", "tree_depth"} <= names
+        assert {"picture_hash", "heading_level", "tree_depth"} <= names
 
         await store.documents_table.add(
             [
@@ -48,7 +48,6 @@ async def test_populate_handles_extra_columns_on_items_table(temp_db_path):
                     id="doc-1",
                     content="x",
                     docling_document=structure,
-                    docling_pages=pages,
                     docling_version=docling_doc.version,
                 )
             ]
@@ -62,4 +61,4 @@ async def test_populate_handles_extra_columns_on_items_table(temp_db_path):
         assert len(rows) >= 2
         # Columns we didn't write should be null / default-typed.
         for row in rows:
-            assert row.get("picture_data") is None
+            assert row.get("picture_hash") is None
@@ -75,7 +75,6 @@ async def test_migration_backfills_picture_bytes_and_strips_blob(temp_db_path):
                     label="picture",
                     text="",
                     page_numbers="[1]",
-                    picture_data=None,
                 )
             ]
         )
@@ -46,7 +46,7 @@ class TestV0_58_0Migration:
             # Legacy columns dropped from documents; blobs stay.
             doc_names = {f.name for f in await store.documents_table.schema()}
             assert _LEGACY_COLUMNS.isdisjoint(doc_names)
-            assert {"id", "content", "docling_document", "docling_pages"} <= doc_names
+            assert {"id", "content", "docling_document"} <= doc_names
 
             # Attributes landed in document_meta.
             meta_rows = await store.document_meta_table.query().to_list()
@@ -66,7 +66,6 @@ class TestV0_58_0Migration:
             assert doc.title == "One"
             assert doc.metadata == {"source_revision": "r1", "md5": "a"}
             assert doc.docling_document == b"structure-blob-1"
-            assert doc.docling_pages == b"pages-blob-1"
             assert doc.docling_version == "1.10.0"
 
             # Lookup by uri (resolved via document_meta) works too.
@@ -41,12 +41,15 @@ async def test_adds_the_missing_indexes(temp_db_path):
             "content_fts": "FTS",
             "id": "BTree",
             "document_id": "BTree",
+            "labels": "LabelList",
+            "page_numbers": "LabelList",
         }
         assert await _indexed(store.document_items_table) == {
             "document_id": "BTree",
             "position": "BTree",
             "self_ref": "BTree",
             "label": "Bitmap",
+            "picture_hash": "BTree",
         }
 
 
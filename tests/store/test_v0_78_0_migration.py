@@ -0,0 +1,411 @@
+import json
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+
+import pytest
+
+from haiku.rag.store.compression import compress_json, decompress_json
+from haiku.rag.store.engine import Store
+from haiku.rag.store.models.document_item import picture_hash
+from haiku.rag.store.upgrades.v0_78_0 import (
+    _apply_deduplicate_pictures,
+    _apply_split_document_pages,
+    _apply_typed_chunk_metadata,
+)
+
+
+def _page(page_no: int) -> dict:
+    return {"page_no": page_no, "size": {"width": 612.0, "height": 792.0}}
+
+
+def _pages_blob(*page_numbers: int) -> bytes:
+    return compress_json(json.dumps({str(n): _page(n) for n in page_numbers}))
+
+
+async def _seed_legacy_pages(store: Store, blobs: dict[str, bytes | None]) -> None:
+    """Give documents the pre-0.78 `docling_pages` column, one blob per
+    document id."""
+    await store.documents_table.add(
+        [{"id": doc_id, "content": doc_id} for doc_id in blobs]
+    )
+    await store.documents_table.add_columns({"docling_pages": "CAST(NULL AS BINARY)"})
+    for doc_id, blob in blobs.items():
+        if blob is not None:
+            await store.documents_table.update(
+                {"docling_pages": blob}, where=f"id = '{doc_id}'"
+            )
+
+
+async def _page_rows(store: Store) -> dict[tuple[str, int], dict]:
+    rows = await store.document_pages_table.query().to_list()
+    return {
+        (row["document_id"], row["page_no"]): json.loads(decompress_json(row["page"]))
+        for row in rows
+    }
+
+
+@pytest.mark.asyncio
+class TestV0_78_0Migration:
+    """v0.78.0 moves the docling_pages blob into document_pages, one row per
+    page, so visualizing a chunk reads only the pages it touches."""
+
+    async def test_moves_pages_and_drops_column(self, temp_db_path):
+        async with Store(temp_db_path, create=True, skip_migration_check=True) as store:
+            await _seed_legacy_pages(
+                store,
+                {"doc-1": _pages_blob(1, 2), "doc-2": _pages_blob(1), "doc-3": None},
+            )
+
+            await _apply_split_document_pages(store)
+
+            assert "docling_pages" not in (await store.documents_table.schema()).names
+            assert await _page_rows(store) == {
+                ("doc-1", 1): _page(1),
+                ("doc-1", 2): _page(2),
+                ("doc-2", 1): _page(1),
+            }
+            assert await store.documents_table.count_rows() == 3
+
+    async def test_flushes_in_batches(self, temp_db_path, monkeypatch):
+        monkeypatch.setattr("haiku.rag.store.upgrades.v0_78_0._BATCH_BYTES", 1)
+        async with Store(temp_db_path, create=True, skip_migration_check=True) as store:
+            await _seed_legacy_pages(
+                store, {"doc-1": _pages_blob(1), "doc-2": _pages_blob(1, 2)}
+            )
+            add = AsyncMock(wraps=store.document_pages_table.add)
+            monkeypatch.setattr(store.document_pages_table, "add", add)
+
+            await _apply_split_document_pages(store)
+
+            # One add per document once each crosses the batch size.
+            assert add.await_count == 2
+            assert len(await _page_rows(store)) == 3
+
+    async def test_idempotent_after_partial_run(self, temp_db_path):
+        async with Store(temp_db_path, create=True, skip_migration_check=True) as store:
+            await _seed_legacy_pages(
+                store, {"doc-1": _pages_blob(1), "doc-2": _pages_blob(1, 2)}
+            )
+            # A previous run moved doc-1 before failing.
+            await store.document_pages_table.add(
+                [{"document_id": "doc-1", "page_no": 1, "page": b"moved"}]
+            )
+
+            await _apply_split_document_pages(store)
+            rows = await store.document_pages_table.query().to_list()
+            assert sorted((r["document_id"], r["page_no"]) for r in rows) == [
+                ("doc-1", 1),
+                ("doc-2", 1),
+                ("doc-2", 2),
+            ]
+
+            version = await store.document_pages_table.version()
+            await _apply_split_document_pages(store)
+            assert await store.document_pages_table.version() == version
+
+    async def test_unreadable_blob_is_skipped(self, temp_db_path):
+        async with Store(temp_db_path, create=True, skip_migration_check=True) as store:
+            await _seed_legacy_pages(
+                store, {"doc-1": b"not zstd", "doc-2": _pages_blob(3)}
+            )
+
+            await _apply_split_document_pages(store)
+
+            assert await _page_rows(store) == {("doc-2", 3): _page(3)}
+            assert "docling_pages" not in (await store.documents_table.schema()).names
+
+    async def test_skips_vacuum_when_disk_is_tight(self, temp_db_path, monkeypatch):
+        from haiku.rag.store.upgrades import v0_78_0
+
+        monkeypatch.setattr(
+            v0_78_0.shutil,
+            "disk_usage",
+            lambda _p: SimpleNamespace(total=1, used=1, free=1),
+        )
+        async with Store(temp_db_path, create=True, skip_migration_check=True) as store:
+            await _seed_legacy_pages(store, {"doc-1": _pages_blob(1)})
+            monkeypatch.setattr(
+                store.documents_table,
+                "stats",
+                AsyncMock(return_value={"total_bytes": 10_000_000}),
+            )
+            optimize = AsyncMock()
+            monkeypatch.setattr(store.documents_table, "optimize", optimize)
+
+            await _apply_split_document_pages(store)
+
+            assert await _page_rows(store) == {("doc-1", 1): _page(1)}
+            optimize.assert_not_awaited()
+
+    async def test_runs_from_migrate(self, temp_db_path):
+        async with Store(temp_db_path, create=True, skip_migration_check=True) as store:
+            await _seed_legacy_pages(store, {"doc-1": _pages_blob(1)})
+            await store.set_haiku_version("0.77.0")
+
+        async with Store(temp_db_path, skip_migration_check=True) as store:
+            applied = await store.migrate()
+            assert any("0.78.0" in d for d in applied)
+            assert await _page_rows(store) == {("doc-1", 1): _page(1)}
+
+
+async def _seed_legacy_pictures(
+    store: Store, pictures: dict[str, bytes | None]
+) -> None:
+    """Give document_items the pre-0.78 `picture_data` column in place of
+    `picture_hash`, one item per `document_id/self_ref` key."""
+    await store.document_items_table.drop_columns(["picture_hash"])
+    await store.document_items_table.add_columns(
+        {"picture_data": "CAST(NULL AS BINARY)"}
+    )
+    rows = []
+    for position, (key, data) in enumerate(pictures.items()):
+        document_id, self_ref = key.split("/", 1)
+        rows.append(
+            {
+                "document_id": document_id,
+                "position": position,
+                "self_ref": self_ref,
+                "label": "picture" if data is not None else "text",
+                "text": "",
+                "page_numbers": "[]",
+                "heading_level": 0,
+                "tree_depth": 0,
+            }
+        )
+    await store.document_items_table.add(rows)
+    for key, data in pictures.items():
+        if data is not None:
+            document_id, self_ref = key.split("/", 1)
+            await store.document_items_table.update(
+                {"picture_data": data},
+                where=f"document_id = '{document_id}' AND self_ref = '{self_ref}'",
+            )
+
+
+async def _picture_refs(store: Store) -> dict[str, str | None]:
+    rows = await (
+        store.document_items_table.query()
+        .select(["document_id", "self_ref", "picture_hash"])
+        .to_list()
+    )
+    return {f"{r['document_id']}/{r['self_ref']}": r["picture_hash"] for r in rows}
+
+
+@pytest.mark.asyncio
+class TestV0_78_0PictureMigration:
+    """v0.78.0 moves picture bytes into picture_blobs, stored once per
+    distinct picture and referenced from document_items by hash."""
+
+    async def test_moves_pictures_once_per_content(self, temp_db_path):
+        logo, chart = b"logo-bytes", b"chart-bytes"
+        async with Store(temp_db_path, create=True, skip_migration_check=True) as store:
+            await _seed_legacy_pictures(
+                store,
+                {
+                    "doc-1/#/pictures/0": logo,
+                    "doc-1/#/pictures/1": chart,
+                    "doc-2/#/pictures/0": logo,
+                    "doc-2/#/texts/0": None,
+                },
+            )
+
+            await _apply_deduplicate_pictures(store)
+
+            schema = await store.document_items_table.schema()
+            assert "picture_data" not in schema.names
+            assert await _picture_refs(store) == {
+                "doc-1/#/pictures/0": picture_hash(logo),
+                "doc-1/#/pictures/1": picture_hash(chart),
+                "doc-2/#/pictures/0": picture_hash(logo),
+                "doc-2/#/texts/0": None,
+            }
+            blobs = await store.picture_blobs_table.query().to_list()
+            assert {r["hash"]: r["data"] for r in blobs} == {
+                picture_hash(logo): logo,
+                picture_hash(chart): chart,
+            }
+            indices = await store.document_items_table.list_indices()
+            assert "picture_hash" in {c for i in indices for c in i.columns}
+
+    async def test_idempotent_after_partial_run(self, temp_db_path, monkeypatch):
+        monkeypatch.setattr("haiku.rag.store.upgrades.v0_78_0._BATCH_BYTES", 1)
+        async with Store(temp_db_path, create=True, skip_migration_check=True) as store:
+            await _seed_legacy_pictures(
+                store, {"doc-1/#/pictures/0": b"a", "doc-2/#/pictures/0": b"a"}
+            )
+            # Fail the second batch's reference write, after doc-1's landed.
+            original = store.document_items_table.merge_insert
+            calls = 0
+
+            def merge_insert(on):
+                nonlocal calls
+                calls += 1
+                if calls == 2:
+                    raise RuntimeError("interrupted")
+                return original(on)
+
+            monkeypatch.setattr(
+                store.document_items_table, "merge_insert", merge_insert
+            )
+            with pytest.raises(RuntimeError):
+                await _apply_deduplicate_pictures(store)
+            monkeypatch.setattr(store.document_items_table, "merge_insert", original)
+
+            await _apply_deduplicate_pictures(store)
+
+            assert set((await _picture_refs(store)).values()) == {picture_hash(b"a")}
+            assert await store.picture_blobs_table.count_rows() == 1
+
+            version = await store.document_items_table.version()
+            await _apply_deduplicate_pictures(store)
+            assert await store.document_items_table.version() == version
+
+    async def test_runs_from_migrate(self, temp_db_path):
+        async with Store(temp_db_path, create=True, skip_migration_check=True) as store:
+            await _seed_legacy_pictures(store, {"doc-1/#/pictures/0": b"png"})
+            await store.set_haiku_version("0.77.0")
+
+        async with Store(temp_db_path, skip_migration_check=True) as store:
+            await store.migrate()
+            assert await _picture_refs(store) == {
+                "doc-1/#/pictures/0": picture_hash(b"png")
+            }
+
+
+async def _seed_legacy_chunks(store: Store, metadata: dict[str, str]) -> None:
+    """Give chunks the pre-0.78 layout, every ChunkMetadata field inside the
+    `metadata` JSON, one chunk per `document_id/chunk_id` key."""
+    await store.chunks_table.drop_columns(
+        ["doc_item_refs", "headings", "labels", "page_numbers"]
+    )
+    dim = store.embedder._vector_dim
+    rows = []
+    for order, (key, raw) in enumerate(metadata.items()):
+        document_id, chunk_id = key.split("/", 1)
+        rows.append(
+            {
+                "id": chunk_id,
+                "document_id": document_id,
+                "content": chunk_id,
+                "content_fts": chunk_id,
+                "metadata": raw,
+                "order": order,
+                "vector": [0.0] * dim,
+            }
+        )
+    await store.chunks_table.add(rows)
+
+
+async def _chunk_columns(store: Store) -> dict[str, dict]:
+    rows = await (
+        store.chunks_table.query()
+        .select(
+            ["id", "doc_item_refs", "headings", "labels", "page_numbers", "metadata"]
+        )
+        .to_list()
+    )
+    return {row.pop("id"): row for row in rows}
+
+
+@pytest.mark.asyncio
+class TestV0_78_0ChunkMetadataMigration:
+    """v0.78.0 moves the ChunkMetadata fields out of the chunks.metadata JSON
+    into native list columns, leaving only other keys in the JSON."""
+
+    async def test_moves_fields_into_columns(self, temp_db_path):
+        async with Store(temp_db_path, create=True, skip_migration_check=True) as store:
+            await _seed_legacy_chunks(
+                store,
+                {
+                    "doc-1/c1": json.dumps(
+                        {
+                            "doc_item_refs": ["#/tables/0"],
+                            "headings": ["Results"],
+                            "labels": ["table"],
+                            "page_numbers": [10, 11],
+                            "speaker": "MR SMITH",
+                        }
+                    ),
+                    "doc-1/c2": json.dumps({"headings": None, "labels": ["text"]}),
+                    "doc-2/c3": "{}",
+                    "doc-2/c4": "not json",
+                },
+            )
+
+            await _apply_typed_chunk_metadata(store)
+
+            assert await _chunk_columns(store) == {
+                "c1": {
+                    "doc_item_refs": ["#/tables/0"],
+                    "headings": ["Results"],
+                    "labels": ["table"],
+                    "page_numbers": [10, 11],
+                    "metadata": json.dumps({"speaker": "MR SMITH"}),
+                },
+                "c2": {
+                    "doc_item_refs": [],
+                    "headings": None,
+                    "labels": ["text"],
+                    "page_numbers": [],
+                    "metadata": "{}",
+                },
+                "c3": {
+                    "doc_item_refs": [],
+                    "headings": None,
+                    "labels": [],
+                    "page_numbers": [],
+                    "metadata": "{}",
+                },
+                "c4": {
+                    "doc_item_refs": [],
+                    "headings": None,
+                    "labels": [],
+                    "page_numbers": [],
+                    "metadata": "not json",
+                },
+            }
+            indices = await store.chunks_table.list_indices()
+            label_lists = {
+                c for i in indices if i.index_type == "LabelList" for c in i.columns
+            }
+            assert label_lists == {"labels", "page_numbers"}
+
+    async def test_idempotent_after_partial_run(self, temp_db_path, monkeypatch):
+        monkeypatch.setattr("haiku.rag.store.upgrades.v0_78_0._CHUNK_BATCH_ROWS", 1)
+        async with Store(temp_db_path, create=True, skip_migration_check=True) as store:
+            meta = json.dumps({"labels": ["text"]})
+            await _seed_legacy_chunks(store, {"doc-1/c1": meta, "doc-2/c2": meta})
+            original = store.chunks_table.merge_insert
+            calls = 0
+
+            def merge_insert(on):
+                nonlocal calls
+                calls += 1
+                if calls == 2:
+                    raise RuntimeError("interrupted")
+                return original(on)
+
+            monkeypatch.setattr(store.chunks_table, "merge_insert", merge_insert)
+            with pytest.raises(RuntimeError):
+                await _apply_typed_chunk_metadata(store)
+            monkeypatch.setattr(store.chunks_table, "merge_insert", original)
+
+            await _apply_typed_chunk_metadata(store)
+
+            columns = await _chunk_columns(store)
+            assert [columns[c]["labels"] for c in ("c1", "c2")] == [["text"], ["text"]]
+
+            version = await store.chunks_table.version()
+            await _apply_typed_chunk_metadata(store)
+            assert await store.chunks_table.version() == version
+
+    async def test_runs_from_migrate(self, temp_db_path):
+        async with Store(temp_db_path, create=True, skip_migration_check=True) as store:
+            await _seed_legacy_chunks(
+                store, {"doc-1/c1": json.dumps({"page_numbers": [3]})}
+            )
+            await store.set_haiku_version("0.77.0")
+
+        async with Store(temp_db_path, skip_migration_check=True) as store:
+            await store.migrate()
+            assert (await _chunk_columns(store))["c1"]["page_numbers"] == [3]
@@ -0,0 +1,51 @@
+from contextlib import ExitStack
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from haiku.rag.store.engine import Store
+from haiku.rag.store.models import Document
+from haiku.rag.store.repositories.document import DocumentRepository
+
+
+@pytest.mark.asyncio
+async def test_warm_loads_the_search_indexes(temp_db_path):
+    async with Store(temp_db_path, create=True) as store:
+        await DocumentRepository(store).create(Document(content="x", uri="a"))
+
+    async with Store(temp_db_path, read_only=True) as store:
+        warmed = await store.warm()
+
+        expected = {
+            f"{name}.{index.name}"
+            for name in ("chunks", "documents", "document_meta")
+            for index in await getattr(store, f"{name}_table").list_indices()
+        }
+        assert set(warmed) == expected
+        assert "chunks.content_fts_idx" in warmed
+        assert "document_meta.uri_idx" in warmed
+
+
+@pytest.mark.asyncio
+async def test_warm_an_empty_database(temp_db_path):
+    async with Store(temp_db_path, create=True) as store:
+        prewarmed: list[str] = []
+        indexes: set[str] = set()
+        with ExitStack() as stack:
+            for name in ("chunks", "documents", "document_meta"):
+                table = getattr(store, f"{name}_table")
+                indexes |= {f"{name}.{i.name}" for i in await table.list_indices()}
+
+                async def prewarm(index_name, name=name):
+                    prewarmed.append(f"{name}.{index_name}")
+
+                stack.enter_context(
+                    patch.object(table, "prewarm_index", AsyncMock(side_effect=prewarm))
+                )
+            warmed = await store.warm()
+
+    # The vector index is only built once there are chunks; the scalar and
+    # FTS indexes of the empty tables are each prewarmed once.
+    assert "chunks.vector_idx" not in indexes
+    assert not any(index.endswith("vector_idx") for index in prewarmed)
+    assert sorted(warmed) == sorted(prewarmed) == sorted(indexes)
@@ -4,7 +4,7 @@ They stub the client and record the console: each test pins what the app asks
 the client for and what it renders, without a database or a model.
 """
 
-from unittest.mock import AsyncMock
+from unittest.mock import AsyncMock, MagicMock
 
 import pytest
 from rich.console import Console
@@ -123,6 +123,25 @@ async def test_delete_document_reports_a_missing_id(app, client):
     assert "not found" in out(app)
 
 
+async def test_delete_documents_reports_the_count(app, client):
+    client.delete_documents.return_value = 3
+
+    await app.delete_documents(filter="uri LIKE 'x%'")
+
+    client.delete_documents.assert_awaited_once_with(
+        document_ids=None, filter="uri LIKE 'x%'"
+    )
+    assert "Deleted 3 documents" in out(app)
+
+
+async def test_update_documents_metadata_reports_no_match(app, client):
+    client.update_documents_metadata.return_value = 0
+
+    await app.update_documents_metadata({"k": "v"}, doc_ids=["nope"])
+
+    assert "No matching documents" in out(app)
+
+
 async def test_search_requires_a_query_or_an_image(app):
     await app.search()
 
@@ -397,6 +416,96 @@ async def test_migrate_returns_what_the_store_applied(app, store_stub):
     assert await app.migrate() == ["v0_40_0"]
 
 
+async def test_train_dictionary_reports_size_and_speed(app, store_stub, monkeypatch):
+    from haiku.rag.store.dictionary import DictionaryTrainingReport
+
+    train = AsyncMock(
+        return_value=DictionaryTrainingReport(
+            dictionary_id=7,
+            dictionary_bytes=4096,
+            samples=50,
+            raw_bytes=100_000,
+            plain_bytes=20_000,
+            dictionary_compressed_bytes=15_000,
+            plain_decompress_s=0.002,
+            dictionary_decompress_s=0.0015,
+        )
+    )
+    monkeypatch.setattr("haiku.rag.store.dictionary.train_docling_dictionary", train)
+
+    await app.train_dictionary(samples=50, size=4096)
+
+    train.assert_awaited_once_with(store_stub, sample_size=50, dict_size=4096)
+    assert "Trained dictionary 7" in out(app)
+    assert "15,000 bytes (-25.0%)" in out(app)
+
+
+def _manifest(include_vectors: bool = True):
+    from datetime import UTC, datetime
+
+    from haiku.rag.store.transfer import ExportedTable, ExportFormat, ExportManifest
+
+    return ExportManifest(
+        format=ExportFormat.PARQUET,
+        haiku_rag_version="0.78.0",
+        created_at=datetime.now(UTC),
+        include_vectors=include_vectors,
+        include_pages=True,
+        tables=[
+            ExportedTable(
+                name="documents",
+                file="documents.parquet",
+                rows=3,
+                version=1,
+                schema_ipc="",
+            ),
+            ExportedTable(
+                name="chunks",
+                file="chunks.parquet",
+                rows=1200,
+                version=1,
+                schema_ipc="",
+            ),
+        ],
+    )
+
+
+async def test_export_reports_rows_and_tables(app, store_stub, monkeypatch, tmp_path):
+    from haiku.rag.store.transfer import ExportFormat
+
+    export = AsyncMock(return_value=_manifest())
+    monkeypatch.setattr("haiku.rag.store.transfer.export_database", export)
+
+    await app.export_database(tmp_path / "out", format="arrow", include_pages=False)
+
+    args = export.await_args
+    assert args is not None
+    assert args.args == (store_stub, tmp_path / "out")
+    assert args.kwargs["format"] == ExportFormat.ARROW
+    assert args.kwargs["include_pages"] is False
+    assert "Exported 1,203 rows from 2 tables" in out(app)
+
+
+async def test_import_without_vectors_says_to_re_embed(app, monkeypatch, tmp_path):
+    monkeypatch.setattr(
+        "haiku.rag.store.transfer.import_database",
+        AsyncMock(return_value=_manifest(include_vectors=False)),
+    )
+
+    await app.import_database(tmp_path / "out")
+
+    assert "Imported 1,203 rows" in out(app)
+    assert "rebuild --embed-only" in out(app)
+
+
+async def test_import_refuses_read_only_mode(app, tmp_path):
+    from haiku.rag.store.exceptions import ReadOnlyError
+
+    app.read_only = True
+    with pytest.raises(ReadOnlyError):
+        await app.import_database(tmp_path / "out")
+
+
 async def test_list_tags_reports_none(app, monkeypatch):
     store = AsyncMock()
     store.list_tags.return_value = {}
@@ -520,6 +629,17 @@ async def test_run_mcp_http(app, client, monkeypatch):
     )
 
 
+async def test_run_mcp_passes_warm_options(app, client, monkeypatch):
+    server = AsyncMock()
+    create = MagicMock(return_value=server)
+    monkeypatch.setattr("haiku.rag.app.create_mcp_server", create)
+
+    await app.run_mcp(transport="stdio", warm=True)
+
+    assert create.call_args.kwargs["warm"] is True
+    assert create.call_args.kwargs["warm_blocking"] is False
+
+
 async def test_run_mcp_survives_interruption(app, client, monkeypatch):
     server = AsyncMock()
     server.run_stdio_async.side_effect = KeyboardInterrupt
@@ -681,6 +801,8 @@ def _database_info(vector_index, chunk_rows=300):
                 "document_meta",
                 "chunks",
                 "document_items",
+                "document_pages",
+                "picture_blobs",
                 "settings",
             )
         ],
@@ -808,3 +930,58 @@ async def test_analyze_prints_citation_renderables(app, client, monkeypatch):
     await app.analyze("how many?")
 
     assert "citation renderable" in out(app)
+
+
+async def test_info_reports_compaction_decisions_and_last_run(app, monkeypatch):
+    from datetime import datetime
+
+    from haiku.rag.store.compaction import (
+        CompactionRun,
+        TableCompaction,
+        TableLayout,
+    )
+
+    info = _database_info({"exists": False})
+    documents = next(t for t in info.tables if t.name == "documents")
+    documents.layout = TableLayout(num_fragments=20, num_small_fragments=20)
+    documents.compaction_due = ["20/20 small fragments"]
+    info.last_compaction = CompactionRun(
+        started_at=datetime(2026, 1, 1, 3, 0),
+        duration_s=2.5,
+        tables=[
+            TableCompaction(
+                name="chunks",
+                layout=TableLayout(),
+                reasons=["120 stale versions"],
+                compacted=True,
+                duration_s=2.0,
+            ),
+            TableCompaction(name="documents", layout=TableLayout()),
+        ],
+    )
+
+    async def stub_info(config, db_path):
+        return info
+
+    monkeypatch.setattr("haiku.rag.store.info.gather_database_info", stub_info)
+
+    await app.info()
+
+    printed = out(app)
+    assert "due: 20/20 small fragments" in printed
+    assert "2026-01-01 03:00:00 (2.5s)" in printed
+    assert "chunks: compacted in 2.0s (120 stale versions)" in printed
+    assert "documents: skipped" in printed
+
+
+async def test_info_reports_no_compaction_run(app, monkeypatch):
+    info = _database_info({"exists": False})
+
+    async def stub_info(config, db_path):
+        return info
+
+    monkeypatch.setattr("haiku.rag.store.info.gather_database_info", stub_info)
+
+    await app.info()
+
+    assert "last run: never" in out(app)
@@ -1,7 +1,9 @@
+import pytest
+
 from haiku.rag.app import HaikuRAGApp
 from haiku.rag.client import HaikuRAG
-from haiku.rag.client.documents import parent_uri_filter
-from haiku.rag.config.models import AppConfig
+from haiku.rag.client.documents import parent_uri_filter, parent_uris_filter
+from haiku.rag.config.models import AppConfig, MetadataColumnConfig
 from haiku.rag.store.models.document import Document
 
 
@@ -158,3 +160,95 @@ def test_processing_config_extract_pdf_attachments_overridable():
 
     cfg = ProcessingConfig(extract_pdf_attachments=False)
     assert cfg.extract_pdf_attachments is False
+
+
+def test_parent_uris_filter_matches_any_uri():
+    f = parent_uris_filter(["file:///a.pdf", "file:///b.pdf"])
+    assert f == (
+        '(metadata LIKE \'%"parent_uri": "file:///a.pdf"%\' OR '
+        'metadata LIKE \'%"parent_uri": "file:///b.pdf"%\')'
+    )
+
+
+def test_parent_uris_filter_uses_a_promoted_column():
+    columns = [MetadataColumnConfig(key="parent_uri", type="string")]
+    f = parent_uris_filter(["file:///a.pdf", "file:///b's.pdf"], columns)
+    assert f == "meta_parent_uri IN ('file:///a.pdf', 'file:///b''s.pdf')"
+
+
+async def _tree(client: HaikuRAG, name: str) -> list[str]:
+    parent_uri = f"file:///{name}.pdf"
+    parent = await client.document_repository.create(
+        Document(content=name, uri=parent_uri, metadata={"group": name})
+    )
+    child = await client.document_repository.create(
+        Document(
+            content=f"{name} child",
+            uri=f"{parent_uri}#attachment=a.pdf",
+            metadata={"parent_uri": parent_uri},
+        )
+    )
+    assert parent.id is not None and child.id is not None
+    return [parent.id, child.id]
+
+
+async def test_delete_documents_by_ids_cascades_in_one_version_per_table(
+    temp_db_path,
+):
+    async with HaikuRAG(temp_db_path, create=True) as client:
+        first = await _tree(client, "first")
+        second = await _tree(client, "second")
+        kept = await _tree(client, "kept")
+        before = await client.store.current_table_versions()
+
+        deleted = await client.delete_documents([first[0], second[0], "missing"])
+
+        assert deleted == 4
+        after = await client.store.current_table_versions()
+        for table in ("documents", "document_meta", "chunks", "document_pages"):
+            assert after[table] == before[table] + 1
+        remaining = {doc.id for doc in await client.list_documents()}
+        assert remaining == set(kept)
+
+
+async def test_delete_documents_by_filter(temp_db_path):
+    async with HaikuRAG(temp_db_path, create=True) as client:
+        doomed = await _tree(client, "doomed")
+        kept = await _tree(client, "kept")
+
+        deleted = await client.delete_documents(filter="uri = 'file:///doomed.pdf'")
+
+        assert deleted == 2
+        assert all([await client.get_document_by_id(i) is None for i in doomed])
+        assert {doc.id for doc in await client.list_documents()} == set(kept)
+
+
+async def test_delete_documents_needs_ids_or_a_filter(temp_db_path):
+    async with HaikuRAG(temp_db_path, create=True) as client:
+        with pytest.raises(ValueError, match="exactly one"):
+            await client.delete_documents()
+        with pytest.raises(ValueError, match="exactly one"):
+            await client.delete_documents(["a"], filter="uri = 'a'")
+
+
+async def test_update_documents_metadata_merges_or_replaces(temp_db_path):
+    async with HaikuRAG(temp_db_path, create=True) as client:
+        first = await _tree(client, "first")
+        second = await _tree(client, "second")
+
+        updated = await client.update_documents_metadata(
+            {"team": "search"}, document_ids=[first[0], second[0], "missing"]
+        )
+        assert updated == 2
+        doc = await client.get_document_by_id(first[0])
+        assert doc is not None
+        assert doc.metadata == {"group": "first", "team": "search"}
+        assert doc.content == "first"
+
+        updated = await client.update_documents_metadata(
+            {"archived": True}, filter="uri = 'file:///second.pdf'", replace=True
+        )
+        assert updated == 1
+        doc = await client.get_document_by_id(second[0])
+        assert doc is not None
+        assert doc.metadata == {"archived": True}
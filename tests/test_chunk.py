@@ -570,6 +570,82 @@ async def test_chunk_search_with_precomputed_vector_skips_text_query(temp_db_pat
         assert any(c.document_id == doc.id for c, _ in results)
 
 
+async def _create_chunks(client: HaikuRAG, metadatas: list[dict]) -> list[Chunk]:
+    """Store chunks with fixed embeddings, bypassing the embedder."""
+    dim = client.store.embedder._vector_dim
+    chunks = [
+        Chunk(
+            document_id="doc-1",
+            content=f"chunk {order}",
+            metadata=metadata,
+            order=order,
+            embedding=[1.0] * dim,
+        )
+        for order, metadata in enumerate(metadatas)
+    ]
+    result = await client.chunk_repository.create(chunks)
+    assert isinstance(result, list)
+    return result
+
+
+async def test_chunk_metadata_round_trips_through_columns(temp_db_path):
+    """ChunkMetadata fields are stored as native columns, other keys as JSON,
+    and read back as the same metadata dict."""
+    metadata = {
+        "doc_item_refs": ["#/tables/0"],
+        "headings": ["Results"],
+        "labels": ["table"],
+        "page_numbers": [10, 11],
+        "speaker": "MR SMITH",
+    }
+    async with HaikuRAG(
+        db_path=temp_db_path, config=get_config(), create=True
+    ) as client:
+        [chunk] = await _create_chunks(client, [metadata])
+        assert chunk.id is not None
+
+        row = (
+            await client.store.chunks_table.query()
+            .select(["labels", "page_numbers", "metadata"])
+            .to_list()
+        )[0]
+        assert row["labels"] == ["table"]
+        assert row["page_numbers"] == [10, 11]
+        assert row["metadata"] == '{"speaker": "MR SMITH"}'
+
+        stored = await client.chunk_repository.get_by_id(chunk.id)
+        assert stored is not None
+        assert stored.metadata == metadata
+
+
+async def test_chunk_search_filters_on_metadata_columns(temp_db_path):
+    """A chunk_filter on the typed columns is applied inside the search."""
+    async with HaikuRAG(
+        db_path=temp_db_path, config=get_config(), create=True
+    ) as client:
+        await _create_chunks(
+            client,
+            [
+                {"labels": ["table"], "page_numbers": [3]},
+                {"labels": ["text"], "page_numbers": [12]},
+                {"labels": ["table"], "page_numbers": [15]},
+            ],
+        )
+        vector = [1.0] * client.store.embedder._vector_dim
+
+        async def contents(chunk_filter: str) -> set[str]:
+            results = await client.chunk_repository.search(
+                query_vector=vector, limit=10, chunk_filter=chunk_filter
+            )
+            return {chunk.content for chunk, _ in results}
+
+        assert await contents("array_has(labels, 'table')") == {"chunk 0", "chunk 2"}
+        pages = ", ".join(str(p) for p in range(10, 21))
+        assert await contents(
+            f"array_has(labels, 'table') AND array_has_any(page_numbers, [{pages}])"
+        ) == {"chunk 2"}
+
+
 async def test_get_chunk_ids_by_self_ref_grouped_without_documents(temp_db_path):
     async with HaikuRAG(
         db_path=temp_db_path, config=get_config(), create=True
@@ -579,15 +655,116 @@ async def test_get_chunk_ids_by_self_ref_grouped_without_documents(temp_db_path)
 
 async def test_process_search_results_rejects_unknown_score_column(temp_db_path):
     """A result frame with no recognised score column is a programming error."""
-    import pandas as pd
+    import pyarrow as pa
 
     async with HaikuRAG(
         db_path=temp_db_path, config=get_config(), create=True
     ) as client:
 
         class _Frame:
-            async def to_pandas(self):
-                return pd.DataFrame([{"id": "c1", "content": "x", "metadata": "{}"}])
+            async def to_arrow(self):
+                return pa.Table.from_pylist([{"id": "c1", "content": "x"}])
 
         with pytest.raises(ValueError, match="Unknown search result format"):
             await client.chunk_repository._process_search_results(_Frame())
+
+
+def _text_chunks(contents: list[str], labels: list[str] | None = None) -> list[Chunk]:
+    return [
+        Chunk(
+            document_id="doc-1",
+            content=content,
+            metadata={"labels": labels or ["text"]},
+            order=order,
+        )
+        for order, content in enumerate(contents)
+    ]
+
+
+async def _row_ids(client: HaikuRAG) -> dict[str, int]:
+    """Content to Lance row id. A row rewritten by an update gets a new one."""
+    rows = (
+        await client.store.chunks_table.query()
+        .select(["content"])
+        .with_row_id()
+        .to_list()
+    )
+    return {row["content"]: row["_rowid"] for row in rows}
+
+
+async def test_update_rewrites_only_changed_chunks(temp_db_path):
+    """Unchanged chunks keep their ids, vectors and rows; edited chunks get a
+    new id and need embedding, and dropped chunks are deleted."""
+    async with HaikuRAG(
+        db_path=temp_db_path, config=get_config(), create=True
+    ) as client:
+        dim = client.store.embedder._vector_dim
+        original = _text_chunks(["alpha", "beta", "gamma"])
+        for i, chunk in enumerate(original):
+            chunk.embedding = [float(i)] * dim
+        await client.chunk_repository.replace_for_document("doc-1", original)
+        before = await _row_ids(client)
+
+        updated = _text_chunks(["alpha", "beta edited", "gamma", "delta"])
+        reused = await client.chunk_repository.reuse_embeddings("doc-1", updated)
+
+        assert reused == 2
+        assert [c.id for c in updated] == [original[0].id, None, original[2].id, None]
+        assert updated[0].embedding == [0.0] * dim
+        assert updated[2].embedding == [2.0] * dim
+        assert updated[1].embedding is None and updated[3].embedding is None
+
+        updated[1].embedding = updated[3].embedding = [9.0] * dim
+        await client.chunk_repository.replace_for_document("doc-1", updated)
+        after = await _row_ids(client)
+
+        assert set(after) == {"alpha", "beta edited", "gamma", "delta"}
+        assert after["alpha"] == before["alpha"]
+        assert after["gamma"] == before["gamma"]
+        assert updated[1].id not in (None, original[1].id)
+        assert await client.chunk_repository.get_by_id(original[1].id) is None
+
+
+async def test_reused_chunks_follow_their_new_order(temp_db_path):
+    """A chunk inserted ahead of the others shifts them: they keep ids and
+    vectors but are rewritten with their new order. Repeated texts pair up
+    with the stored repeats in order."""
+    async with HaikuRAG(
+        db_path=temp_db_path, config=get_config(), create=True
+    ) as client:
+        dim = client.store.embedder._vector_dim
+        original = _text_chunks(["same", "same", "tail"])
+        for chunk in original:
+            chunk.embedding = [1.0] * dim
+        await client.chunk_repository.replace_for_document("doc-1", original)
+
+        updated = _text_chunks(["head", "same", "same", "tail"])
+        assert await client.chunk_repository.reuse_embeddings("doc-1", updated) == 3
+        assert [c.id for c in updated[1:]] == [c.id for c in original]
+        updated[0].embedding = [1.0] * dim
+        await client.chunk_repository.replace_for_document("doc-1", updated)
+
+        chunks = await client.chunk_repository.get_by_document_id("doc-1")
+        assert [(c.content, c.order) for c in chunks] == [
+            ("head", 0),
+            ("same", 1),
+            ("same", 2),
+            ("tail", 3),
+        ]
+        assert [c.id for c in chunks[1:]] == [c.id for c in original]
+
+
+async def test_picture_chunks_are_not_reused_for_text(temp_db_path):
+    """A stored picture chunk's vector comes from its image, so text with the
+    same caption is embedded afresh."""
+    async with HaikuRAG(
+        db_path=temp_db_path, config=get_config(), create=True
+    ) as client:
+        dim = client.store.embedder._vector_dim
+        [picture] = _text_chunks(["A chart"], labels=["picture"])
+        picture.embedding = [1.0] * dim
+        await client.chunk_repository.replace_for_document("doc-1", [picture])
+
+        updated = _text_chunks(["A chart"])
+        assert await client.chunk_repository.reuse_embeddings("doc-1", updated) == 0
+        assert updated[0].id is None and updated[0].embedding is None
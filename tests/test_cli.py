@@ -1,5 +1,6 @@
 import subprocess
 import sys
+from pathlib import Path
 from unittest.mock import AsyncMock, patch
 
 import pytest
@@ -386,6 +387,36 @@ DB_ARGS = ["--db", "/tmp/test.lancedb"]
         ),
         (["get", "doc-1"], "get_document", {"doc_id": "doc-1"}),
         (["delete", "doc-1"], "delete_document", {"doc_id": "doc-1"}),
+        (
+            ["delete", "doc-1", "doc-2"],
+            "delete_documents",
+            {"doc_ids": ["doc-1", "doc-2"], "filter": None},
+        ),
+        (
+            ["delete", "--filter", "uri LIKE 'x%'"],
+            "delete_documents",
+            {"doc_ids": None, "filter": "uri LIKE 'x%'"},
+        ),
+        (
+            ["update-metadata", "doc-1", "--meta", "team=search", "--meta", "n=2"],
+            "update_documents_metadata",
+            {
+                "metadata": {"team": "search", "n": 2},
+                "doc_ids": ["doc-1"],
+                "filter": None,
+                "replace": False,
+            },
+        ),
+        (
+            ["update-metadata", "-f", "title = 'a'", "--meta", "k=v", "--replace"],
+            "update_documents_metadata",
+            {
+                "metadata": {"k": "v"},
+                "doc_ids": None,
+                "filter": "title = 'a'",
+                "replace": True,
+            },
+        ),
         (
             ["visualize", "chunk-1"],
             "visualize_chunk",
@@ -397,7 +428,48 @@ DB_ARGS = ["--db", "/tmp/test.lancedb"]
             {"chunk_id": "chunk-1", "expand": False},
         ),
         (["vacuum"], "vacuum", {}),
+        (
+            ["train-dictionary", "--samples", "50", "--size", "4096"],
+            "train_dictionary",
+            {"samples": 50, "size": 4096},
+        ),
         (["create-index"], "create_index", {}),
+        (
+            ["export", "/tmp/out"],
+            "export_database",
+            {
+                "destination": Path("/tmp/out"),
+                "format": "parquet",
+                "include_vectors": True,
+                "include_pages": True,
+                "concurrency": 4,
+            },
+        ),
+        (
+            [
+                "export",
+                "/tmp/out",
+                "--format",
+                "arrow",
+                "--no-vectors",
+                "--no-pages",
+                "--parallel",
+                "2",
+            ],
+            "export_database",
+            {
+                "destination": Path("/tmp/out"),
+                "format": "arrow",
+                "include_vectors": False,
+                "include_pages": False,
+                "concurrency": 2,
+            },
+        ),
+        (
+            ["import", "/tmp/out"],
+            "import_database",
+            {"source": Path("/tmp/out"), "concurrency": 4},
+        ),
         (["init"], "init", {}),
         (["info"], "info", {}),
         # limit/search_type default to None: the app layer resolves the config
@@ -428,6 +500,7 @@ def test_command_dispatches_to_the_app(app_stub, argv, method, expected):
                 "filter": None,
                 "search_type": None,
                 "image": None,
+                "at_tag": None,
             },
         ),
         (
@@ -438,6 +511,18 @@ def test_command_dispatches_to_the_app(app_stub, argv, method, expected):
                 "filter": None,
                 "search_type": "vector",
                 "image": None,
+                "at_tag": None,
+            },
+        ),
+        (
+            ["search", "q", "--at-tag", "v1"],
+            {
+                "query": "q",
+                "limit": None,
+                "filter": None,
+                "search_type": None,
+                "image": None,
+                "at_tag": "v1",
             },
         ),
     ],
@@ -479,6 +564,15 @@ def test_rebuild_flag_selects_the_mode(app_stub, flag, mode_name):
     assert kwargs["mode"].name == mode_name
 
 
+def test_train_dictionary_exits_nonzero_on_failure(app_stub):
+    app_stub.train_dictionary.side_effect = ValueError("No documents")
+
+    result = runner.invoke(cli, ["train-dictionary"] + DB_ARGS)
+
+    assert result.exit_code == 1
+    assert "No documents" in result.output
+
+
 def test_migrate_reports_applied_migrations(app_stub):
     app_stub.migrate.return_value = ["v0_40_0: add document_items"]
 
@@ -487,6 +581,16 @@ def test_migrate_reports_applied_migrations(app_stub):
     assert result.exit_code == 0, result.output
     assert "Applied 1 migration(s)" in result.output
     assert "add document_items" in result.output
+    app_stub.migrate.assert_awaited_once_with(concurrency=4)
+
+
+def test_migrate_passes_parallelism(app_stub):
+    app_stub.migrate.return_value = []
+
+    result = runner.invoke(cli, ["migrate", "--parallel", "2"] + DB_ARGS)
+
+    assert result.exit_code == 0, result.output
+    app_stub.migrate.assert_awaited_once_with(concurrency=2)
 
 
 def test_migrate_reports_an_up_to_date_database(app_stub):
@@ -521,6 +625,16 @@ def test_mcp_without_stdio_leaves_the_transport_unset(app_stub):
 
     assert result.exit_code == 0, result.output
     assert app_stub.run_mcp.call_args.kwargs["transport"] is None
+    assert app_stub.run_mcp.call_args.kwargs["warm"] is False
+
+
+def test_mcp_warm_flags_reach_the_server(app_stub):
+    result = runner.invoke(cli, ["mcp", "--warm", "--warm-blocking"] + DB_ARGS)
+
+    assert result.exit_code == 0, result.output
+    kwargs = app_stub.run_mcp.call_args.kwargs
+    assert kwargs["warm"] is True
+    assert kwargs["warm_blocking"] is True
 
 
 def test_version_flag_prints_the_version():
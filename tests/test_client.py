@@ -51,9 +51,9 @@ async def test_prepare_document_from_docling_runs_off_event_loop_thread(monkeypa
     document = Document(content="")
     original = documents._prepare_document_from_docling_sync
 
-    def spy(doc, docling):
+    def spy(doc, docling, params=None):
         called_from.append(threading.current_thread())
-        return original(doc, docling)
+        return original(doc, docling, params)
 
     monkeypatch.setattr(documents, "_prepare_document_from_docling_sync", spy)
 
@@ -1260,16 +1260,14 @@ async def test_cascade_delete_is_atomic(temp_db_path, monkeypatch):
         )
         assert parent.id is not None and child.id is not None
 
-        orig_delete = client.document_repository.delete
+        pages = client.document_repository.document_page_repository
 
-        async def delete_failing_on_child(doc_id):
-            if doc_id == child.id:
+        async def delete_failing_on_child(document_ids):
+            if child.id in document_ids:
                 raise RuntimeError("child delete failed")
-            return await orig_delete(doc_id)
 
-        monkeypatch.setattr(
-            client.document_repository, "delete", delete_failing_on_child
-        )
+        # The subtree's chunks and items are deleted before its pages.
+        monkeypatch.setattr(pages, "delete_by_document_ids", delete_failing_on_child)
         with pytest.raises(RuntimeError, match="child delete failed"):
             await client.delete_document(parent.id)
         monkeypatch.undo()
@@ -1278,6 +1276,7 @@ async def test_cascade_delete_is_atomic(temp_db_path, monkeypatch):
         assert await client.get_document_by_id(parent.id) is not None
         assert await client.get_document_by_id(child.id) is not None
         assert await client.count_documents() == 2
+        assert len(await client.chunk_repository.get_by_document_id(parent.id)) == 1
 
 
 async def test_delete_missing_id_returns_false_without_vacuum(temp_db_path):
@@ -2396,7 +2395,7 @@ async def test_update_document_with_url_prefixed_content(temp_db_path, monkeypat
 
 async def test_update_document_with_chunks_keeps_page_images(temp_db_path, monkeypatch):
     """Replacing content and chunks without a docling document writes the stored
-    record back as-is, so its page rasters must survive the round trip."""
+    record back as-is; its page rasters must survive the update."""
     _patch_embed_chunks(monkeypatch)
 
     async with HaikuRAG(temp_db_path, create=True) as client:
@@ -2404,9 +2403,7 @@ async def test_update_document_with_chunks_keeps_page_images(temp_db_path, monke
         assert doc.id is not None
 
         sentinel_pages = b"\x80SENTINEL_PAGE_BYTES"
-        await client.store.documents_table.update(
-            {"docling_pages": sentinel_pages}, where=f"id = '{doc.id}'"
-        )
+        await client.document_page_repository.create_all({doc.id: {1: sentinel_pages}})
 
         await client.update_document(
             doc.id,
@@ -2417,7 +2414,8 @@ async def test_update_document_with_chunks_keeps_page_images(temp_db_path, monke
         stored = await client.document_repository.get_by_id(doc.id, include_blobs=True)
         assert stored is not None
         assert stored.content == "replacement body"
-        assert stored.docling_pages == sentinel_pages
+        pages = await client.store.document_pages_table.query().to_list()
+        assert [row["page"] for row in pages] == [sentinel_pages]
 
 
 async def test_rebuild_rechunk_with_url_prefixed_stored_content(
@@ -2707,10 +2705,7 @@ async def test_visualize_chunk_returns_empty_when_pages_row_missing(temp_db_path
         doc = await client.import_document(docling_doc, chunks, uri="test://no-row")
         stored = await client.chunk_repository.get_by_document_id(doc.id)
 
-        async def no_pages_row(document_id):
-            return None
-
-        client.document_repository.get_pages_data = no_pages_row  # type: ignore[method-assign]
+        await client.document_page_repository.delete_by_document_id(doc.id)
 
         assert await client.visualize_chunk(stored[0]) == []
 
@@ -0,0 +1,167 @@
+import pytest
+from docling_core.types.doc.document import DoclingDocument
+
+from haiku.rag.client.processing import convert
+from haiku.rag.config import AppConfig
+from haiku.rag.converters.cache import (
+    ConversionCache,
+    conversion_key,
+    read_conversion_cache_stats,
+)
+
+
+@pytest.fixture
+def config(tmp_path):
+    config = AppConfig()
+    config.processing.conversion_cache.enabled = True
+    config.processing.conversion_cache.path = tmp_path / "cache"
+    return config
+
+
+@pytest.fixture
+def converter(monkeypatch):
+    """Stands in for docling, counting conversions."""
+
+    class _Converter:
+        supported_extensions = [".pdf", ".md"]
+        calls = 0
+
+        async def convert_file(self, path, source_uri=None):
+            type(self).calls += 1
+            doc = DoclingDocument(name=path.stem)
+            doc.add_text(label="text", text=path.read_text())  # ty: ignore[invalid-argument-type]
+            return doc
+
+    monkeypatch.setattr(
+        "haiku.rag.client.processing.get_converter", lambda config: _Converter()
+    )
+    return _Converter
+
+
+def _write(tmp_path, name: str, content: str):
+    path = tmp_path / name
+    path.write_text(content)
+    return path
+
+
+@pytest.mark.asyncio
+async def test_repeat_conversion_is_served_from_the_cache(config, converter, tmp_path):
+    first = await convert(config, _write(tmp_path, "a.pdf", "same bytes"))
+    # The same bytes under another name and URI.
+    second = await convert(config, _write(tmp_path, "b.pdf", "same bytes"))
+
+    assert converter.calls == 1
+    assert second.export_to_markdown() == first.export_to_markdown()
+    assert second.name == "b"
+    stats = read_conversion_cache_stats(config)
+    assert stats is not None
+    assert (stats.hits, stats.misses) == (1, 1)
+    assert stats.size_bytes > 0
+
+
+@pytest.mark.asyncio
+async def test_disabled_cache_converts_every_time(config, converter, tmp_path):
+    config.processing.conversion_cache.enabled = False
+    path = _write(tmp_path, "a.pdf", "bytes")
+
+    await convert(config, path)
+    await convert(config, path)
+
+    assert converter.calls == 2
+    assert read_conversion_cache_stats(config) is None
+
+
+@pytest.mark.asyncio
+async def test_conversion_without_descriptions_is_not_cached(
+    config, monkeypatch, tmp_path
+):
+    """A VLM failing silently leaves every picture undescribed. That result is
+    not cached, so the next conversion calls the VLM again and its described
+    result is cached instead."""
+    from docling_core.types.doc.document import (
+        DescriptionMetaField,
+        PictureItem,
+        PictureMeta,
+    )
+    from docling_core.types.doc.labels import DocItemLabel
+
+    class _FlakyVLMConverter:
+        supported_extensions = [".pdf"]
+        calls = 0
+
+        async def convert_file(self, path, source_uri=None):
+            type(self).calls += 1
+            doc = DoclingDocument(name=path.stem)
+            picture = PictureItem(self_ref="#/pictures/0", label=DocItemLabel.PICTURE)
+            if type(self).calls > 1:
+                picture.meta = PictureMeta(
+                    description=DescriptionMetaField(text="A red square.")
+                )
+            doc.pictures.append(picture)
+            return doc
+
+    monkeypatch.setattr(
+        "haiku.rag.client.processing.get_converter",
+        lambda config: _FlakyVLMConverter(),
+    )
+    config.processing.pictures = "description"
+    path = _write(tmp_path, "a.pdf", "bytes")
+
+    failed = await convert(config, path)
+    described = await convert(config, path)
+    cached = await convert(config, path)
+
+    assert _FlakyVLMConverter.calls == 2
+    assert failed.pictures[0].meta is None
+    for doc in (described, cached):
+        meta = doc.pictures[0].meta
+        assert meta is not None and meta.description is not None
+        assert meta.description.text == "A red square."
+
+
+def test_key_follows_bytes_and_conversion_settings(config, tmp_path):
+    pdf = _write(tmp_path, "a.pdf", "bytes")
+    key = conversion_key(config, pdf, "file:///a.pdf")
+
+    assert conversion_key(config, _write(tmp_path, "b.pdf", "bytes")) == key
+    assert conversion_key(config, _write(tmp_path, "c.pdf", "other")) != key
+    assert conversion_key(config, _write(tmp_path, "a.md", "bytes")) != key
+
+    other = config.model_copy(deep=True)
+    other.processing.conversion_options.table_mode = "fast"
+    assert conversion_key(other, pdf) != key
+    other = config.model_copy(deep=True)
+    other.processing.converter = "docling-serve"
+    assert conversion_key(other, pdf) != key
+
+
+def test_markup_keys_include_the_source_uri(config, tmp_path):
+    """Relative image references in HTML and Markdown resolve against the
+    source URI, so the same markup under two URIs converts differently."""
+    md = _write(tmp_path, "page.md", "![](img.png)")
+
+    assert conversion_key(config, md, "https://a.example/") != conversion_key(
+        config, md, "https://b.example/"
+    )
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path):
+    def document(text: str) -> DoclingDocument:
+        doc = DoclingDocument(name="d")
+        doc.add_text(label="text", text=text)  # ty: ignore[invalid-argument-type]
+        return doc
+
+    cache = ConversionCache(tmp_path / "cache", max_size_bytes=10**6)
+    cache.put("a" * 64, document("first"))
+    cache.put("b" * 64, document("second"))
+    entry = tmp_path / "cache" / "entries" / "aa" / f"{'a' * 64}.json.zst"
+    assert cache.get("a" * 64) is not None
+
+    cache.max_size_bytes = entry.stat().st_size * 2 + 10
+    cache.put("c" * 64, document("third"))
+
+    assert cache.get("b" * 64) is None
+    assert cache.get("a" * 64) is not None
+    assert cache.get("c" * 64) is not None
+    assert not (tmp_path / "cache" / "entries" / "bb" / f"{'b' * 64}.json.zst").exists()
+    cache.close()
@@ -1,6 +1,7 @@
 """Tests for document converters."""
 
 import asyncio
+import os
 import tempfile
 import threading
 import time
@@ -14,9 +15,14 @@ from docling_core.types.doc.document import DoclingDocument
 
 from haiku.rag.config import AppConfig
 from haiku.rag.config.models import ModelConfig
-from haiku.rag.converters import docling_local, get_converter
+from haiku.rag.converters import docling_local, docling_pool, get_converter
 from haiku.rag.converters.base import vlm_api_url
 from haiku.rag.converters.docling_local import DoclingLocalConverter
+from haiku.rag.converters.docling_pool import (
+    DoclingPoolConverter,
+    conversion_pool,
+    shutdown_conversion_pools,
+)
 from haiku.rag.converters.docling_serve import DoclingServeConverter
 from haiku.rag.converters.text_utils import TextFileHandler, docling_safe_name
 
@@ -235,6 +241,13 @@ class TestConverterFactory:
         converter = get_converter(config)
         assert isinstance(converter, DoclingLocalConverter)
 
+    def test_get_docling_pool_converter(self):
+        """Conversion workers select the pooled docling-local converter."""
+        config = AppConfig()
+        config.processing.conversion_pool.workers = 2
+        converter = get_converter(config)
+        assert isinstance(converter, DoclingPoolConverter)
+
     def test_get_docling_serve_converter(self):
         """Test getting docling-serve converter."""
         config = AppConfig()
@@ -1162,6 +1175,89 @@ class TestSharedDoclingConverter:
         assert docling_calls.constructions == 1
 
 
+def _crash_on_marked_files(path: str, source_uri: str | None) -> str:
+    """Stands in for the worker's conversion; kills the worker on files named
+    crash*."""
+    if Path(path).name.startswith("crash"):
+        os._exit(1)
+    return docling_pool._convert_in_worker(path, source_uri)
+
+
+def _data_limit() -> int:
+    import resource
+
+    return resource.getrlimit(resource.RLIMIT_DATA)[0]
+
+
+class TestDoclingPoolConverter:
+    """Conversion in worker processes. CSV inputs resolve to SimplePipeline, so
+    the workers load no models."""
+
+    @pytest.fixture
+    def config(self):
+        config = AppConfig()
+        config.processing.conversion_pool.workers = 2
+        return config
+
+    @pytest.fixture(autouse=True)
+    def stop_pools(self):
+        yield
+        shutdown_conversion_pools()
+
+    def _csv(self, tmp_path, name: str) -> Path:
+        source = tmp_path / name
+        source.write_text("a,b\n1,2\n")
+        return source
+
+    @pytest.mark.asyncio
+    async def test_converts_in_a_worker_like_in_process(self, config, tmp_path):
+        source = self._csv(tmp_path, "rows.csv")
+
+        pooled = await DoclingPoolConverter(config).convert_file(source)
+        local = await DoclingLocalConverter(config).convert_file(source)
+
+        assert isinstance(pooled, DoclingDocument)
+        assert pooled.export_to_markdown() == local.export_to_markdown()
+
+    @pytest.mark.asyncio
+    async def test_converters_share_one_pool(self, config):
+        assert conversion_pool(config) is conversion_pool(config.model_copy())
+        other = config.model_copy(deep=True)
+        other.processing.conversion_options.table_mode = "fast"
+        assert conversion_pool(other) is not conversion_pool(config)
+
+    @pytest.mark.asyncio
+    async def test_crash_fails_only_the_crashing_conversion(
+        self, config, tmp_path, monkeypatch
+    ):
+        monkeypatch.setattr(docling_pool, "_convert_in_worker", _crash_on_marked_files)
+        converter = DoclingPoolConverter(config)
+        files = [
+            self._csv(tmp_path, name) for name in ("one.csv", "crash.csv", "two.csv")
+        ]
+
+        results = await asyncio.gather(
+            *(converter.convert_file(path) for path in files),
+            return_exceptions=True,
+        )
+
+        assert isinstance(results[0], DoclingDocument)
+        assert isinstance(results[1], ValueError)
+        assert isinstance(results[2], DoclingDocument)
+        # The broken executor was replaced, so later conversions still run.
+        assert isinstance(await converter.convert_file(files[0]), DoclingDocument)
+
+    @pytest.mark.asyncio
+    @pytest.mark.skipif(os.name == "nt", reason="no rlimits on Windows")
+    async def test_workers_run_under_the_memory_limit(self, config):
+        config.processing.conversion_pool.max_task_memory_mb = 4096
+        executor = conversion_pool(config)._current_executor()
+
+        limit = await asyncio.wrap_future(executor.submit(_data_limit))
+
+        assert limit == 4096 * 1024 * 1024
+
+
 class TestDoclingServeConverter:
     """Tests for DoclingServeConverter (mocked)."""
 
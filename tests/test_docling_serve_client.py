@@ -306,6 +306,7 @@ async def test_request_span_records_instance_per_attempt(monkeypatch):
     """Each attempt opens a docling_serve.request span tagged with the
     instance URL, so failover is traceable in Logfire."""
     from contextlib import nullcontext
+    from unittest.mock import Mock
 
     from haiku.rag.providers import docling_serve as ds_module
 
@@ -313,7 +314,7 @@ async def test_request_span_records_instance_per_attempt(monkeypatch):
 
     def _fake_span(span_name, /, **attrs):
         spans.append({"span_name": span_name, **attrs})
-        return nullcontext()
+        return nullcontext(Mock())
 
     monkeypatch.setattr(ds_module.logfire, "span", _fake_span)
 
@@ -476,6 +477,8 @@ def test_from_config_wires_retry_and_breaker():
     ds.max_attempts = 7
     ds.timeout = 42.0
     ds.circuit_breaker = CircuitBreakerConfig(failure_threshold=9, cooldown_s=90.0)
+    ds.poll_wait_s = 3.0
+    ds.max_poll_interval_s = 0.5
 
     for component in (DoclingServeConverter(config), DoclingServeChunker(config)):
         client = component.client
@@ -483,6 +486,8 @@ def test_from_config_wires_retry_and_breaker():
         assert client.timeout == 42.0
         assert client._breaker_config.failure_threshold == 9
         assert client._breaker_config.cooldown_s == 90.0
+        assert client._poll_wait == 3.0
+        assert client._max_poll_interval == 0.5
 
 
 @pytest.mark.asyncio
@@ -509,3 +514,118 @@ async def test_submit_without_task_id_raises():
                 {},
                 "doc.pdf",
             )
+
+
+def _pending_transport(pending_polls: int, hold_s: float = 0.0):
+    """Submit/poll/result trio whose task reports `started` for the first
+    `pending_polls` status requests, each held open for `hold_s`. Records the
+    query of every status request."""
+    import time
+
+    queries: list[dict[str, str]] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        path = request.url.path
+        if path == "/v1/convert/file/async":
+            return httpx.Response(200, json={"task_id": "t"})
+        if path == "/v1/status/poll/t":
+            queries.append(dict(request.url.params))
+            time.sleep(hold_s)
+            done = len(queries) > pending_polls
+            return httpx.Response(
+                200, json={"task_status": "success" if done else "started"}
+            )
+        if path == "/v1/result/t":
+            return httpx.Response(200, json={"ok": True})
+        return httpx.Response(404)
+
+    return httpx.MockTransport(handler), queries
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    from haiku.rag.providers import docling_serve as ds_module
+
+    recorded: list[float] = []
+
+    async def _sleep(delay):
+        recorded.append(delay)
+
+    monkeypatch.setattr(ds_module.asyncio, "sleep", _sleep)
+    return recorded
+
+
+@pytest.mark.asyncio
+async def test_status_requests_long_poll_without_sleeping(sleeps):
+    """A server honouring `wait` holds each status request open, so the client
+    asks again straight away instead of sleeping."""
+    transport, queries = _pending_transport(pending_polls=2, hold_s=0.02)
+    client = DoclingServeClient(
+        base_urls="http://longpoll-a:5001", transport=transport, poll_wait=0.03
+    )
+
+    assert await _poll(client) == {"ok": True}
+    assert queries == [{"wait": "0.03"}] * 3
+    assert sleeps == []
+
+
+@pytest.mark.asyncio
+async def test_status_polling_backs_off_when_wait_is_ignored(sleeps):
+    """A server answering status requests at once gets polled quickly at first,
+    then at most every max_poll_interval."""
+    transport, queries = _pending_transport(pending_polls=5)
+    client = DoclingServeClient(
+        base_urls="http://backoff-a:5001",
+        transport=transport,
+        poll_wait=5.0,
+        poll_interval=0.05,
+        max_poll_interval=0.15,
+    )
+
+    assert await _poll(client) == {"ok": True}
+    assert len(queries) == 6
+    assert sleeps == pytest.approx([0.05, 0.1, 0.15, 0.15, 0.15])
+
+
+@pytest.mark.asyncio
+async def test_zero_poll_wait_polls_without_the_wait_parameter(sleeps):
+    transport, queries = _pending_transport(pending_polls=1)
+    client = DoclingServeClient(
+        base_urls="http://nowait-a:5001", transport=transport, poll_wait=0
+    )
+
+    await _poll(client)
+
+    assert queries == [{}, {}]
+    assert sleeps == [0.05]
+
+
+@pytest.mark.asyncio
+async def test_task_span_records_timing(monkeypatch):
+    from contextlib import nullcontext
+    from unittest.mock import Mock
+
+    from haiku.rag.providers import docling_serve as ds_module
+
+    task_spans: list[Mock] = []
+
+    def _fake_span(span_name, /, **attrs):
+        span = Mock()
+        if span_name == "docling_serve.task":
+            task_spans.append(span)
+        return nullcontext(span)
+
+    monkeypatch.setattr(ds_module.logfire, "span", _fake_span)
+    transport, _ = _pending_transport(pending_polls=1, hold_s=0.01)
+    client = DoclingServeClient(
+        base_urls="http://timing-a:5001", transport=transport, poll_wait=0.01
+    )
+
+    await _poll(client)
+
+    [span] = task_spans
+    attributes = {c.args[0]: c.args[1] for c in span.set_attribute.call_args_list}
+    assert attributes["task_id"] == "t"
+    assert attributes["polls"] == 2
+    assert attributes["wait_s"] >= 0.02
+    assert attributes["submit_s"] >= 0
@@ -43,9 +43,12 @@ from haiku.rag.doctor import (
 from haiku.rag.store.schema import (
     DocumentItemRecord,
     DocumentMetaRecord,
+    DocumentPageRecord,
     DocumentRecord,
+    PictureBlobRecord,
     SettingsRecord,
     create_chunk_model,
+    get_picture_blobs_arrow_schema,
 )
 
 runner = CliRunner()
@@ -93,6 +96,8 @@ async def _build_db(
     meta_tbl = await db.create_table("document_meta", schema=DocumentMetaRecord)
     chunks_tbl = await db.create_table("chunks", schema=create_chunk_model(vector_dim))
     items_tbl = await db.create_table("document_items", schema=DocumentItemRecord)
+    await db.create_table("document_pages", schema=DocumentPageRecord)
+    await db.create_table("picture_blobs", schema=get_picture_blobs_arrow_schema())
 
     await settings_tbl.add(
         [
@@ -129,7 +134,7 @@ async def _build_db(
                 id="c1",
                 document_id="d1",
                 content="hello",
-                metadata=json.dumps({"doc_item_refs": ["#/texts/0"]}),
+                doc_item_refs=["#/texts/0"],
                 vector=[0.1] * vector_dim,
             )
         ]
@@ -233,6 +238,17 @@ async def test_orphaned_document_item_fails(temp_db_path):
     assert _result(report, "orphaned_document_items").severity is Severity.FAIL
 
 
+@pytest.mark.asyncio
+async def test_orphaned_document_page_fails(temp_db_path):
+    db = await _build_db(temp_db_path)
+    pages_tbl = await db.open_table("document_pages")
+    await pages_tbl.add([DocumentPageRecord(document_id="ghost", page_no=1, page=b"")])
+    report = await run_doctor(_config(), temp_db_path, {})
+    result = _result(report, "orphaned_document_pages")
+    assert result.severity is Severity.FAIL
+    assert "ghost" in result.details
+
+
 async def _add_doc(db, doc_id, *, items, metadata=None, chunks=None):
     docs_tbl = await db.open_table("documents")
     meta_tbl = await db.open_table("document_meta")
@@ -365,7 +381,7 @@ async def test_dangling_doc_item_ref_fails(temp_db_path):
                 id="c2",
                 document_id="d1",
                 content="x",
-                metadata=json.dumps({"doc_item_refs": ["#/texts/999"]}),
+                doc_item_refs=["#/texts/999"],
                 vector=[0.3] * VECTOR_DIM,
             )
         ]
@@ -386,7 +402,7 @@ async def test_unembedded_chunk_warns(temp_db_path):
                 id="zero",
                 document_id="d1",
                 content="x",
-                metadata=json.dumps({"doc_item_refs": ["#/texts/0"]}),
+                doc_item_refs=["#/texts/0"],
                 vector=[0.0] * VECTOR_DIM,
             )
         ]
@@ -438,7 +454,6 @@ async def test_missing_picture_data_in_text_document_is_ok(temp_db_path):
                 position=0,
                 self_ref="#/pictures/0",
                 label="picture",
-                picture_data=None,
             )
         ],
     )
@@ -459,7 +474,6 @@ async def test_missing_picture_data_in_pdf_document_warns(temp_db_path):
                 position=0,
                 self_ref="#/pictures/0",
                 label="picture",
-                picture_data=None,
             )
         ],
     )
@@ -480,7 +494,6 @@ async def test_missing_picture_data_warns(temp_db_path):
                 position=1,
                 self_ref="#/pictures/0",
                 label="picture",
-                picture_data=None,
             )
         ]
     )
@@ -500,12 +513,49 @@ async def test_picture_with_data_ok(temp_db_path):
                 position=1,
                 self_ref="#/pictures/0",
                 label="picture",
-                picture_data=b"\x89PNG",
+                picture_hash="h1",
             )
         ]
     )
+    blobs_tbl = await db.open_table("picture_blobs")
+    await blobs_tbl.add([PictureBlobRecord(hash="h1", data=b"\x89PNG")])
     report = await run_doctor(_config(), temp_db_path, {})
     assert _result(report, "picture_data").severity is Severity.OK
+    assert _result(report, "missing_picture_blobs").severity is Severity.OK
+    assert _result(report, "orphaned_picture_blobs").severity is Severity.OK
+
+
+@pytest.mark.asyncio
+async def test_missing_picture_blob_fails(temp_db_path):
+    db = await _build_db(temp_db_path)
+    items_tbl = await db.open_table("document_items")
+    await items_tbl.add(
+        [
+            DocumentItemRecord(
+                document_id="d1",
+                position=1,
+                self_ref="#/pictures/0",
+                label="picture",
+                picture_hash="gone",
+            )
+        ]
+    )
+    report = await run_doctor(_config(), temp_db_path, {})
+    result = _result(report, "missing_picture_blobs")
+    assert result.severity is Severity.FAIL
+    assert "gone" in result.details
+
+
+@pytest.mark.asyncio
+async def test_orphaned_picture_blob_warns(temp_db_path):
+    db = await _build_db(temp_db_path)
+    blobs_tbl = await db.open_table("picture_blobs")
+    await blobs_tbl.add([PictureBlobRecord(hash="stray", data=b"\x89PNG")])
+    report = await run_doctor(_config(), temp_db_path, {})
+    result = _result(report, "orphaned_picture_blobs")
+    assert result.severity is Severity.WARN
+    assert "stray" in result.details
+    assert not report.failed
 
 
 @pytest.mark.asyncio
@@ -1121,6 +1171,8 @@ async def _build_dup_db(path, docs: dict[str, list[int]], *, vector_dim: int = 8
     chunk_model = create_chunk_model(vector_dim)
     chunks_tbl = await db.create_table("chunks", schema=chunk_model)
     items_tbl = await db.create_table("document_items", schema=DocumentItemRecord)
+    await db.create_table("document_pages", schema=DocumentPageRecord)
+    await db.create_table("picture_blobs", schema=get_picture_blobs_arrow_schema())
 
     await settings_tbl.add(
         [
@@ -1157,7 +1209,7 @@ async def _build_dup_db(path, docs: dict[str, list[int]], *, vector_dim: int = 8
                     id=f"{doc_id}-c{n}",
                     document_id=doc_id,
                     content="x",
-                    metadata=json.dumps({"doc_item_refs": ["#/texts/0"]}),
+                    doc_item_refs=["#/texts/0"],
                     vector=eye[i].tolist(),
                 )
                 for n, i in enumerate(idxs)
@@ -1219,7 +1271,7 @@ async def test_many_unembedded_chunks_are_sampled(temp_db_path):
                 id=f"z{i}",
                 document_id="d1",
                 content="x",
-                metadata=json.dumps({"doc_item_refs": ["#/texts/0"]}),
+                doc_item_refs=["#/texts/0"],
                 vector=[0.0] * VECTOR_DIM,
             )
             for i in range(8)
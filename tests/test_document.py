@@ -48,7 +48,7 @@ async def test_document_list_all_content_skips_docling_blobs(temp_db_path):
                 Document(
                     content=content,
                     docling_document=b"structure-blob",
-                    docling_pages=b"page-raster-blob",
+                    docling_pages={1: b"page-raster-blob"},
                 )
             )
 
@@ -278,7 +278,7 @@ def test_set_docling_splits_structure_and_pages():
 
 
 def test_set_docling_with_page_images():
-    """set_docling stores page images in docling_pages."""
+    """set_docling compresses each page image on its own in docling_pages."""
     import json
 
     from docling_core.types.doc.base import Size
@@ -298,10 +298,17 @@ def test_set_docling_with_page_images():
     document.set_docling(docling_doc)
 
     assert document.docling_pages is not None
+    assert set(document.docling_pages) == {1}
+    page = json.loads(decompress_json(document.docling_pages[1]))
+    assert page["page_no"] == 1
 
-    # Pages blob should contain page data
-    pages = json.loads(decompress_json(document.docling_pages))
-    assert "1" in pages
+
+def test_set_docling_without_pages_clears_pages():
+    from docling_core.types.doc.document import DoclingDocument
+
+    document = Document(content="test")
+    document.set_docling(DoclingDocument(name="no_pages"))
+    assert document.docling_pages == {}
 
 
 def test_compress_docling_split_dict_sources_match():
@@ -334,37 +341,6 @@ def test_compress_docling_split_dict_sources_match():
     assert pages_dump == pages_str
 
 
-def test_get_page_images():
-    """get_page_images returns requested pages from docling_pages blob."""
-    import json
-
-    from haiku.rag.store.compression import compress_json
-
-    pages_data = {
-        "1": {"size": {"width": 612, "height": 792}, "page_no": 1},
-        "2": {"size": {"width": 612, "height": 792}, "page_no": 2},
-        "3": {"size": {"width": 612, "height": 792}, "page_no": 3},
-    }
-    document = Document(
-        content="test",
-        docling_pages=compress_json(json.dumps(pages_data)),
-    )
-
-    result = document.get_page_images([1, 3])
-    assert len(result) == 2
-    assert 1 in result
-    assert 3 in result
-    assert 2 not in result
-
-    # Missing pages are skipped
-    result = document.get_page_images([99])
-    assert len(result) == 0
-
-    # None docling_pages returns empty
-    doc_no_pages = Document(content="test")
-    assert doc_no_pages.get_page_images([1]) == {}
-
-
 @pytest.mark.asyncio
 async def test_get_docling_data_loads_only_docling_columns(
     qa_corpus: list[dict[str, str]], temp_db_path
@@ -414,47 +390,68 @@ async def test_get_docling_data_loads_only_docling_columns(
 
 
 @pytest.mark.asyncio
-@pytest.mark.parametrize(
-    "with_pages",
-    # Markdown documents have no page images, so their pages blob stays None.
-    [True, False],
-    ids=["with_pages", "markdown"],
-)
-async def test_get_pages_data_loads_only_pages_column(
-    qa_corpus: list[dict[str, str]], temp_db_path, with_pages
-):
-    """get_pages_data returns only page image data for a document."""
-    import json
-
-    from haiku.rag.store.compression import compress_json
-
-    pages_blob = (
-        compress_json(
-            json.dumps({"1": {"size": {"width": 612, "height": 792}, "page_no": 1}})
-        )
-        if with_pages
-        else None
-    )
+async def test_get_docling_document_caches_per_table_version(temp_db_path):
+    """Repeat parses of a document reuse the cached object until the
+    documents table changes."""
+    from docling_core.types.doc.document import DoclingDocument
 
     async with Store(temp_db_path, create=True) as store:
         doc_repo = DocumentRepository(store)
+        doc = Document(content="body")
+        doc.set_docling(DoclingDocument(name="cached"))
+        created = await doc_repo.create(doc)
+        assert created.id is not None
 
-        doc = Document(
-            content=qa_corpus[0]["document_extracted"],
-            uri="https://example.com/doc.txt",
-            docling_pages=pages_blob,
-        )
+        first = await doc_repo.get_docling_document(created.id)
+        assert first is not None and first.name == "cached"
+        assert await doc_repo.get_docling_document(created.id) is first
+
+        await doc_repo.create(Document(content="another"))
+        reparsed = await doc_repo.get_docling_document(created.id)
+        assert reparsed is not None and reparsed is not first
+        assert reparsed.name == "cached"
+
+        await doc_repo.delete(created.id)
+        assert await doc_repo.get_docling_document(created.id) is None
+        assert await doc_repo.get_docling_document("nonexistent-id") is None
+
+        await doc_repo.delete_all()
+        assert len(doc_repo._docling_cache) == 0
+
+
+@pytest.mark.asyncio
+async def test_get_docling_document_cache_can_be_disabled(temp_db_path):
+    from docling_core.types.doc.document import DoclingDocument
+
+    from haiku.rag.config import get_config
+
+    config = get_config().model_copy(deep=True)
+    config.storage.docling_cache_size_bytes = 0
+    async with Store(temp_db_path, config=config, create=True) as store:
+        doc_repo = DocumentRepository(store)
+        doc = Document(content="body")
+        doc.set_docling(DoclingDocument(name="uncached"))
         created = await doc_repo.create(doc)
         assert created.id is not None
 
-        result = await doc_repo.get_pages_data(created.id)
-        assert result is not None
-        assert result.id == created.id
-        assert result.content == ""
-        assert result.docling_pages == pages_blob
+        first = await doc_repo.get_docling_document(created.id)
+        assert await doc_repo.get_docling_document(created.id) is not first
 
-        # Non-existent ID returns None
-        assert await doc_repo.get_pages_data("nonexistent-id") is None
+
+def test_document_reuses_parsed_docling_until_blob_changes():
+    from docling_core.types.doc.document import DoclingDocument
+
+    doc = Document(content="body")
+    assert doc.get_docling_document() is None
+
+    doc.set_docling(DoclingDocument(name="first"))
+    parsed = doc.get_docling_document()
+    assert parsed is not None
+    assert doc.get_docling_document() is parsed
+
+    doc.set_docling(DoclingDocument(name="second"))
+    reparsed = doc.get_docling_document()
+    assert reparsed is not None and reparsed.name == "second"
 
 
 @pytest.mark.asyncio
@@ -472,7 +469,7 @@ async def test_document_get_by_id_docling_blobs(temp_db_path, include_blobs):
                 title="Test Document",
                 metadata={"key": "value"},
                 docling_document=b"structure-blob",
-                docling_pages=b"page-raster-blob",
+                docling_pages={1: b"page-raster-blob"},
                 docling_version="2.1.0",
             )
         )
@@ -486,13 +483,13 @@ async def test_document_get_by_id_docling_blobs(temp_db_path, include_blobs):
         assert doc.uri == "https://example.com/doc.pdf"
         assert doc.title == "Test Document"
         assert doc.metadata == {"key": "value"}
+        # Page images live in document_pages and are never loaded with the row.
+        assert doc.docling_pages is None
         if include_blobs:
             assert doc.docling_document == b"structure-blob"
-            assert doc.docling_pages == b"page-raster-blob"
             assert doc.docling_version == "2.1.0"
         else:
             assert doc.docling_document is None
-            assert doc.docling_pages is None
 
 
 @pytest.mark.asyncio
@@ -507,7 +504,7 @@ async def test_document_get_by_uri_docling_blobs(temp_db_path, include_blobs):
                 content="the text",
                 uri="https://example.com/doc.pdf",
                 docling_document=b"structure-blob",
-                docling_pages=b"page-raster-blob",
+                docling_pages={1: b"page-raster-blob"},
             )
         )
 
@@ -518,12 +515,11 @@ async def test_document_get_by_uri_docling_blobs(temp_db_path, include_blobs):
         assert doc is not None
         assert doc.id == created.id
         assert doc.content == "the text"
+        assert doc.docling_pages is None
         if include_blobs:
             assert doc.docling_document == b"structure-blob"
-            assert doc.docling_pages == b"page-raster-blob"
         else:
             assert doc.docling_document is None
-            assert doc.docling_pages is None
 
 
 @pytest.mark.asyncio
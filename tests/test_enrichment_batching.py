@@ -256,7 +256,7 @@ async def test_reranker_blob_fetch_is_one_query_for_any_document_count(
 
     assert counts == [1, 1], counts
     # The reranker scores pixels, so `text` has no business in the projection.
-    picture_projections = [p for p in item_projections if "picture_data" in p]
+    picture_projections = [p for p in item_projections if "picture_hash" in p]
     assert picture_projections, "no picture query observed"
     assert all("text" not in p for p in picture_projections), picture_projections
 
@@ -660,3 +660,84 @@ class TestMCPClientLifetime:
                 mcp_db, config=drifted, read_only=False
             )._lifespan_manager():
                 pass
+
+
+def _health(mcp):
+    route = next(r for r in mcp._additional_http_routes if r.path == "/health")
+    return route.endpoint
+
+
+class TestMCPWarmUp:
+    @pytest.fixture
+    async def empty_db(self, temp_db_path):
+        async with HaikuRAG(temp_db_path, create=True):
+            pass
+        return temp_db_path
+
+    @pytest.mark.asyncio
+    async def test_health_is_ready_without_warm_up(self, empty_db):
+        mcp = create_mcp_server(empty_db, read_only=True)
+
+        async with mcp._lifespan_manager():
+            response = await _health(mcp)(None)
+            assert response.status_code == 200
+
+    @pytest.mark.asyncio
+    async def test_health_waits_for_background_warm_up(self, empty_db, monkeypatch):
+        import asyncio
+
+        from haiku.rag.store.engine import Store
+
+        release = asyncio.Event()
+
+        async def slow_warm(self):
+            await release.wait()
+            return []
+
+        monkeypatch.setattr(Store, "warm", slow_warm)
+
+        mcp = create_mcp_server(empty_db, read_only=True, warm=True)
+        async with mcp._lifespan_manager():
+            response = await _health(mcp)(None)
+            assert response.status_code == 503
+            assert b"warming" in response.body
+
+            release.set()
+            for _ in range(100):
+                if (await _health(mcp)(None)).status_code == 200:
+                    break
+                await asyncio.sleep(0.01)
+            assert (await _health(mcp)(None)).status_code == 200
+
+    @pytest.mark.asyncio
+    async def test_blocking_warm_up_finishes_before_startup(
+        self, empty_db, monkeypatch
+    ):
+        from haiku.rag.store.engine import Store
+
+        warmed = []
+        warm = Store.warm
+
+        async def recorded(self):
+            warmed.extend(await warm(self))
+            return warmed
+
+        monkeypatch.setattr(Store, "warm", recorded)
+
+        mcp = create_mcp_server(empty_db, read_only=True, warm_blocking=True)
+        async with mcp._lifespan_manager():
+            assert "chunks.content_fts_idx" in warmed
+            assert (await _health(mcp)(None)).status_code == 200
+
+    @pytest.mark.asyncio
+    async def test_failed_warm_up_still_reports_ready(self, empty_db, monkeypatch):
+        from haiku.rag.store.engine import Store
+
+        async def broken(self):
+            raise RuntimeError("index unavailable")
+
+        monkeypatch.setattr(Store, "warm", broken)
+
+        mcp = create_mcp_server(empty_db, read_only=True, warm_blocking=True)
+        async with mcp._lifespan_manager():
+            assert (await _health(mcp)(None)).status_code == 200
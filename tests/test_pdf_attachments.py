@@ -65,7 +65,7 @@ async def fake_ingest_fetch_result(
                 metadata=final_metadata,
             )
         )
-    await _reconcile_pdf_attachments(client, doc, result.body, depth=depth)
+    await _reconcile_pdf_attachments(client, doc, result.read_body(), depth=depth)
     return doc
 
 
@@ -498,9 +498,9 @@ async def test_extract_pdf_attachments_called_off_event_loop_thread(
     event_loop_thread = threading.current_thread()
     called_from: list[threading.Thread] = []
 
-    def spy(body, uri, *, depth):
+    def spy(body, uri, *, depth, workers):
         called_from.append(threading.current_thread())
-        return _extract_pdf_attachments(body, uri, depth=depth)
+        return _extract_pdf_attachments(body, uri, depth=depth, workers=workers)
 
     monkeypatch.setattr("haiku.rag.client.documents._extract_pdf_attachments", spy)
     monkeypatch.setattr(
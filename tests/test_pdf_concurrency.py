@@ -4,7 +4,7 @@ import threading
 import pypdfium2 as pdfium
 
 from haiku.rag.client.documents import _extract_pdf_attachments
-from haiku.rag.converters.pdf_split import iter_pdf_slices
+from haiku.rag.converters.pdf_split import iter_pdf_slices, shutdown_pdfium_pools
 
 
 def _make_pdf(pages: int, attachment: tuple[str, bytes] | None) -> bytes:
@@ -19,30 +19,23 @@ def _make_pdf(pages: int, attachment: tuple[str, bytes] | None) -> bytes:
     return buf.getvalue()
 
 
-def test_concurrent_pdfium_access_does_not_corrupt_global_state(tmp_path):
-    """libpdfium has global, non-thread-safe C state. The attachment scan and
-    the page slicer both call into it; without a single shared lock across both
-    sites, concurrent workers corrupt that state and then fail otherwise-valid
-    PDFs with "Data format error". Both paths operate on valid PDFs here, so any
-    failure means the global state was corrupted by a concurrent caller."""
-    body = _make_pdf(pages=6, attachment=("notes.txt", b"payload"))
-    path = tmp_path / "doc.pdf"
-    path.write_bytes(body)
-
+def _hammer(body: bytes, path, workers: int, rounds: int) -> tuple[list, list]:
     scan_results: list[dict | None] = []
     slice_errors: list[str] = []
     lock = threading.Lock()
 
     def scan() -> None:
-        for _ in range(40):
-            r = _extract_pdf_attachments(body, "file:///doc.pdf", depth=0)
+        for _ in range(rounds):
+            r = _extract_pdf_attachments(
+                body, "file:///doc.pdf", depth=0, workers=workers
+            )
             with lock:
                 scan_results.append(r)
 
     def slice_() -> None:
-        for _ in range(40):
+        for _ in range(rounds):
             try:
-                slices = list(iter_pdf_slices(path, 2))
+                slices = list(iter_pdf_slices(path, 2, workers=workers))
                 assert len(slices) == 3
             except Exception as exc:  # noqa: BLE001
                 with lock:
@@ -54,9 +47,41 @@ def test_concurrent_pdfium_access_does_not_corrupt_global_state(tmp_path):
         t.start()
     for t in threads:
         t.join()
+    return scan_results, slice_errors
+
+
+def test_concurrent_pdfium_access_does_not_corrupt_global_state(tmp_path):
+    """libpdfium has global, non-thread-safe C state. The attachment scan and
+    the page slicer both call into it; without a single shared lock across both
+    sites, concurrent workers corrupt that state and then fail otherwise-valid
+    PDFs with "Data format error". Both paths operate on valid PDFs here, so any
+    failure means the global state was corrupted by a concurrent caller."""
+    body = _make_pdf(pages=6, attachment=("notes.txt", b"payload"))
+    path = tmp_path / "doc.pdf"
+    path.write_bytes(body)
+
+    scan_results, slice_errors = _hammer(body, path, workers=0, rounds=40)
 
     failed_scans = sum(r is None or len(r) != 1 for r in scan_results)
     assert failed_scans == 0, (
         f"{failed_scans}/{len(scan_results)} attachment scans failed"
     )
     assert slice_errors == [], slice_errors
+
+
+def test_concurrent_pdfium_access_through_helper_processes(tmp_path):
+    """With helper processes every caller's pdfium work runs outside this
+    process, in parallel across helpers; results match the in-process scan."""
+    body = _make_pdf(pages=6, attachment=("notes.txt", b"payload"))
+    path = tmp_path / "doc.pdf"
+    path.write_bytes(body)
+
+    try:
+        scan_results, slice_errors = _hammer(body, path, workers=2, rounds=5)
+    finally:
+        shutdown_pdfium_pools()
+
+    expected = _extract_pdf_attachments(body, "file:///doc.pdf", depth=0)
+    assert expected is not None and len(expected) == 1
+    assert scan_results == [expected] * len(scan_results)
+    assert slice_errors == [], slice_errors
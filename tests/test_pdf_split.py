@@ -12,9 +12,14 @@ from pathlib import Path
 import pypdfium2 as pdfium
 import pytest
 
+from haiku.rag.client import HaikuRAG
+from haiku.rag.client.exceptions import UnsupportedSourceError
 from haiku.rag.converters.pdf_split import (
     convert_pdf_with_splitting,
     iter_pdf_slices,
+    pdf_page_count,
+    pdfium_pool,
+    shutdown_pdfium_pools,
 )
 
 
@@ -63,6 +68,53 @@ def test_iter_pdf_slices_single_slice_when_doc_fits(tmp_path):
         d.close()
 
 
+@pytest.fixture
+def pdfium_helpers():
+    yield 2
+    shutdown_pdfium_pools()
+
+
+def test_helper_slices_match_in_process_slices(tmp_path, pdfium_helpers):
+    src = _make_pdf(5, tmp_path)
+
+    helper = list(iter_pdf_slices(src, slice_size=2, workers=pdfium_helpers))
+    in_process = list(iter_pdf_slices(src, slice_size=2))
+
+    assert [(s, e) for s, e, _ in helper] == [(1, 2), (3, 4), (5, 5)]
+    assert [(s, e) for s, e, _ in helper] == [(s, e) for s, e, _ in in_process]
+    for _, _, pdf_bytes in helper:
+        d = pdfium.PdfDocument(io.BytesIO(pdf_bytes))
+        try:
+            assert len(d) in (1, 2)
+        finally:
+            d.close()
+    assert pdf_page_count(src, workers=pdfium_helpers) == pdf_page_count(src) == 5
+
+
+@pytest.mark.asyncio
+async def test_last_client_to_close_stops_the_helpers(tmp_path, temp_db_path):
+    src = _make_pdf(2, tmp_path)
+    pool = pdfium_pool(1)
+    try:
+        async with HaikuRAG(temp_db_path, create=True):
+            assert pdf_page_count(src, workers=1) == 2
+            assert pool._executor is not None
+
+        assert pool._executor is None
+    finally:
+        shutdown_pdfium_pools()
+
+
+def test_helper_reports_unreadable_pdf(tmp_path, pdfium_helpers):
+    bad = tmp_path / "bad.pdf"
+    bad.write_bytes(b"not a pdf")
+
+    with pytest.raises(UnsupportedSourceError, match="cannot open PDF"):
+        pdf_page_count(bad, workers=pdfium_helpers)
+    with pytest.raises(UnsupportedSourceError, match="cannot open PDF"):
+        list(iter_pdf_slices(bad, slice_size=2, workers=pdfium_helpers))
+
+
 def test_iter_pdf_slices_rejects_zero_slice_size(tmp_path):
     src = _make_pdf(2, tmp_path)
     with pytest.raises(ValueError, match="slice_size must be >= 1"):
@@ -200,6 +252,103 @@ async def test_concatenate_runs_off_event_loop_thread(tmp_path, monkeypatch):
     )
 
 
+@pytest.mark.asyncio
+async def test_slices_convert_concurrently_and_merge_in_page_order(
+    tmp_path, monkeypatch
+):
+    """Up to `concurrency` slices convert at once, and slices finishing out of
+    order are still merged in page order."""
+    import asyncio
+
+    from docling_core.types.doc.document import DoclingDocument
+
+    src = _make_pdf(7, tmp_path)
+    in_flight = 0
+    peak = 0
+    calls = 0
+
+    class _Converter:
+        async def convert_file(self, path: Path, *, source_uri):
+            nonlocal in_flight, peak, calls
+            index = calls
+            calls += 1
+            in_flight += 1
+            peak = max(peak, in_flight)
+            # Earlier slices finish later.
+            await asyncio.sleep(0.02 * (4 - index))
+            in_flight -= 1
+            return DoclingDocument(name=f"slice-{index}")
+
+    merged: list[list[str]] = []
+
+    def spy(docs):
+        merged.append([doc.name for doc in docs])
+        return docs[0]
+
+    monkeypatch.setattr(DoclingDocument, "concatenate", staticmethod(spy))
+
+    await convert_pdf_with_splitting(
+        _Converter(),  # ty: ignore[invalid-argument-type]
+        src,
+        source_uri=None,
+        slice_size=2,
+        concurrency=2,
+    )
+
+    assert peak == 2
+    assert merged == [["slice-0", "slice-1", "slice-2", "slice-3"]]
+
+
+@pytest.mark.asyncio
+async def test_concurrent_slice_failure_cancels_the_others_and_cleans_up(
+    tmp_path, monkeypatch
+):
+    import asyncio
+
+    src = _make_pdf(6, tmp_path)
+    monkeypatch.setattr("tempfile.tempdir", str(tmp_path))
+    calls: list[Path] = []
+    cancelled = 0
+
+    class _Converter:
+        async def convert_file(self, path: Path, *, source_uri):
+            nonlocal cancelled
+            calls.append(path)
+            if len(calls) == 2:
+                raise RuntimeError("docling exploded")
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled += 1
+                raise
+
+    with pytest.raises(ValueError, match="pages 3-4"):
+        await convert_pdf_with_splitting(
+            _Converter(),  # ty: ignore[invalid-argument-type]
+            src,
+            source_uri=None,
+            slice_size=2,
+            concurrency=2,
+        )
+
+    assert len(calls) == 2
+    assert cancelled == 1
+    assert [p for p in calls if p.exists()] == []
+
+
+@pytest.mark.asyncio
+async def test_convert_rejects_zero_concurrency(tmp_path):
+    src = _make_pdf(2, tmp_path)
+    with pytest.raises(ValueError, match="concurrency must be >= 1"):
+        await convert_pdf_with_splitting(
+            object(),  # ty: ignore[invalid-argument-type]
+            src,
+            source_uri=None,
+            slice_size=1,
+            concurrency=0,
+        )
+
+
 def test_concatenate_shifts_page_nos_and_unique_self_refs():
     """Pins the docling-core contract we rely on: when two docs (each with
     items on page 1) are concatenated, the second doc's items move to page 2
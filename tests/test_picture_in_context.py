@@ -300,7 +300,7 @@ async def test_embed_only_preserves_picture_vectors(temp_db_path, monkeypatch):
 
     async def _picture_chunk_row(rag):
         rows = await rag.chunk_repository.store.chunks_table.query().to_list()
-        picture_rows = [r for r in rows if "#/pictures/0" in (r.get("metadata") or "")]
+        picture_rows = [r for r in rows if "#/pictures/0" in r["doc_item_refs"]]
         assert len(picture_rows) == 1
         return picture_rows[0]
 
@@ -754,6 +754,43 @@ async def test_embed_chunks_dispatches_text_vs_picture():
     assert image_calls == [b"PNGBYTES"]
 
 
+@pytest.mark.asyncio
+async def test_embed_chunks_embeds_each_picture_once():
+    """Repeated pictures are embedded once, and pictures with a known vector
+    are not embedded at all."""
+    from haiku.rag.embeddings import EmbedderWrapper, embed_chunks
+    from haiku.rag.store.models.chunk import Chunk
+    from haiku.rag.store.models.document_item import picture_hash
+
+    image_calls: list[bytes] = []
+
+    class StubEmbedder(EmbedderWrapper):
+        supports_images = True
+
+        def __init__(self):
+            super().__init__(embedder=None, vector_dim=4)
+
+        async def embed_image(self, image):
+            image_calls.append(image)
+            return [float(len(image_calls))] * 4
+
+    def picture(data: bytes, order: int) -> Chunk:
+        chunk = Chunk(content="logo", metadata={"labels": ["picture"]}, order=order)
+        chunk._picture_data = data
+        return chunk
+
+    chunks = [picture(b"LOGO", 0), picture(b"CHART", 1), picture(b"LOGO", 2)]
+    embedded = await embed_chunks(
+        chunks,
+        StubEmbedder(),
+        picture_vectors={picture_hash(b"CHART"): [7.0] * 4},
+    )
+
+    assert image_calls == [b"LOGO"]
+    assert [c.embedding for c in embedded] == [[1.0] * 4, [7.0] * 4, [1.0] * 4]
+    assert [c._picture_data for c in embedded] == [b"LOGO", b"CHART", b"LOGO"]
+
+
 @pytest.mark.asyncio
 async def test_embed_chunks_raises_on_picture_chunks_with_text_only_embedder():
     from haiku.rag.embeddings import EmbedderWrapper, embed_chunks
@@ -822,13 +859,9 @@ async def test_ingest_emits_picture_chunks_with_multimodal_embedder(
         await _store_document_with_chunks(rag, document, embedded, docling_doc)
 
         all_db_chunks = await rag.chunk_repository.store.chunks_table.query().to_list()
-        picture_db_chunks = [
-            c for c in all_db_chunks if "picture" in (c.get("metadata") or "")
-        ]
+        picture_db_chunks = [c for c in all_db_chunks if "picture" in c["labels"]]
         assert len(picture_db_chunks) >= 1
-        assert any(
-            "#/pictures/0" in (c.get("metadata") or "") for c in picture_db_chunks
-        )
+        assert any("#/pictures/0" in c["doc_item_refs"] for c in picture_db_chunks)
 
 
 @pytest.mark.asyncio
@@ -223,13 +223,17 @@ async def test_convert_dispatches_large_pdfs_through_split_and_merge(
 
     config = AppConfig()
     config.processing.split_pages = 2
+    config.processing.split_concurrency = 3
+    config.processing.pdfium_workers = 2
 
     pdf = tmp_path / "big.pdf"
     pdf.write_bytes(b"%PDF-1.4 stub")
     called: dict = {}
 
-    async def fake_split(converter, path, uri, slice_size):
+    async def fake_split(converter, path, uri, slice_size, concurrency, pdfium_workers):
         called["slice_size"] = slice_size
+        called["concurrency"] = concurrency
+        called["pdfium_workers"] = pdfium_workers
         called["path"] = path
         return DoclingDocument(name="merged")
 
@@ -241,6 +245,8 @@ async def test_convert_dispatches_large_pdfs_through_split_and_merge(
 
     assert doc.name == "merged"
     assert called["slice_size"] == 2
+    assert called["concurrency"] == 3
+    assert called["pdfium_workers"] == 2
     assert called["path"] == pdf
 
 
@@ -15,7 +15,7 @@ class ChunkData(TypedDict):
     document_id: str
     content: str
     content_fts: str
-    metadata: str
+    metadata: dict
     order: int
 
 
@@ -189,6 +189,7 @@ async def test_rebuild_resumes_phase2_from_staging_after_crash(
         _StagingChunkRecord,
         _StagingMarkerRecord,
     )
+    from haiku.rag.store.models.chunk import chunk_metadata_columns
 
     # auto_vacuum off: this test drops the chunks table by hand to simulate a
     # crash, where no background vacuum would be in flight. Leaving it on lets
@@ -215,7 +216,7 @@ async def test_rebuild_resumes_phase2_from_staging_after_crash(
                     id=c.id or "",
                     document_id=c.document_id or "",
                     content=c.content,
-                    metadata=json.dumps(c.metadata),
+                    **chunk_metadata_columns(c.metadata),
                     order=c.order,
                 )
                 for c in original_chunks
@@ -381,12 +382,13 @@ async def test_rebuild_embed_only_with_changed_vector_dim(
     The Store should use the stored vector_dim for reading existing chunks,
     then rebuild should handle changing to the new dimension.
     """
-    import json
 
     import lancedb
     from lancedb.pydantic import LanceModel, Vector
     from pydantic import Field
 
+    from haiku.rag.store.models.chunk import chunk_metadata_columns
+
     # Step 1: Create a database with normal 2560-dim embeddings
     async with HaikuRAG(temp_db_path, create=True) as client:
         doc = await client.create_document(content=qa_corpus[0]["document_extracted"])
@@ -400,7 +402,7 @@ async def test_rebuild_embed_only_with_changed_vector_dim(
                 document_id=c.document_id or "",
                 content=c.content,
                 content_fts=c.content,
-                metadata=json.dumps(c.metadata),
+                metadata=c.metadata,
                 order=c.order,
             )
             for c in chunks_before
@@ -414,6 +416,10 @@ async def test_rebuild_embed_only_with_changed_vector_dim(
         document_id: str
         content: str
         content_fts: str = Field(default="")
+        doc_item_refs: list[str] = Field(default_factory=list)
+        headings: list[str] | None = None
+        labels: list[str] = Field(default_factory=list)
+        page_numbers: list[int] = Field(default_factory=list)
         metadata: str = Field(default="{}")
         order: int = Field(default=0)
         vector: Vector(4096) = Field(default_factory=lambda: [0.0] * 4096)  # type: ignore
@@ -428,7 +434,7 @@ async def test_rebuild_embed_only_with_changed_vector_dim(
             document_id=c["document_id"],
             content=c["content"],
             content_fts=c["content_fts"],
-            metadata=c["metadata"],
+            **chunk_metadata_columns(c["metadata"]),
             order=c["order"],
             vector=[0.1] * 4096,
         )
@@ -723,12 +729,12 @@ async def test_rebuild_descriptions_patches_blob_and_chunks(temp_db_path, monkey
 
     - the docling blob has the description in meta;
     - the chunk text picks it up;
-    - the docling_pages blob is preserved untouched.
+    - the stored page images are preserved untouched.
 
     The pages assertion guards against a foot-gun in compress_docling_split:
     the docling document loaded via get_docling_document() never carries
-    pages (they live in a separate column), so calling set_docling() after
-    patching would write pages_bytes=None and silently destroy page rasters
+    pages (they live in document_pages), so calling set_docling() after
+    patching would write an empty page set and silently destroy page rasters
     on disk — breaking visualize_chunk for the affected docs."""
     from haiku.rag.client.documents import _store_document_with_chunks
     from haiku.rag.config import AppConfig
@@ -746,13 +752,11 @@ async def test_rebuild_descriptions_patches_blob_and_chunks(temp_db_path, monkey
         created = await _store_document_with_chunks(rag, document, [], docling_doc)
         assert created.id is not None
 
-        # _docling_doc_with_picture has no PageItems, so set_docling leaves
-        # docling_pages as None. Inject sentinel bytes to stand in for what
-        # a real ingest with generate_page_images=True would store.
+        # _docling_doc_with_picture has no PageItems, so set_docling stores
+        # no pages. Inject sentinel bytes to stand in for what a real ingest
+        # with generate_page_images=True would store.
         sentinel_pages = b"\x80SENTINEL_PAGE_BYTES"
-        await rag.store.documents_table.update(
-            {"docling_pages": sentinel_pages}, where=f"id = '{created.id}'"
-        )
+        await rag.document_page_repository.create_all({created.id: {1: sentinel_pages}})
 
         from_blob = (
             await rag.document_repository.get_by_id(created.id, include_blobs=True)
@@ -799,8 +803,9 @@ async def test_rebuild_descriptions_patches_blob_and_chunks(temp_db_path, monkey
         chunks = await rag.chunk_repository.get_by_document_id(created.id)
         assert any("A red square (mocked)." in (c.content or "") for c in chunks)
 
-        # docling_pages must survive untouched — see docstring.
-        assert after.docling_pages == sentinel_pages
+        # Page images must survive untouched — see docstring.
+        pages = await rag.store.document_pages_table.query().to_list()
+        assert [row["page"] for row in pages] == [sentinel_pages]
 
 
 @pytest.mark.vcr()
@@ -903,7 +908,7 @@ async def test_patch_picture_descriptions_warns_on_missing_bytes(temp_db_path):
         # Wipe the stored picture bytes to simulate a doc that knows about
         # pictures but doesn't have them on disk.
         await rag.store.document_items_table.update(
-            {"picture_data": None},
+            {"picture_hash": None},
             where=f"document_id = '{created.id}' AND label = 'picture'",
         )
 
@@ -1549,7 +1554,7 @@ async def test_rebuild_embed_only_recovers_picture_bytes(
 
         if wipe_bytes:
             await rag.store.document_items_table.update(
-                {"picture_data": None},
+                {"picture_hash": None},
                 where=f"document_id = '{created.id}' AND label = 'picture'",
             )
 
@@ -28,8 +28,11 @@ def _meta(etag: str) -> dict:
 
 
 def _get_result(data: bytes) -> MagicMock:
+    async def _stream():
+        yield data
+
     result = MagicMock()
-    result.bytes_async = AsyncMock(return_value=data)
+    result.stream = MagicMock(side_effect=lambda **_: _stream())
     return result
 
 
@@ -175,8 +178,9 @@ async def test_create_document_from_s3_rejects_invalid_uri(
 async def test_create_document_from_s3_rejects_unsupported_extension(
     fake_obstore_io, temp_db_path
 ):
-    head_async, _ = fake_obstore_io
+    head_async, get_async = fake_obstore_io
     head_async.return_value = _meta('"abc"')
+    get_async.return_value = _get_result(b"opaque")
 
     async with HaikuRAG(temp_db_path, create=True) as client:
         with pytest.raises(ValueError, match="Unsupported content type"):
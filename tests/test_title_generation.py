@@ -1,3 +1,4 @@
+import asyncio
 import random
 
 import pytest
@@ -5,6 +6,7 @@ from docling_core.types.doc.document import ContentLayer, DoclingDocument
 from docling_core.types.doc.labels import DocItemLabel
 
 from haiku.rag.client import HaikuRAG
+from haiku.rag.client.documents import DocumentImport
 from haiku.rag.client.titles import extract_structural_title, resolve_title
 from haiku.rag.config import AppConfig
 from haiku.rag.config.models import ProcessingConfig
@@ -232,6 +234,159 @@ class TestImportDocumentAutoTitle:
             assert doc.title == "Keep This Title"
 
 
+# =========================================================================
+# Deferred LLM titles
+# =========================================================================
+
+
+@pytest.fixture
+def llm_titles(monkeypatch):
+    """Stands in for the title model, recording the content it is shown."""
+    seen: list[str] = []
+
+    async def fake_llm(config, content):
+        seen.append(content)
+        return f"Generated {len(seen)}"
+
+    monkeypatch.setattr("haiku.rag.client.titles.generate_title_with_llm", fake_llm)
+    return seen
+
+
+class TestTitleBackfill:
+    @pytest.mark.asyncio
+    async def test_untitled_document_is_titled_after_storing(
+        self, temp_db_path, llm_titles
+    ):
+        config = AppConfig(processing=ProcessingConfig(auto_title=True))
+        async with HaikuRAG(temp_db_path, config=config, create=True) as client:
+            doc = await client.create_document(
+                "Plain text without a heading.", uri="test://deferred"
+            )
+            assert doc.title is None
+            assert doc.id is not None
+        # Closing the client drains the backfill.
+        assert llm_titles == ["Plain text without a heading."]
+
+        async with HaikuRAG(temp_db_path, config=config) as client:
+            stored = await client.get_document_by_id(doc.id)
+            assert stored is not None
+            assert stored.title == "Generated 1"
+
+    @pytest.mark.asyncio
+    async def test_batch_import_is_titled_together(self, temp_db_path, llm_titles):
+        config = AppConfig(processing=ProcessingConfig(auto_title=True))
+        async with HaikuRAG(temp_db_path, config=config, create=True) as client:
+            imports = []
+            for text in ["First body.", "# Heading\n\nSecond body.", "Third body."]:
+                docling_doc = await client.convert(text)
+                imports.append(
+                    DocumentImport(docling_doc, await client.chunk(docling_doc))
+                )
+            docs = await client.import_documents(imports)
+        assert sorted(llm_titles) == ["First body.", "Third body."]
+
+        async with HaikuRAG(temp_db_path, config=config) as client:
+            titles = [
+                (await client.get_document_by_id(doc.id)).title
+                for doc in docs
+                if doc.id is not None
+            ]
+        assert titles[1] == "Heading"
+        assert {titles[0], titles[2]} == {"Generated 1", "Generated 2"}
+
+    @pytest.mark.asyncio
+    async def test_title_set_meanwhile_is_kept(self, temp_db_path, monkeypatch):
+        release = asyncio.Event()
+
+        async def slow_llm(config, content):
+            await release.wait()
+            return "Generated"
+
+        monkeypatch.setattr("haiku.rag.client.titles.generate_title_with_llm", slow_llm)
+        config = AppConfig(processing=ProcessingConfig(auto_title=True))
+        async with HaikuRAG(temp_db_path, config=config, create=True) as client:
+            doc = await client.create_document("No heading here.", uri="test://kept")
+            assert doc.id is not None
+            await client.update_document(doc.id, title="Chosen Title")
+            release.set()
+
+        async with HaikuRAG(temp_db_path, config=config) as client:
+            stored = await client.get_document_by_id(doc.id)
+            assert stored is not None
+            assert stored.title == "Chosen Title"
+
+    @pytest.mark.asyncio
+    async def test_metadata_updated_meanwhile_is_kept(self, temp_db_path, monkeypatch):
+        release = asyncio.Event()
+
+        async def slow_llm(config, content):
+            await release.wait()
+            return "Generated"
+
+        monkeypatch.setattr("haiku.rag.client.titles.generate_title_with_llm", slow_llm)
+        config = AppConfig(processing=ProcessingConfig(auto_title=True))
+        async with HaikuRAG(temp_db_path, config=config, create=True) as client:
+            doc = await client.create_document("No heading here.", uri="test://meta")
+            assert doc.id is not None
+            await client.update_document(doc.id, metadata={"reviewed": True})
+            release.set()
+
+        async with HaikuRAG(temp_db_path, config=config) as client:
+            stored = await client.get_document_by_id(doc.id)
+            assert stored is not None
+            assert stored.title == "Generated"
+            assert stored.metadata == {"reviewed": True}
+
+    @pytest.mark.asyncio
+    async def test_set_missing_titles_counts_titled_documents(self, temp_db_path):
+        async with HaikuRAG(temp_db_path, create=True) as client:
+            untitled = await client.create_document("Body.", uri="test://untitled")
+            titled = await client.create_document(
+                "Body.", uri="test://titled", title="Kept"
+            )
+            assert untitled.id is not None and titled.id is not None
+
+            count = await client.document_repository.set_missing_titles(
+                {untitled.id: "It's new", titled.id: "Ignored", "missing": "Ignored"}
+            )
+
+            assert count == 1
+            stored = await client.get_document_by_id(untitled.id)
+            kept = await client.get_document_by_id(titled.id)
+            assert stored is not None and kept is not None
+            assert stored.title == "It's new"
+            assert kept.title == "Kept"
+
+    @pytest.mark.asyncio
+    async def test_failed_generation_leaves_title_empty(
+        self, temp_db_path, monkeypatch
+    ):
+        async def exploding_llm(config, content):
+            raise RuntimeError("LLM unavailable")
+
+        monkeypatch.setattr(
+            "haiku.rag.client.titles.generate_title_with_llm", exploding_llm
+        )
+        config = AppConfig(processing=ProcessingConfig(auto_title=True))
+        async with HaikuRAG(temp_db_path, config=config, create=True) as client:
+            doc = await client.create_document("No heading here.", uri="test://fail")
+            assert doc.id is not None
+
+        async with HaikuRAG(temp_db_path, config=config) as client:
+            stored = await client.get_document_by_id(doc.id)
+            assert stored is not None
+            assert stored.title is None
+
+    @pytest.mark.asyncio
+    async def test_disabled_backfill_titles_inline(self, temp_db_path, llm_titles):
+        config = AppConfig(processing=ProcessingConfig(auto_title=True))
+        config.processing.title_backfill.enabled = False
+        async with HaikuRAG(temp_db_path, config=config, create=True) as client:
+            assert client.title_backfiller is None
+            doc = await client.create_document("No heading here.", uri="test://inline")
+            assert doc.title == "Generated 1"
+
+
 # =========================================================================
 # generate_title() public method
 # =========================================================================
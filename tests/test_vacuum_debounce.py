@@ -31,7 +31,7 @@ async def test_schedule_vacuum_is_debounced(temp_db_path, monkeypatch):
         async def fake_vacuum(*_a, **_k):
             calls.append(1)
 
-        monkeypatch.setattr(client.store, "vacuum", fake_vacuum)
+        monkeypatch.setattr(client.store, "compact", fake_vacuum)
 
         for _ in range(3):
             client._schedule_vacuum()
@@ -57,7 +57,7 @@ async def test_debounced_writes_still_collapse_on_close(temp_db_path, monkeypatc
         async def fake_vacuum(*_a, **_k):
             calls.append(1)
 
-        monkeypatch.setattr(client.store, "vacuum", fake_vacuum)
+        monkeypatch.setattr(client.store, "compact", fake_vacuum)
 
         client._schedule_vacuum()  # schedules the first background pass
         client._schedule_vacuum()  # debounced (no task)
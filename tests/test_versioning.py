@@ -273,8 +273,10 @@ async def test_vacuum_completes_before_context_exit(temp_db_path, monkeypatch):
     """Test that background vacuum completes when context manager exits."""
     from haiku.rag.config import get_config
 
-    # Set aggressive vacuum retention for this test
+    # Set aggressive vacuum retention for this test, and compact as soon as
+    # any version is stale
     monkeypatch.setattr(get_config().storage, "vacuum_retention_seconds", 0)
+    monkeypatch.setattr(get_config().storage.compaction, "max_stale_versions", 1)
 
     async with HaikuRAG(db_path=temp_db_path, create=True) as client:
         # Create multiple documents - each creation triggers automatic vacuum with retention=0
@@ -310,7 +312,7 @@ async def test_aexit_awaits_background_vacuum(temp_db_path, monkeypatch):
     vacuum_completed = asyncio.Event()
 
     async with HaikuRAG(db_path=temp_db_path, create=True) as client:
-        original_vacuum = client.store.vacuum
+        original_vacuum = client.store.compact
 
         async def instrumented_vacuum(*args, **kwargs):
             vacuum_started.set()
@@ -320,7 +322,7 @@ async def test_aexit_awaits_background_vacuum(temp_db_path, monkeypatch):
             await original_vacuum(*args, **kwargs)
             vacuum_completed.set()
 
-        client.store.vacuum = instrumented_vacuum
+        client.store.compact = instrumented_vacuum
 
         await client.create_document(content="triggers background vacuum")
 
@@ -363,7 +365,7 @@ async def test_aexit_awaits_all_background_vacuums(temp_db_path, monkeypatch):
                     await asyncio.sleep(2.0)
                     first_vacuum_completed.set()
 
-        client.store.vacuum = slow_vacuum
+        client.store.compact = slow_vacuum
 
         await client.create_document(content="triggers first vacuum")
         # Let Task A start and acquire the vacuum lock before scheduling B.
@@ -409,6 +411,7 @@ async def test_auto_vacuum_enabled_triggers_vacuum(temp_db_path, monkeypatch):
     # Enable auto-vacuum with aggressive retention
     monkeypatch.setattr(get_config().storage, "auto_vacuum", True)
     monkeypatch.setattr(get_config().storage, "vacuum_retention_seconds", 0)
+    monkeypatch.setattr(get_config().storage.compaction, "max_stale_versions", 1)
 
     async with HaikuRAG(db_path=temp_db_path, create=True) as client:
         # Create multiple documents
@@ -439,7 +442,7 @@ async def test_close_suppresses_failing_drain_vacuum(temp_db_path, monkeypatch):
 
     # Writes happened, so close owes a final vacuum — force that drain branch.
     client._vacuum_dirty = True
-    monkeypatch.setattr(client.store, "vacuum", boom)
+    monkeypatch.setattr(client.store, "compact", boom)
 
     # Must not raise despite the drain vacuum erroring.
     await client.__aexit__(None, None, None)
@@ -0,0 +1,113 @@
+import asyncio
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+import pytest
+
+from haiku.rag.converters import worker_pool
+from haiku.rag.converters.worker_pool import (
+    WorkerPool,
+    acquire_worker_pools,
+    release_worker_pools,
+)
+
+
+def _echo_or_crash(value: str) -> str:
+    """Kills its worker for "crash"; otherwise returns `value` a little later,
+    so the other tasks are still in flight when the crash lands."""
+    if value == "crash":
+        os._exit(1)
+    time.sleep(0.5)
+    return value
+
+
+class _CountingPool(WorkerPool):
+    """Records how many single-worker retry executors are alive at once."""
+
+    def __init__(self, workers: int):
+        super().__init__("Test worker", workers)
+        self.retrying = 0
+        self.peak_retrying = 0
+        self.count_lock = threading.Lock()
+
+    def _new_executor(self, workers: int) -> ProcessPoolExecutor:
+        if workers == self.workers:
+            return super()._new_executor(workers)
+        with self.count_lock:
+            self.retrying += 1
+            self.peak_retrying = max(self.peak_retrying, self.retrying)
+        return _RetryExecutor(self)
+
+
+class _RetryExecutor(ProcessPoolExecutor):
+    def __init__(self, pool: _CountingPool):
+        super().__init__(max_workers=1, mp_context=multiprocessing.get_context("spawn"))
+        self.pool = pool
+
+    def shutdown(self, wait: bool = True, *, cancel_futures: bool = False) -> None:
+        with self.pool.count_lock:
+            self.pool.retrying -= 1
+        super().shutdown(wait, cancel_futures=cancel_futures)
+
+
+@pytest.mark.asyncio
+async def test_retries_after_a_crash_are_bounded_by_workers():
+    pool = _CountingPool(workers=2)
+    values = ["crash", *(f"v{i}" for i in range(5))]
+    try:
+        results = await asyncio.gather(
+            *(pool.arun(_echo_or_crash, value) for value in values),
+            return_exceptions=True,
+        )
+    finally:
+        pool.shutdown()
+
+    assert isinstance(results[0], BrokenProcessPool)
+    assert results[1:] == values[1:]
+    assert 0 < pool.peak_retrying <= 2
+
+
+def test_blocking_run_retries_alone():
+    pool = WorkerPool("Test worker", 1)
+    try:
+        with pytest.raises(BrokenProcessPool):
+            pool.run(_echo_or_crash, "crash")
+        assert pool.run(_echo_or_crash, "after") == "after"
+    finally:
+        pool.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_last_client_to_close_stops_the_workers(temp_db_path):
+    # Imported here: spawned workers import this module to find their tasks.
+    from haiku.rag.client import HaikuRAG
+
+    pool = WorkerPool("Test worker", 1)
+    try:
+        assert await pool.arun(_echo_or_crash, "started") == "started"
+
+        async with HaikuRAG(temp_db_path, create=True):
+            async with HaikuRAG(temp_db_path):
+                pass
+            # Another client is still open.
+            assert pool._executor is not None
+
+        assert pool._executor is None
+    finally:
+        pool.shutdown()
+
+
+def test_release_without_users_stops_every_pool(monkeypatch):
+    monkeypatch.setattr(worker_pool, "_users", 0)
+    pools = [WorkerPool("Test worker", 1) for _ in range(2)]
+    for pool in pools:
+        pool._current_executor()
+
+    acquire_worker_pools()
+    release_worker_pools()
+
+    assert all(pool._executor is None for pool in pools)